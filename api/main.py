@@ -1,22 +1,29 @@
-import json
-import subprocess
+import asyncio
+import threading
+from contextlib import asynccontextmanager
+from datetime import datetime
 from pathlib import Path
-from typing import Any, Iterator
+from typing import Annotated, Any, AsyncIterator, Callable, Iterator, TypeVar
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Header, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, Response
 from pydantic import BaseModel
+from starlette.background import BackgroundTask
 from sse_starlette.sse import EventSourceResponse
 
-from neurocli_core.code_formatter import format_code
-from neurocli_core.diff_generator import generate_diff
-from neurocli_core.file_handler import create_backup
-from neurocli_core.git_engine import execute_commit_and_push, get_staged_diff
-from neurocli_core.radar_engine import (
-    scan_recent_edits,
-    scan_technical_debt,
-    scan_workspace_health,
+from api.responses import (
+    JSON_BACKEND,
+    CompressionMiddleware,
+    FastJSONResponse,
+    FastJSONRoute,
+    dumps,
+    get_response_metrics,
 )
+from neurocli_core.executors import LaneBusyError, close_execution_lanes, get_execution_lanes
+from neurocli_core.llm_api_openai import close_openai_clients, start_background_warm_up
+# Git, radar, formatter, diff, and backup services are imported inside their
+# handlers so API readiness only pays for the prompt workflow.
 from neurocli_core.workflow_service import (
     AIWorkflowRequest,
     AIWorkflowResponse,
@@ -36,8 +43,29 @@ EXCLUDED_DIRECTORIES = {
     "dist",
     "build",
 }
+# Diff payload bounds: files per summary page, and characters of one file's diff.
+DIFF_PAGE_SIZE = 200
+MAX_FILE_DIFF_CHARS = 512 * 1024
 
-app = FastAPI(title="NeuroCLI API")
+T = TypeVar("T")
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    # Warm-up runs on a daemon thread so API readiness never waits on the network.
+    start_background_warm_up()
+    yield
+    close_openai_clients()
+    close_execution_lanes()
+
+    from neurocli_core.formatter_service import close_formatter_service
+
+    close_formatter_service()
+
+
+app = FastAPI(title="NeuroCLI API", lifespan=lifespan)
+# Set before any route is declared: dict results are rendered with orjson when available.
+app.router.route_class = FastJSONRoute
 
 # The React client still runs on Vite defaults during local development.
 app.add_middleware(
@@ -52,6 +80,16 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(CompressionMiddleware)
+
+
+@app.exception_handler(LaneBusyError)
+async def lane_busy_handler(request: Request, exc: LaneBusyError) -> Response:
+    """Turn a full lane that a handler did not catch into the usual ``{"error"}`` payload."""
+
+    return FastJSONResponse(
+        {"error": str(exc), "lane": exc.lane}, status_code=503, headers={"Retry-After": "1"}
+    )
 
 
 class PromptRequest(BaseModel):
@@ -66,13 +104,58 @@ class FormatRequest(BaseModel):
     file_path: str
 
 
+class FormatBatchRequest(BaseModel):
+    # With no paths and no changed_only, the whole workspace is formatted.
+    paths: list[str] | None = None
+    pattern: str | None = None
+    changed_only: bool = False
+    check_only: bool = False
+    max_workers: int | None = None
+
+
 class ApplyRequest(BaseModel):
     file_path: str
     content: str
+    # SHA-256 of the file bytes the client last saw; the apply is refused if it moved.
+    expected_hash: str | None = None
+
+
+class ApplyBatchRequest(BaseModel):
+    files: list[ApplyRequest]
+
+
+class UndoRequest(BaseModel):
+    file_path: str
+
+
+class ProposalApplyRequest(BaseModel):
+    # None applies every hunk; an empty list applies nothing.
+    accepted_hunk_ids: list[str] | None = None
 
 
 class CommitRequest(BaseModel):
     message: str
+    # Push as a background job after committing; poll or stream it by `push_job_id`.
+    push: bool = True
+
+
+class DiffStreamRequest(BaseModel):
+    paths: list[str] | None = None
+
+
+class ContextEstimateRequest(BaseModel):
+    paths: list[str]
+    refine: bool = True
+
+
+async def _run_blocking(lane: str, func: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    """Run blocking work on a bounded executor lane (see ``neurocli_core.executors``).
+
+    Handlers never call filesystem, subprocess, or model code on the event loop
+    directly; one slow call there would stall every open SSE stream.
+    """
+
+    return await get_execution_lanes().run(lane, func, *args, **kwargs)
 
 
 def _is_within_workspace(path: Path) -> bool:
@@ -187,42 +270,80 @@ def get_directory_tree(path: Path) -> dict[str, Any]:
     return result
 
 
-def _get_git_status() -> tuple[str, list[str]]:
+def _get_git_status() -> tuple[str, list[str], dict[str, Any] | None]:
+    from neurocli_core.git_status import GitStatusError, get_git_status_service
+
     try:
-        status_result = subprocess.run(
-            ["git", "status", "-s"],
-            capture_output=True,
-            encoding="utf-8",
-            errors="replace",
-            check=True,
-            cwd=WORKSPACE_ROOT,
-        )
-        lines = status_result.stdout.strip().splitlines()
-        unsaved = [line[3:] for line in lines if len(line) > 3]
-
-        branch_result = subprocess.run(
-            ["git", "branch", "--show-current"],
-            capture_output=True,
-            encoding="utf-8",
-            check=True,
-            cwd=WORKSPACE_ROOT,
-        )
-        branch = branch_result.stdout.strip()
-        return f"On branch {branch}", unsaved
-    except subprocess.CalledProcessError:
-        return "Not a git repository or git error.", []
+        status = get_git_status_service(WORKSPACE_ROOT).status()
+    except GitStatusError:
+        return "Not a git repository or git error.", [], None
+    return status.summary(), status.changed_paths, status.to_dict()
 
 
 def _serialize_stream_events(payload: PromptRequest) -> Iterator[dict[str, str]]:
     workflow_request, error_response = _build_safe_workflow_request(payload)
     if error_response is not None:
         error_event = {"event": "error", "delta": "", "response": error_response.to_dict()}
-        yield {"event": "error", "data": json.dumps(error_event)}
+        yield {"event": "error", "data": dumps(error_event)}
         return
 
     # Every SSE message carries the canonical workflow event JSON as its data payload.
     for event in stream_ai_workflow(workflow_request):
-        yield {"event": event.event, "data": json.dumps(event.to_dict())}
+        event_payload = event.to_dict()
+        if event.response is not None:
+            _attach_proposal(event_payload, event.response)
+        yield {"event": event.event, "data": dumps(event_payload)}
+
+
+def _collect_batch_targets(req: FormatBatchRequest) -> list[Path]:
+    from neurocli_core.batch_formatter import collect_format_targets
+
+    paths = [str(_resolve_workspace_path(raw_path)) for raw_path in req.paths or []]
+    return collect_format_targets(
+        WORKSPACE_ROOT, paths=paths, pattern=req.pattern, changed_only=req.changed_only
+    )
+
+
+def _serialize_format_batch_events(req: FormatBatchRequest) -> Iterator[dict[str, str]]:
+    from neurocli_core.batch_formatter import (
+        get_format_batch_store,
+        iter_format_batch,
+        new_format_batch,
+    )
+
+    try:
+        files = _collect_batch_targets(req)
+    except Exception as exc:
+        yield {"event": "error", "data": dumps({"error": str(exc)})}
+        return
+
+    yield {"event": "start", "data": dumps({"total": len(files)})}
+    batch = new_format_batch(WORKSPACE_ROOT, check_only=req.check_only)
+    for outcome in iter_format_batch(batch, files, max_workers=req.max_workers):
+        progress = {"done": len(batch.outcomes), "total": len(files), "file": outcome.to_dict()}
+        yield {"event": "progress", "data": dumps(progress)}
+
+    if batch.changed and not batch.check_only:
+        get_format_batch_store().add(batch)
+    yield {"event": "complete", "data": dumps(batch.to_dict())}
+
+
+def _attach_proposal(payload: dict[str, Any], response: AIWorkflowResponse) -> None:
+    """Register file updates as reviewable proposals so clients can apply them hunk by hunk."""
+
+    if not response.ok or response.response_kind != "file_update" or not response.target_file:
+        return
+
+    from neurocli_core.proposals import get_proposal_store
+
+    proposal = get_proposal_store().create(
+        response.target_file, response.original_content, response.output_text
+    )
+    payload["proposal"] = proposal.to_dict()
+
+
+def _format_timestamp(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
 
 
 @app.get("/")
@@ -240,7 +361,13 @@ async def execute_prompt(payload: PromptRequest) -> dict[str, Any]:
     workflow_request, error_response = _build_safe_workflow_request(payload)
     if error_response is not None:
         return error_response.to_dict()
-    return execute_ai_workflow(workflow_request).to_dict()
+    try:
+        response = await _run_blocking("llm", execute_ai_workflow, workflow_request)
+    except LaneBusyError as exc:
+        return _build_workflow_error_response(payload, str(exc)).to_dict()
+    payload = response.to_dict()
+    _attach_proposal(payload, response)
+    return payload
 
 
 @app.post("/api/ai/stream")
@@ -252,92 +379,692 @@ async def stream_prompt(payload: PromptRequest) -> EventSourceResponse:
 async def get_radar_stats() -> dict[str, Any]:
     """Return aggregated stats from the radar engine for the current workspace."""
 
-    health = scan_workspace_health(str(WORKSPACE_ROOT))
-    debt = scan_technical_debt(str(WORKSPACE_ROOT))
-    edits = scan_recent_edits(str(WORKSPACE_ROOT), max_items=20, max_days=7)
+    from neurocli_core.radar_engine import (
+        scan_recent_edits,
+        scan_technical_debt,
+        scan_workspace_health,
+    )
+
+    lanes = get_execution_lanes()
+    root = str(WORKSPACE_ROOT)
+    try:
+        # The walks run in worker processes and are shared by concurrent callers;
+        # recent edits only read the backup index.
+        health, debt, edits = await asyncio.gather(
+            lanes.run_shared("cpu", f"radar-health:{root}", scan_workspace_health, root),
+            lanes.run_shared("cpu", f"radar-debt:{root}", scan_technical_debt, root),
+            _run_blocking("io", scan_recent_edits, root, max_items=20, max_days=7),
+        )
+    except LaneBusyError as exc:
+        return {"error": str(exc)}
 
     return {"health": health, "debt": debt, "edits": edits}
 
 
+@app.post("/api/context/estimate")
+async def estimate_context_endpoint(req: ContextEstimateRequest) -> dict[str, Any]:
+    """Estimate context tokens with the same cached service the Textual app uses."""
+
+    from neurocli_core.token_estimator import get_token_estimator
+
+    try:
+        resolved_paths = [str(_resolve_workspace_path(raw_path)) for raw_path in req.paths]
+    except (FileNotFoundError, ValueError) as exc:
+        return {"error": str(exc)}
+
+    estimate = await _run_blocking(
+        "io", get_token_estimator().estimate, resolved_paths, refine=req.refine
+    )
+    payload = estimate.to_dict()
+    # Echo the caller's own path strings so the client can key rows by them.
+    caller_paths = dict(zip(resolved_paths, req.paths))
+    for path_payload in payload["paths"]:
+        path_payload["path"] = caller_paths.get(path_payload["path"], path_payload["path"])
+    return payload
+
+
 @app.get("/api/files")
 async def get_files() -> dict[str, Any]:
     """Return the directory structure of the current workspace root."""
 
-    return get_directory_tree(WORKSPACE_ROOT)
+    return await _run_blocking("io", get_directory_tree, WORKSPACE_ROOT)
+
+
+@app.get("/api/files/list")
+async def list_directory_endpoint(
+    path: str = "",
+    cursor: str | None = None,
+    limit: int = 200,
+) -> dict[str, Any]:
+    """Return one directory level with workspace-relative paths, child counts, and a page cursor."""
+
+    from neurocli_core.workspace_tree import get_workspace_tree
+
+    tree = get_workspace_tree(WORKSPACE_ROOT, excluded=EXCLUDED_DIRECTORIES)
+    try:
+        page = await _run_blocking("io", tree.list_directory, path, cursor=cursor, limit=limit)
+    except (OSError, ValueError) as exc:
+        return {"error": str(exc)}
+    return page.to_dict()
 
 
 @app.get("/api/git/status")
 async def get_status_endpoint() -> dict[str, Any]:
-    status_msg, unsaved_files = _get_git_status()
-    return {"status_message": status_msg, "unsaved_files": unsaved_files}
+    try:
+        status_msg, unsaved_files, details = await _run_blocking("git", _get_git_status)
+    except LaneBusyError as exc:
+        return {"error": str(exc)}
+    payload: dict[str, Any] = {"status_message": status_msg, "unsaved_files": unsaved_files}
+    if details is not None:
+        payload["branch"] = details["branch"]
+        payload["entries"] = details["entries"]
+    return payload
+
+
+def _git_pathspec(raw_path: str) -> str:
+    resolved = _resolve_workspace_path(raw_path, must_exist=False)
+    return resolved.relative_to(WORKSPACE_ROOT).as_posix()
 
 
 @app.get("/api/git/diff")
-async def get_diff_endpoint(path: str | None = None) -> dict[str, str]:
-    _ = path
+async def get_diff_endpoint(
+    path: str | None = None,
+    summary: bool = False,
+    offset: int = 0,
+    limit: int = DIFF_PAGE_SIZE,
+) -> dict[str, Any]:
+    """Return the diff, one file's diff (`path`), or a paginated file list (`summary`)."""
+
+    from neurocli_core.git_engine import get_diff_stats, get_staged_diff
+
+    if summary:
+        try:
+            stats, is_fallback = await _run_blocking("git", get_diff_stats, None, WORKSPACE_ROOT)
+        except Exception as exc:
+            return {"error": str(exc)}
+        offset = max(0, offset)
+        limit = max(1, min(limit, DIFF_PAGE_SIZE))
+        return {
+            "files": [stat.to_dict() for stat in stats[offset : offset + limit]],
+            "total_files": len(stats),
+            "offset": offset,
+            "limit": limit,
+            "added": sum(stat.added or 0 for stat in stats),
+            "deleted": sum(stat.deleted or 0 for stat in stats),
+            "fallback": is_fallback,
+        }
+
+    if path:
+        try:
+            pathspec = _git_pathspec(path)
+            diff_text, is_fallback = await _run_blocking(
+                "git", get_staged_diff, [pathspec], WORKSPACE_ROOT
+            )
+        except Exception as exc:
+            return {"error": str(exc)}
+        truncated = len(diff_text) > MAX_FILE_DIFF_CHARS
+        return {
+            "path": pathspec,
+            "diffs": diff_text[:MAX_FILE_DIFF_CHARS],
+            "truncated": truncated,
+            "fallback": is_fallback,
+        }
+
     try:
-        diff_text, _is_fallback = get_staged_diff()
+        diff_text, _is_fallback = await _run_blocking("git", get_staged_diff)
         return {"diffs": diff_text}
     except Exception as exc:
         return {"diffs": str(exc)}
 
 
+def _serialize_diff_events(req: DiffStreamRequest) -> Iterator[dict[str, str]]:
+    from neurocli_core.git_engine import get_diff_stats, iter_file_diffs
+
+    try:
+        paths = [_git_pathspec(raw_path) for raw_path in req.paths or []]
+        stats, is_fallback = get_diff_stats(paths, WORKSPACE_ROOT)
+    except Exception as exc:
+        yield {"event": "error", "data": dumps({"event": "error", "error": str(exc)})}
+        return
+
+    # The file list goes first so the client can render it before any diff text arrives.
+    summary_event = {
+        "event": "summary",
+        "files": [stat.to_dict() for stat in stats],
+        "fallback": is_fallback,
+    }
+    yield {"event": "summary", "data": dumps(summary_event)}
+    sent = 0
+    try:
+        for file_path, diff_text in iter_file_diffs(paths, WORKSPACE_ROOT, cached=not is_fallback):
+            sent += 1
+            file_event = {
+                "event": "file",
+                "path": file_path,
+                "diff": diff_text[:MAX_FILE_DIFF_CHARS],
+                "truncated": len(diff_text) > MAX_FILE_DIFF_CHARS,
+            }
+            yield {"event": "file", "data": dumps(file_event)}
+    except RuntimeError as exc:
+        yield {"event": "error", "data": dumps({"event": "error", "error": str(exc), "files": sent})}
+        return
+    yield {"event": "complete", "data": dumps({"event": "complete", "files": sent})}
+
+
+@app.post("/api/git/diff/stream")
+async def stream_diff_endpoint(req: DiffStreamRequest) -> EventSourceResponse:
+    """Stream the file list, then each file's diff as git produces it."""
+
+    return EventSourceResponse(_serialize_diff_events(req))
+
+
+def _serialize_commit_message_events() -> Iterator[dict[str, str]]:
+    from neurocli_core.git_engine import get_staged_diff, stream_commit_message
+
+    try:
+        diff_text, is_fallback = get_staged_diff()
+    except Exception as exc:
+        yield {"event": "error", "data": dumps({"event": "error", "delta": "", "error": str(exc)})}
+        return
+
+    for event in stream_commit_message(diff_text):
+        event_payload = event.to_dict()
+        if event.event == "start":
+            # True when nothing was staged and the message describes all tracked changes.
+            event_payload["fallback"] = is_fallback
+        yield {"event": event.event, "data": dumps(event_payload)}
+
+
+@app.post("/api/git/commit-message/stream")
+async def stream_commit_message_endpoint() -> EventSourceResponse:
+    """Stream an AI commit message for the staged diff; disconnecting cancels generation."""
+
+    return EventSourceResponse(_serialize_commit_message_events())
+
+
 @app.post("/api/git/commit")
 async def execute_commit_endpoint(req: CommitRequest) -> dict[str, Any]:
+    """Commit, then start the push in the background and return its job ID."""
+
+    from neurocli_core.git_engine import execute_commit, start_push
+    from neurocli_core.git_status import get_git_status_service
+
     try:
-        status_msg, unsaved_files = _get_git_status()
-        _ = status_msg
+        _status_msg, unsaved_files, _details = await _run_blocking("git", _get_git_status)
         add_all = len(unsaved_files) > 0
-        execute_commit_and_push(req.message, add_all=add_all)
-        return {"success": True, "message": "Successfully committed and pushed"}
+        commit = await _run_blocking("git", execute_commit, req.message, add_all, WORKSPACE_ROOT)
     except Exception as exc:
         return {"success": False, "message": str(exc)}
+    finally:
+        # A commit moves HEAD and the index; drop the cached status either way.
+        get_git_status_service(WORKSPACE_ROOT).invalidate()
+
+    if not req.push:
+        return {"success": True, "message": f"Committed {commit}", "commit": commit}
+    job = start_push(WORKSPACE_ROOT)
+    return {
+        "success": True,
+        "message": f"Committed {commit}; pushing in the background",
+        "commit": commit,
+        "push_job_id": job.job_id,
+    }
+
+
+@app.post("/api/git/push")
+async def start_push_endpoint() -> dict[str, Any]:
+    """Start a background push, for example to retry one that failed."""
+
+    from neurocli_core.git_engine import start_push
+
+    job = start_push(WORKSPACE_ROOT)
+    return {"push_job_id": job.job_id, "job": job.to_dict()}
+
+
+@app.get("/api/git/push/{job_id}")
+async def get_push_job_endpoint(job_id: str) -> dict[str, Any]:
+    from neurocli_core.git_jobs import get_push_job_manager
+
+    try:
+        return get_push_job_manager().get(job_id).to_dict()
+    except KeyError as exc:
+        return {"error": exc.args[0]}
+
+
+def _serialize_push_events(
+    job_id: str, should_stop: Callable[[], bool] | None = None
+) -> Iterator[dict[str, str]]:
+    from neurocli_core.git_jobs import get_push_job_manager
+
+    final_events = {"succeeded": "complete", "failed": "error", "cancelled": "cancelled"}
+    try:
+        for snapshot in get_push_job_manager().watch(job_id, should_stop=should_stop):
+            event = final_events.get(snapshot["status"], "progress")
+            yield {"event": event, "data": dumps({"event": event, "job": snapshot})}
+    except KeyError as exc:
+        yield {"event": "error", "data": dumps({"event": "error", "error": exc.args[0]})}
+
+
+@app.post("/api/git/push/{job_id}/stream")
+async def stream_push_job(job_id: str) -> EventSourceResponse:
+    """Stream push progress; disconnecting stops the stream, not the push."""
+
+    # The watcher blocks a threadpool thread between job updates; a disconnect
+    # releases it at the next poll instead of when the push next changes.
+    disconnected = threading.Event()
+
+    async def on_client_close(message: Any) -> None:
+        disconnected.set()
+
+    return EventSourceResponse(
+        _serialize_push_events(job_id, should_stop=disconnected.is_set),
+        client_close_handler_callable=on_client_close,
+        background=BackgroundTask(disconnected.set),
+    )
+
+
+@app.post("/api/git/push/{job_id}/cancel")
+async def cancel_push_job_endpoint(job_id: str) -> dict[str, Any]:
+    from neurocli_core.git_jobs import get_push_job_manager
+
+    try:
+        job = await _run_blocking("git", get_push_job_manager().cancel, job_id)
+    except KeyError as exc:
+        return {"error": exc.args[0]}
+    return job.to_dict()
+
+
+def _file_cache_headers(fingerprint: Any) -> dict[str, str]:
+    # no-cache: browsers keep the body but revalidate with If-None-Match every time.
+    return {"ETag": fingerprint.etag, "Cache-Control": "no-cache"}
+
+
+@app.get("/api/file", response_model=None)
+async def get_file_content(
+    path: str,
+    offset: int | None = None,
+    length: int | None = None,
+    start_line: int | None = None,
+    line_count: int | None = None,
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> dict[str, Any] | Response:
+    """Return a text file, or a byte (`offset`/`length`) or line (`start_line`/`line_count`) window of it.
+
+    Files above the inline limit come back as a first window with `truncated`
+    and `next_offset`. An `If-None-Match` that still matches returns 304.
+    """
+
+    from neurocli_core.file_reader import BinaryFileError, get_file_reader
+
+    reader = get_file_reader()
+    try:
+        resolved_path = _resolve_workspace_file(path)
+        fingerprint = await _run_blocking("io", reader.fingerprint, resolved_path)
+        if fingerprint.matches(if_none_match):
+            return Response(status_code=304, headers=_file_cache_headers(fingerprint))
+        window = await _run_blocking(
+            "io",
+            reader.read,
+            resolved_path,
+            offset=offset,
+            length=length,
+            start_line=start_line,
+            line_count=line_count,
+        )
+    except BinaryFileError as exc:
+        return {"error": str(exc), "binary": True}
+    except Exception as exc:
+        return {"error": str(exc)}
+    return FastJSONResponse(
+        window.to_dict(), headers=_file_cache_headers(window.fingerprint), route="/api/file"
+    )
 
 
-@app.get("/api/file")
-async def get_file_content(path: str) -> dict[str, str]:
-    """Read a file's content and return it."""
+@app.get("/api/file/raw", response_model=None)
+async def get_file_raw(
+    path: str,
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> dict[str, Any] | Response:
+    """Stream a text file as `text/plain` in chunks; `Range` requests return 206."""
 
+    from neurocli_core.file_reader import get_file_reader
+
+    reader = get_file_reader()
     try:
         resolved_path = _resolve_workspace_file(path)
-        return {"content": resolved_path.read_text(encoding="utf-8")}
+        if await _run_blocking("io", reader.is_binary, resolved_path):
+            message = f"{resolved_path.name} looks like a binary file; it cannot be shown as text."
+            return {"error": message, "binary": True}
+        fingerprint = await _run_blocking("io", reader.fingerprint, resolved_path)
     except Exception as exc:
         return {"error": str(exc)}
+    if fingerprint.matches(if_none_match):
+        return Response(status_code=304, headers=_file_cache_headers(fingerprint))
+    return FileResponse(
+        resolved_path,
+        media_type="text/plain; charset=utf-8",
+        headers=_file_cache_headers(fingerprint),
+    )
 
 
 @app.post("/api/format")
 async def format_file_endpoint(req: FormatRequest) -> dict[str, Any]:
     """Format a file and return the proposed diff, mirroring the Textual flow."""
 
+    from neurocli_core.code_formatter import format_code_result
+    from neurocli_core.diff_generator import render_markdown_diff
+    from neurocli_core.proposals import get_proposal_store
+
     try:
         resolved_path = _resolve_workspace_file(req.file_path)
-        original_content = resolved_path.read_text(encoding="utf-8")
-        formatted_content = format_code(original_content, str(resolved_path))
+        original_content = await _run_blocking("io", resolved_path.read_text, encoding="utf-8")
+        result = await _run_blocking("format", format_code_result, original_content, str(resolved_path))
+        formatted_content = result.content
 
         if formatted_content == original_content:
-            return {"status": "no_change", "message": "No formatting needed.", "diff": ""}
-
+            return {
+                "status": "no_change",
+                "message": "No formatting needed.",
+                "diff": "",
+                "hunks": [],
+                "formatter": result.to_dict(),
+            }
+
+        proposal = get_proposal_store().create(
+            str(resolved_path), original_content, formatted_content
+        )
         return {
             "status": "changes_proposed",
-            "diff": generate_diff(original_content, formatted_content),
+            "diff": render_markdown_diff(proposal.hunks),
+            "hunks": [hunk.to_dict() for hunk in proposal.hunks],
+            "proposal_id": proposal.proposal_id,
             "proposed_content": formatted_content,
+            "formatter": result.to_dict(),
         }
     except Exception as exc:
         return {"error": str(exc)}
 
 
+@app.post("/api/format/batch")
+async def format_batch_endpoint(req: FormatBatchRequest) -> dict[str, Any]:
+    """Format many files in parallel and return the combined change report."""
+
+    from neurocli_core.batch_formatter import get_format_batch_store, run_format_batch
+
+    try:
+        files = await _run_blocking("io", _collect_batch_targets, req)
+        batch = await _run_blocking(
+            "format",
+            run_format_batch,
+            WORKSPACE_ROOT,
+            files,
+            check_only=req.check_only,
+            max_workers=req.max_workers,
+        )
+    except Exception as exc:
+        return {"error": str(exc)}
+
+    if batch.changed and not batch.check_only:
+        get_format_batch_store().add(batch)
+    return batch.to_dict()
+
+
+@app.post("/api/format/batch/stream")
+async def stream_format_batch(req: FormatBatchRequest) -> EventSourceResponse:
+    return EventSourceResponse(_serialize_format_batch_events(req))
+
+
+@app.post("/api/format/batch/{batch_id}/apply")
+async def apply_format_batch_endpoint(batch_id: str) -> dict[str, Any]:
+    """Write every file of a format batch, or none of them when any file moved on."""
+
+    from neurocli_core.apply_engine import ApplyConflictError
+    from neurocli_core.batch_formatter import apply_format_batch, get_format_batch_store
+
+    store = get_format_batch_store()
+    try:
+        batch = store.get(batch_id)
+        result = await _run_blocking("io", apply_format_batch, batch)
+        store.discard(batch_id)
+        return {
+            "status": "success",
+            "message": f"Formatted {len(result.files)} files.",
+            "applied_files": result.files,
+            "transaction_id": result.transaction_id,
+        }
+    except ApplyConflictError as exc:
+        return {"error": str(exc), "conflicting_files": exc.paths}
+    except KeyError as exc:
+        return {"error": exc.args[0]}
+    except Exception as exc:
+        return {"error": str(exc)}
+
+
+@app.get("/api/formatters/health")
+async def formatter_health_endpoint() -> dict[str, Any]:
+    """Ping the resident formatter workers and return their timing and cache metrics."""
+
+    from neurocli_core.formatter_service import get_formatter_service
+
+    service = get_formatter_service()
+    return {
+        "formatters": await _run_blocking("format", service.health),
+        "cache": service.cache_stats(),
+    }
+
+
+@app.get("/api/executors")
+async def executor_stats_endpoint() -> dict[str, Any]:
+    """Return per-lane worker, queue, and throughput counters."""
+
+    return {"lanes": get_execution_lanes().stats()}
+
+
+@app.get("/api/metrics/responses")
+async def response_metrics_endpoint() -> dict[str, Any]:
+    """Return per-route serialization time and body versus on-the-wire bytes."""
+
+    return {"json_backend": JSON_BACKEND, "routes": get_response_metrics().snapshot()}
+
+
 @app.post("/api/apply")
 async def apply_changes_endpoint(req: ApplyRequest) -> dict[str, str]:
     """Write proposed changes back to disk after creating a local backup."""
 
+    from neurocli_core.apply_engine import ApplyConflictError, FileChange, apply_transaction
+
     try:
         resolved_path = _resolve_workspace_file(req.file_path)
-        backup_dir = resolved_path.parent / "backups"
-        create_backup(str(resolved_path), str(backup_dir))
-        resolved_path.write_text(req.content, encoding="utf-8")
+        result = await _run_blocking(
+            "io",
+            apply_transaction,
+            [FileChange(str(resolved_path), content=req.content, expected_hash=req.expected_hash)],
+        )
         return {
             "status": "success",
             "message": f"Changes applied to {resolved_path.name} successfully.",
+            "transaction_id": result.transaction_id,
+        }
+    except ApplyConflictError as exc:
+        return {"error": str(exc), "conflicting_files": exc.paths}
+    except Exception as exc:
+        return {"error": str(exc)}
+
+
+@app.post("/api/apply/batch")
+async def apply_batch_endpoint(req: ApplyBatchRequest) -> dict[str, Any]:
+    """Write several files in one transaction: all of them land, or none do."""
+
+    from neurocli_core.apply_engine import ApplyConflictError, FileChange, apply_transaction
+
+    try:
+        changes = [
+            FileChange(
+                str(_resolve_workspace_path(entry.file_path, must_exist=False)),
+                content=entry.content,
+                expected_hash=entry.expected_hash,
+            )
+            for entry in req.files
+        ]
+        result = await _run_blocking("io", apply_transaction, changes)
+        return {
+            "status": "success",
+            "message": f"Applied changes to {len(result.files)} files.",
+            **result.to_dict(),
+        }
+    except ApplyConflictError as exc:
+        return {"error": str(exc), "conflicting_files": exc.paths}
+    except Exception as exc:
+        return {"error": str(exc)}
+
+
+@app.post("/api/apply/{transaction_id}/undo")
+async def undo_apply_endpoint(transaction_id: str) -> dict[str, Any]:
+    """Restore every file of an earlier apply from its backup set, as a new transaction."""
+
+    from neurocli_core.apply_engine import ApplyConflictError, undo_transaction
+    from neurocli_core.backup_store import get_backup_store
+
+    try:
+        for record in await _run_blocking("io", get_backup_store().transaction, transaction_id):
+            _resolve_workspace_path(record.path, must_exist=False)
+        result = await _run_blocking("io", undo_transaction, transaction_id)
+        return {
+            "status": "success",
+            "message": f"Restored {len(result.files)} files.",
+            **result.to_dict(),
+        }
+    except ApplyConflictError as exc:
+        return {"error": str(exc), "conflicting_files": exc.paths}
+    except KeyError as exc:
+        return {"error": exc.args[0]}
+    except Exception as exc:
+        return {"error": str(exc)}
+
+
+@app.get("/api/backups")
+async def list_backups_endpoint(path: str | None = None, limit: int = 50) -> dict[str, Any]:
+    """List saved versions of one file, or of the whole workspace, newest first."""
+
+    from neurocli_core.backup_store import get_backup_store
+
+    store = get_backup_store()
+    try:
+        if path:
+            target = _resolve_workspace_path(path, must_exist=False)
+            versions = await _run_blocking("io", store.versions, target, limit=limit)
+        else:
+            versions = await _run_blocking("io", store.versions, under=WORKSPACE_ROOT, limit=limit)
+    except (FileNotFoundError, ValueError, LaneBusyError) as exc:
+        return {"error": str(exc)}
+    return {"versions": [record.to_dict() for record in versions]}
+
+
+@app.get("/api/backups/{version_id}")
+async def get_backup_endpoint(version_id: int) -> dict[str, Any]:
+    """Return one saved version and its content."""
+
+    from neurocli_core.backup_store import get_backup_store
+
+    store = get_backup_store()
+    try:
+        record = await _run_blocking("io", store.get, version_id)
+        _resolve_workspace_path(record.path, must_exist=False)
+        content = (await _run_blocking("io", store.read, version_id)).decode("utf-8")
+        return {**record.to_dict(), "content": content}
+    except KeyError as exc:
+        return {"error": exc.args[0]}
+    except UnicodeDecodeError:
+        return {"error": "This version is not UTF-8 text."}
+    except Exception as exc:
+        return {"error": str(exc)}
+
+
+@app.post("/api/backups/{version_id}/restore")
+async def restore_backup_endpoint(version_id: int) -> dict[str, Any]:
+    """Write a saved version back to its file; the current content is backed up first."""
+
+    from neurocli_core.backup_store import get_backup_store
+
+    store = get_backup_store()
+    try:
+        version = await _run_blocking("io", store.get, version_id)
+        target = _resolve_workspace_path(version.path, must_exist=False)
+        record = await _run_blocking("io", store.restore, version_id)
+        return {
+            "status": "success",
+            "message": f"Restored {target.name} to the version from {_format_timestamp(record.created_at)}.",
+            "version": record.to_dict(),
+        }
+    except KeyError as exc:
+        return {"error": exc.args[0]}
+    except Exception as exc:
+        return {"error": str(exc)}
+
+
+@app.post("/api/backups/undo")
+async def undo_backup_endpoint(req: UndoRequest) -> dict[str, Any]:
+    """Restore the newest saved version of a file that differs from what is on disk."""
+
+    from neurocli_core.backup_store import get_backup_store
+
+    try:
+        target = _resolve_workspace_path(req.file_path, must_exist=False)
+        record = await _run_blocking("io", get_backup_store().undo, target)
+        return {
+            "status": "success",
+            "message": f"Restored {target.name} to the version from {_format_timestamp(record.created_at)}.",
+            "version": record.to_dict(),
+        }
+    except KeyError as exc:
+        return {"error": exc.args[0]}
+    except Exception as exc:
+        return {"error": str(exc)}
+
+
+@app.get("/api/proposals/{proposal_id}")
+async def get_proposal_endpoint(proposal_id: str) -> dict[str, Any]:
+    """Return an open proposal's hunks for review."""
+
+    from neurocli_core.proposals import get_proposal_store
+
+    try:
+        return get_proposal_store().get(proposal_id).to_dict()
+    except KeyError as exc:
+        return {"error": exc.args[0]}
+
+
+@app.post("/api/proposals/{proposal_id}/apply")
+async def apply_proposal_endpoint(proposal_id: str, req: ProposalApplyRequest) -> dict[str, Any]:
+    """Apply only the accepted hunks of a proposal to the file as it is on disk now."""
+
+    from neurocli_core.apply_engine import FileChange, apply_transaction
+    from neurocli_core.proposals import HunkConflictError, get_proposal_store
+
+    store = get_proposal_store()
+    try:
+        proposal = store.get(proposal_id)
+        resolved_path = _resolve_workspace_file(proposal.target_file)
+        accepted = proposal.hunk_ids if req.accepted_hunk_ids is None else req.accepted_hunk_ids
+        if not accepted:
+            return {"status": "no_change", "message": "No hunks accepted.", "applied_hunk_ids": []}
+
+        # Hunks are located in the file as it is now, inside the transaction.
+        await _run_blocking(
+            "io",
+            apply_transaction,
+            [FileChange(str(resolved_path), hunks=proposal.hunks, accepted_hunk_ids=accepted)],
+        )
+        store.discard(proposal_id)
+        accepted_ids = set(accepted)
+        applied = [hunk_id for hunk_id in proposal.hunk_ids if hunk_id in accepted_ids]
+        return {
+            "status": "success",
+            "message": f"Applied {len(applied)} of {len(proposal.hunks)} hunks to {resolved_path.name}.",
+            "applied_hunk_ids": applied,
         }
+    except HunkConflictError as exc:
+        return {"error": str(exc), "conflicting_hunk_ids": exc.hunk_ids}
+    except KeyError as exc:
+        return {"error": exc.args[0]}
     except Exception as exc:
         return {"error": str(exc)}
@@ -0,0 +1,341 @@
+"""JSON rendering, response compression, and per-route payload metrics.
+
+Routes registered on the app use :class:`FastJSONRoute`: a handler's ``dict``
+is rendered straight to bytes with orjson when it is installed (``json``
+otherwise), skipping FastAPI's validate-then-serialize pass over
+``dict[str, Any]``. Handlers still return plain dicts, so calling them
+directly (as the tests do) is unchanged.
+
+:class:`CompressionMiddleware` then compresses complete response bodies of at
+least ``NEUROCLI_COMPRESS_MIN_BYTES`` (1 KiB) with zstd or gzip, whichever the
+client's ``Accept-Encoding`` prefers (zstd needs Python 3.14 or
+``zstandard``). Server-sent event streams and streamed bodies pass through
+untouched so events are never buffered.
+
+Both record into :class:`ResponseMetrics`, keyed by route template:
+serialization time, body bytes, and bytes on the wire per encoding.
+"""
+
+from __future__ import annotations
+
+import functools
+import gzip
+import inspect
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable
+
+from fastapi.routing import APIRoute
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from neurocli_core.config import get_env_int
+from neurocli_core.executors import LaneBusyError, get_execution_lanes
+
+try:
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - depends on local environment
+    _orjson = None
+
+_zstandard = None
+try:  # Python 3.14+
+    from compression import zstd as _zstd
+except ImportError:  # pragma: no cover - depends on the interpreter
+    _zstd = None
+    try:
+        import zstandard as _zstandard
+    except ImportError:
+        pass
+
+
+JSON_BACKEND = "orjson" if _orjson is not None else "json"
+DEFAULT_COMPRESS_MIN_BYTES = 1024
+# Bodies this large are compressed on the io lane; zlib and zstd release the GIL.
+OFFLOAD_COMPRESS_BYTES = 64 * 1024
+GZIP_LEVEL = 5
+ZSTD_LEVEL = 3
+UNCOMPRESSED_CONTENT_TYPES = ("text/event-stream",)
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Path):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps_bytes(value: Any) -> bytes:
+    """Encode ``value`` as compact UTF-8 JSON."""
+
+    if _orjson is not None:
+        return _orjson.dumps(value, default=_default, option=_orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        value, default=_default, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def dumps(value: Any) -> str:
+    """Encode ``value`` as compact JSON text, for SSE ``data`` fields."""
+
+    if _orjson is not None:
+        return _orjson.dumps(value, default=_default, option=_orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(value, default=_default, ensure_ascii=False, separators=(",", ":"))
+
+
+@dataclass(slots=True)
+class RouteMetrics:
+    responses: int = 0
+    serialized: int = 0
+    serialize_ms: float = 0.0
+    max_serialize_ms: float = 0.0
+    compress_ms: float = 0.0
+    body_bytes: int = 0
+    wire_bytes: int = 0
+    encodings: dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "responses": self.responses,
+            "avg_serialize_ms": round(self.serialize_ms / self.serialized, 3) if self.serialized else 0.0,
+            "max_serialize_ms": round(self.max_serialize_ms, 3),
+            "compress_ms": round(self.compress_ms, 3),
+            "body_bytes": self.body_bytes,
+            "wire_bytes": self.wire_bytes,
+            "ratio": round(self.wire_bytes / self.body_bytes, 3) if self.body_bytes else 1.0,
+            "encodings": dict(self.encodings),
+        }
+
+
+class ResponseMetrics:
+    """Thread-safe per-route counters for serialization and transfer size."""
+
+    def __init__(self) -> None:
+        self._routes: dict[str, RouteMetrics] = {}
+        self._lock = threading.Lock()
+
+    def record_serialization(self, route: str, elapsed_ms: float) -> None:
+        with self._lock:
+            metrics = self._routes.setdefault(route, RouteMetrics())
+            metrics.serialized += 1
+            metrics.serialize_ms += elapsed_ms
+            metrics.max_serialize_ms = max(metrics.max_serialize_ms, elapsed_ms)
+
+    def record_transfer(
+        self, route: str, body_bytes: int, wire_bytes: int, encoding: str, compress_ms: float = 0.0
+    ) -> None:
+        with self._lock:
+            metrics = self._routes.setdefault(route, RouteMetrics())
+            metrics.responses += 1
+            metrics.body_bytes += body_bytes
+            metrics.wire_bytes += wire_bytes
+            metrics.compress_ms += compress_ms
+            metrics.encodings[encoding] = metrics.encodings.get(encoding, 0) + 1
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            return {route: metrics.to_dict() for route, metrics in sorted(self._routes.items())}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+
+_metrics = ResponseMetrics()
+
+
+def get_response_metrics() -> ResponseMetrics:
+    return _metrics
+
+
+class FastJSONResponse(JSONResponse):
+    """``JSONResponse`` rendered with :func:`dumps_bytes` and timed per route."""
+
+    def __init__(self, content: Any, *args: Any, route: str | None = None, **kwargs: Any) -> None:
+        self._route = route
+        super().__init__(content, *args, **kwargs)
+
+    def render(self, content: Any) -> bytes:
+        started_at = time.perf_counter()
+        body = dumps_bytes(content)
+        if self._route is not None:
+            _metrics.record_serialization(self._route, (time.perf_counter() - started_at) * 1000)
+        return body
+
+
+class FastJSONRoute(APIRoute):
+    """API route whose ``dict`` results are rendered by :class:`FastJSONResponse`.
+
+    The wrapper keeps the handler's signature, so parameters, dependencies, and
+    the OpenAPI schema are still derived from the original function.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        super().__init__(path, _render_dicts(endpoint, path), **kwargs)
+
+
+def _render_dicts(endpoint: Callable[..., Any], route: str) -> Callable[..., Any]:
+    def wrap(result: Any) -> Any:
+        return FastJSONResponse(result, route=route) if isinstance(result, dict) else result
+
+    if inspect.iscoroutinefunction(endpoint):
+
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            return wrap(await endpoint(*args, **kwargs))
+
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
+        return wrap(endpoint(*args, **kwargs))
+
+    return sync_wrapper
+
+
+def available_encodings() -> tuple[str, ...]:
+    return ("zstd", "gzip") if _zstd is not None or _zstandard is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: str) -> str | None:
+    """Pick the supported encoding the client weights highest; ties prefer zstd."""
+
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name] = weight
+
+    best: tuple[float, str] | None = None
+    for encoding in available_encodings():
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > 0 and (best is None or weight > best[0]):
+            best = (weight, encoding)
+    return best[1] if best else None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+    if _zstd is not None:
+        return _zstd.compress(body, level=ZSTD_LEVEL)
+    if _zstandard is not None:
+        return _zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(body)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+class CompressionMiddleware:
+    """Compress complete responses above a size threshold and record transfer metrics."""
+
+    def __init__(self, app: ASGIApp, *, minimum_size: int | None = None) -> None:
+        self.app = app
+        if minimum_size is None:
+            minimum_size = get_env_int("NEUROCLI_COMPRESS_MIN_BYTES", DEFAULT_COMPRESS_MIN_BYTES)
+        self.minimum_size = max(0, minimum_size)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        encoding = negotiate_encoding(headers.get(b"accept-encoding", b"").decode("latin-1"))
+        start: Message | None = None
+        streaming = False
+        totals = {"body": 0, "wire": 0, "compress_ms": 0.0}
+        used_encoding = "identity"
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start, streaming, used_encoding
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or streaming or start is None:
+                if start is not None:
+                    await send(start)
+                    start = None
+                if message["type"] == "http.response.body":
+                    size = len(message.get("body", b""))
+                    totals["body"] += size
+                    totals["wire"] += size
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            response_start, start = start, None
+            totals["body"] += len(body)
+            if message.get("more_body", False) or not self._should_compress(response_start, body, encoding):
+                # Streams (SSE included) go out as they are produced.
+                streaming = True
+                totals["wire"] += len(body)
+                await send(response_start)
+                await send(message)
+                return
+
+            started_at = time.perf_counter()
+            compressed = await _compress_off_loop(body, encoding)
+            totals["compress_ms"] += (time.perf_counter() - started_at) * 1000
+            totals["wire"] += len(compressed)
+            used_encoding = encoding
+            response_headers = [
+                # The compressed bytes differ from the identity ones, so a strong tag becomes weak.
+                (name, b"W/" + value if name.lower() == b"etag" and not value.startswith(b"W/") else value)
+                for name, value in response_start.get("headers", [])
+                if name.lower() not in (b"content-length", b"vary")
+            ]
+            vary = [value for name, value in response_start.get("headers", []) if name.lower() == b"vary"]
+            response_headers += [
+                (b"content-encoding", encoding.encode("latin-1")),
+                (b"content-length", str(len(compressed)).encode("latin-1")),
+                (b"vary", b", ".join([*vary, b"Accept-Encoding"])),
+            ]
+            await send({**response_start, "headers": response_headers})
+            await send({**message, "body": compressed})
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            if route is not None and getattr(route, "path", None):
+                _metrics.record_transfer(
+                    route.path, totals["body"], totals["wire"], used_encoding, totals["compress_ms"]
+                )
+
+    def _should_compress(self, start: Message, body: bytes, encoding: str | None) -> bool:
+        if encoding is None or len(body) < self.minimum_size:
+            return False
+        if start.get("status") in (204, 206, 304):
+            return False
+        for name, value in start.get("headers", []):
+            lowered = name.lower()
+            if lowered == b"content-encoding":
+                return False
+            if lowered == b"content-type" and value.decode("latin-1").startswith(UNCOMPRESSED_CONTENT_TYPES):
+                return False
+        return True
+
+
+async def _compress_off_loop(body: bytes, encoding: str) -> bytes:
+    if len(body) < OFFLOAD_COMPRESS_BYTES:
+        return compress(body, encoding)
+    try:
+        return await get_execution_lanes().run("io", compress, body, encoding)
+    except LaneBusyError:
+        return compress(body, encoding)
+
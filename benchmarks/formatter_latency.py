@@ -0,0 +1,73 @@
+"""Compare per-call formatter subprocesses with the resident formatter workers.
+
+Usage:
+    python benchmarks/formatter_latency.py [--iterations N] [--file PATH]
+
+The one-shot rows spawn ``python -m ruff format -`` per call, the way
+``format_code`` used to. The resident row goes through ``format_code_result``
+with the result cache disabled and includes the worker start-up in its first
+sample. The cached row repeats the same call with the cache enabled.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from neurocli_core.code_formatter import format_code_result  # noqa: E402
+from neurocli_core.formatter_service import close_formatter_service, get_formatter_service  # noqa: E402
+
+
+def _time_calls(label: str, func: Callable[[], object], iterations: int) -> None:
+    samples: list[float] = []
+    for _ in range(iterations):
+        started_at = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started_at) * 1000)
+    print(
+        f"{label:<32} median {statistics.median(samples):8.2f} ms"
+        f"  first {samples[0]:8.2f} ms  (n={iterations})"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument(
+        "--file",
+        default=str(Path(__file__).resolve().parent.parent / "neurocli_core" / "workflow_service.py"),
+    )
+    args = parser.parse_args()
+
+    source = Path(args.file).read_text(encoding="utf-8")
+    _time_calls(
+        "one-shot python -m ruff",
+        lambda: subprocess.run(
+            [sys.executable, "-m", "ruff", "format", "-"],
+            input=source,
+            capture_output=True,
+            text=True,
+            check=False,
+        ),
+        args.iterations,
+    )
+    service = get_formatter_service()
+    cache, service.cache = service.cache, None
+    _time_calls("resident ruff server", lambda: format_code_result(source, args.file), args.iterations)
+    service.cache = cache
+    if cache is not None:
+        _time_calls("format cache", lambda: format_code_result(source, args.file), args.iterations)
+    print(service.metrics()["ruff"])
+    print(service.cache_stats())
+    close_formatter_service()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Measure OpenAI client setup and first-request latency, fresh vs pooled.
+
+Usage:
+    python benchmarks/openai_client_latency.py            # client construction only
+    python benchmarks/openai_client_latency.py --live     # also time a real first request
+
+The live mode needs ``OPENAI_API_KEY`` and network access. It compares the old
+path (new ``OpenAI`` client per call) with the pooled registry after a warm-up.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from neurocli_core.config import get_openai_api_key  # noqa: E402
+from neurocli_core.llm_api_openai import (  # noqa: E402
+    close_openai_clients,
+    get_openai_client,
+    warm_up_openai_client,
+)
+
+
+def _time_calls(label: str, func: Callable[[], object], iterations: int) -> None:
+    samples: list[float] = []
+    for _ in range(iterations):
+        started_at = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started_at) * 1000)
+    print(
+        f"{label:<32} median {statistics.median(samples):8.2f} ms"
+        f"  max {max(samples):8.2f} ms  (n={iterations})"
+    )
+
+
+def _fresh_client(api_key: str) -> object:
+    from openai import OpenAI
+
+    return OpenAI(api_key=api_key)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--live", action="store_true", help="time a real request")
+    args = parser.parse_args()
+
+    api_key = get_openai_api_key() or "sk-benchmark-placeholder"
+
+    started_at = time.perf_counter()
+    import openai  # noqa: F401
+
+    print(f"{'import openai':<32} {(time.perf_counter() - started_at) * 1000:8.2f} ms")
+
+    _time_calls("fresh OpenAI() per call", lambda: _fresh_client(api_key), args.iterations)
+    close_openai_clients()
+    _time_calls("pooled get_openai_client()", lambda: get_openai_client(api_key), args.iterations)
+
+    if not args.live:
+        return 0
+
+    if not get_openai_api_key():
+        print("--live needs OPENAI_API_KEY", file=sys.stderr)
+        return 1
+
+    def fresh_request() -> object:
+        return _fresh_client(api_key).models.list()
+
+    def pooled_request() -> object:
+        return get_openai_client(api_key).models.list()
+
+    _time_calls("fresh client + request", fresh_request, 5)
+    close_openai_clients()
+    warm_up_seconds = warm_up_openai_client(api_key)
+    if warm_up_seconds is not None:
+        print(f"{'warm-up':<32} {warm_up_seconds * 1000:8.2f} ms")
+    _time_calls("pooled request after warm-up", pooled_request, 5)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
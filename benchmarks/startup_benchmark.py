@@ -0,0 +1,143 @@
+"""Startup-time budget check for the Textual app and the FastAPI bridge.
+
+Usage:
+    python benchmarks/startup_benchmark.py
+    python benchmarks/startup_benchmark.py --runs 5 --tui-frame-budget-ms 1500
+
+Each measurement runs in a fresh interpreter:
+
+- ``python -X importtime`` cumulative import time of ``neurocli_app.main``
+  and ``api.main``
+- time to first frame: import the app and render it headless once
+- API readiness: import ``api.main``, run the lifespan startup, and answer ``/``
+
+The script exits non-zero when the median of any measurement exceeds its
+budget, so it can gate CI or a pre-push hook. Budgets can also be set with
+``NEUROCLI_BUDGET_*`` environment variables.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+FIRST_FRAME_SNIPPET = """
+import time
+started_at = time.perf_counter()
+import asyncio
+from neurocli_app.main import NeuroApp
+
+async def render_once():
+    app = NeuroApp()
+    async with app.run_test(headless=True, size=(120, 40)) as pilot:
+        await pilot.pause()
+        print(f"READY_MS {(time.perf_counter() - started_at) * 1000:.2f}", flush=True)
+
+asyncio.run(render_once())
+"""
+
+API_READY_SNIPPET = """
+import time
+started_at = time.perf_counter()
+import asyncio
+from api import main
+
+async def ready_once():
+    async with main.app.router.lifespan_context(main.app):
+        await main.root()
+        print(f"READY_MS {(time.perf_counter() - started_at) * 1000:.2f}", flush=True)
+
+asyncio.run(ready_once())
+"""
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+\d+\s+\|\s+(\d+)\s+\|\s*(\S+)\s*$")
+
+
+def _child_env() -> dict[str, str]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(PROJECT_ROOT), env.get("PYTHONPATH")]))
+    # Startup must never reach the network while it is being measured.
+    env["NEUROCLI_OPENAI_WARMUP"] = "0"
+    return env
+
+
+def measure_import_ms(module: str) -> float:
+    """Return the cumulative ``-X importtime`` cost of ``module`` in milliseconds."""
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        cwd=PROJECT_ROOT,
+        env=_child_env(),
+        check=True,
+    )
+    for line in reversed(result.stderr.splitlines()):
+        match = _IMPORTTIME_LINE.match(line)
+        if match and match.group(2) == module:
+            return int(match.group(1)) / 1000
+    raise RuntimeError(f"No importtime entry for {module}")
+
+
+def measure_ready_ms(snippet: str) -> float:
+    """Run ``snippet`` in a fresh interpreter and return its reported READY time."""
+
+    result = subprocess.run(
+        [sys.executable, "-c", snippet],
+        capture_output=True,
+        text=True,
+        cwd=PROJECT_ROOT,
+        env=_child_env(),
+        check=True,
+        timeout=120,
+    )
+    for line in result.stdout.splitlines():
+        if line.startswith("READY_MS "):
+            return float(line.split()[1])
+    raise RuntimeError(f"Startup probe did not report readiness:\n{result.stderr}")
+
+
+def _budget(name: str, default: float) -> float:
+    raw_value = os.getenv(f"NEUROCLI_BUDGET_{name}")
+    try:
+        return float(raw_value) if raw_value else default
+    except ValueError:
+        return default
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--tui-import-budget-ms", type=float, default=_budget("TUI_IMPORT_MS", 800))
+    parser.add_argument("--api-import-budget-ms", type=float, default=_budget("API_IMPORT_MS", 1000))
+    parser.add_argument("--tui-frame-budget-ms", type=float, default=_budget("TUI_FRAME_MS", 2500))
+    parser.add_argument("--api-ready-budget-ms", type=float, default=_budget("API_READY_MS", 1500))
+    args = parser.parse_args()
+
+    checks = [
+        ("import neurocli_app.main", lambda: measure_import_ms("neurocli_app.main"), args.tui_import_budget_ms),
+        ("import api.main", lambda: measure_import_ms("api.main"), args.api_import_budget_ms),
+        ("TUI time to first frame", lambda: measure_ready_ms(FIRST_FRAME_SNIPPET), args.tui_frame_budget_ms),
+        ("API readiness", lambda: measure_ready_ms(API_READY_SNIPPET), args.api_ready_budget_ms),
+    ]
+
+    failures = 0
+    for label, measure, budget_ms in checks:
+        samples = [measure() for _ in range(max(1, args.runs))]
+        median_ms = statistics.median(samples)
+        verdict = "ok" if median_ms <= budget_ms else "OVER BUDGET"
+        failures += verdict != "ok"
+        print(f"{label:<28} median {median_ms:8.1f} ms  budget {budget_ms:8.1f} ms  {verdict}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
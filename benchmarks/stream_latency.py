@@ -0,0 +1,98 @@
+"""Measure SSE stream latency while radar scans run on the same API process.
+
+Usage:
+    python benchmarks/stream_latency.py [--streams 4] [--root PATH]
+
+Concurrent prompt streams (mock provider, no key or network) are consumed the
+way sse-starlette does, and the gap between consecutive events is recorded in
+three phases: streams alone, streams while radar runs inline on the event
+loop (the old handler), and streams while ``/api/radar`` runs on the
+execution lanes. With the lanes, p95 and max gaps should match the baseline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+os.environ.setdefault("NEUROCLI_LLM_PROVIDER", "mock")
+os.environ.setdefault("NEUROCLI_MOCK_TOKENS", "400")
+os.environ.setdefault("NEUROCLI_MOCK_TOKENS_PER_SECOND", "200")
+
+from starlette.concurrency import iterate_in_threadpool  # noqa: E402
+
+from api import main  # noqa: E402
+from neurocli_core import radar_engine  # noqa: E402
+
+
+async def _consume_stream(index: int, gaps: list[float]) -> None:
+    events = main._serialize_stream_events(main.PromptRequest(prompt=f"Benchmark stream #{index}"))
+    last = time.perf_counter()
+    async for _event in iterate_in_threadpool(events):
+        now = time.perf_counter()
+        gaps.append((now - last) * 1000)
+        last = now
+
+
+def _scan_inline(root: str) -> None:
+    radar_engine.scan_workspace_health(root)
+    radar_engine.scan_technical_debt(root)
+    radar_engine.scan_recent_edits(root, max_items=20, max_days=7)
+
+
+async def _scan_with_lanes() -> None:
+    payload = await main.get_radar_stats()
+    if "error" in payload:
+        raise RuntimeError(payload["error"])
+
+
+async def _phase(streams: int, mode: str, root: str) -> list[float]:
+    gaps: list[float] = []
+    consumers = asyncio.gather(*(_consume_stream(index, gaps) for index in range(streams)))
+    # Radar runs back to back for as long as the streams do.
+    while mode != "baseline" and not consumers.done():
+        if mode == "inline":
+            _scan_inline(root)
+            await asyncio.sleep(0)
+        else:
+            await _scan_with_lanes()
+    await consumers
+    return gaps
+
+
+def _report(label: str, gaps: list[float]) -> None:
+    ordered = sorted(gaps)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    print(
+        f"{label:<18} events {len(gaps):6d}  gap p50 {statistics.median(gaps):7.2f} ms"
+        f"  p95 {p95:7.2f} ms  max {ordered[-1]:8.2f} ms"
+    )
+
+
+async def _run(args: argparse.Namespace) -> None:
+    root = str(args.root)
+    # Warm the process pool so the first measured scan does not include spawning it.
+    await _scan_with_lanes()
+    for mode in ("baseline", "inline", "lanes"):
+        _report(mode, await _phase(args.streams, mode, root))
+
+
+def main_cli() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--streams", type=int, default=4)
+    parser.add_argument("--root", type=Path, default=main.WORKSPACE_ROOT)
+    args = parser.parse_args()
+    main.WORKSPACE_ROOT = args.root.resolve()
+    asyncio.run(_run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main_cli())
@@ -0,0 +1,93 @@
+"""Load-test the shared streaming workflow against an offline provider.
+
+Usage:
+    python benchmarks/workflow_load.py --requests 200 --concurrency 16
+    python benchmarks/workflow_load.py --provider replay --cassettes .neurocli/cassettes
+
+The mock provider needs no key or network. ``--rate`` and ``--latency`` shape
+its synthetic stream so pipeline overhead can be separated from model time.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from neurocli_core.llm_providers import LLMProvider, MockProvider, ReplayProvider  # noqa: E402
+from neurocli_core.workflow_service import (  # noqa: E402
+    build_ai_workflow_request,
+    stream_ai_workflow,
+)
+
+
+def _run_one(provider: LLMProvider, index: int, prompt_variants: int) -> tuple[float, float]:
+    request = build_ai_workflow_request(f"Benchmark prompt #{index % prompt_variants}")
+    started_at = time.perf_counter()
+    first_delta_at: float | None = None
+    for event in stream_ai_workflow(request, provider=provider):
+        if event.event == "delta" and first_delta_at is None:
+            first_delta_at = time.perf_counter()
+        if event.event == "error":
+            raise RuntimeError(event.response.error if event.response else "stream error")
+    finished_at = time.perf_counter()
+    return (first_delta_at or finished_at) - started_at, finished_at - started_at
+
+
+def _percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--provider", choices=["mock", "replay"], default="mock")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--tokens", type=int, default=256)
+    parser.add_argument("--rate", type=float, default=0.0, help="mock tokens per second")
+    parser.add_argument("--latency", type=float, default=0.0, help="mock first-token seconds")
+    parser.add_argument("--cassettes", type=Path, default=None)
+    parser.add_argument("--variants", type=int, default=4, help="distinct prompts to cycle")
+    args = parser.parse_args()
+
+    if args.provider == "replay":
+        if args.cassettes is None:
+            parser.error("--provider replay needs --cassettes")
+        provider: LLMProvider = ReplayProvider(cassette_dir=args.cassettes, mode="replay")
+    else:
+        provider = MockProvider(
+            response_tokens=args.tokens,
+            tokens_per_second=args.rate,
+            first_token_latency=args.latency,
+        )
+
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(
+            pool.map(lambda i: _run_one(provider, i, args.variants), range(args.requests))
+        )
+    wall_seconds = time.perf_counter() - started_at
+
+    first_delta = [sample * 1000 for sample, _total in results]
+    totals = [total * 1000 for _first, total in results]
+    print(f"provider={args.provider} requests={args.requests} concurrency={args.concurrency}")
+    print(f"throughput       {args.requests / wall_seconds:10.1f} req/s")
+    print(
+        f"first delta ms   p50 {statistics.median(first_delta):8.2f}"
+        f"  p95 {_percentile(first_delta, 0.95):8.2f}"
+    )
+    print(
+        f"total ms         p50 {statistics.median(totals):8.2f}"
+        f"  p95 {_percentile(totals, 0.95):8.2f}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -16,7 +16,7 @@ class CommandModal(ModalScreen[None]):
         ("Ctrl+M", "Model settings", "Set model override and raw model options JSON."),
         ("Ctrl+O", "Context manager", "Attach or remove files from the prompt context stack."),
         ("Ctrl+D", "Workspace radar", "Open repository health, debt, and recent edit signals."),
-        ("Ctrl+E", "Review editor", "Edit the current proposal before keeping or applying it."),
+        ("Ctrl+E", "Review editor", "Edit the current proposal, or pick individual hunks to apply."),
         ("Ctrl+G", "Git review", "Open the git status, diff, and commit workflow."),
         ("Ctrl+L", "Reset view", "Clear transient prompt, stream, diff, and apply state."),
         ("Ctrl+K", "Commands", "Open this command reference window."),
@@ -2,8 +2,11 @@ from textual.app import ComposeResult
 from textual.containers import Container, Horizontal, Vertical
 from textual.screen import ModalScreen
 from textual.widgets import Button, DirectoryTree, Label, ListView, ListItem, Static
+from textual.worker import get_current_worker
 from pathlib import Path
 
+from neurocli_core.token_estimator import ContextTokenTracker
+
 
 class ContextModal(ModalScreen[set[str]]):
     """A modal screen that manages selection of multiple files/directories as context."""
@@ -14,6 +17,7 @@ class ContextModal(ModalScreen[set[str]]):
         super().__init__(*args, **kwargs)
         self.selected_paths: set[str] = set(current_context)
         self.estimated_tokens: int = 0
+        self._token_tracker = ContextTokenTracker()
 
     def compose(self) -> ComposeResult:
         with Container(id="context_dialog"):
@@ -40,7 +44,9 @@ class ContextModal(ModalScreen[set[str]]):
 
     def on_mount(self) -> None:
         self._refresh_list()
-        self._update_tokens()
+        for path_str in sorted(self.selected_paths):
+            self._track_path(path_str)
+        self._render_tokens()
 
     def on_directory_tree_file_selected(self, event: DirectoryTree.FileSelected) -> None:
         """Add file to context when selected."""
@@ -48,7 +54,8 @@ class ContextModal(ModalScreen[set[str]]):
         if path_str not in self.selected_paths:
             self.selected_paths.add(path_str)
             self._refresh_list()
-            self._update_tokens()
+            self._track_path(path_str)
+            self._render_tokens()
 
     def on_directory_tree_directory_selected(self, event: DirectoryTree.DirectorySelected) -> None:
         """Optionally add directory to context when selected. For now, we allow it."""
@@ -56,7 +63,8 @@ class ContextModal(ModalScreen[set[str]]):
         if path_str not in self.selected_paths:
             self.selected_paths.add(path_str)
             self._refresh_list()
-            self._update_tokens()
+            self._track_path(path_str)
+            self._render_tokens()
 
     def on_list_view_selected(self, event: ListView.Selected) -> None:
         """Remove item from context when clicked in the list."""
@@ -64,7 +72,8 @@ class ContextModal(ModalScreen[set[str]]):
         if path_str in self.selected_paths:
             self.selected_paths.remove(path_str)
             self._refresh_list()
-            self._update_tokens()
+            self._token_tracker.remove(path_str)
+            self._render_tokens()
 
     def _refresh_list(self) -> None:
         """Refresh the visible list view based on selected_paths set."""
@@ -74,35 +83,48 @@ class ContextModal(ModalScreen[set[str]]):
         for path in sorted(self.selected_paths):
             p = Path(path)
             # Display basename but keep full path as identifier via `name`
-            item = ListItem(Label(f"📄 {p.name}" if p.is_file() else f"📁 {p.name}"))
-            item.name = path
+            item = ListItem(
+                Label(f"📄 {p.name}" if p.is_file() else f"📁 {p.name}"),
+                name=path,
+            )
             list_view.append(item)
 
-    def _update_tokens(self) -> None:
-        """Calculate a rough token estimation for selected files."""
-        total_chars = 0
-        for path_str in self.selected_paths:
-            p = Path(path_str)
-            if p.is_file():
-                try:
-                    # Quick character count. A real token estimator would use tiktoken.
-                    # We assume ~4 chars per token.
-                    with open(p, "r", encoding="utf-8") as f:
-                        total_chars += len(f.read())
-                except Exception:
-                    pass
-            elif p.is_dir():
-                # Rough estimate for directories by summing up file contents
-                for child in p.rglob("*"):
-                    if child.is_file():
-                        try:
-                            with open(child, "r", encoding="utf-8") as f:
-                                total_chars += len(f.read())
-                        except Exception:
-                            pass
-                            
-        self.estimated_tokens = total_chars // 4
-        self.query_one("#token_estimator", Label).update(f"Tokens (Est): ~{self.estimated_tokens:,}")
+    def _track_path(self, path_str: str) -> None:
+        """Start estimating a newly added path without blocking the UI thread."""
+        if self._token_tracker.add(path_str):
+            self.run_worker(
+                lambda: self._estimate_path_worker(path_str),
+                thread=True,
+                group="token_estimate",
+                name=f"estimate:{path_str}",
+            )
+
+    def _estimate_path_worker(self, path_str: str) -> None:
+        """Publish a stat-size estimate first, then refine it from cached file reads."""
+        worker = get_current_worker()
+
+        def should_stop() -> bool:
+            return worker.is_cancelled or not self._token_tracker.is_tracked(path_str)
+
+        for refine in (False, True):
+            estimate = self._token_tracker.estimator.estimate_path(
+                path_str, refine=refine, should_stop=should_stop
+            )
+            if should_stop():
+                return
+            if self._token_tracker.update(estimate):
+                self.app.call_from_thread(self._render_tokens)
+
+    def _render_tokens(self) -> None:
+        """Show the running total, marking it while estimates are still refining."""
+        snapshot = self._token_tracker.snapshot()
+        self.estimated_tokens = snapshot.total_tokens
+        label = f"Tokens (Est): ~{self.estimated_tokens:,}"
+        if snapshot.pending:
+            label += " …"
+        if snapshot.over_budget:
+            label += f" (over {snapshot.budget:,} budget)"
+        self.query_one("#token_estimator", Label).update(label)
 
     async def on_button_pressed(self, event: Button.Pressed) -> None:
         if event.button.id == "btn_cancel_context":
@@ -112,4 +134,6 @@ class ContextModal(ModalScreen[set[str]]):
         elif event.button.id == "btn_clear_context":
             self.selected_paths.clear()
             self._refresh_list()
-            self._update_tokens()
+            self.workers.cancel_group(self, "token_estimate")
+            self._token_tracker.clear()
+            self._render_tokens()
@@ -0,0 +1,273 @@
+"""A virtualized, read-only file viewer for the Textual workspace.
+
+:class:`FileViewer` never holds a whole file. Opening one builds the shared
+:class:`~neurocli_core.file_reader.FileReader` line index on a thread worker;
+after that only the blocks of ``BLOCK_LINES`` lines under the viewport are
+read and kept in a small LRU, so opening and scrolling a large log cost the
+same as a small module. Each block paints as plain text first and is redrawn
+once its syntax highlighting is ready.
+
+Files above ``NEUROCLI_VIEWER_HIGHLIGHT_MAX_BYTES`` (2 MiB) are shown as plain
+text. Highlighting is per block, so a construct spanning a block boundary
+(a long docstring, say) may be coloured from the boundary onwards as code.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from rich.segment import Segment
+from rich.text import Text
+from textual.geometry import Size
+from textual.message import Message
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+
+if TYPE_CHECKING:
+    from neurocli_core.file_reader import FileReader
+
+
+BLOCK_LINES = 256
+MAX_CACHED_BLOCKS = 32
+DEFAULT_HIGHLIGHT_MAX_BYTES = 2 * 1024 * 1024
+# Lines wider than this are cut for display; the file itself is untouched.
+MAX_LINE_CHARS = 2000
+SYNTAX_THEME = "ansi_dark"
+
+
+def highlight_block(text: str, path: Path, *, highlight: bool) -> list[Text]:
+    """Split one block of file text into display lines, syntax-highlighted when asked."""
+
+    lines = text.split("\n")
+    if lines and lines[-1] == "":
+        lines.pop()
+    lines = [line.rstrip("\r")[:MAX_LINE_CHARS].expandtabs(4) for line in lines]
+    if not highlight or not lines:
+        return [Text(line) for line in lines]
+
+    from rich.syntax import Syntax
+
+    lexer = Syntax.guess_lexer(str(path), code="\n".join(lines[:20]))
+    if lexer == "default":
+        return [Text(line) for line in lines]
+    rendered = Syntax("", lexer, theme=SYNTAX_THEME).highlight("\n".join(lines))
+    rendered.rstrip()
+    highlighted = rendered.split("\n", allow_blank=True)
+    # The highlighter may drop trailing blank lines; keep the block's line count exact.
+    highlighted.extend(Text("") for _ in range(len(lines) - len(highlighted)))
+    return highlighted[: len(lines)]
+
+
+class FileViewer(ScrollView, can_focus=True):
+    """Scroll through a text file of any size, loading only the visible lines."""
+
+    COMPONENT_CLASSES = {"file-viewer--gutter", "file-viewer--placeholder"}
+
+    DEFAULT_CSS = """
+    FileViewer {
+        background: transparent;
+    }
+    FileViewer > .file-viewer--gutter {
+        color: $text-muted;
+    }
+    FileViewer > .file-viewer--placeholder {
+        color: $text-disabled;
+    }
+    """
+
+    class Loaded(Message):
+        """Posted once a file is indexed and its first lines can be drawn."""
+
+        def __init__(self, path: Path, total_lines: int, highlighted: bool) -> None:
+            super().__init__()
+            self.path = path
+            self.total_lines = total_lines
+            self.highlighted = highlighted
+
+    class Failed(Message):
+        """Posted when a file cannot be shown, e.g. because it is binary."""
+
+        def __init__(self, path: Path, error: str) -> None:
+            super().__init__()
+            self.path = path
+            self.error = error
+
+    def __init__(
+        self,
+        *,
+        reader: FileReader | None = None,
+        highlight_max_bytes: int | None = None,
+        name: str | None = None,
+        id: str | None = None,
+        classes: str | None = None,
+    ) -> None:
+        super().__init__(name=name, id=id, classes=classes)
+        if highlight_max_bytes is None:
+            # neurocli_core pulls in the workflow service; keep it off the app's import path.
+            from neurocli_core.config import get_env_int
+
+            highlight_max_bytes = get_env_int(
+                "NEUROCLI_VIEWER_HIGHLIGHT_MAX_BYTES", DEFAULT_HIGHLIGHT_MAX_BYTES
+            )
+        self._reader = reader
+        self.highlight_max_bytes = max(0, highlight_max_bytes)
+        self.path: Path | None = None
+        self.total_lines = 0
+        self.highlighted = False
+        self._generation = 0
+        self._gutter_width = 0
+        self._content_width = 0
+        self._blocks: OrderedDict[int, list[Text]] = OrderedDict()
+        self._pending: set[int] = set()
+        self._message: str | None = None
+
+    @property
+    def reader(self) -> FileReader:
+        if self._reader is None:
+            from neurocli_core.file_reader import get_file_reader
+
+            self._reader = get_file_reader()
+        return self._reader
+
+    @property
+    def loaded_blocks(self) -> list[int]:
+        """Block numbers currently held in memory, least recently used first."""
+
+        return list(self._blocks)
+
+    def load(self, path: Path | str) -> None:
+        """Show ``path`` from its first line, indexing it off the event loop."""
+
+        path = Path(path)
+        self._generation += 1
+        generation = self._generation
+        self.path = path
+        self.total_lines = 0
+        self.highlighted = False
+        self._blocks.clear()
+        self._pending.clear()
+        self._content_width = 0
+        self._message = f"Opening {path.name}…"
+        self.border_title = path.name
+        self.virtual_size = Size(0, 1)
+        self.scroll_to(0, 0, animate=False, immediate=True)
+        self.refresh()
+        self.run_worker(
+            lambda: self._index_worker(path, generation),
+            thread=True,
+            group="file_viewer_index",
+            exclusive=True,
+        )
+
+    def render_line(self, y: int) -> Strip:
+        scroll_x, scroll_y = self.scroll_offset
+        width = self.scrollable_content_region.width
+        if self._message is not None:
+            if y:
+                return Strip.blank(width)
+            style = self.get_component_rich_style("file-viewer--placeholder")
+            return Strip([Segment(self._message, style)]).crop_extend(0, width, None)
+
+        line_number = scroll_y + y
+        if line_number >= self.total_lines:
+            return Strip.blank(width)
+
+        gutter_style = self.get_component_rich_style("file-viewer--gutter")
+        gutter = Segment(f"{line_number + 1:>{self._gutter_width - 1}} ", gutter_style)
+        block_number, row = divmod(line_number, BLOCK_LINES)
+        block = self._blocks.get(block_number)
+        if block is None:
+            self._request_block(block_number)
+            text = Text("")
+        else:
+            self._blocks.move_to_end(block_number)
+            text = block[row] if row < len(block) else Text("")
+
+        body = Strip(list(text.render(self.app.console)), text.cell_len)
+        body = body.crop_extend(scroll_x, scroll_x + width - self._gutter_width, None)
+        return Strip.join([Strip([gutter], self._gutter_width), body])
+
+    def _index_worker(self, path: Path, generation: int) -> None:
+        try:
+            reader = self.reader
+            if reader.is_binary(path):
+                raise ValueError(f"{path.name} looks like a binary file; it cannot be shown as text.")
+            total_lines = reader.line_index(path).total_lines
+            size = path.stat().st_size
+        except (OSError, ValueError) as error:
+            self.app.call_from_thread(self._index_failed, path, generation, str(error))
+            return
+        highlighted = size <= self.highlight_max_bytes
+        self.app.call_from_thread(self._index_ready, path, generation, total_lines, highlighted)
+
+    def _index_ready(self, path: Path, generation: int, total_lines: int, highlighted: bool) -> None:
+        if generation != self._generation:
+            return
+        self.total_lines = total_lines
+        self.highlighted = highlighted
+        self._gutter_width = len(str(max(1, total_lines))) + 1
+        self._message = None if total_lines else f"{path.name} is empty."
+        self.virtual_size = Size(self._gutter_width, max(1, total_lines))
+        self.refresh()
+        self.post_message(self.Loaded(path, total_lines, highlighted))
+
+    def _index_failed(self, path: Path, generation: int, error: str) -> None:
+        if generation != self._generation:
+            return
+        self._message = error
+        self.refresh()
+        self.post_message(self.Failed(path, error))
+
+    def _request_block(self, block_number: int) -> None:
+        if block_number in self._pending or self.path is None:
+            return
+        self._pending.add(block_number)
+        path, generation, highlighted = self.path, self._generation, self.highlighted
+        self.run_worker(
+            lambda: self._block_worker(path, generation, block_number, highlighted),
+            thread=True,
+            group="file_viewer_blocks",
+        )
+
+    def _block_worker(self, path: Path, generation: int, block_number: int, highlighted: bool) -> None:
+        if generation != self._generation:
+            return
+        if not self._block_in_view(block_number):
+            # Scrolled past while queued; render_line asks again if it comes back.
+            self.app.call_from_thread(self._pending.discard, block_number)
+            return
+        try:
+            window = self.reader.read(
+                path, start_line=block_number * BLOCK_LINES + 1, line_count=BLOCK_LINES
+            )
+        except (OSError, ValueError) as error:
+            self.app.call_from_thread(
+                self._block_ready, generation, block_number, [Text(f"<unreadable: {error}>")]
+            )
+            return
+        # Plain text paints at once; the highlighted block replaces it when ready.
+        lines = highlight_block(window.content, path, highlight=False)
+        self.app.call_from_thread(self._block_ready, generation, block_number, lines)
+        if highlighted and generation == self._generation:
+            lines = highlight_block(window.content, path, highlight=True)
+            self.app.call_from_thread(self._block_ready, generation, block_number, lines)
+
+    def _block_ready(self, generation: int, block_number: int, lines: list[Text]) -> None:
+        if generation != self._generation:
+            return
+        self._pending.discard(block_number)
+        self._blocks[block_number] = lines
+        while len(self._blocks) > MAX_CACHED_BLOCKS:
+            self._blocks.popitem(last=False)
+        widest = max((line.cell_len for line in lines), default=0)
+        if widest > self._content_width:
+            self._content_width = widest
+            self.virtual_size = Size(self._gutter_width + widest, self.virtual_size.height)
+        self.refresh()
+
+    def _block_in_view(self, block_number: int) -> bool:
+        first_line = round(self.scroll_y)
+        last_line = first_line + max(1, self.scrollable_content_region.height)
+        return first_line // BLOCK_LINES - 1 <= block_number <= last_line // BLOCK_LINES + 1
@@ -2,98 +2,197 @@ from textual.app import ComposeResult
 from textual.containers import Container, Horizontal, Vertical
 from textual.screen import ModalScreen
 from textual.widgets import Button, Label, TextArea, LoadingIndicator
-from textual.worker import Worker, WorkerState
+from textual.worker import Worker, WorkerState, get_current_worker
 
 from neurocli_core.git_engine import (
     get_staged_diff,
-    generate_commit_message,
-    execute_commit_and_push
+    stream_commit_message,
+    execute_commit,
+    start_push
 )
+from neurocli_core.git_jobs import get_push_job_manager
 
 
 class GitModal(ModalScreen[None]):
     """A modal screen that displays an AI-generated commit message for review."""
 
     CSS_PATH = "main.css"
-    
+
     _add_all: bool = False
+    _stop_requested: bool = False
+    _push_job_id: str | None = None
 
     def compose(self) -> ComposeResult:
         with Container(id="git_dialog"):
             yield Label("🐙 The Git Whisperer - Review Commit", id="git_header")
-            
+
             with Vertical(id="git_main_area"):
                 yield LoadingIndicator(id="git_loading_indicator")
+                yield Label("", id="git_progress_label")
                 yield TextArea(id="commit_text_area", language="markdown", show_line_numbers=False)
-                
+
             with Horizontal(id="git_action_row"):
                 yield Button("Cancel", id="btn_cancel_git", variant="error")
+                yield Button("Stop", id="btn_stop_git", variant="warning")
                 yield Button("Commit & Push", id="btn_commit_push", variant="success")
 
     def on_mount(self) -> None:
-        """Fetch the diff and get the AI generated commit message when the modal opens."""
-        # Hide the text area and action row while loading
+        """Fetch the diff and stream the AI generated commit message when the modal opens."""
+        # The message streams into the text area; commit stays hidden until it is complete.
         self.query_one("#commit_text_area").styles.display = "none"
-        self.query_one("#git_action_row").styles.display = "none"
-        
+        self.query_one("#btn_commit_push").styles.display = "none"
+
         # Start a worker thread to perform the diff and AI call without blocking the UI
         self.run_worker(self._generate_message_worker, thread=True, name="fetch_commit_message")
 
     def _generate_message_worker(self) -> str:
-        """Worker thread function to run the process."""
+        """Worker thread function: stream the message, forwarding each chunk to the UI."""
+        worker = get_current_worker()
         diff_text, is_fallback = get_staged_diff()
         self._add_all = is_fallback
-        
-        if not diff_text:
-            return "No changes detected to commit."
-            
-        return generate_commit_message(diff_text)
+
+        def should_stop() -> bool:
+            return worker.is_cancelled or self._stop_requested
+
+        message = ""
+        for event in stream_commit_message(diff_text, should_stop=should_stop):
+            if worker.is_cancelled:
+                break
+            if event.event == "progress":
+                self.app.call_from_thread(self._show_progress, event.progress)
+            elif event.event == "delta":
+                self.app.call_from_thread(self._append_message_text, event.delta)
+            elif event.event == "error":
+                raise RuntimeError(event.error)
+            elif event.summary is not None and event.event in ("complete", "cancelled"):
+                message = event.summary.message
+        return message
+
+    def _show_progress(self, progress: dict) -> None:
+        """Report map-phase progress while large diffs are summarized file by file."""
+        self.query_one("#git_progress_label", Label).update(
+            f"Summarizing changes {progress['done']}/{progress['total']}: {progress['file']}"
+        )
+
+    def _append_message_text(self, delta: str) -> None:
+        """Show the text area on the first chunk and append each chunk as it arrives."""
+        text_area = self.query_one("#commit_text_area", TextArea)
+        if text_area.styles.display == "none":
+            self.query_one("#git_loading_indicator").styles.display = "none"
+            self.query_one("#git_progress_label").styles.display = "none"
+            text_area.styles.display = "block"
+        text_area.insert(delta, text_area.document.end)
+
+    def _commit_and_push_worker(self, commit_message: str) -> str:
+        """Commit, then follow the background push job until it finishes."""
+        worker = get_current_worker()
+        commit = execute_commit(commit_message, self._add_all)
+        self.app.call_from_thread(self._show_status, f"Committed {commit}. Pushing...")
+
+        if worker.is_cancelled:
+            return "cancelled"
+        manager = get_push_job_manager()
+        self._push_job_id = start_push().job_id
+        self.app.call_from_thread(self._enable_push_cancel)
+        for snapshot in manager.watch(self._push_job_id, should_stop=lambda: worker.is_cancelled):
+            if snapshot["phase"]:
+                self.app.call_from_thread(
+                    self._show_status,
+                    f"Pushing {commit}: {snapshot['phase']} {snapshot['percent']}% "
+                    f"({snapshot['current']}/{snapshot['total']})",
+                )
+
+        job = manager.get(self._push_job_id)
+        if job.status == "failed":
+            raise RuntimeError(f"Committed {commit}, but the push failed: {job.error}")
+        return job.status
+
+    def _enable_push_cancel(self) -> None:
+        """The push job exists now, so "Cancel Push" has something to cancel."""
+        self.query_one("#btn_cancel_git", Button).disabled = False
+
+    def _show_status(self, text: str) -> None:
+        label = self.query_one("#git_progress_label", Label)
+        label.styles.display = "block"
+        label.update(text)
 
     def on_worker_state_changed(self, event: Worker.StateChanged) -> None:
         """Called when any worker state changes."""
-        
+
         # Handle the fetch worker finishing
         if event.worker.name == "fetch_commit_message":
             if event.state == WorkerState.SUCCESS:
                 self.query_one("#git_loading_indicator").styles.display = "none"
+                self.query_one("#git_progress_label").styles.display = "none"
+                self.query_one("#btn_stop_git").styles.display = "none"
                 text_area = self.query_one("#commit_text_area", TextArea)
                 text_area.load_text(event.worker.result)
                 text_area.styles.display = "block"
-                self.query_one("#git_action_row").styles.display = "block"
-                
+                self.query_one("#btn_commit_push").styles.display = "block"
+
             elif event.state == WorkerState.ERROR:
                 self.query_one("#git_loading_indicator").styles.display = "none"
+                self.query_one("#git_progress_label").styles.display = "none"
+                self.query_one("#btn_stop_git").styles.display = "none"
                 text_area = self.query_one("#commit_text_area", TextArea)
                 text_area.load_text(f"Error generating commit message: {event.worker.error}")
                 text_area.styles.display = "block"
                 self.query_one("#btn_cancel_git").styles.display = "block"
                 # Don't show commit button if there's an error
-                
+
         # Handle the push worker finishing
         elif event.worker.name == "execute_commit":
             if event.state == WorkerState.SUCCESS:
-                self.app.notify("Successfully committed and pushed changes!", title="Git", severity="information")
+                if event.worker.result == "cancelled":
+                    self.app.notify("Push cancelled. The commit is kept locally.", title="Git", severity="warning")
+                else:
+                    self.app.notify("Successfully committed and pushed changes!", title="Git", severity="information")
                 self.dismiss()
             elif event.state == WorkerState.ERROR:
+                committed = self._push_job_id is not None
+                self._push_job_id = None
                 self.query_one("#git_loading_indicator").styles.display = "none"
+                self.query_one("#git_progress_label").styles.display = "none"
                 self.app.notify(f"Git execution failed: {event.worker.error}", title="Git Error", severity="error", timeout=10)
-                self.query_one("#git_action_row").styles.display = "block"
+                cancel_button = self.query_one("#btn_cancel_git", Button)
+                cancel_button.disabled = False
+                # Once the commit exists only the push failed; committing again would fail.
+                cancel_button.label = "Close" if committed else "Cancel"
+                if not committed:
+                    self.query_one("#btn_commit_push").styles.display = "block"
 
 
     async def on_button_pressed(self, event: Button.Pressed) -> None:
         if event.button.id == "btn_cancel_git":
+            if self._push_job_id is not None:
+                # The commit stays; the push worker reports the cancellation and closes the modal.
+                job_id = self._push_job_id
+                self.run_worker(lambda: get_push_job_manager().cancel(job_id), thread=True, name="cancel_push")
+                event.button.disabled = True
+                return
+            # Stops an in-flight generation; the worker closes the model stream.
+            self.workers.cancel_node(self)
             self.dismiss()
-            
+
+        elif event.button.id == "btn_stop_git":
+            # Keep what has streamed so far as an editable draft.
+            self._stop_requested = True
+            event.button.disabled = True
+
         elif event.button.id == "btn_commit_push":
-            # Hide action row while pushing
-            self.query_one("#git_action_row").styles.display = "none"
+            # Only cancelling the push stays available while committing and pushing;
+            # it is enabled once the push job exists, since the commit itself can't be cancelled.
+            self.query_one("#btn_commit_push").styles.display = "none"
+            cancel_button = self.query_one("#btn_cancel_git", Button)
+            cancel_button.label = "Cancel Push"
+            cancel_button.disabled = True
             self.query_one("#git_loading_indicator").styles.display = "block"
-            
+
             commit_message = self.query_one("#commit_text_area", TextArea).text
-            
+
             # Start worker for the git operation
             self.run_worker(
-                lambda: execute_commit_and_push(commit_message, self._add_all),
+                lambda: self._commit_and_push_worker(commit_message),
                 thread=True,
                 name="execute_commit"
             )
@@ -0,0 +1,84 @@
+from textual.app import ComposeResult
+from textual.containers import Container, Horizontal, VerticalScroll
+from textual.screen import ModalScreen
+from textual.widgets import Button, Label, SelectionList, Static
+from textual.widgets.selection_list import Selection
+
+from neurocli_core.diff_generator import DiffHunk, render_hunk
+
+
+class HunkReviewModal(ModalScreen[list[str] | None]):
+    """Accept or reject each hunk of the current proposal before a partial apply."""
+
+    CSS_PATH = "main.css"
+
+    def __init__(self, *args, target_file: str, hunks: list[DiffHunk], **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.target_file = target_file
+        self.hunks = hunks
+        self._hunks_by_id = {hunk.id: hunk for hunk in hunks}
+
+    def compose(self) -> ComposeResult:
+        with Container(id="hunk_dialog"):
+            yield Label("↔ Hunk Review", id="hunk_header")
+
+            with Horizontal(id="hunk_main_area"):
+                yield SelectionList[str](
+                    *(
+                        Selection(self._build_hunk_label(hunk), hunk.id, True)
+                        for hunk in self.hunks
+                    ),
+                    id="hunk_selection_list",
+                )
+                with VerticalScroll(id="hunk_preview_scroll"):
+                    yield Static("", id="hunk_preview", markup=False)
+
+            with Horizontal(id="hunk_action_row"):
+                yield Static("", id="hunk_summary_label")
+                yield Button("Cancel", id="btn_cancel_hunks", variant="error")
+                yield Button("Apply Selected", id="btn_apply_hunks", variant="success")
+
+    def on_mount(self) -> None:
+        self._refresh_summary()
+        if self.hunks:
+            self._show_preview(self.hunks[0].id)
+        self.query_one("#hunk_selection_list", SelectionList).focus()
+
+    def on_selection_list_selection_highlighted(
+        self, event: SelectionList.SelectionHighlighted
+    ) -> None:
+        self._show_preview(event.selection.value)
+
+    def on_selection_list_selected_changed(self, _event: SelectionList.SelectedChanged) -> None:
+        self._refresh_summary()
+
+    async def on_button_pressed(self, event: Button.Pressed) -> None:
+        if event.button.id == "btn_cancel_hunks":
+            self.dismiss()
+            return
+
+        if event.button.id == "btn_apply_hunks":
+            selected = set(self.query_one("#hunk_selection_list", SelectionList).selected)
+            # Keep file order so the partial apply walks the file once, top to bottom.
+            self.dismiss([hunk.id for hunk in self.hunks if hunk.id in selected])
+
+    def _show_preview(self, hunk_id: str) -> None:
+        hunk = self._hunks_by_id.get(hunk_id)
+        preview = self.query_one("#hunk_preview", Static)
+        if hunk is None:
+            preview.update("")
+            return
+        preview.update(render_hunk(hunk))
+
+    def _refresh_summary(self) -> None:
+        selected_count = len(self.query_one("#hunk_selection_list", SelectionList).selected)
+        self.query_one("#hunk_summary_label", Static).update(
+            f"{selected_count} of {len(self.hunks)} hunks selected"
+        )
+        self.query_one("#btn_apply_hunks", Button).disabled = selected_count == 0
+
+    @staticmethod
+    def _build_hunk_label(hunk: DiffHunk) -> str:
+        removed = sum(1 for op, _text in hunk.lines if op == "-")
+        added = sum(1 for op, _text in hunk.lines if op == "+")
+        return f"{hunk.header}  -{removed} +{added}"
@@ -1,27 +1,26 @@
+from __future__ import annotations
+
 import os
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from textual.app import App, ComposeResult
 from textual.containers import Container, Horizontal, VerticalScroll
 from textual.widgets import Button, DirectoryTree, Input, LoadingIndicator, Markdown, Static
 from textual.worker import Worker
-from textual_fspicker import FileOpen
-
-from neurocli_app.command_modal import CommandModal
-from neurocli_app.context_modal import ContextModal
-from neurocli_app.git_modal import GitModal
-from neurocli_app.model_modal import ModelModal
-from neurocli_app.radar_modal import RadarModal
-from neurocli_app.review_modal import ReviewModal
+
+from neurocli_app.file_viewer import FileViewer
 from neurocli_app.theme import arctic_theme, fleet_dark, modern_theme, solid_modern
-from neurocli_app.workflow_adapter import (
-    build_textual_workflow_request,
-    run_textual_stream_workflow,
-)
-from neurocli_core.code_formatter import format_code
-from neurocli_core.diff_generator import generate_diff
-from neurocli_core.file_handler import create_backup
-from neurocli_core.workflow_service import AIWorkflowRequest, AIWorkflowResponse, AIWorkflowStreamEvent
+
+# Modals, the file picker, and neurocli_core services are imported on first use
+# so cold start only pays for what the first frame needs.
+if TYPE_CHECKING:
+    from neurocli_core.diff_generator import DiffHunk
+    from neurocli_core.workflow_service import (
+        AIWorkflowRequest,
+        AIWorkflowResponse,
+        AIWorkflowStreamEvent,
+    )
 
 
 class NeuroApp(App):
@@ -69,6 +68,7 @@ class NeuroApp(App):
                 with Container(id="workspace_panel"):
                     # Output/History Section
                     yield Markdown("AI response will appear here...", id="response_display")
+                    yield FileViewer(id="file_viewer")
                     yield LoadingIndicator(id="loading_indicator")
                     yield Button("Apply Changes", id="apply_button")
 
@@ -107,9 +107,18 @@ class NeuroApp(App):
         self.theme = "fleet_dark"
         self.query_one("#loading_indicator").styles.display = "none"
         self.query_one("#apply_button").styles.display = "none"
+        self.query_one("#file_viewer").styles.display = "none"
         self._refresh_model_button()
         self._refresh_workspace_status()
         self.query_one("#prompt_input", Input).focus()
+        self.call_after_refresh(self._start_background_warm_up)
+
+    def _start_background_warm_up(self) -> None:
+        """Optionally pre-open the pooled OpenAI connection once the first frame is up."""
+
+        from neurocli_core.llm_api_openai import start_background_warm_up
+
+        start_background_warm_up()
 
     def on_directory_tree_file_selected(
         self, event: DirectoryTree.FileSelected
@@ -118,7 +127,7 @@ class NeuroApp(App):
         self._display_file_content(str(event.path))
 
     def _display_file_content(self, path_str: str) -> None:
-        """Helper to read and display file content in the Markdown widget."""
+        """Show a file in the virtualized viewer in place of the response Markdown."""
         path = Path(path_str)
         
         if not path.exists() or not path.is_file():
@@ -133,25 +142,27 @@ class NeuroApp(App):
         self._workflow_state = "Viewing file"
         self._refresh_workspace_status()
 
-        try:
-            # Determine extension for syntax highlighting
-            ext = path.suffix.lower().lstrip(".")
-            if not ext:
-                ext = "text"
-
-            # Read file content safely
-            with open(path, "r", encoding="utf-8") as f:
-                content = f.read()
-
-            # Update the response display with the file content
-            markdown_view = f"### Viewing: {path.name}\n\n```{ext}\n{content}\n```"
-            self.query_one("#response_display", Markdown).update(markdown_view)
-        except Exception as e:
-            self.query_one("#response_display", Markdown).update(
-                f"### Error\n\nFailed to read file: {e}"
-            )
-            self._workflow_state = "File read error"
-            self._refresh_workspace_status()
+        self.query_one("#response_display").styles.display = "none"
+        viewer = self.query_one("#file_viewer", FileViewer)
+        viewer.styles.display = "block"
+        viewer.load(path)
+
+    def on_file_viewer_loaded(self, event: FileViewer.Loaded) -> None:
+        mode = "highlighted" if event.highlighted else "plain text"
+        self._workflow_state = f"Viewing file ({event.total_lines:,} lines, {mode})"
+        self._refresh_workspace_status()
+
+    def on_file_viewer_failed(self, event: FileViewer.Failed) -> None:
+        self._workflow_state = "File read error"
+        self._refresh_workspace_status()
+
+    def _response_display(self) -> Markdown:
+        """Return the response Markdown, swapping it back in for the file viewer."""
+
+        self.query_one("#file_viewer").styles.display = "none"
+        response_display = self.query_one("#response_display", Markdown)
+        response_display.styles.display = "block"
+        return response_display
 
     def _run_prompt(self) -> None:
         """Run the AI request using the shared streaming workflow contract."""
@@ -161,6 +172,8 @@ class NeuroApp(App):
         if not prompt.strip():
             return
 
+        from neurocli_app.workflow_adapter import build_textual_workflow_request
+
         try:
             request = build_textual_workflow_request(
                 prompt,
@@ -170,7 +183,7 @@ class NeuroApp(App):
                 model_options_text=self.model_options_text,
             )
         except ValueError as error:
-            self.query_one("#response_display", Markdown).update(f"### Request Error\n\n{error}")
+            self._response_display().update(f"### Request Error\n\n{error}")
             self._workflow_state = "Request error"
             self._refresh_workspace_status()
             return
@@ -182,18 +195,11 @@ class NeuroApp(App):
         self.query_one("#apply_button").styles.display = "none"
         self.query_one("#loading_indicator").styles.display = "block"
         self._refresh_workspace_status()
-        self.query_one("#response_display", Markdown).update(
+        self._response_display().update(
             self._render_stream_output(request)
         )
         self.run_worker(
-            lambda: run_textual_stream_workflow(
-                request,
-                lambda event: self.call_from_thread(
-                    self._handle_stream_event,
-                    request,
-                    event,
-                ),
-            ),
+            lambda: self._stream_workflow_worker(request),
             thread=True,
             name="run_ai_workflow",
         )
@@ -203,35 +209,44 @@ class NeuroApp(App):
         """Format the currently selected file."""
         file_path = self.query_one("#file_path_input", Input).value
         if not file_path or not os.path.exists(file_path):
-            self.query_one("#response_display", Markdown).update("Please select a valid file to format.")
+            self._response_display().update("Please select a valid file to format.")
             self._workflow_state = "Format needs target"
             self._refresh_workspace_status()
             return
 
+        from neurocli_core.code_formatter import format_code_result
+        from neurocli_core.diff_generator import generate_diff
+
         try:
             with open(file_path, "r", encoding="utf-8") as f:
                 original_content = f.read()
 
-            formatted_content = format_code(original_content, file_path)
+            result = format_code_result(original_content, file_path)
+            formatted_content = result.content
+            timing_label = (
+                f" ({result.formatter} {result.mode}, {result.elapsed_ms:.0f} ms)"
+                if result.formatter
+                else ""
+            )
             
             if formatted_content == original_content:
-                self.query_one("#response_display", Markdown).update("No formatting needed.")
+                self._response_display().update("No formatting needed.")
                 self.query_one("#apply_button").styles.display = "none"
                 self._proposed_content = ""
                 self._proposal_baseline_content = ""
-                self._workflow_state = "Format clean"
+                self._workflow_state = f"Format clean{timing_label}"
             else:
                 diff = generate_diff(original_content, formatted_content)
-                self.query_one("#response_display", Markdown).update(diff)
+                self._response_display().update(diff)
                 self._proposed_content = formatted_content
                 self._proposal_baseline_content = original_content
                 self.query_one("#apply_button").styles.display = "block"
-                self._workflow_state = "Format review ready"
+                self._workflow_state = f"Format review ready{timing_label}"
         except RuntimeError as e:
-            self.query_one("#response_display", Markdown).update(f"### Formatter Error\n\n{e}")
+            self._response_display().update(f"### Formatter Error\n\n{e}")
             self._workflow_state = "Formatter error"
         except Exception as e:
-            self.query_one("#response_display", Markdown).update(f"Error formatting file: {e}")
+            self._response_display().update(f"Error formatting file: {e}")
             self._workflow_state = "Format error"
         finally:
             self._refresh_workspace_status()
@@ -239,18 +254,17 @@ class NeuroApp(App):
     async def on_button_pressed(self, event: Button.Pressed) -> None:
         """Handle button actions while keeping existing wiring intact."""
         if event.button.id == "browse_button":
+            from textual_fspicker import FileOpen
+
             self.push_screen(FileOpen(), self.on_file_open_selected)
         elif event.button.id == "run_button":
             self._run_prompt()
         elif event.button.id == "format_button":
             self._format_file()
         elif event.button.id == "btn_model":
-            self.push_screen(
-                ModelModal(self.selected_model, self.model_options_text),
-                self._on_model_modal_dismissed,
-            )
+            self.action_open_model()
         elif event.button.id == "btn_context":
-            self.push_screen(ContextModal(self.context_paths), self._on_context_modal_dismissed)
+            self.action_open_context()
         elif event.button.id == "btn_radar":
             self.action_open_radar()
         elif event.button.id == "btn_review":
@@ -329,14 +343,22 @@ class NeuroApp(App):
             self._refresh_workspace_status()
             return
 
-        try:
-            backup_dir = os.path.join(os.path.dirname(file_path), "backups")
-            create_backup(file_path, backup_dir)
+        from neurocli_core.apply_engine import FileChange, apply_transaction
 
-            with open(file_path, "w", encoding="utf-8") as file:
-                file.write(self._proposed_content)
+        try:
+            # The baseline check refuses the write if the file changed on disk
+            # after the proposal was generated.
+            apply_transaction(
+                [
+                    FileChange(
+                        file_path,
+                        content=self._proposed_content,
+                        expected_content=self._proposal_baseline_content or None,
+                    )
+                ]
+            )
 
-            self.query_one("#response_display").update(
+            self._response_display().update(
                 f"Changes applied to {file_path} successfully."
             )
             self._proposed_content = ""
@@ -344,13 +366,69 @@ class NeuroApp(App):
             self.query_one("#apply_button").styles.display = "none"
             self._workflow_state = "Applied with backup"
         except Exception as error:
-            self.query_one("#response_display").update(
+            self._response_display().update(
                 f"Error applying changes: {error}"
             )
             self._workflow_state = "Apply error"
         finally:
             self._refresh_workspace_status()
 
+    def _open_hunk_review(self) -> None:
+        """Split the current draft into hunks and let the user pick which ones to apply."""
+
+        from neurocli_app.hunk_modal import HunkReviewModal
+        from neurocli_core.diff_generator import compute_diff_hunks
+
+        hunks = compute_diff_hunks(self._proposal_baseline_content, self._proposed_content)
+        if not hunks:
+            self._workflow_state = "No hunks to review"
+            self._refresh_workspace_status()
+            return
+
+        self.push_screen(
+            HunkReviewModal(
+                target_file=self.query_one("#file_path_input", Input).value,
+                hunks=hunks,
+            ),
+            lambda accepted_ids: self._apply_accepted_hunks(hunks, accepted_ids),
+        )
+
+    def _apply_accepted_hunks(self, hunks: list[DiffHunk], accepted_ids: list[str] | None) -> None:
+        """Apply only the accepted hunks to the file as it is on disk now, after a backup."""
+
+        if accepted_ids is None:
+            return
+
+        file_path = self.query_one("#file_path_input", Input).value
+        if not file_path or not accepted_ids:
+            self._workflow_state = "Nothing to apply"
+            self._refresh_workspace_status()
+            return
+
+        from neurocli_core.apply_engine import FileChange, apply_transaction
+
+        try:
+            # Hunks are relocated against the current file, so edits made on
+            # disk since the proposal do not force a full regeneration.
+            apply_transaction(
+                [FileChange(file_path, hunks=hunks, accepted_hunk_ids=accepted_ids)]
+            )
+
+            self._response_display().update(
+                f"Applied {len(accepted_ids)} of {len(hunks)} hunks to {file_path}."
+            )
+            self._proposed_content = ""
+            self._proposal_baseline_content = ""
+            self.query_one("#apply_button").styles.display = "none"
+            self._workflow_state = "Hunks applied with backup"
+        except Exception as error:
+            self._response_display().update(
+                f"Error applying hunks: {error}"
+            )
+            self._workflow_state = "Apply error"
+        finally:
+            self._refresh_workspace_status()
+
     def _reset_workspace_view(self) -> None:
         """Reset transient prompt, stream, diff, and apply state without changing files."""
 
@@ -359,7 +437,7 @@ class NeuroApp(App):
         self._streamed_output = ""
         self._workflow_state = "Reset"
         self.query_one("#prompt_input", Input).value = ""
-        self.query_one("#response_display", Markdown).update("AI response will appear here...")
+        self._response_display().update("AI response will appear here...")
         self.query_one("#loading_indicator").styles.display = "none"
         self.query_one("#apply_button").styles.display = "none"
         self._refresh_workspace_status()
@@ -401,10 +479,24 @@ class NeuroApp(App):
 
         loading_indicator.styles.display = "none"
 
+    def _stream_workflow_worker(self, request: AIWorkflowRequest) -> AIWorkflowResponse:
+        """Run the stream on the worker thread, diffing file updates as chunks arrive."""
+
+        from neurocli_app.workflow_adapter import StreamDiffPreview, run_textual_stream_workflow
+
+        preview = StreamDiffPreview.from_request(request)
+
+        def on_event(event: AIWorkflowStreamEvent) -> None:
+            rendered_preview = preview.update(event) if preview is not None else None
+            self.call_from_thread(self._handle_stream_event, request, event, rendered_preview)
+
+        return run_textual_stream_workflow(request, on_event)
+
     def _handle_stream_event(
         self,
         request: AIWorkflowRequest,
         event: AIWorkflowStreamEvent,
+        rendered_preview: str | None = None,
     ) -> None:
         """Render incremental stream output and then apply the final response shape."""
 
@@ -414,14 +506,14 @@ class NeuroApp(App):
             self._streamed_output = ""
             self._workflow_state = "Streaming started"
             self._refresh_workspace_status()
-            markdown_display.update(self._render_stream_output(request))
+            markdown_display.update(rendered_preview or self._render_stream_output(request))
             return
 
         if event.event == "delta":
             self._streamed_output += event.delta
             self._workflow_state = "Streaming output"
             self._refresh_workspace_status()
-            markdown_display.update(self._render_stream_output(request))
+            markdown_display.update(rendered_preview or self._render_stream_output(request))
             return
 
         if event.response is not None:
@@ -453,7 +545,7 @@ class NeuroApp(App):
     def _handle_workflow_response(self, response: AIWorkflowResponse) -> None:
         """Apply the normalized response shape shared by sync and streaming callers."""
 
-        markdown_display = self.query_one("#response_display", Markdown)
+        markdown_display = self._response_display()
         file_path_input = self.query_one("#file_path_input", Input)
 
         if response.target_file:
@@ -469,6 +561,9 @@ class NeuroApp(App):
             return
 
         if response.response_kind == "file_update":
+            from neurocli_core.code_formatter import format_code
+            from neurocli_core.diff_generator import generate_diff
+
             file_path = response.target_file or file_path_input.value
             try:
                 # The formatter runs after generation so both UIs can share one
@@ -515,6 +610,8 @@ class NeuroApp(App):
     def action_open_model(self) -> None:
         """Open model overrides without introducing app-specific fields."""
 
+        from neurocli_app.model_modal import ModelModal
+
         self.push_screen(
             ModelModal(self.selected_model, self.model_options_text),
             self._on_model_modal_dismissed,
@@ -523,16 +620,22 @@ class NeuroApp(App):
     def action_open_context(self) -> None:
         """Open the context stack manager."""
 
+        from neurocli_app.context_modal import ContextModal
+
         self.push_screen(ContextModal(self.context_paths), self._on_context_modal_dismissed)
 
     def action_open_radar(self) -> None:
         """Open workspace radar backed by neurocli_core services."""
 
+        from neurocli_app.radar_modal import RadarModal
+
         self.push_screen(RadarModal())
 
     def action_open_review(self) -> None:
         """Open the editable proposal review lane."""
 
+        from neurocli_app.review_modal import ReviewModal
+
         self.push_screen(
             ReviewModal(
                 target_file=self.query_one("#file_path_input", Input).value,
@@ -545,11 +648,15 @@ class NeuroApp(App):
     def action_open_git(self) -> None:
         """Open the git action lane backed by neurocli_core git services."""
 
+        from neurocli_app.git_modal import GitModal
+
         self.push_screen(GitModal())
 
     def action_open_commands(self) -> None:
         """Open the visible command reference window."""
 
+        from neurocli_app.command_modal import CommandModal
+
         self.push_screen(CommandModal())
 
     def action_reset_workspace(self) -> None:
@@ -576,13 +683,19 @@ class NeuroApp(App):
             self._apply_changes()
             return
 
+        if payload.get("action") == "hunks" and self._proposal_baseline_content:
+            self._open_hunk_review()
+            return
+
         self._workflow_state = "Review draft kept"
         if self._proposal_baseline_content:
-            self.query_one("#response_display", Markdown).update(
+            from neurocli_core.diff_generator import generate_diff
+
+            self._response_display().update(
                 generate_diff(self._proposal_baseline_content, edited_content)
             )
         else:
-            self.query_one("#response_display", Markdown).update(
+            self._response_display().update(
                 "Review draft updated. Apply is ready when you are."
             )
         self._refresh_workspace_status()
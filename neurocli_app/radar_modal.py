@@ -1,88 +1,208 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable
+
 from textual.app import ComposeResult
 from textual.containers import Container, Horizontal, Vertical, Grid
 from textual.screen import ModalScreen
 from textual.widgets import Button, Label, DataTable, Static
-from pathlib import Path
+from textual.worker import get_current_worker
+
+from neurocli_core.radar_engine import iter_technical_debt, iter_workspace_health, scan_recent_edits
+
+
+@dataclass(slots=True)
+class RadarResults:
+    """The last complete result of each Radar scan for one project root."""
+
+    health: dict[str, Any] | None = None
+    debt: list[dict[str, Any]] | None = None
+    edits: list[dict[str, Any]] | None = None
+    scanned_at: datetime | None = None
+
+
+# Reopening Radar paints these at once and refreshes them in the background.
+_last_results: dict[str, RadarResults] = {}
+
+
+def cached_radar_results(project_root: str) -> RadarResults | None:
+    return _last_results.get(project_root)
+
+
+def clear_radar_cache() -> None:
+    _last_results.clear()
+
+
+def _default_project_root() -> str:
+    return str(Path(__file__).parent.parent.resolve())
 
-from neurocli_core.radar_engine import scan_workspace_health, scan_technical_debt, scan_recent_edits
 
 class RadarModal(ModalScreen[None]):
-    """A modal screen that displays Workspace Radar (Health & Heatmap)."""
+    """A modal screen that displays Workspace Radar (Health & Heatmap).
+
+    Scans run on thread workers and fill each panel as batches arrive. Closing
+    the modal cancels them; a scan that finished is cached per project root,
+    so the next open shows it immediately while a fresh scan runs.
+    """
 
     CSS_PATH = "main.css"
 
+    def __init__(self, project_root: str | None = None) -> None:
+        super().__init__()
+        self.project_root = project_root or _default_project_root()
+        self._results = _last_results.setdefault(self.project_root, RadarResults())
+        self._active_scans: set[str] = set()
+
     def compose(self) -> ComposeResult:
         with Container(id="radar_dialog"):
             yield Label("📊 Workspace Radar", id="radar_header")
-            
+            yield Label("", id="radar_status")
+
             with Grid(id="radar_grid"):
                 # Left side: Code Composition
                 with Vertical(id="radar_composition"):
                     yield Label("Code Composition", classes="radar_section_title")
-                    yield Vertical(id="composition_content")
-                    
+                    with Vertical(id="composition_content"):
+                        yield Label("Scanning…", id="total_loc_label")
+                        yield Static("", id="composition_rows", classes="lang_row")
+
                 # Right side: Technical Debt
                 with Vertical(id="radar_debt"):
                     yield Label("Technical Debt", classes="radar_section_title")
                     yield DataTable(id="debt_table")
-                    
+
                 # Bottom: AI Heatmap
                 with Container(id="radar_heatmap"):
                     yield Label("Recent AI Edits", classes="radar_section_title")
                     yield DataTable(id="edits_table")
-                    
+
             with Horizontal(id="radar_action_row"):
                 yield Button("Close", id="btn_close_radar", variant="error")
 
     def on_mount(self) -> None:
-        self._load_health()
-        self._load_debt()
-        self._load_recent_edits()
-
-    def _load_health(self) -> None:
-        # Load the stats dynamically, ensuring we scan the project root
-        project_root = str(Path(__file__).parent.parent.resolve())
-        health_data = scan_workspace_health(project_root)
-        composition_view = self.query_one("#composition_content", Vertical)
-        
+        debt_table = self.query_one("#debt_table", DataTable)
+        debt_table.cursor_type = "row"
+        debt_table.zebra_stripes = True
+        debt_table.add_columns("File", "Line", "Message")
+
+        edits_table = self.query_one("#edits_table", DataTable)
+        edits_table.cursor_type = "row"
+        edits_table.zebra_stripes = True
+        edits_table.add_columns("File", "Last Edited")
+
+        # Cached panels paint now; their scans then replace them only once complete.
+        if self._results.health is not None:
+            self._show_health(self._results.health)
+        if self._results.debt is not None:
+            self._show_debt(self._results.debt, replace=True)
+        if self._results.edits is not None:
+            self._show_edits(self._results.edits)
+
+        self._start_scan("health", self._scan_health)
+        self._start_scan("debt", self._scan_debt)
+        self._start_scan("edits", self._scan_recent_edits)
+
+    def on_unmount(self) -> None:
+        self.workers.cancel_node(self)
+
+    def _start_scan(self, name: str, scan: Callable[[bool], None]) -> None:
+        progressive = getattr(self._results, name) is None
+        self._active_scans.add(name)
+        self._refresh_status()
+        self.run_worker(lambda: scan(progressive), thread=True, name=f"radar_{name}", group="radar")
+
+    def _scan_health(self, progressive: bool) -> None:
+        worker = get_current_worker()
+        snapshot = None
+        for snapshot in iter_workspace_health(self.project_root):
+            if worker.is_cancelled:
+                return
+            if progressive:
+                self._post(self._show_health, snapshot)
+        self._post(self._finish_scan, "health", snapshot, not progressive)
+
+    def _scan_debt(self, progressive: bool) -> None:
+        worker = get_current_worker()
+        found: list[dict[str, Any]] = []
+        for batch in iter_technical_debt(self.project_root):
+            if worker.is_cancelled:
+                return
+            found.extend(batch)
+            if progressive and batch:
+                self._post(self._show_debt, batch)
+        self._post(self._finish_scan, "debt", found, not progressive)
+
+    def _scan_recent_edits(self, progressive: bool) -> None:
+        # Thresholds can be adjusted here as needed
+        edits = scan_recent_edits(self.project_root, max_items=20, max_days=7)
+        self._post(self._finish_scan, "edits", edits, True)
+
+    def _post(self, callback: Callable[..., None], *args: Any) -> None:
+        if not get_current_worker().is_cancelled:
+            self.app.call_from_thread(callback, *args)
+
+    def _finish_scan(self, name: str, result: Any, render: bool) -> None:
+        setattr(self._results, name, result)
+        self._results.scanned_at = datetime.now()
+        if not self.is_attached:
+            return
+        # Progressive scans already painted every batch; cached panels are swapped whole.
+        if render and name == "health":
+            self._show_health(result)
+        elif render and name == "debt":
+            self._show_debt(result, replace=True)
+        elif render:
+            self._show_edits(result)
+        self._active_scans.discard(name)
+        self._refresh_status()
+
+    def _refresh_status(self) -> None:
+        if self._active_scans:
+            status = f"Scanning {', '.join(sorted(self._active_scans))}…"
+            if self._results.scanned_at is not None:
+                status += f" (showing results from {self._results.scanned_at:%H:%M:%S})"
+        elif self._results.scanned_at is not None:
+            status = f"Updated {self._results.scanned_at:%H:%M:%S}"
+        else:
+            status = ""
+        self.query_one("#radar_status", Label).update(status)
+
+    def _show_health(self, health_data: dict[str, Any]) -> None:
+        if not self.is_attached:
+            return
         total_loc = health_data["total_loc"]
-        composition_view.mount(Label(f"Total Lines of Code: {total_loc:,}", id="total_loc_label"))
-        
+        self.query_one("#total_loc_label", Label).update(f"Total Lines of Code: {total_loc:,}")
+
+        rows = []
         for lang, data in health_data["composition"].items():
             loc = data["loc"]
             pct = data["percentage"]
-            
+
             # Simple textual progress bar mapping 100% to 20 chars
             bar_len = 20
             filled = int((pct / 100) * bar_len)
             bar = "█" * filled + "-" * (bar_len - filled)
-            
-            composition_view.mount(
-                Label(f"{lang:10} | {bar} {pct:4.1f}% ({loc:,} LOC)", classes="lang_row")
-            )
-
-    def _load_debt(self) -> None:
-        project_root = str(Path(__file__).parent.parent.resolve())
-        debt_data = scan_technical_debt(project_root)
+            rows.append(f"{lang:10} | {bar} {pct:4.1f}% ({loc:,} LOC)")
+        self.query_one("#composition_rows", Static).update("\n".join(rows))
+
+    def _show_debt(self, debt_data: list[dict[str, Any]], *, replace: bool = False) -> None:
+        if not self.is_attached:
+            return
         table = self.query_one("#debt_table", DataTable)
-        table.cursor_type = "row"
-        table.zebra_stripes = True
-        
-        table.add_columns("File", "Line", "Message")
-        
-        for item in debt_data:
-            table.add_row(item["file_name"], str(item["line_number"]), item["message"])
-
-    def _load_recent_edits(self) -> None:
-        project_root = str(Path(__file__).parent.parent.resolve())
-        # Thresholds can be adjusted here as needed
-        edits_data = scan_recent_edits(project_root, max_items=20, max_days=7)
+        if replace:
+            table.clear()
+        table.add_rows(
+            (item["file_name"], str(item["line_number"]), item["message"]) for item in debt_data
+        )
+
+    def _show_edits(self, edits_data: list[dict[str, Any]]) -> None:
+        if not self.is_attached:
+            return
         table = self.query_one("#edits_table", DataTable)
-        table.cursor_type = "row"
-        table.zebra_stripes = True
-        
-        table.add_columns("File", "Last Edited")
-        
+        table.clear()
         if edits_data:
             for edit in edits_data:
                 table.add_row(edit["original_file"], edit["time_ago"])
@@ -91,4 +211,5 @@ class RadarModal(ModalScreen[None]):
 
     async def on_button_pressed(self, event: Button.Pressed) -> None:
         if event.button.id == "btn_close_radar":
+            self.workers.cancel_node(self)
             self.dismiss()
@@ -34,7 +34,7 @@ class ReviewModal(ModalScreen[dict[str, str] | None]):
 
             with Horizontal(id="review_future_row"):
                 yield Button("🔎 Find", id="btn_review_find", classes="review_future_btn")
-                yield Button("↔ Diff", id="btn_review_diff", classes="review_future_btn")
+                yield Button("↔ Hunks", id="btn_review_diff", classes="review_future_btn")
                 yield Button("🧪 Tests", id="btn_review_tests", classes="review_future_btn")
                 yield Button("✨ Explain", id="btn_review_explain", classes="review_future_btn")
 
@@ -59,10 +59,14 @@ class ReviewModal(ModalScreen[dict[str, str] | None]):
         self.query_one("#btn_keep_review", Button).disabled = not has_proposal
         self.query_one("#btn_apply_review", Button).disabled = not has_proposal
 
+        # Hunk review needs a baseline to diff the draft against.
+        self.query_one("#btn_review_diff", Button).disabled = not (
+            has_proposal and self.baseline_content
+        )
+
         # These controls reserve space for editor upgrades without implying they run today.
         for button_id in (
             "#btn_review_find",
-            "#btn_review_diff",
             "#btn_review_tests",
             "#btn_review_explain",
         ):
@@ -88,6 +92,15 @@ class ReviewModal(ModalScreen[dict[str, str] | None]):
             )
             return
 
+        if event.button.id == "btn_review_diff":
+            self.dismiss(
+                {
+                    "action": "hunks",
+                    "content": self.query_one("#review_text_area", TextArea).text,
+                }
+            )
+            return
+
         if event.button.id == "btn_apply_review":
             self.dismiss(
                 {
@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 import json
+from pathlib import Path
 from typing import Any, Callable, Iterable
 
+from neurocli_core.diff_generator import IncrementalDiff, render_hunk
 from neurocli_core.workflow_service import (
     AIWorkflowRequest,
     AIWorkflowResponse,
@@ -76,3 +78,64 @@ def run_textual_stream_workflow(
         raise RuntimeError("The workflow stream ended without a final response event.")
 
     return final_response
+
+
+# Only the tail of an open (not yet resynced) change is shown, so the preview
+# stays cheap to re-render on every delta.
+PREVIEW_PENDING_LINES = 20
+
+
+class StreamDiffPreview:
+    """Incremental diff preview for a streamed full-file update.
+
+    Runs on the stream worker thread and returns rendered Markdown, so the UI
+    thread only swaps text in.
+    """
+
+    def __init__(self, target_file: str, original_content: str) -> None:
+        self.target_file = target_file
+        self.differ = IncrementalDiff(original_content)
+        self._rendered_hunks: list[str] = []
+
+    @classmethod
+    def from_request(cls, request: AIWorkflowRequest) -> StreamDiffPreview | None:
+        """Return a preview for file-targeted requests, or None when there is no readable target."""
+
+        if not request.target_file:
+            return None
+        try:
+            original_content = Path(request.target_file).read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            return None
+        return cls(request.target_file, original_content)
+
+    def update(self, event: AIWorkflowStreamEvent) -> str:
+        """Feed one stream event and return the refreshed preview Markdown."""
+
+        if event.event == "delta":
+            new_hunks = self.differ.feed(event.delta)
+        elif event.event == "complete":
+            new_hunks = self.differ.finish()
+        else:
+            new_hunks = []
+        self._rendered_hunks.extend(render_hunk(hunk) for hunk in new_hunks)
+        return self.render()
+
+    def render(self) -> str:
+        file_name = Path(self.target_file).name or "selected file"
+        language = Path(self.target_file).suffix.lower().lstrip(".") or "text"
+        sections = [
+            f"### Generating update for {file_name}",
+            (
+                f"Aligned {self.differ.aligned_old_lines:,} of "
+                f"{self.differ.total_old_lines:,} original lines | "
+                f"{len(self._rendered_hunks)} hunks ready"
+            ),
+        ]
+        if self._rendered_hunks:
+            sections.append("```diff\n" + "".join(self._rendered_hunks) + "```")
+
+        pending_lines = self.differ.pending_text.splitlines()[-PREVIEW_PENDING_LINES:]
+        if pending_lines:
+            sections.append("Generating:\n\n```" + language + "\n" + "\n".join(pending_lines) + "\n```")
+        return "\n\n".join(sections)
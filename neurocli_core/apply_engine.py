@@ -0,0 +1,331 @@
+"""All-or-nothing writes of one or more files.
+
+``apply_transaction`` takes a list of ``FileChange`` entries (full content or
+hunks to patch in) and commits them in phases:
+
+1. Read every target, check it against the caller's expected content or hash,
+   and resolve patches against what is on disk now.
+2. Write each new content to a temp file in the target's directory, then
+   fsync all of them.
+3. Re-check every target hash, then record one backup set for the
+   transaction in the backup store.
+4. ``os.replace`` the temp files into place and fsync the directories.
+
+If anything fails, temp files are removed, any target already replaced is put
+back, and the transaction's backup set is discarded, so a crash or a conflict
+never leaves a truncated or half-applied change set (or backups of a
+transaction that never happened) behind.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import stat
+import tempfile
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Sequence
+
+from neurocli_core.diff_generator import DiffHunk
+from neurocli_core.proposals import HunkConflictError, apply_hunks
+
+
+class ApplyConflictError(ValueError):
+    """Raised when target files changed on disk since the caller read them."""
+
+    def __init__(self, paths: Sequence[str]) -> None:
+        self.paths = list(paths)
+        super().__init__(
+            "These files changed on disk; reload them and try again: " + ", ".join(self.paths)
+        )
+
+
+@dataclass(slots=True)
+class FileChange:
+    """One file in a transaction: new ``content``, ``hunks`` to patch into the current file,
+    or raw ``data`` written byte for byte (used by undo, so non-UTF-8 files round-trip).
+
+    ``expected_content`` or ``expected_hash`` (SHA-256 of the bytes on disk)
+    make the transaction refuse to run when the file no longer matches.
+    """
+
+    path: str
+    content: str | None = None
+    hunks: Sequence[DiffHunk] | None = None
+    accepted_hunk_ids: Iterable[str] | None = None
+    expected_content: str | None = None
+    expected_hash: str | None = None
+    data: bytes | None = None
+
+
+@dataclass(slots=True)
+class TransactionResult:
+    transaction_id: str
+    files: list[str]
+    created: list[str] = field(default_factory=list)
+    backup_ids: list[int] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "transaction_id": self.transaction_id,
+            "files": self.files,
+            "created": self.created,
+            "backup_ids": self.backup_ids,
+            "elapsed_ms": round(self.elapsed_ms, 3),
+        }
+
+
+@dataclass(slots=True)
+class _StagedFile:
+    target: Path
+    original: bytes | None
+    original_hash: str | None
+    data: bytes
+    temp_path: Path | None = None
+    replaced: bool = False
+
+
+# Transactions in one process run one at a time so two applies touching the
+# same file cannot interleave their check and rename phases.
+_transaction_lock = threading.Lock()
+
+
+def content_hash(data: bytes | str) -> str:
+    """SHA-256 hex digest of file bytes (``str`` is hashed as UTF-8)."""
+
+    if isinstance(data, str):
+        data = data.encode("utf-8", "surrogatepass")
+    return hashlib.sha256(data).hexdigest()
+
+
+def apply_transaction(
+    changes: Sequence[FileChange],
+    *,
+    label: str = "apply",
+    backup: bool = True,
+) -> TransactionResult:
+    """Write every change or none of them.
+
+    Raises:
+        ApplyConflictError: A target does not match its expected content or
+            hash, or changed while the transaction was running.
+        HunkConflictError: Accepted hunks could not be located in a target.
+        KeyError: An accepted hunk id is unknown.
+    """
+
+    started_at = time.perf_counter()
+    transaction_id = uuid.uuid4().hex
+    with _transaction_lock:
+        staged = _resolve(changes)
+        backup_ids: list[int] = []
+        try:
+            for entry in staged:
+                entry.temp_path = _write_temp(entry)
+            for entry in staged:
+                _fsync_path(entry.temp_path)
+
+            # Last check before backing up and renaming: another writer may have got in since phase 1.
+            moved = [
+                str(entry.target)
+                for entry in staged
+                if _read_hash(entry.target) != entry.original_hash
+            ]
+            if moved:
+                raise ApplyConflictError(moved)
+
+            if backup:
+                backup_ids = _record_backup_set(staged, label, transaction_id)
+
+            for entry in staged:
+                os.replace(entry.temp_path, entry.target)
+                entry.temp_path = None
+                entry.replaced = True
+            for directory in {entry.target.parent for entry in staged}:
+                _fsync_directory(directory)
+        except BaseException:
+            _roll_back(staged)
+            if backup_ids:
+                _discard_backup_set(transaction_id)
+            raise
+
+    return TransactionResult(
+        transaction_id=transaction_id,
+        files=[str(entry.target) for entry in staged],
+        created=[str(entry.target) for entry in staged if entry.original is None],
+        backup_ids=backup_ids,
+        elapsed_ms=(time.perf_counter() - started_at) * 1000,
+    )
+
+
+def undo_transaction(transaction_id: str) -> TransactionResult:
+    """Put every file of an earlier transaction back to its backed-up content, as a new transaction.
+
+    Files the earlier transaction created had no prior content and are left in place.
+    """
+
+    from neurocli_core.backup_store import get_backup_store
+
+    store = get_backup_store()
+    changes = []
+    for record in store.transaction(transaction_id):
+        changes.append(FileChange(record.path, data=store.read(record.id)))
+    return apply_transaction(changes, label="undo")
+
+
+def _resolve(changes: Sequence[FileChange]) -> list[_StagedFile]:
+    staged: list[_StagedFile] = []
+    conflicts: list[str] = []
+    hunk_conflicts: list[str] = []
+    seen: set[Path] = set()
+
+    for change in changes:
+        target = Path(change.path).resolve()
+        if target in seen:
+            raise ValueError(f"File appears twice in one transaction: {change.path}")
+        seen.add(target)
+
+        try:
+            original: bytes | None = target.read_bytes()
+        except FileNotFoundError:
+            original = None
+        # Only decode when needed, so non-UTF-8 files can still be replaced wholesale.
+        needs_text = change.hunks is not None or change.expected_content is not None
+        current_text = _decode(original) if needs_text else None
+
+        if change.expected_hash is not None and change.expected_hash != (
+            content_hash(original) if original is not None else None
+        ):
+            conflicts.append(str(target))
+            continue
+        if change.expected_content is not None and change.expected_content != current_text:
+            conflicts.append(str(target))
+            continue
+
+        if change.hunks is not None:
+            try:
+                new_text = apply_hunks(current_text or "", change.hunks, change.accepted_hunk_ids)
+            except HunkConflictError as exc:
+                hunk_conflicts.extend(exc.hunk_ids)
+                continue
+            data = _encode(new_text, original)
+        elif change.content is not None:
+            data = _encode(change.content, original)
+        elif change.data is not None:
+            data = change.data
+        else:
+            raise ValueError(f"No content, hunks, or data given for {change.path}")
+
+        staged.append(
+            _StagedFile(
+                target=target,
+                original=original,
+                original_hash=content_hash(original) if original is not None else None,
+                data=data,
+            )
+        )
+
+    if conflicts:
+        raise ApplyConflictError(conflicts)
+    if hunk_conflicts:
+        raise HunkConflictError(hunk_conflicts)
+    return staged
+
+
+def _decode(data: bytes | None) -> str | None:
+    if data is None:
+        return None
+    # Universal newlines, matching how callers read files with read_text().
+    return data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _encode(text: str, original: bytes | None) -> bytes:
+    # Keep a CRLF file CRLF: content arrives with the "\n" endings read_text() gives.
+    if original is not None and b"\r\n" in original and "\r\n" not in text:
+        text = text.replace("\n", "\r\n")
+    return text.encode("utf-8")
+
+
+def _write_temp(entry: _StagedFile) -> Path:
+    entry.target.parent.mkdir(parents=True, exist_ok=True)
+    file_descriptor, temp_name = tempfile.mkstemp(
+        dir=entry.target.parent, prefix=f".{entry.target.name}.", suffix=".neurocli-tmp"
+    )
+    try:
+        with os.fdopen(file_descriptor, "wb") as handle:
+            handle.write(entry.data)
+    except BaseException:
+        # The caller never learns this path, so a failed write must clean up here.
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+    if entry.original is not None:
+        try:
+            os.chmod(temp_name, stat.S_IMODE(entry.target.stat().st_mode))
+        except OSError:
+            pass
+    return Path(temp_name)
+
+
+def _record_backup_set(staged: list[_StagedFile], label: str, transaction_id: str) -> list[int]:
+    from neurocli_core.backup_store import get_backup_store
+
+    entries = [(entry.target, entry.original) for entry in staged if entry.original is not None]
+    if not entries:
+        return []
+    records = get_backup_store().backup_set(entries, label=label, transaction_id=transaction_id)
+    return [record.id for record in records]
+
+
+def _discard_backup_set(transaction_id: str) -> None:
+    from neurocli_core.backup_store import get_backup_store
+
+    try:
+        get_backup_store().discard_transaction(transaction_id)
+    except Exception:
+        # Rollback must still re-raise the original error; stray versions only cost space.
+        pass
+
+
+def _roll_back(staged: list[_StagedFile]) -> None:
+    for entry in staged:
+        if entry.temp_path is not None:
+            try:
+                entry.temp_path.unlink()
+            except FileNotFoundError:
+                pass
+        if not entry.replaced:
+            continue
+        if entry.original is None:
+            entry.target.unlink(missing_ok=True)
+            continue
+        # Restore through a temp file too, so the rollback itself cannot truncate.
+        restore = _StagedFile(entry.target, entry.original, None, entry.original)
+        restore_path = _write_temp(restore)
+        os.replace(restore_path, entry.target)
+
+
+def _read_hash(path: Path) -> str | None:
+    try:
+        return content_hash(path.read_bytes())
+    except FileNotFoundError:
+        return None
+
+
+def _fsync_path(path: Path) -> None:
+    with open(path, "rb+") as handle:
+        os.fsync(handle.fileno())
+
+
+def _fsync_directory(directory: Path) -> None:
+    # Directory fsync makes the renames durable; Windows has no equivalent.
+    if os.name == "nt":
+        return
+    file_descriptor = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(file_descriptor)
+    finally:
+        os.close(file_descriptor)
@@ -0,0 +1,435 @@
+"""Deduplicated, compressed backups of files before NeuroCLI overwrites them.
+
+Every apply records a version in one store instead of copying the file into a
+``backups/`` folder next to it. File contents are kept once per SHA-256 as
+compressed blobs (zstd when available, zlib otherwise) under ``objects/``, and
+a SQLite index maps ``(path, time) -> hash``. Listing, restoring, and the
+Radar "recent edits" view are index queries; nothing walks the workspace.
+
+Old versions are pruned by ``gc``: the newest ``keep_per_file`` versions of
+each file are always kept, older ones expire after ``max_age_days``, and blobs
+no longer referenced are deleted. GC runs on its own at most once a day.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Sequence
+
+from neurocli_core.config import get_env_float, get_env_int, get_env_str
+
+_zstandard = None
+try:  # Python 3.14+
+    from compression import zstd as _zstd
+except ImportError:  # pragma: no cover - depends on the interpreter
+    _zstd = None
+    try:
+        import zstandard as _zstandard
+    except ImportError:
+        pass
+
+
+DEFAULT_KEEP_PER_FILE = 20
+DEFAULT_MAX_AGE_DAYS = 30
+AUTO_GC_INTERVAL_SECONDS = 24 * 60 * 60
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    codec TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    stored_size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS versions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    path TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    hash TEXT NOT NULL REFERENCES blobs(hash),
+    label TEXT NOT NULL DEFAULT '',
+    transaction_id TEXT
+);
+CREATE INDEX IF NOT EXISTS versions_by_path ON versions (path, created_at);
+CREATE INDEX IF NOT EXISTS versions_by_time ON versions (created_at);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+_VERSION_COLUMNS = "v.id, v.path, v.created_at, v.hash, b.size, v.label, v.transaction_id"
+
+
+@dataclass(frozen=True, slots=True)
+class BackupRecord:
+    """One saved version of one file."""
+
+    id: int
+    path: str
+    created_at: float
+    hash: str
+    size: int
+    label: str = ""
+    # Versions saved together by one multi-file apply share this id.
+    transaction_id: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(slots=True)
+class GcReport:
+    versions_removed: int = 0
+    blobs_removed: int = 0
+    bytes_freed: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def default_backup_dir() -> Path:
+    """``NEUROCLI_BACKUP_DIR``, or ``neurocli/backups`` in the user's cache directory."""
+
+    configured = get_env_str("NEUROCLI_BACKUP_DIR", "")
+    if configured:
+        return Path(configured).expanduser()
+    if os.name == "nt":
+        cache_root = Path(os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local")
+    else:
+        cache_root = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    return cache_root / "neurocli" / "backups"
+
+
+class BackupStore:
+    """Content-addressed blobs plus a SQLite version index under one directory."""
+
+    def __init__(
+        self,
+        root: Path,
+        *,
+        keep_per_file: int = DEFAULT_KEEP_PER_FILE,
+        max_age_days: float = DEFAULT_MAX_AGE_DAYS,
+    ) -> None:
+        self.root = Path(root)
+        self.keep_per_file = keep_per_file
+        self.max_age_days = max_age_days
+        self._objects = self.root / "objects"
+        self._objects.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.root / "index.sqlite3", check_same_thread=False, timeout=10.0)
+        self._db.row_factory = sqlite3.Row
+        # WAL lets the TUI and the API server share one store.
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self._migrate()
+
+    def backup(self, path: str | Path, *, label: str = "apply") -> BackupRecord:
+        """Save the current content of ``path`` as a new version."""
+
+        path = Path(path).resolve()
+        return self.backup_bytes(path, path.read_bytes(), label=label)
+
+    def backup_bytes(self, path: str | Path, data: bytes, *, label: str = "apply") -> BackupRecord:
+        """Save ``data`` as a new version of ``path``; identical content shares one blob."""
+
+        return self.backup_set([(path, data)], label=label)[0]
+
+    def backup_set(
+        self,
+        entries: Sequence[tuple[str | Path, bytes]],
+        *,
+        label: str = "apply",
+        transaction_id: str | None = None,
+    ) -> list[BackupRecord]:
+        """Save several files as versions recorded in one index transaction."""
+
+        prepared = [
+            (str(Path(path).resolve()), hashlib.sha256(data).hexdigest(), data) for path, data in entries
+        ]
+
+        created_at = time.time()
+        records = []
+        # Blob check-or-create and the version rows share one locked write
+        # transaction, so gc can never drop a blob between the two.
+        with self._lock, self._db:
+            self._db.execute("BEGIN IMMEDIATE")
+            for path_key, digest, data in prepared:
+                self._store_blob(digest, data)
+                cursor = self._db.execute(
+                    "INSERT INTO versions (path, created_at, hash, label, transaction_id) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (path_key, created_at, digest, label, transaction_id),
+                )
+                records.append(
+                    BackupRecord(cursor.lastrowid, path_key, created_at, digest, len(data), label, transaction_id)
+                )
+        self._maybe_auto_gc()
+        return records
+
+    def versions(
+        self,
+        path: str | Path | None = None,
+        *,
+        under: str | Path | None = None,
+        since: float | None = None,
+        limit: int | None = None,
+    ) -> list[BackupRecord]:
+        """Newest-first versions of one file, or of every file ``under`` a directory."""
+
+        clauses: list[str] = []
+        params: list[Any] = []
+        if path is not None:
+            clauses.append("v.path = ?")
+            params.append(str(Path(path).resolve()))
+        if under is not None:
+            prefix = str(Path(under).resolve()).rstrip(os.sep) + os.sep
+            clauses.append("substr(v.path, 1, ?) = ?")
+            params.extend([len(prefix), prefix])
+        if since is not None:
+            clauses.append("v.created_at >= ?")
+            params.append(since)
+        query = f"SELECT {_VERSION_COLUMNS} FROM versions v JOIN blobs b ON b.hash = v.hash"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY v.created_at DESC, v.id DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._db.execute(query, params).fetchall()
+        return [BackupRecord(**dict(row)) for row in rows]
+
+    def get(self, version_id: int) -> BackupRecord:
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT {_VERSION_COLUMNS} FROM versions v JOIN blobs b ON b.hash = v.hash "
+                "WHERE v.id = ?",
+                (version_id,),
+            ).fetchone()
+        if row is None:
+            raise KeyError(f"Unknown backup version: {version_id}")
+        return BackupRecord(**dict(row))
+
+    def transaction(self, transaction_id: str) -> list[BackupRecord]:
+        """Return the versions saved by one multi-file apply."""
+
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {_VERSION_COLUMNS} FROM versions v JOIN blobs b ON b.hash = v.hash "
+                "WHERE v.transaction_id = ? ORDER BY v.id",
+                (transaction_id,),
+            ).fetchall()
+        if not rows:
+            raise KeyError(f"Unknown backup transaction: {transaction_id}")
+        return [BackupRecord(**dict(row)) for row in rows]
+
+    def discard_transaction(self, transaction_id: str) -> int:
+        """Delete the versions of a transaction that did not commit; returns how many.
+
+        Their blobs become unreferenced and are reclaimed by the next ``gc``.
+        """
+
+        with self._lock, self._db:
+            cursor = self._db.execute("DELETE FROM versions WHERE transaction_id = ?", (transaction_id,))
+        return cursor.rowcount
+
+    def read(self, version_id: int) -> bytes:
+        """Return the saved content of a version."""
+
+        return self._read_blob(self.get(version_id).hash)
+
+    def restore(self, version_id: int) -> BackupRecord:
+        """Write a version back to its path, saving the current content first so it can be undone.
+
+        Returns the record of the version restored.
+        """
+
+        record = self.get(version_id)
+        data = self._read_blob(record.hash)
+        target = Path(record.path)
+        if target.exists():
+            self.backup(target, label="restore")
+        _atomic_write(target, data)
+        return record
+
+    def undo(self, path: str | Path) -> BackupRecord:
+        """Restore the newest saved version of ``path`` that differs from its current content.
+
+        Snapshots taken by ``restore`` itself are skipped, so repeated undo
+        steps further back instead of toggling between two versions.
+        """
+
+        target = Path(path).resolve()
+        try:
+            current_hash = hashlib.sha256(target.read_bytes()).hexdigest()
+        except FileNotFoundError:
+            current_hash = None
+        for record in self.versions(target):
+            if record.label != "restore" and record.hash != current_hash:
+                return self.restore(record.id)
+        raise KeyError(f"No earlier version recorded for {path}")
+
+    def gc(
+        self,
+        *,
+        keep_per_file: int | None = None,
+        max_age_days: float | None = None,
+    ) -> GcReport:
+        """Drop expired versions beyond the per-file minimum, then unreferenced blobs."""
+
+        keep = self.keep_per_file if keep_per_file is None else keep_per_file
+        max_age = self.max_age_days if max_age_days is None else max_age_days
+        cutoff = time.time() - max_age * 24 * 60 * 60
+        report = GcReport()
+        with self._lock, self._db:
+            cursor = self._db.execute(
+                """
+                DELETE FROM versions WHERE id IN (
+                    SELECT id FROM (
+                        SELECT id, created_at, ROW_NUMBER() OVER (
+                            PARTITION BY path ORDER BY created_at DESC, id DESC
+                        ) AS newest_rank
+                        FROM versions
+                    ) WHERE newest_rank > ? AND created_at < ?
+                )
+                """,
+                (keep, cutoff),
+            )
+            report.versions_removed = cursor.rowcount
+            orphans = self._db.execute(
+                "SELECT hash, codec, stored_size FROM blobs "
+                "WHERE hash NOT IN (SELECT DISTINCT hash FROM versions)"
+            ).fetchall()
+            self._db.executemany("DELETE FROM blobs WHERE hash = ?", [(row["hash"],) for row in orphans])
+            self._db.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('last_gc', ?)", (str(time.time()),)
+            )
+            # Still under the lock: a backup_set re-creating one of these blobs
+            # must not have its fresh file unlinked from under it.
+            for row in orphans:
+                try:
+                    self._blob_path(row["hash"], row["codec"]).unlink()
+                except FileNotFoundError:
+                    pass
+                report.blobs_removed += 1
+                report.bytes_freed += row["stored_size"]
+        return report
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT (SELECT COUNT(*) FROM versions) AS versions, "
+                "COUNT(*) AS blobs, COALESCE(SUM(size), 0) AS bytes, "
+                "COALESCE(SUM(stored_size), 0) AS stored_bytes FROM blobs"
+            ).fetchone()
+        return dict(row)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def _migrate(self) -> None:
+        columns = {row["name"] for row in self._db.execute("PRAGMA table_info(versions)")}
+        with self._db:
+            if "transaction_id" not in columns:
+                self._db.execute("ALTER TABLE versions ADD COLUMN transaction_id TEXT")
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS versions_by_transaction ON versions (transaction_id)"
+            )
+
+    def _store_blob(self, digest: str, data: bytes) -> None:
+        """Make sure a blob row and file exist; callers hold ``_lock`` inside a write transaction."""
+
+        known = self._db.execute("SELECT 1 FROM blobs WHERE hash = ?", (digest,)).fetchone()
+        if known is not None:
+            return
+
+        codec, payload = _compress(data)
+        _atomic_write(self._blob_path(digest, codec), payload)
+        self._db.execute(
+            "INSERT OR IGNORE INTO blobs (hash, codec, size, stored_size) VALUES (?, ?, ?, ?)",
+            (digest, codec, len(data), len(payload)),
+        )
+
+    def _read_blob(self, digest: str) -> bytes:
+        with self._lock:
+            row = self._db.execute("SELECT codec FROM blobs WHERE hash = ?", (digest,)).fetchone()
+        if row is None:
+            raise KeyError(f"Missing backup blob: {digest}")
+        data = _decompress(row["codec"], self._blob_path(digest, row["codec"]).read_bytes())
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"Backup blob {digest} is corrupt.")
+        return data
+
+    def _blob_path(self, digest: str, codec: str) -> Path:
+        return self._objects / digest[:2] / f"{digest[2:]}.{codec}"
+
+    def _maybe_auto_gc(self) -> None:
+        with self._lock:
+            row = self._db.execute("SELECT value FROM meta WHERE key = 'last_gc'").fetchone()
+            if row is None:
+                # A new store starts its GC clock now instead of collecting immediately.
+                with self._db:
+                    self._db.execute(
+                        "INSERT OR IGNORE INTO meta (key, value) VALUES ('last_gc', ?)",
+                        (str(time.time()),),
+                    )
+                return
+        if time.time() - float(row["value"]) >= AUTO_GC_INTERVAL_SECONDS:
+            self.gc()
+
+
+def _compress(data: bytes) -> tuple[str, bytes]:
+    if _zstd is not None:
+        return "zst", _zstd.compress(data)
+    if _zstandard is not None:
+        return "zst", _zstandard.ZstdCompressor().compress(data)
+    return "zz", zlib.compress(data, 6)
+
+
+def _decompress(codec: str, payload: bytes) -> bytes:
+    if codec == "zz":
+        return zlib.decompress(payload)
+    if codec == "zst":
+        if _zstd is not None:
+            return _zstd.decompress(payload)
+        if _zstandard is not None:
+            return _zstandard.ZstdDecompressor().decompress(payload)
+        raise RuntimeError("This backup was compressed with zstd; install 'zstandard' to read it.")
+    raise ValueError(f"Unknown backup codec: {codec}")
+
+
+def _atomic_write(target: Path, data: bytes) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    file_descriptor, temp_name = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(file_descriptor, "wb") as handle:
+            handle.write(data)
+        os.replace(temp_name, target)
+    except BaseException:
+        try:
+            os.unlink(temp_name)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+_store: BackupStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_backup_store() -> BackupStore:
+    """Return the process-wide backup store, opening it on first use."""
+
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = BackupStore(
+                default_backup_dir(),
+                keep_per_file=get_env_int("NEUROCLI_BACKUP_KEEP", DEFAULT_KEEP_PER_FILE),
+                max_age_days=get_env_float("NEUROCLI_BACKUP_MAX_AGE_DAYS", DEFAULT_MAX_AGE_DAYS),
+            )
+        return _store
@@ -0,0 +1,403 @@
+"""Format many files at once and report the combined result.
+
+``format_workspace`` fans ``format_code_result`` out over a thread pool and
+yields one ``FileFormatOutcome`` per file as it finishes, so callers can stream
+progress. The collected outcomes form a ``FormatBatch``: a combined change
+report whose file proposals are applied as one transaction by
+``apply_format_batch``. Check-only runs use the same path and simply never
+apply, which is what a commit gate needs.
+
+Run ``python -m neurocli_core.batch_formatter --changed --check`` to gate a
+commit on the files git reports as changed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Literal, Sequence
+
+from neurocli_core.apply_engine import FileChange, TransactionResult, apply_transaction
+from neurocli_core.code_formatter import format_code_result
+from neurocli_core.diff_generator import render_unified_diff
+from neurocli_core.formatter_service import get_formatter_service
+from neurocli_core.proposals import Proposal, build_proposal
+
+
+OutcomeStatus = Literal["changed", "unchanged", "skipped", "error"]
+
+MAX_STORED_BATCHES = 16
+EXCLUDED_DIRECTORIES = frozenset(
+    {".git", "__pycache__", "node_modules", ".venv", "venv", "dist", "build", "backups"}
+)
+
+
+@dataclass(slots=True)
+class FileFormatOutcome:
+    """What formatting did to one file."""
+
+    path: str
+    status: OutcomeStatus
+    formatter: str | None = None
+    mode: str | None = None
+    elapsed_ms: float = 0.0
+    error: str | None = None
+    proposal: Proposal | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        payload: dict[str, Any] = {
+            "path": self.path,
+            "status": self.status,
+            "formatter": self.formatter,
+            "mode": self.mode,
+            "elapsed_ms": round(self.elapsed_ms, 3),
+            "error": self.error,
+        }
+        if self.proposal is not None:
+            payload["hunks"] = [hunk.to_dict() for hunk in self.proposal.hunks]
+        return payload
+
+
+@dataclass(slots=True)
+class FormatBatch:
+    """Combined outcome of formatting a set of files."""
+
+    batch_id: str
+    root: str
+    check_only: bool
+    outcomes: list[FileFormatOutcome] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+    @property
+    def changed(self) -> list[FileFormatOutcome]:
+        return [outcome for outcome in self.outcomes if outcome.status == "changed"]
+
+    @property
+    def ok(self) -> bool:
+        """True when nothing failed and, for check-only runs, nothing needs formatting."""
+
+        if any(outcome.status == "error" for outcome in self.outcomes):
+            return False
+        return not (self.check_only and self.changed)
+
+    def summary(self) -> dict[str, int]:
+        counts = {"changed": 0, "unchanged": 0, "skipped": 0, "error": 0}
+        for outcome in self.outcomes:
+            counts[outcome.status] += 1
+        counts["total"] = len(self.outcomes)
+        return counts
+
+    def unified_diff(self) -> str:
+        """All file changes as one ``git apply``-compatible patch."""
+
+        parts = []
+        for outcome in self.changed:
+            relative = _relative(outcome.path, self.root)
+            parts.append(
+                render_unified_diff(
+                    outcome.proposal.hunks, fromfile=f"a/{relative}", tofile=f"b/{relative}"
+                )
+            )
+        return "".join(parts)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "batch_id": self.batch_id,
+            "check_only": self.check_only,
+            "ok": self.ok,
+            "summary": self.summary(),
+            "elapsed_ms": round(self.elapsed_ms, 3),
+            "files": [outcome.to_dict() for outcome in self.outcomes],
+        }
+
+
+def changed_files(root: Path) -> list[Path]:
+    """Return modified, staged, and untracked files that git reports under ``root``."""
+
+    from neurocli_core.git_status import GitStatusError, get_git_status_service
+
+    service = get_git_status_service(root)
+    try:
+        status = service.status()
+        top_level = service.toplevel
+    except GitStatusError as exc:
+        raise RuntimeError(f"Could not list changed files: {exc}") from exc
+
+    paths: list[Path] = []
+    for entry in status.entries:
+        if entry.kind == "ignored" or "D" in (entry.index_status, entry.worktree_status):
+            continue
+        candidate = top_level / entry.path
+        if entry.kind == "untracked" and entry.path.endswith("/"):
+            # git collapses a new directory into one entry; format what is inside it.
+            paths.extend(
+                path for path in sorted(candidate.rglob("*"))
+                if path.is_file() and _is_within(path, root)
+            )
+        elif candidate.is_file() and _is_within(candidate, root):
+            paths.append(candidate)
+    return paths
+
+
+def collect_format_targets(
+    root: Path,
+    *,
+    paths: Iterable[str] | None = None,
+    pattern: str | None = None,
+    changed_only: bool = False,
+) -> list[Path]:
+    """Resolve explicit paths, a glob, or git's changed files into formattable files.
+
+    Directories are walked, excluded folders are skipped, and files without a
+    formatter for their extension are dropped.
+    """
+
+    root = root.resolve()
+    if changed_only:
+        candidates = changed_files(root)
+    elif paths:
+        candidates = []
+        for raw_path in paths:
+            candidate = Path(raw_path)
+            candidate = (candidate if candidate.is_absolute() else root / candidate).resolve()
+            candidates.extend(_walk(candidate) if candidate.is_dir() else [candidate])
+    else:
+        candidates = list(_walk(root))
+
+    if pattern:
+        candidates = [
+            candidate
+            for candidate in candidates
+            if fnmatch.fnmatch(_relative(str(candidate), str(root)), pattern)
+            or fnmatch.fnmatch(candidate.name, pattern)
+        ]
+
+    service = get_formatter_service()
+    targets: dict[Path, None] = {}
+    for candidate in candidates:
+        if not _is_within(candidate, root):
+            raise ValueError(f"Path must stay within the workspace root: {candidate}")
+        if candidate.is_file() and service.formatter_for(str(candidate)) is not None:
+            targets[candidate] = None
+    return sorted(targets)
+
+
+def format_workspace(
+    files: Sequence[Path],
+    *,
+    max_workers: int | None = None,
+) -> Iterator[FileFormatOutcome]:
+    """Format ``files`` concurrently, yielding each outcome as soon as it is ready."""
+
+    if not files:
+        return
+    workers = max_workers or min(8, os.cpu_count() or 1, len(files))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="neurocli-format") as pool:
+        futures = [pool.submit(format_one_file, path) for path in files]
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            # A consumer that stops early (a closed SSE stream) drops queued files.
+            for future in futures:
+                future.cancel()
+
+
+def format_one_file(path: Path) -> FileFormatOutcome:
+    """Format a single file and describe the result; never raises."""
+
+    started_at = time.perf_counter()
+    try:
+        original = path.read_text(encoding="utf-8")
+        result = format_code_result(original, str(path))
+    except UnicodeDecodeError:
+        return FileFormatOutcome(str(path), "skipped", error="Not a UTF-8 text file.")
+    except Exception as exc:
+        elapsed_ms = (time.perf_counter() - started_at) * 1000
+        return FileFormatOutcome(str(path), "error", elapsed_ms=elapsed_ms, error=str(exc))
+
+    elapsed_ms = (time.perf_counter() - started_at) * 1000
+    if result.mode == "rejected":
+        status: OutcomeStatus = "error"
+    elif result.mode == "skipped":
+        status = "skipped"
+    else:
+        status = "changed" if result.content != original else "unchanged"
+    outcome = FileFormatOutcome(
+        str(path), status, result.formatter, result.mode, elapsed_ms, result.error
+    )
+    if status == "changed":
+        outcome.proposal = build_proposal(str(path), original, result.content)
+    return outcome
+
+
+def new_format_batch(root: Path, *, check_only: bool = False) -> FormatBatch:
+    return FormatBatch(uuid.uuid4().hex, str(root), check_only)
+
+
+def iter_format_batch(
+    batch: FormatBatch,
+    files: Sequence[Path],
+    *,
+    max_workers: int | None = None,
+) -> Iterator[FileFormatOutcome]:
+    """Format ``files`` into ``batch``, yielding each outcome as it is added."""
+
+    started_at = time.perf_counter()
+    for outcome in format_workspace(files, max_workers=max_workers):
+        batch.outcomes.append(outcome)
+        yield outcome
+    batch.outcomes.sort(key=lambda outcome: outcome.path)
+    batch.elapsed_ms = (time.perf_counter() - started_at) * 1000
+
+
+def run_format_batch(
+    root: Path,
+    files: Sequence[Path],
+    *,
+    check_only: bool = False,
+    max_workers: int | None = None,
+    on_outcome: Callable[[FileFormatOutcome, int, int], None] | None = None,
+) -> FormatBatch:
+    """Format ``files`` and collect a batch; ``on_outcome(outcome, done, total)`` reports progress."""
+
+    batch = new_format_batch(root, check_only=check_only)
+    for outcome in iter_format_batch(batch, files, max_workers=max_workers):
+        if on_outcome is not None:
+            on_outcome(outcome, len(batch.outcomes), len(files))
+    return batch
+
+
+def apply_format_batch(batch: FormatBatch) -> TransactionResult:
+    """Write every changed file in ``batch`` as one transaction.
+
+    Raises:
+        ApplyConflictError: A file changed on disk after it was formatted.
+    """
+
+    if batch.check_only:
+        raise ValueError("Check-only batches cannot be applied.")
+
+    changes = [
+        FileChange(
+            outcome.proposal.target_file,
+            content=outcome.proposal.proposed_content,
+            expected_content=outcome.proposal.baseline_content,
+        )
+        for outcome in batch.changed
+    ]
+    return apply_transaction(changes, label="format")
+
+
+class FormatBatchStore:
+    """Bounded, thread-safe in-memory store of batches awaiting apply."""
+
+    def __init__(self, max_entries: int = MAX_STORED_BATCHES) -> None:
+        self._max_entries = max_entries
+        self._batches: OrderedDict[str, FormatBatch] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, batch: FormatBatch) -> None:
+        with self._lock:
+            self._batches[batch.batch_id] = batch
+            while len(self._batches) > self._max_entries:
+                self._batches.popitem(last=False)
+
+    def get(self, batch_id: str) -> FormatBatch:
+        with self._lock:
+            try:
+                return self._batches[batch_id]
+            except KeyError:
+                raise KeyError(f"Unknown or expired format batch: {batch_id}") from None
+
+    def discard(self, batch_id: str) -> None:
+        with self._lock:
+            self._batches.pop(batch_id, None)
+
+
+_store = FormatBatchStore()
+
+
+def get_format_batch_store() -> FormatBatchStore:
+    """Return the process-wide format batch store."""
+
+    return _store
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Format many files with NeuroCLI's formatters.")
+    parser.add_argument("paths", nargs="*", help="Files or directories (default: the whole root).")
+    parser.add_argument("--root", default=".", help="Workspace root (default: current directory).")
+    parser.add_argument("--glob", dest="pattern", help="Only files matching this glob.")
+    parser.add_argument("--changed", action="store_true", help="Only files git reports as changed.")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker threads.")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--check", action="store_true", help="Exit 1 if any file needs formatting.")
+    mode.add_argument("--write", action="store_true", help="Apply the changes (with backups).")
+    args = parser.parse_args(argv)
+
+    root = Path(args.root).resolve()
+    files = collect_format_targets(
+        root, paths=args.paths, pattern=args.pattern, changed_only=args.changed
+    )
+
+    def report(outcome: FileFormatOutcome, done: int, total: int) -> None:
+        if outcome.status in ("changed", "error"):
+            detail = f": {outcome.error}" if outcome.error else ""
+            relative = _relative(outcome.path, str(root))
+            print(f"[{done}/{total}] {outcome.status} {relative}{detail}", file=sys.stderr)
+
+    batch = run_format_batch(
+        root, files, check_only=not args.write, max_workers=args.jobs, on_outcome=report
+    )
+    summary = batch.summary()
+    if args.write:
+        apply_format_batch(batch)
+    elif not args.check:
+        sys.stdout.write(batch.unified_diff())
+    print(
+        f"{summary['total']} files: {summary['changed']} "
+        f"{'reformatted' if args.write else 'need formatting'}, "
+        f"{summary['error']} failed ({batch.elapsed_ms:.0f} ms)",
+        file=sys.stderr,
+    )
+    if args.check:
+        return 0 if batch.ok else 1
+    return 1 if summary["error"] else 0
+
+
+def _walk(directory: Path) -> Iterator[Path]:
+    for current, directory_names, file_names in os.walk(directory):
+        directory_names[:] = sorted(
+            name for name in directory_names if name not in EXCLUDED_DIRECTORIES
+        )
+        for file_name in sorted(file_names):
+            yield Path(current) / file_name
+
+
+def _is_within(path: Path, root: Path) -> bool:
+    try:
+        path.resolve().relative_to(root.resolve())
+        return True
+    except ValueError:
+        return False
+
+
+def _relative(path: str, root: str) -> str:
+    try:
+        return Path(path).relative_to(root).as_posix()
+    except ValueError:
+        return Path(path).as_posix()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,8 +1,7 @@
-import subprocess
-import sys
-import os
 import re
 
+from neurocli_core.formatter_service import FormatResult, get_formatter_service
+
 def strip_markdown_blocks(text: str) -> str:
     """Removes markdown code block formatting (```python ... ```) if present."""
     # Match ```language\n...``` or just ```\n...```
@@ -23,40 +22,18 @@ def format_code(code_string: str, file_path: str) -> str:
     Returns:
         The formatted code string, or the original string if the extension is unsupported or if formatting fails.
     """
+    return format_code_result(code_string, file_path).content
+
+
+def format_code_result(code_string: str, file_path: str) -> FormatResult:
+    """
+    Formats code like ``format_code`` but also reports which formatter ran,
+    whether it used the resident worker, and how long it took.
+
+    Raises:
+        RuntimeError: The formatter for this extension is not installed.
+    """
     code_string = strip_markdown_blocks(code_string)
-    _, ext = os.path.splitext(file_path.lower())
-    
-    python_exts = ['.py']
-    web_exts = ['.js', '.jsx', '.ts', '.tsx', '.json', '.css', '.html', '.md']
-    
-    if ext in python_exts:
-        cmd = [sys.executable, "-m", "ruff", "format", "-"]
-        tool_name = "ruff"
-        install_msg = "Please run 'pip install ruff'."
-    elif ext in web_exts:
-        # We use npx to run prettier. npx is generally available with Node.js installations.
-        cmd = ["npx", "prettier", "--stdin-filepath", file_path]
-        tool_name = "prettier"
-        install_msg = "Please ensure Node.js and 'npx' are installed."
-    else:
-        # Unsupported extension, return original code
-        return code_string
-
-    try:
-        result = subprocess.run(
-            cmd,
-            input=code_string,
-            capture_output=True,
-            text=True,
-            check=True,
-            shell=(os.name == "nt"),
-        )
-        return result.stdout
-    except FileNotFoundError:
-        raise RuntimeError(
-            f"The '{tool_name}' formatter is not installed or not in PATH. "
-            f"{install_msg}"
-        )
-    except subprocess.CalledProcessError:
-        # If the tool fails for other reasons, return the original code
-        return code_string
+    # Resident ruff/prettier workers live in formatter_service; a missing tool
+    # raises FormatterUnavailableError, which is a RuntimeError for callers.
+    return get_formatter_service().format(code_string, file_path)
@@ -0,0 +1,536 @@
+"""Map-reduce commit message generation for diffs of any size.
+
+Small diffs still go to the model in one prompt. Larger ones are split per
+file, and per group of hunks when a file is too big on its own; each chunk
+is summarized in a bounded thread pool, and a final prompt composes the
+Conventional Commit message from those summaries. Lockfiles, minified and
+generated files are listed by name only.
+
+Chunk summaries are cached by the SHA-256 of the chunk text (plus provider
+and model), so regenerating after a small extra change only summarizes the
+files that changed.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, Literal
+
+from neurocli_core.config import get_env_int, get_settings
+from neurocli_core.llm_providers import LLMProvider, get_llm_provider
+from neurocli_core.token_estimator import CHARS_PER_TOKEN
+
+
+# Bump when the chunk prompt changes so cached summaries are not reused.
+SUMMARY_PROMPT_VERSION = 1
+
+DEFAULT_DIRECT_TOKENS = 6_000
+DEFAULT_CHUNK_TOKENS = 3_000
+DEFAULT_SUMMARY_WORKERS = 4
+DEFAULT_SUMMARY_CACHE_ENTRIES = 1024
+
+LOCKFILE_NAMES = {
+    "package-lock.json",
+    "npm-shrinkwrap.json",
+    "yarn.lock",
+    "pnpm-lock.yaml",
+    "bun.lockb",
+    "poetry.lock",
+    "Pipfile.lock",
+    "uv.lock",
+    "pdm.lock",
+    "Cargo.lock",
+    "Gemfile.lock",
+    "composer.lock",
+    "go.sum",
+    "flake.lock",
+}
+GENERATED_PATTERNS = (
+    "*.min.js",
+    "*.min.css",
+    "*.map",
+    "*_pb2.py",
+    "*_pb2_grpc.py",
+    "*.pb.go",
+    "*.generated.*",
+    "dist/*",
+    "build/*",
+    "node_modules/*",
+    "*/dist/*",
+    "*/node_modules/*",
+)
+# Checked against the first added lines of a file.
+GENERATED_MARKERS = ("@generated", "DO NOT EDIT", "auto-generated", "autogenerated")
+
+CommitStreamEventType = Literal["start", "progress", "delta", "complete", "cancelled", "error"]
+
+_DIFF_HEADER = re.compile(r'^diff --git "?a/(.*?)"? "?b/(.*?)"?$')
+_HUNK_HEADER = "@@ "
+
+COMMIT_INSTRUCTIONS = (
+    "You are an expert developer. Generate a concise Conventional Commit message "
+    "for the following {subject}. Only return the commit message text. Do not use Markdown "
+    "code blocks around it. Do not include introductory text."
+)
+
+
+@dataclass(slots=True)
+class FileDiff:
+    """One file's section of a ``git diff``: the header lines plus its hunks."""
+
+    path: str
+    header: str
+    hunks: list[str] = field(default_factory=list)
+    skip_reason: str | None = None
+
+    @property
+    def text(self) -> str:
+        return "".join([self.header, *self.hunks])
+
+    @property
+    def digest(self) -> str:
+        return hashlib.sha256(self.text.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+@dataclass(slots=True)
+class DiffChunk:
+    """A slice of one file's diff, small enough for one summary prompt."""
+
+    path: str
+    text: str
+    part: int = 1
+    parts: int = 1
+
+    @property
+    def digest(self) -> str:
+        return hashlib.sha256(self.text.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+@dataclass(slots=True)
+class CommitPlan:
+    """How a diff will be summarized: in one prompt, or chunk by chunk."""
+
+    files: list[FileDiff]
+    chunks: list[DiffChunk]
+    direct: bool
+
+    @property
+    def skipped(self) -> list[FileDiff]:
+        return [diff for diff in self.files if diff.skip_reason]
+
+    @property
+    def included_text(self) -> str:
+        return "".join(diff.text for diff in self.files if not diff.skip_reason)
+
+
+@dataclass(slots=True)
+class CommitSummary:
+    message: str
+    mode: str
+    files: int = 0
+    skipped: list[str] = field(default_factory=list)
+    chunks: int = 0
+    cache_hits: int = 0
+    elapsed_ms: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "message": self.message,
+            "mode": self.mode,
+            "files": self.files,
+            "skipped": self.skipped,
+            "chunks": self.chunks,
+            "cache_hits": self.cache_hits,
+            "elapsed_ms": round(self.elapsed_ms, 3),
+        }
+
+
+@dataclass(slots=True)
+class CommitStreamEvent:
+    """One step of a streamed commit message, shaped like the workflow stream events."""
+
+    event: CommitStreamEventType
+    delta: str = ""
+    summary: CommitSummary | None = None
+    progress: dict[str, Any] | None = None
+    error: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        payload: dict[str, Any] = {"event": self.event, "delta": self.delta}
+        if self.summary is not None:
+            payload["summary"] = self.summary.to_dict()
+        if self.progress is not None:
+            payload["progress"] = self.progress
+        if self.error is not None:
+            payload["error"] = self.error
+        return payload
+
+
+class SummaryCache:
+    """Thread-safe LRU of chunk summaries keyed by chunk hash, provider, and model."""
+
+    def __init__(self, max_entries: int | None = None) -> None:
+        if max_entries is None:
+            max_entries = get_env_int("NEUROCLI_COMMIT_SUMMARY_CACHE_ENTRIES", DEFAULT_SUMMARY_CACHE_ENTRIES)
+        self.max_entries = max(0, max_entries)
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            summary = self._entries.get(key)
+            if summary is not None:
+                self._entries.move_to_end(key)
+            return summary
+
+    def put(self, key: str, summary: str) -> None:
+        if self.max_entries == 0:
+            return
+        with self._lock:
+            self._entries[key] = summary
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def split_diff(diff_text: str) -> list[FileDiff]:
+    """Split ``git diff`` output into per-file sections with their hunks."""
+
+    files: list[FileDiff] = []
+    current: FileDiff | None = None
+    header_lines: list[str] = []
+    hunk_lines: list[str] = []
+
+    def flush_hunk() -> None:
+        if current is not None and hunk_lines:
+            current.hunks.append("".join(hunk_lines))
+            hunk_lines.clear()
+
+    def flush_file() -> None:
+        nonlocal current
+        flush_hunk()
+        if current is not None:
+            current.header = "".join(header_lines)
+            files.append(current)
+        header_lines.clear()
+
+    for line in diff_text.splitlines(keepends=True):
+        if not line.endswith("\n"):
+            line += "\n"
+        if line.startswith("diff --git "):
+            flush_file()
+            match = _DIFF_HEADER.match(line.rstrip("\n"))
+            current = FileDiff(path=match.group(2) if match else line[11:].strip(), header="")
+            header_lines.append(line)
+        elif current is None:
+            continue
+        elif line.startswith(_HUNK_HEADER):
+            flush_hunk()
+            hunk_lines.append(line)
+        elif hunk_lines:
+            hunk_lines.append(line)
+        else:
+            header_lines.append(line)
+            if line.startswith(("+++ b/", '+++ "b/')):
+                current.path = line[4:].strip().strip('"')[2:]
+    flush_file()
+
+    for diff in files:
+        diff.skip_reason = skip_reason(diff)
+    return files
+
+
+def skip_reason(diff: FileDiff) -> str | None:
+    """Why a file's diff is left out of the prompts, or ``None`` to include it."""
+
+    name = diff.path.rsplit("/", 1)[-1]
+    if name in LOCKFILE_NAMES:
+        return "lockfile"
+    if any(fnmatch.fnmatch(diff.path, pattern) for pattern in GENERATED_PATTERNS):
+        return "generated"
+    if "Binary files " in diff.header or "GIT binary patch" in diff.header:
+        return "binary"
+    added = [
+        line for hunk in diff.hunks[:1] for line in hunk.splitlines()[1:12] if line.startswith("+")
+    ]
+    if any(marker in line for line in added for marker in GENERATED_MARKERS):
+        return "generated"
+    return None
+
+
+def chunk_file_diff(diff: FileDiff, max_tokens: int) -> list[DiffChunk]:
+    """Group a file's hunks into chunks of at most ``max_tokens`` each.
+
+    Every chunk repeats the file header so it can be summarized on its own; a
+    single hunk larger than the budget is truncated.
+    """
+
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(diff.text) <= max_chars:
+        return [DiffChunk(diff.path, diff.text)]
+
+    budget = max(max_chars - len(diff.header), CHARS_PER_TOKEN)
+    groups: list[list[str]] = []
+    size = 0
+    for hunk in diff.hunks:
+        if len(hunk) > budget:
+            hunk = hunk[:budget] + "\n... (hunk truncated)\n"
+        if groups and size + len(hunk) <= budget:
+            groups[-1].append(hunk)
+            size += len(hunk)
+        else:
+            groups.append([hunk])
+            size = len(hunk)
+    if not groups:
+        return [DiffChunk(diff.path, diff.header[:max_chars])]
+    return [
+        DiffChunk(diff.path, diff.header + "".join(group), part=index, parts=len(groups))
+        for index, group in enumerate(groups, start=1)
+    ]
+
+
+class CommitSummarizer:
+    """Turns a diff into a commit message, map-reducing when it is large."""
+
+    def __init__(
+        self,
+        *,
+        direct_tokens: int | None = None,
+        chunk_tokens: int | None = None,
+        max_workers: int | None = None,
+        cache: SummaryCache | None = None,
+    ) -> None:
+        self.direct_tokens = direct_tokens or get_env_int(
+            "NEUROCLI_COMMIT_DIRECT_TOKENS", DEFAULT_DIRECT_TOKENS
+        )
+        self.chunk_tokens = chunk_tokens or get_env_int(
+            "NEUROCLI_COMMIT_CHUNK_TOKENS", DEFAULT_CHUNK_TOKENS
+        )
+        self.max_workers = max_workers or get_env_int(
+            "NEUROCLI_COMMIT_SUMMARY_WORKERS", DEFAULT_SUMMARY_WORKERS
+        )
+        self.cache = cache if cache is not None else SummaryCache()
+
+    def plan(self, diff_text: str) -> CommitPlan:
+        files = split_diff(diff_text)
+        included = [diff for diff in files if not diff.skip_reason]
+        if not files:
+            # Not ``git diff`` output; keep the old single-prompt behavior.
+            files = [FileDiff(path="", header=diff_text)]
+            included = files
+        direct = estimate_tokens("".join(diff.text for diff in included)) <= self.direct_tokens
+        chunks = [] if direct else [
+            chunk for diff in included for chunk in chunk_file_diff(diff, self.chunk_tokens)
+        ]
+        return CommitPlan(files=files, chunks=chunks, direct=direct)
+
+    def iter_chunk_summaries(
+        self, plan: CommitPlan, provider: LLMProvider
+    ) -> Iterator[tuple[int, str, bool]]:
+        """Yield ``(chunk_index, summary, cached)`` as each chunk is summarized.
+
+        Cached summaries come first. Closing the iterator early cancels chunks
+        that have not started yet.
+        """
+
+        model = get_settings().openai_model
+        keys = [self._cache_key(chunk, provider.name, model) for chunk in plan.chunks]
+        missing: list[int] = []
+        for index, key in enumerate(keys):
+            summary = self.cache.get(key)
+            if summary is None:
+                missing.append(index)
+            else:
+                yield index, summary, True
+        if not missing:
+            return
+
+        def run(index: int) -> str:
+            summary = provider.complete(_chunk_prompt(plan.chunks[index])).strip()
+            self.cache.put(keys[index], summary)
+            return summary
+
+        workers = max(1, min(self.max_workers, len(missing)))
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="commit-summary")
+        try:
+            futures = {pool.submit(run, index): index for index in missing}
+            for future in as_completed(futures):
+                # result() re-raises the provider error for that chunk.
+                yield futures[future], future.result(), False
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def summarize_chunks(self, plan: CommitPlan, provider: LLMProvider) -> tuple[list[str], int]:
+        """Return every chunk summary in chunk order, and how many came from the cache."""
+
+        summaries = [""] * len(plan.chunks)
+        hits = 0
+        for index, summary, cached in self.iter_chunk_summaries(plan, provider):
+            summaries[index] = summary
+            hits += cached
+        return summaries, hits
+
+    def compose_prompt(self, plan: CommitPlan, summaries: list[str] | None = None) -> str:
+        """The prompt that produces the final message for ``plan``."""
+
+        skipped = "".join(
+            f"- {diff.path} ({diff.skip_reason})\n" for diff in plan.skipped
+        )
+        skipped_note = f"\nAlso changed, not shown:\n{skipped}" if skipped else ""
+        if plan.direct:
+            return (
+                COMMIT_INSTRUCTIONS.format(subject="diff")
+                + skipped_note
+                + f"\n\nDIFF:\n{plan.included_text}"
+            )
+
+        lines = []
+        for chunk, summary in zip(plan.chunks, summaries or []):
+            label = chunk.path if chunk.parts == 1 else f"{chunk.path} (part {chunk.part}/{chunk.parts})"
+            lines.append(f"- {label}: {summary}")
+        return (
+            COMMIT_INSTRUCTIONS.format(subject="change summaries, one per file or part of a file")
+            + " Use a subject line, then a blank line and a short body for the most important changes."
+            + skipped_note
+            + "\n\nSUMMARIES:\n"
+            + "\n".join(lines)
+        )
+
+    def summarize(self, diff_text: str, *, provider: LLMProvider | None = None) -> CommitSummary:
+        started_at = time.perf_counter()
+        if not diff_text.strip():
+            return CommitSummary(message="No changes detected to commit.", mode="empty")
+
+        # Raises ProviderConfigurationError (a ValueError) when no key is configured.
+        provider = provider or get_llm_provider()
+        plan = self.plan(diff_text)
+        summaries, hits = ([], 0) if plan.direct else self.summarize_chunks(plan, provider)
+        message = provider.complete(self.compose_prompt(plan, summaries)).strip()
+        return CommitSummary(
+            message=message,
+            mode="direct" if plan.direct else "map_reduce",
+            files=len(plan.files) - len(plan.skipped),
+            skipped=[diff.path for diff in plan.skipped],
+            chunks=len(plan.chunks),
+            cache_hits=hits,
+            elapsed_ms=(time.perf_counter() - started_at) * 1000,
+        )
+
+    def stream(
+        self,
+        diff_text: str,
+        *,
+        provider: LLMProvider | None = None,
+        should_stop: Callable[[], bool] | None = None,
+    ) -> Iterator[CommitStreamEvent]:
+        """Generate the message as events: ``start``, chunk ``progress``, ``delta``, then ``complete``.
+
+        Only the final composing prompt is streamed; chunk summaries are short
+        and arrive as ``progress``. When ``should_stop()`` turns true the model
+        stream is closed and a ``cancelled`` event ends the sequence. Errors
+        end it with an ``error`` event instead of raising.
+        """
+
+        started_at = time.perf_counter()
+        stop = should_stop or (lambda: False)
+        if not diff_text.strip():
+            summary = CommitSummary(message="No changes detected to commit.", mode="empty")
+            yield CommitStreamEvent("start", summary=summary)
+            yield CommitStreamEvent("delta", delta=summary.message)
+            yield CommitStreamEvent("complete", summary=summary)
+            return
+
+        try:
+            provider = provider or get_llm_provider()
+            plan = self.plan(diff_text)
+            summary = CommitSummary(
+                message="",
+                mode="direct" if plan.direct else "map_reduce",
+                files=len(plan.files) - len(plan.skipped),
+                skipped=[diff.path for diff in plan.skipped],
+                chunks=len(plan.chunks),
+            )
+            yield CommitStreamEvent("start", summary=summary)
+
+            summaries = [""] * len(plan.chunks)
+            chunk_summaries = self.iter_chunk_summaries(plan, provider)
+            try:
+                for done, (index, chunk_summary, cached) in enumerate(chunk_summaries, start=1):
+                    summaries[index] = chunk_summary
+                    summary.cache_hits += cached
+                    yield CommitStreamEvent(
+                        "progress",
+                        progress={"done": done, "total": len(plan.chunks), "file": plan.chunks[index].path},
+                    )
+                    if stop():
+                        yield CommitStreamEvent("cancelled", summary=summary)
+                        return
+            finally:
+                chunk_summaries.close()
+
+            parts: list[str] = []
+            deltas = provider.stream(self.compose_prompt(plan, summaries))
+            try:
+                for delta in deltas:
+                    if stop():
+                        summary.message = "".join(parts).strip()
+                        yield CommitStreamEvent("cancelled", summary=summary)
+                        return
+                    parts.append(delta)
+                    yield CommitStreamEvent("delta", delta=delta)
+            finally:
+                close = getattr(deltas, "close", None)
+                if close is not None:
+                    close()
+        except Exception as exc:
+            yield CommitStreamEvent("error", error=str(exc))
+            return
+
+        summary.message = "".join(parts).strip()
+        summary.elapsed_ms = (time.perf_counter() - started_at) * 1000
+        yield CommitStreamEvent("complete", summary=summary)
+
+    @staticmethod
+    def _cache_key(chunk: DiffChunk, provider_name: str, model: str) -> str:
+        return f"{SUMMARY_PROMPT_VERSION}:{provider_name}:{model}:{chunk.digest}"
+
+
+def _chunk_prompt(chunk: DiffChunk) -> str:
+    part = f" (part {chunk.part} of {chunk.parts})" if chunk.parts > 1 else ""
+    return (
+        "Summarize what this diff changes and why, in one or two plain sentences. "
+        "Name the functions, classes, or settings involved. Do not use Markdown. "
+        f"File: {chunk.path}{part}\n\nDIFF:\n{chunk.text}"
+    )
+
+
+_summarizer: CommitSummarizer | None = None
+_summarizer_lock = threading.Lock()
+
+
+def get_commit_summarizer() -> CommitSummarizer:
+    """Return the process-wide summarizer, whose cache outlives single requests."""
+
+    global _summarizer
+    with _summarizer_lock:
+        if _summarizer is None:
+            _summarizer = CommitSummarizer()
+        return _summarizer
@@ -1,45 +1,259 @@
-"""Configuration helpers shared across the backend surface area."""
+"""Configuration helpers shared across the backend surface area.
+
+Settings are loaded once into an immutable :class:`NeuroSettings` snapshot.
+The project ``.env`` file is re-read only when its modification time changes
+(checked at most once per :data:`ENV_CHECK_INTERVAL_SECONDS`) or when
+:func:`refresh_settings` is called, so hot paths read configuration without
+touching the filesystem.
+"""
 
 from __future__ import annotations
 
 import os
+import threading
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping
 
 try:
-    from dotenv import load_dotenv
+    from dotenv import dotenv_values
 except ModuleNotFoundError:  # pragma: no cover - depends on local environment
-    def load_dotenv(*args, **kwargs):  # type: ignore[no-redef]
-        """Fallback no-op when python-dotenv is not installed."""
+    def dotenv_values(*args, **kwargs):  # type: ignore[no-redef]
+        """Fallback that reads nothing when python-dotenv is not installed."""
 
-        return False
+        return {}
 
 
 DEFAULT_OPENAI_MODEL = "gpt-4o-mini"
+PROJECT_ROOT = Path(__file__).parent.parent
+DOTENV_PATH = PROJECT_ROOT / ".env"
+ENV_CHECK_INTERVAL_SECONDS = 1.0
+
+_TRUTHY_VALUES = {"1", "true", "yes", "on"}
+
+
+def _parse_int(raw_value: str | None, default: int) -> int:
+    if raw_value is None or not raw_value.strip():
+        return default
+    try:
+        return int(raw_value)
+    except ValueError:
+        return default
 
 
-def _load_project_env() -> None:
-    """Load the project ``.env`` file when it exists.
+def _parse_float(raw_value: str | None, default: float) -> float:
+    if raw_value is None or not raw_value.strip():
+        return default
+    try:
+        return float(raw_value)
+    except ValueError:
+        return default
 
-    The service layer should be able to report clean errors when configuration
-    is missing, so this helper intentionally avoids raising when the file is not
-    present.
+
+@dataclass(frozen=True, slots=True)
+class NeuroSettings:
+    """Immutable snapshot of NeuroCLI configuration.
+
+    Environment variables take precedence over the project ``.env`` file,
+    matching the previous ``load_dotenv(override=False)`` behavior.
     """
 
-    project_root = Path(__file__).parent.parent
-    dotenv_path = project_root / ".env"
-    if dotenv_path.exists():
-        load_dotenv(dotenv_path=dotenv_path, override=False)
+    openai_api_key: str | None = None
+    openai_model: str = DEFAULT_OPENAI_MODEL
+    openai_base_url: str | None = None
+    llm_provider: str = "openai"
+    llm_max_attempts: int = 3
+    llm_connect_timeout: float = 10.0
+    llm_read_timeout: float = 120.0
+    llm_first_token_timeout: float = 60.0
+    llm_idle_timeout: float = 60.0
+    context_token_budget: int = 128_000
+    token_cache_entries: int = 4096
+    format_cache_entries: int = 512
+    env: Mapping[str, str] = field(default_factory=lambda: MappingProxyType({}))
+    env_mtime_ns: int | None = None
+
+    @classmethod
+    def from_mapping(
+        cls,
+        values: Mapping[str, str],
+        *,
+        env_mtime_ns: int | None = None,
+    ) -> "NeuroSettings":
+        """Build typed settings from a merged ``name -> value`` mapping."""
+
+        defaults = cls()
+        frozen_values = MappingProxyType(dict(values))
+
+        def text(name: str, default: str) -> str:
+            raw_value = frozen_values.get(name)
+            return raw_value.strip() if raw_value and raw_value.strip() else default
+
+        return cls(
+            openai_api_key=frozen_values.get("OPENAI_API_KEY") or None,
+            openai_model=text("OPENAI_MODEL", defaults.openai_model),
+            openai_base_url=frozen_values.get("OPENAI_BASE_URL") or None,
+            llm_provider=text("NEUROCLI_LLM_PROVIDER", defaults.llm_provider).lower(),
+            llm_max_attempts=_parse_int(
+                frozen_values.get("NEUROCLI_LLM_MAX_ATTEMPTS"), defaults.llm_max_attempts
+            ),
+            llm_connect_timeout=_parse_float(
+                frozen_values.get("NEUROCLI_LLM_CONNECT_TIMEOUT"), defaults.llm_connect_timeout
+            ),
+            llm_read_timeout=_parse_float(
+                frozen_values.get("NEUROCLI_LLM_READ_TIMEOUT"), defaults.llm_read_timeout
+            ),
+            llm_first_token_timeout=_parse_float(
+                frozen_values.get("NEUROCLI_LLM_FIRST_TOKEN_TIMEOUT"),
+                defaults.llm_first_token_timeout,
+            ),
+            llm_idle_timeout=_parse_float(
+                frozen_values.get("NEUROCLI_LLM_IDLE_TIMEOUT"), defaults.llm_idle_timeout
+            ),
+            context_token_budget=_parse_int(
+                frozen_values.get("NEUROCLI_CONTEXT_TOKEN_BUDGET"), defaults.context_token_budget
+            ),
+            token_cache_entries=_parse_int(
+                frozen_values.get("NEUROCLI_TOKEN_CACHE_ENTRIES"), defaults.token_cache_entries
+            ),
+            format_cache_entries=_parse_int(
+                frozen_values.get("NEUROCLI_FORMAT_CACHE_ENTRIES"), defaults.format_cache_entries
+            ),
+            env=frozen_values,
+            env_mtime_ns=env_mtime_ns,
+        )
+
+    def get_str(self, name: str, default: str) -> str:
+        """Return a string setting, falling back to ``default`` when unset or blank."""
+
+        raw_value = self.env.get(name)
+        if raw_value is None or not raw_value.strip():
+            return default
+        return raw_value.strip()
+
+    def get_int(self, name: str, default: int) -> int:
+        """Return an integer setting, falling back to ``default`` on missing or bad input."""
+
+        return _parse_int(self.env.get(name), default)
+
+    def get_float(self, name: str, default: float) -> float:
+        """Return a float setting, falling back to ``default`` on missing or bad input."""
+
+        return _parse_float(self.env.get(name), default)
+
+    def get_flag(self, name: str, default: bool = False) -> bool:
+        """Return a boolean setting where ``1``/``true``/``yes``/``on`` enable it."""
+
+        raw_value = self.env.get(name)
+        if raw_value is None or not raw_value.strip():
+            return default
+        return raw_value.strip().lower() in _TRUTHY_VALUES
+
+
+class _SettingsCache:
+    """Hold the current snapshot and reload it when ``.env`` changes."""
+
+    def __init__(self, dotenv_path: Path) -> None:
+        self.dotenv_path = dotenv_path
+        self._lock = threading.Lock()
+        self._settings: NeuroSettings | None = None
+        self._checked_at = 0.0
+
+    def _env_mtime_ns(self) -> int | None:
+        try:
+            return self.dotenv_path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _load(self, env_mtime_ns: int | None) -> NeuroSettings:
+        values: dict[str, str] = {}
+        if env_mtime_ns is not None:
+            values.update(
+                {
+                    name: value
+                    for name, value in dotenv_values(self.dotenv_path).items()
+                    if value is not None
+                }
+            )
+        values.update(os.environ)
+        return NeuroSettings.from_mapping(values, env_mtime_ns=env_mtime_ns)
+
+    def get(self) -> NeuroSettings:
+        now = time.monotonic()
+        settings = self._settings
+        if settings is not None and now - self._checked_at < ENV_CHECK_INTERVAL_SECONDS:
+            return settings
+
+        with self._lock:
+            if self._settings is not None and now - self._checked_at < ENV_CHECK_INTERVAL_SECONDS:
+                return self._settings
+            env_mtime_ns = self._env_mtime_ns()
+            if self._settings is None or self._settings.env_mtime_ns != env_mtime_ns:
+                self._settings = self._load(env_mtime_ns)
+            self._checked_at = now
+            return self._settings
+
+    def refresh(self) -> NeuroSettings:
+        with self._lock:
+            self._settings = self._load(self._env_mtime_ns())
+            self._checked_at = time.monotonic()
+            return self._settings
+
+
+_settings_cache = _SettingsCache(DOTENV_PATH)
+
+
+def get_settings() -> NeuroSettings:
+    """Return the cached settings snapshot, reloading only if ``.env`` changed."""
+
+    return _settings_cache.get()
+
+
+def refresh_settings() -> NeuroSettings:
+    """Force a reload from ``.env`` and the process environment."""
+
+    return _settings_cache.refresh()
 
 
 def get_openai_api_key() -> str | None:
     """Return the configured OpenAI API key, or ``None`` when missing."""
 
-    _load_project_env()
-    return os.getenv("OPENAI_API_KEY")
+    return get_settings().openai_api_key
 
 
 def get_default_openai_model() -> str:
     """Return the configured default model name for NeuroCLI."""
 
-    _load_project_env()
-    return os.getenv("OPENAI_MODEL", DEFAULT_OPENAI_MODEL)
+    return get_settings().openai_model
+
+
+def get_openai_base_url() -> str | None:
+    """Return an optional OpenAI-compatible base URL override."""
+
+    return get_settings().openai_base_url
+
+
+def get_env_str(name: str, default: str) -> str:
+    """Return a string setting, falling back to ``default`` when unset or blank."""
+
+    return get_settings().get_str(name, default)
+
+
+def get_env_float(name: str, default: float) -> float:
+    """Return a float setting, falling back to ``default`` on missing or bad input."""
+
+    return get_settings().get_float(name, default)
+
+
+def get_env_int(name: str, default: int) -> int:
+    """Return an integer setting, falling back to ``default`` on missing or bad input."""
+
+    return get_settings().get_int(name, default)
+
+
+def get_env_flag(name: str, default: bool = False) -> bool:
+    """Return a boolean setting where ``1``/``true``/``yes``/``on`` enable it."""
+
+    return get_settings().get_flag(name, default)
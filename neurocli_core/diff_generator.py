@@ -1,4 +1,177 @@
-import difflib
+"""Line diff engine with structured hunk output.
+
+Lines are interned to integers and compared with Myers' linear-space
+"middle snake" algorithm after trimming the common prefix and suffix. Hunks
+are the primary output; the Markdown rendering used by both UIs is built on
+top of them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Any, Sequence
+
+
+DEFAULT_CONTEXT_LINES = 3
+NO_NEWLINE_MARKER = "\\ No newline at end of file\n"
+
+# Consecutive matching lines a streamed diff needs before it treats a changed
+# region as closed; fewer would resync on lone blank lines and braces.
+RESYNC_LINES = 3
+
+# Below this many edits per sub-problem the search is always exact; above it
+# the search is capped at roughly sqrt(N) edits and splits at the furthest
+# point reached, trading minimality for bounded time on heavy rewrites.
+MIN_EXACT_COST = 256
+
+Opcode = tuple[str, int, int, int, int]
+
+
+@dataclass(slots=True, frozen=True)
+class DiffHunk:
+    """One unified-diff hunk.
+
+    ``old_start`` and ``new_start`` are zero-based line indexes. ``lines``
+    holds ``(op, text)`` pairs where ``op`` is ``" "``, ``"-"`` or ``"+"`` and
+    ``text`` keeps its original line ending.
+    """
+
+    id: str
+    old_start: int
+    old_count: int
+    new_start: int
+    new_count: int
+    lines: tuple[tuple[str, str], ...]
+
+    @property
+    def header(self) -> str:
+        old_range = _format_range(self.old_start, self.old_count)
+        new_range = _format_range(self.new_start, self.new_count)
+        return f"@@ -{old_range} +{new_range} @@"
+
+    @property
+    def old_lines(self) -> list[str]:
+        return [text for op, text in self.lines if op != "+"]
+
+    @property
+    def new_lines(self) -> list[str]:
+        return [text for op, text in self.lines if op != "-"]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "header": self.header,
+            "old_start": self.old_start,
+            "old_count": self.old_count,
+            "new_start": self.new_start,
+            "new_count": self.new_count,
+            "lines": [op + text for op, text in self.lines],
+        }
+
+
+def diff_opcodes(old_lines: Sequence[str], new_lines: Sequence[str]) -> list[Opcode]:
+    """Return ``difflib``-style opcodes transforming ``old_lines`` into ``new_lines``."""
+
+    old_ids, new_ids = _intern_lines(old_lines, new_lines)
+    blocks = _matching_blocks(old_ids, new_ids)
+    return _blocks_to_opcodes(blocks, len(old_ids), len(new_ids))
+
+
+def compute_diff_hunks(
+    original_content: str,
+    new_content: str,
+    *,
+    context: int = DEFAULT_CONTEXT_LINES,
+) -> list[DiffHunk]:
+    """Diff two strings and return their hunks with ``context`` lines around each change."""
+
+    old_lines = original_content.splitlines(keepends=True)
+    new_lines = new_content.splitlines(keepends=True)
+    opcodes = diff_opcodes(old_lines, new_lines)
+    return hunks_from_opcodes(old_lines, new_lines, opcodes, context=context)
+
+
+def hunks_from_opcodes(
+    old_lines: Sequence[str],
+    new_lines: Sequence[str],
+    opcodes: Sequence[Opcode],
+    *,
+    context: int = DEFAULT_CONTEXT_LINES,
+    seen_ids: dict[str, int] | None = None,
+) -> list[DiffHunk]:
+    """Group opcodes into hunks the same way ``difflib.unified_diff`` does.
+
+    Pass the same ``seen_ids`` across calls to keep ids unique when one diff
+    is grouped in several pieces.
+    """
+
+    hunks: list[DiffHunk] = []
+    seen_ids = {} if seen_ids is None else seen_ids
+    for group in _group_opcodes(opcodes, context):
+        lines: list[tuple[str, str]] = []
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                lines.extend((" ", line) for line in old_lines[i1:i2])
+                continue
+            if tag in {"replace", "delete"}:
+                lines.extend(("-", line) for line in old_lines[i1:i2])
+            if tag in {"replace", "insert"}:
+                lines.extend(("+", line) for line in new_lines[j1:j2])
+
+        old_start, old_end = group[0][1], group[-1][2]
+        new_start, new_end = group[0][3], group[-1][4]
+        hunk_id = _hunk_id(lines, seen_ids)
+        hunks.append(
+            DiffHunk(
+                id=hunk_id,
+                old_start=old_start,
+                old_count=old_end - old_start,
+                new_start=new_start,
+                new_count=new_end - new_start,
+                lines=tuple(lines),
+            )
+        )
+    return hunks
+
+
+def render_unified_diff(
+    hunks: Sequence[DiffHunk],
+    *,
+    fromfile: str = "original",
+    tofile: str = "new",
+) -> str:
+    """Render hunks as plain unified-diff text, or ``""`` when there are none."""
+
+    if not hunks:
+        return ""
+
+    parts = [f"--- {fromfile}\n", f"+++ {tofile}\n"]
+    parts.extend(render_hunk(hunk) for hunk in hunks)
+    return "".join(parts)
+
+
+def render_hunk(hunk: DiffHunk) -> str:
+    """Render one hunk, header included, without the ``---``/``+++`` file lines."""
+
+    parts = [hunk.header + "\n"]
+    for op, text in hunk.lines:
+        parts.append(op + text)
+        if not text.endswith(("\n", "\r")):
+            parts.append("\n" + NO_NEWLINE_MARKER)
+    return "".join(parts)
+
+
+def render_markdown_diff(hunks: Sequence[DiffHunk]) -> str:
+    """Render hunks in the fenced Markdown form both UIs display."""
+
+    diff_text = render_unified_diff(hunks)
+    if not diff_text:
+        return "No changes proposed."
+    return f"```diff\n{diff_text}```"
+
 
 def generate_diff(original_content: str, new_content: str) -> str:
     """
@@ -11,13 +184,423 @@ def generate_diff(original_content: str, new_content: str) -> str:
     Returns:
         A Markdown formatted diff string, or a message if no changes are detected.
     """
-    diff = difflib.unified_diff(
-        original_content.splitlines(keepends=True),
-        new_content.splitlines(keepends=True),
-        fromfile='original',
-        tofile='new',
-    )
-    diff_text = "".join(diff)
-    if not diff_text:
-        return "No changes proposed."
-    return f"```diff\n{diff_text}```"
+    return render_markdown_diff(compute_diff_hunks(original_content, new_content))
+
+
+class IncrementalDiff:
+    """Diff a streamed file update against the original as chunks arrive.
+
+    Complete lines are aligned greedily against the original. When they
+    diverge, the changed region stays open until ``RESYNC_LINES`` consecutive
+    streamed lines match the original again; only that region is diffed
+    exactly. A hunk is finalized, and never revised, once the equal run
+    after it is long enough that later lines cannot join it, so reviewers can
+    read early hunks while generation continues. The alignment is greedy, so
+    a full ``compute_diff_hunks`` on the finished text may group a few lines
+    differently.
+    """
+
+    def __init__(
+        self,
+        original_content: str,
+        *,
+        context: int = DEFAULT_CONTEXT_LINES,
+        resync_lines: int = RESYNC_LINES,
+    ) -> None:
+        self._old = original_content.splitlines(keepends=True)
+        self._context = context
+        self._resync_lines = max(1, resync_lines)
+        self._positions: dict[str, list[int]] | None = None
+        self._new: list[str] = []
+        self._partial = ""
+        self._old_pos = 0
+        self._diverged_at: tuple[int, int] | None = None
+        self._opcodes: list[Opcode] = []
+        self._segment_start = 0
+        self._hunks: list[DiffHunk] = []
+        self._seen_ids: dict[str, int] = {}
+        self._finished = False
+
+    @property
+    def hunks(self) -> list[DiffHunk]:
+        """Hunks finalized so far, in file order."""
+
+        return list(self._hunks)
+
+    @property
+    def aligned_old_lines(self) -> int:
+        """Original lines already accounted for by finalized or aligned output."""
+
+        return self._diverged_at[0] if self._diverged_at is not None else self._old_pos
+
+    @property
+    def total_old_lines(self) -> int:
+        return len(self._old)
+
+    @property
+    def pending_text(self) -> str:
+        """Streamed text not yet aligned with the original (an open change plus any partial line)."""
+
+        start = self._diverged_at[1] if self._diverged_at is not None else len(self._new)
+        return "".join(self._new[start:]) + self._partial
+
+    def feed(self, delta: str) -> list[DiffHunk]:
+        """Consume one streamed chunk and return any hunks it finalized."""
+
+        if self._finished:
+            raise RuntimeError("IncrementalDiff.feed() called after finish().")
+
+        emitted = len(self._hunks)
+        lines = (self._partial + delta).splitlines(keepends=True)
+        self._partial = ""
+        # Hold back an unterminated last line, and a bare "\r" that may be
+        # the first half of a "\r\n" split across chunks.
+        if lines and (not lines[-1].endswith(("\n", "\r")) or lines[-1].endswith("\r")):
+            self._partial = lines.pop()
+        for line in lines:
+            self._advance(line)
+        return self._hunks[emitted:]
+
+    def finish(self) -> list[DiffHunk]:
+        """Close the stream, flush every remaining change, and return the new hunks."""
+
+        if self._finished:
+            return []
+
+        emitted = len(self._hunks)
+        if self._partial:
+            self._new.append(self._partial)
+            self._partial = ""
+            if self._diverged_at is None:
+                self._diverged_at = (self._old_pos, len(self._new) - 1)
+
+        start_old, start_new = self._diverged_at or (self._old_pos, len(self._new))
+        self._commit_change(start_old, len(self._old), start_new, len(self._new))
+        self._diverged_at = None
+        self._old_pos = len(self._old)
+        self._emit(final=True)
+        self._finished = True
+        return self._hunks[emitted:]
+
+    def _advance(self, line: str) -> None:
+        new_index = len(self._new)
+        self._new.append(line)
+
+        if self._diverged_at is None:
+            if self._old_pos < len(self._old) and self._old[self._old_pos] == line:
+                self._append_opcode(("equal", self._old_pos, self._old_pos + 1, new_index, new_index + 1))
+                self._old_pos += 1
+                self._emit(final=False)
+                return
+            self._diverged_at = (self._old_pos, new_index)
+
+        self._try_resync()
+
+    def _try_resync(self) -> None:
+        """Close the open change if the newest lines match a run of original lines."""
+
+        start_old, start_new = self._diverged_at
+        window_start = len(self._new) - self._resync_lines
+        if window_start < start_new:
+            return
+
+        window = self._new[window_start:]
+        for position in self._candidate_positions(window[0], start_old):
+            if self._old[position:position + len(window)] != window:
+                continue
+            self._commit_change(start_old, position, start_new, window_start)
+            self._append_opcode(
+                ("equal", position, position + len(window), window_start, len(self._new))
+            )
+            self._old_pos = position + len(window)
+            self._diverged_at = None
+            self._emit(final=False)
+            return
+
+    def _candidate_positions(self, line: str, start: int) -> list[int]:
+        if self._positions is None:
+            self._positions = {}
+            for index, old_line in enumerate(self._old):
+                self._positions.setdefault(old_line, []).append(index)
+
+        positions = self._positions.get(line, [])
+        return positions[bisect_left(positions, start):]
+
+    def _commit_change(self, old_start: int, old_end: int, new_start: int, new_end: int) -> None:
+        """Diff one closed region exactly and append its opcodes at absolute offsets."""
+
+        if old_start == old_end and new_start == new_end:
+            return
+        region = diff_opcodes(self._old[old_start:old_end], self._new[new_start:new_end])
+        for tag, i1, i2, j1, j2 in region:
+            self._append_opcode(
+                (tag, old_start + i1, old_start + i2, new_start + j1, new_start + j2)
+            )
+
+    def _append_opcode(self, opcode: Opcode) -> None:
+        tag, i1, i2, j1, j2 = opcode
+        if tag == "equal" and self._opcodes and self._opcodes[-1][0] == "equal":
+            _tag, prev_i1, prev_i2, prev_j1, prev_j2 = self._opcodes[-1]
+            if prev_i2 == i1 and prev_j2 == j1:
+                self._opcodes[-1] = ("equal", prev_i1, i2, prev_j1, j2)
+                return
+        self._opcodes.append(opcode)
+
+    def _emit(self, *, final: bool) -> None:
+        """Turn the opcodes since the last emitted hunk into hunks once they can no longer grow."""
+
+        segment = self._opcodes[self._segment_start:]
+        if not any(tag != "equal" for tag, *_ in segment):
+            return
+        if not final:
+            tag, i1, i2, _j1, _j2 = segment[-1]
+            if tag != "equal" or i2 - i1 <= 2 * self._context:
+                return
+
+        self._hunks.extend(
+            hunks_from_opcodes(
+                self._old, self._new, segment, context=self._context, seen_ids=self._seen_ids
+            )
+        )
+        # The trailing equal run becomes leading context for the next hunk.
+        self._segment_start = len(self._opcodes) - 1
+
+
+def _format_range(start: int, count: int) -> str:
+    """Format a hunk range like ``difflib``: one-based, empty ranges point before the change."""
+
+    beginning = start + 1
+    if count == 1:
+        return str(beginning)
+    if count == 0:
+        beginning -= 1
+    return f"{beginning},{count}"
+
+
+def _hunk_id(lines: Sequence[tuple[str, str]], seen_ids: dict[str, int]) -> str:
+    """Return a content-derived hunk id, suffixed when identical hunks repeat."""
+
+    digest = hashlib.sha1()
+    for op, text in lines:
+        digest.update(op.encode("utf-8"))
+        digest.update(text.encode("utf-8", "surrogatepass"))
+    hunk_id = digest.hexdigest()[:12]
+    occurrence = seen_ids.get(hunk_id, 0)
+    seen_ids[hunk_id] = occurrence + 1
+    return hunk_id if occurrence == 0 else f"{hunk_id}-{occurrence}"
+
+
+def _intern_lines(old_lines: Sequence[str], new_lines: Sequence[str]) -> tuple[list[int], list[int]]:
+    """Map each distinct line to a small integer so comparisons are int compares."""
+
+    table: dict[str, int] = {}
+    old_ids = [table.setdefault(line, len(table)) for line in old_lines]
+    new_ids = [table.setdefault(line, len(table)) for line in new_lines]
+    return old_ids, new_ids
+
+
+def _matching_blocks(a: list[int], b: list[int]) -> list[tuple[int, int, int]]:
+    """Return sorted ``(i, j, size)`` runs where ``a[i:i+size] == b[j:j+size]``."""
+
+    blocks: list[tuple[int, int, int]] = []
+    a_lo, a_hi, b_lo, b_hi = _trim_common(a, b, 0, len(a), 0, len(b), blocks)
+
+    # Lines that never occur on the other side can only be edits, so the
+    # search runs over the remaining lines and maps matches back afterwards.
+    # A full rewrite (for example re-indented code) leaves nothing to search.
+    shared = set(a[a_lo:a_hi]).intersection(b[b_lo:b_hi])
+    a_index = [i for i in range(a_lo, a_hi) if a[i] in shared]
+    b_index = [j for j in range(b_lo, b_hi) if b[j] in shared]
+    if a_index and b_index:
+        a_kept = [a[i] for i in a_index]
+        b_kept = [b[j] for j in b_index]
+        for i, j, size in _search_blocks(a_kept, b_kept):
+            for offset in range(size):
+                blocks.append((a_index[i + offset], b_index[j + offset], 1))
+
+    blocks.sort()
+    return _merge_adjacent(blocks)
+
+
+def _search_blocks(a: list[int], b: list[int]) -> list[tuple[int, int, int]]:
+    """Run the divide-and-conquer Myers search over two whole sequences."""
+
+    blocks: list[tuple[int, int, int]] = []
+    max_cost = max(MIN_EXACT_COST, int(math.sqrt(len(a) + len(b))))
+    stack = [(0, len(a), 0, len(b))]
+    while stack:
+        a_lo, a_hi, b_lo, b_hi = _trim_common(a, b, *stack.pop(), blocks)
+        if a_lo == a_hi or b_lo == b_hi:
+            continue
+
+        x_start, y_start, x_end, y_end = _middle_snake(a, a_lo, a_hi, b, b_lo, b_hi, max_cost)
+        if x_end > x_start:
+            blocks.append((x_start, y_start, x_end - x_start))
+        if (x_start, y_start) != (a_lo, b_lo):
+            stack.append((a_lo, x_start, b_lo, y_start))
+        if (x_end, y_end) != (a_hi, b_hi):
+            stack.append((x_end, a_hi, y_end, b_hi))
+    return blocks
+
+
+def _trim_common(
+    a: list[int],
+    b: list[int],
+    a_lo: int,
+    a_hi: int,
+    b_lo: int,
+    b_hi: int,
+    blocks: list[tuple[int, int, int]],
+) -> tuple[int, int, int, int]:
+    """Record the common prefix and suffix of a sub-problem and return what remains."""
+
+    start_a, start_b = a_lo, b_lo
+    while a_lo < a_hi and b_lo < b_hi and a[a_lo] == b[b_lo]:
+        a_lo += 1
+        b_lo += 1
+    if a_lo > start_a:
+        blocks.append((start_a, start_b, a_lo - start_a))
+
+    end_a = a_hi
+    while a_lo < a_hi and b_lo < b_hi and a[a_hi - 1] == b[b_hi - 1]:
+        a_hi -= 1
+        b_hi -= 1
+    if a_hi < end_a:
+        blocks.append((a_hi, b_hi, end_a - a_hi))
+
+    return a_lo, a_hi, b_lo, b_hi
+
+
+def _middle_snake(
+    a: list[int],
+    a_lo: int,
+    a_hi: int,
+    b: list[int],
+    b_lo: int,
+    b_hi: int,
+    max_cost: int,
+) -> tuple[int, int, int, int]:
+    """Find the middle snake of an edit path, returning absolute ``(x0, y0, x1, y1)``.
+
+    The caller has already trimmed the common prefix and suffix, so both
+    ranges are non-empty and their first and last lines differ.
+    """
+
+    n = a_hi - a_lo
+    m = b_hi - b_lo
+    delta = n - m
+    odd = delta & 1
+    offset = n + m + 1
+    forward = [0] * (2 * offset + 1)
+    backward = [0] * (2 * offset + 1)
+
+    for d in range((n + m + 1) // 2 + 1):
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and forward[offset + k - 1] < forward[offset + k + 1]):
+                x = forward[offset + k + 1]
+            else:
+                x = forward[offset + k - 1] + 1
+            y = x - k
+            x0, y0 = x, y
+            while x < n and y < m and a[a_lo + x] == b[b_lo + y]:
+                x += 1
+                y += 1
+            forward[offset + k] = x
+            if odd and -(d - 1) <= delta - k <= d - 1 and x + backward[offset + delta - k] >= n:
+                return a_lo + x0, b_lo + y0, a_lo + x, b_lo + y
+
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and backward[offset + k - 1] < backward[offset + k + 1]):
+                x = backward[offset + k + 1]
+            else:
+                x = backward[offset + k - 1] + 1
+            y = x - k
+            x0, y0 = x, y
+            while x < n and y < m and a[a_hi - 1 - x] == b[b_hi - 1 - y]:
+                x += 1
+                y += 1
+            backward[offset + k] = x
+            if not odd and -d <= delta - k <= d and x + forward[offset + delta - k] >= n:
+                return a_hi - x, b_hi - y, a_hi - x0, b_hi - y0
+
+        if d >= max_cost:
+            return _furthest_forward_point(forward, offset, d, n, m, a_lo, b_lo)
+
+    raise AssertionError("middle snake search did not converge")
+
+
+def _furthest_forward_point(
+    forward: list[int],
+    offset: int,
+    d: int,
+    n: int,
+    m: int,
+    a_lo: int,
+    b_lo: int,
+) -> tuple[int, int, int, int]:
+    """Return the forward frontier point that made the most progress as an empty snake."""
+
+    best_x, best_y = 0, 0
+    for k in range(-d, d + 1, 2):
+        x = forward[offset + k]
+        y = x - k
+        if 0 <= x <= n and 0 <= y <= m and x + y > best_x + best_y:
+            best_x, best_y = x, y
+    return a_lo + best_x, b_lo + best_y, a_lo + best_x, b_lo + best_y
+
+
+def _merge_adjacent(blocks: list[tuple[int, int, int]]) -> list[tuple[int, int, int]]:
+    merged: list[tuple[int, int, int]] = []
+    for i, j, size in blocks:
+        if merged:
+            prev_i, prev_j, prev_size = merged[-1]
+            if prev_i + prev_size == i and prev_j + prev_size == j:
+                merged[-1] = (prev_i, prev_j, prev_size + size)
+                continue
+        merged.append((i, j, size))
+    return merged
+
+
+def _blocks_to_opcodes(blocks: list[tuple[int, int, int]], n: int, m: int) -> list[Opcode]:
+    opcodes: list[Opcode] = []
+    i = j = 0
+    for block_i, block_j, size in [*blocks, (n, m, 0)]:
+        if i < block_i and j < block_j:
+            opcodes.append(("replace", i, block_i, j, block_j))
+        elif i < block_i:
+            opcodes.append(("delete", i, block_i, j, block_j))
+        elif j < block_j:
+            opcodes.append(("insert", i, block_i, j, block_j))
+        if size:
+            opcodes.append(("equal", block_i, block_i + size, block_j, block_j + size))
+        i, j = block_i + size, block_j + size
+    return opcodes
+
+
+def _group_opcodes(opcodes: Sequence[Opcode], context: int) -> list[list[Opcode]]:
+    """Split opcodes into context-padded groups, mirroring ``SequenceMatcher.get_grouped_opcodes``."""
+
+    codes = list(opcodes)
+    if not codes or all(tag == "equal" for tag, *_ in codes):
+        return []
+
+    if codes[0][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[0]
+        codes[0] = tag, max(i1, i2 - context), i2, max(j1, j2 - context), j2
+    if codes[-1][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[-1]
+        codes[-1] = tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)
+
+    span = context + context
+    groups: list[list[Opcode]] = []
+    group: list[Opcode] = []
+    for tag, i1, i2, j1, j2 in codes:
+        if tag == "equal" and i2 - i1 > span:
+            group.append((tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)))
+            groups.append(group)
+            group = []
+            i1, j1 = max(i1, i2 - context), max(j1, j2 - context)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == "equal"):
+        groups.append(group)
+    return groups
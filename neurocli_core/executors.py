@@ -0,0 +1,245 @@
+"""Bounded execution lanes for blocking work started from async code.
+
+FastAPI runs every ``async def`` handler on one event loop, so a handler that
+walks the workspace, waits on git, or calls the model synchronously stalls
+every other request and SSE stream until it returns. Handlers hand such work
+to a named lane instead:
+
+* ``io``: file reads and writes, backups, listings (threads).
+* ``git``: git subprocesses (threads; git serializes on the index anyway).
+* ``format``: formatter calls (threads; the tools run in resident workers).
+* ``llm``: blocking model calls (threads that mostly wait on the network).
+* ``cpu``: pure-Python scans such as radar (a process pool, so they do not
+  hold the GIL that streaming threads need).
+
+Each lane owns its executor, so a burst on one lane cannot starve another,
+and admits at most ``workers + queue`` calls; the next one raises
+:class:`LaneBusyError` instead of queueing without bound. Sizes come from
+``NEUROCLI_LANE_<NAME>_WORKERS`` and ``NEUROCLI_LANE_<NAME>_QUEUE``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import os
+import threading
+from concurrent.futures import BrokenExecutor, Executor, Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Literal, TypeVar
+
+from neurocli_core.config import get_env_int
+
+
+T = TypeVar("T")
+LaneKind = Literal["thread", "process"]
+
+
+class LaneBusyError(RuntimeError):
+    """Raised when a lane already holds as many calls as it admits."""
+
+    def __init__(self, lane: str) -> None:
+        super().__init__(f"The server is busy ({lane} lane is full); try again shortly.")
+        self.lane = lane
+
+
+@dataclass(frozen=True, slots=True)
+class LaneSpec:
+    name: str
+    workers: int
+    queue: int
+    kind: LaneKind = "thread"
+
+
+def default_lane_specs() -> list[LaneSpec]:
+    cpu_workers = max(1, min(4, (os.cpu_count() or 2) - 1))
+    specs = [
+        LaneSpec("io", workers=8, queue=64),
+        LaneSpec("git", workers=2, queue=16),
+        LaneSpec("format", workers=4, queue=32),
+        LaneSpec("llm", workers=8, queue=32),
+        LaneSpec("cpu", workers=cpu_workers, queue=8, kind="process"),
+    ]
+    return [
+        LaneSpec(
+            spec.name,
+            workers=max(1, get_env_int(f"NEUROCLI_LANE_{spec.name.upper()}_WORKERS", spec.workers)),
+            queue=max(0, get_env_int(f"NEUROCLI_LANE_{spec.name.upper()}_QUEUE", spec.queue)),
+            kind=spec.kind,
+        )
+        for spec in specs
+    ]
+
+
+class _Lane:
+    def __init__(self, spec: LaneSpec) -> None:
+        self.spec = spec
+        self.pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self._executor: Executor | None = None
+
+    @property
+    def executor(self) -> Executor:
+        # Pools start on first use, so importing the API never spawns processes.
+        if self._executor is None:
+            if self.spec.kind == "process":
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+
+                # spawn, not fork: the API process already runs threads.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.spec.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.spec.workers,
+                    thread_name_prefix=f"neurocli-{self.spec.name}",
+                )
+        return self._executor
+
+    def detach(self, executor: Executor) -> bool:
+        """Forget a broken pool so the next call builds a new one; the caller shuts it down."""
+
+        if self._executor is not executor:
+            return False
+        self._executor = None
+        return True
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "kind": self.spec.kind,
+            "workers": self.spec.workers,
+            "queue": self.spec.queue,
+            "pending": self.pending,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+        }
+
+
+class ExecutionLanes:
+    """Named, bounded executors plus single-flight sharing of identical calls."""
+
+    def __init__(self, specs: list[LaneSpec] | None = None) -> None:
+        self._lanes = {spec.name: _Lane(spec) for spec in specs or default_lane_specs()}
+        self._shared: dict[str, Future[Any]] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, lane: str, func: Callable[..., T], /, *args: Any, **kwargs: Any) -> Future[T]:
+        """Start ``func`` on ``lane``; raises :class:`LaneBusyError` when the lane is full."""
+
+        state = self._lanes[lane]
+        with self._lock:
+            if state.pending >= state.spec.workers + state.spec.queue:
+                state.rejected += 1
+                raise LaneBusyError(lane)
+            state.pending += 1
+            executor = state.executor
+        try:
+            try:
+                future = executor.submit(func, *args, **kwargs)
+            except BrokenExecutor:
+                # A crashed worker process breaks the whole pool; start a fresh one once.
+                with self._lock:
+                    state.detach(executor)
+                    broken, executor = executor, state.executor
+                broken.shutdown(wait=False, cancel_futures=True)
+                future = executor.submit(func, *args, **kwargs)
+        except BaseException:
+            with self._lock:
+                state.pending -= 1
+            raise
+        future.add_done_callback(lambda done: self._finish(state, executor, done))
+        return future
+
+    def submit_shared(
+        self, lane: str, key: str, func: Callable[..., T], /, *args: Any, **kwargs: Any
+    ) -> Future[T]:
+        """Like :meth:`submit`, but callers with the same ``key`` share one in-flight call."""
+
+        with self._lock:
+            future = self._shared.get(key)
+            if future is not None:
+                return future
+        future = self.submit(lane, func, *args, **kwargs)
+        with self._lock:
+            # Another caller may have won the race; keep theirs and let this one finish unused.
+            existing = self._shared.setdefault(key, future)
+        if existing is future:
+            future.add_done_callback(lambda _done: self._forget(key, future))
+        return existing
+
+    async def run(self, lane: str, func: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+        """Await ``func`` on ``lane`` without blocking the event loop.
+
+        Cancelling the awaiting task cancels the call if it has not started yet.
+        """
+
+        return await asyncio.wrap_future(self.submit(lane, func, *args, **kwargs))
+
+    async def run_shared(
+        self, lane: str, key: str, func: Callable[..., T], /, *args: Any, **kwargs: Any
+    ) -> T:
+        """Await a shared call; one caller going away does not cancel it for the others."""
+
+        future = self.submit_shared(lane, key, func, *args, **kwargs)
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            return {name: lane.to_dict() for name, lane in self._lanes.items()}
+
+    def close(self) -> None:
+        with self._lock:
+            executors = [lane._executor for lane in self._lanes.values() if lane._executor is not None]
+            for lane in self._lanes.values():
+                lane._executor = None
+        for executor in executors:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _finish(self, state: _Lane, executor: Executor, future: Future[Any]) -> None:
+        error = None if future.cancelled() else future.exception()
+        with self._lock:
+            state.pending -= 1
+            if future.cancelled() or error is not None:
+                state.failed += 1
+            else:
+                state.completed += 1
+            broken = isinstance(error, BrokenExecutor) and state.detach(executor)
+        if broken:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _forget(self, key: str, future: Future[Any]) -> None:
+        with self._lock:
+            if self._shared.get(key) is future:
+                del self._shared[key]
+
+
+_lanes: ExecutionLanes | None = None
+_lanes_lock = threading.Lock()
+
+
+def get_execution_lanes() -> ExecutionLanes:
+    """Return the process-wide lanes, building them on first use."""
+
+    global _lanes
+    with _lanes_lock:
+        if _lanes is None:
+            _lanes = ExecutionLanes()
+        return _lanes
+
+
+def close_execution_lanes() -> None:
+    """Shut every lane down; the next call builds fresh pools."""
+
+    global _lanes
+    with _lanes_lock:
+        lanes, _lanes = _lanes, None
+    if lanes is not None:
+        lanes.close()
+
+
+atexit.register(close_execution_lanes)
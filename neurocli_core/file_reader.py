@@ -0,0 +1,420 @@
+"""Ranged, conditional reads of workspace text files.
+
+Opening a large log through ``read_text`` loads and decodes all of it. The
+reader here never does: it reads byte or line windows with ``seek``, answers
+"has this file changed?" from a cached fingerprint, and refuses binary files
+after sniffing their first few KiB.
+
+Per file it caches, keyed by ``(size, mtime_ns)``:
+
+* the SHA-256 of the content (the same hash ``apply_engine`` takes as
+  ``expected_hash``), computed in chunks on first use and only for files up
+  to ``NEUROCLI_FILE_HASH_MAX_BYTES``; larger files get a weak size/mtime tag;
+* a sparse line index holding the byte offset of every
+  :data:`LINE_INDEX_STRIDE`-th line, built in one chunked pass, so jumping to
+  any line costs at most one stride of scanning.
+"""
+
+from __future__ import annotations
+
+import codecs
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from itertools import accumulate
+from pathlib import Path
+from typing import Any, Iterator
+
+from neurocli_core.config import get_env_int
+
+
+DEFAULT_INLINE_BYTES = 1024 * 1024
+MAX_RANGE_BYTES = 4 * 1024 * 1024
+# Up to 3 continuation bytes skipped at the start plus one 4-byte character:
+# a window this wide always holds at least one whole character.
+MIN_RANGE_BYTES = 7
+MAX_RANGE_LINES = 10_000
+DEFAULT_HASH_MAX_BYTES = 256 * 1024 * 1024
+BINARY_SNIFF_BYTES = 8192
+LINE_INDEX_STRIDE = 1024
+READ_CHUNK_BYTES = 1024 * 1024
+MAX_CACHED_FILES = 256
+
+
+class BinaryFileError(ValueError):
+    """Raised when a file does not look like UTF-8 text."""
+
+
+@dataclass(slots=True)
+class FileFingerprint:
+    size: int
+    mtime_ns: int
+    sha256: str | None = None
+
+    @property
+    def etag(self) -> str:
+        # Strong when the content hash is known, weak (size and mtime only) otherwise.
+        if self.sha256 is not None:
+            return f'"{self.sha256}"'
+        return f'W/"{self.size:x}-{self.mtime_ns:x}"'
+
+    def matches(self, if_none_match: str | None) -> bool:
+        """Weak comparison against an ``If-None-Match`` header, as GET requires."""
+
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        ours = self.etag.removeprefix("W/")
+        return any(tag.strip().removeprefix("W/") == ours for tag in if_none_match.split(","))
+
+
+@dataclass(slots=True)
+class LineIndex:
+    # checkpoints[k] is the byte offset where line k * stride + 1 starts.
+    checkpoints: list[int]
+    total_lines: int
+    stride: int = LINE_INDEX_STRIDE
+
+
+@dataclass(slots=True)
+class FileSlice:
+    path: str
+    content: str
+    start: int
+    end: int
+    fingerprint: FileFingerprint
+    start_line: int | None = None
+    end_line: int | None = None
+    total_lines: int | None = None
+    truncated: bool = False
+
+    @property
+    def next_offset(self) -> int | None:
+        return self.end if self.end < self.fingerprint.size else None
+
+    def to_dict(self) -> dict[str, Any]:
+        payload: dict[str, Any] = {
+            "content": self.content,
+            "size": self.fingerprint.size,
+            "etag": self.fingerprint.etag,
+            "sha256": self.fingerprint.sha256,
+            "start": self.start,
+            "end": self.end,
+            "next_offset": self.next_offset,
+            "truncated": self.truncated,
+        }
+        if self.start_line is not None:
+            payload["start_line"] = self.start_line
+            payload["end_line"] = self.end_line
+        if self.total_lines is not None:
+            payload["total_lines"] = self.total_lines
+        return payload
+
+
+@dataclass(slots=True)
+class _FileState:
+    size: int
+    mtime_ns: int
+    sha256: str | None = None
+    hashed: bool = False
+    binary: bool | None = None
+    line_index: LineIndex | None = None
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class FileReader:
+    """Windowed reads with cached fingerprints, binary detection, and line indexes."""
+
+    def __init__(
+        self,
+        *,
+        inline_bytes: int | None = None,
+        hash_max_bytes: int | None = None,
+        max_cached: int = MAX_CACHED_FILES,
+    ) -> None:
+        if inline_bytes is None:
+            inline_bytes = get_env_int("NEUROCLI_FILE_INLINE_BYTES", DEFAULT_INLINE_BYTES)
+        if hash_max_bytes is None:
+            hash_max_bytes = get_env_int("NEUROCLI_FILE_HASH_MAX_BYTES", DEFAULT_HASH_MAX_BYTES)
+        self.inline_bytes = max(1, inline_bytes)
+        self.hash_max_bytes = max(0, hash_max_bytes)
+        self.max_cached = max(1, max_cached)
+        self._states: OrderedDict[str, _FileState] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def fingerprint(self, path: Path) -> FileFingerprint:
+        state = self._state(path)
+        self._ensure_hash(path, state)
+        return FileFingerprint(state.size, state.mtime_ns, state.sha256)
+
+    def is_binary(self, path: Path) -> bool:
+        state = self._state(path)
+        with state.lock:
+            if state.binary is None:
+                with open(path, "rb") as handle:
+                    state.binary = looks_binary(handle.read(BINARY_SNIFF_BYTES))
+            return state.binary
+
+    def line_index(self, path: Path) -> LineIndex:
+        state = self._state(path)
+        with state.lock:
+            if state.line_index is None:
+                with open(path, "rb") as handle:
+                    state.line_index = build_line_index(handle, state.size)
+            return state.line_index
+
+    def read(
+        self,
+        path: Path,
+        *,
+        offset: int | None = None,
+        length: int | None = None,
+        start_line: int | None = None,
+        line_count: int | None = None,
+    ) -> FileSlice:
+        """Read a window of ``path``.
+
+        With ``start_line`` (1-based) the window is whole lines; with ``offset``
+        it starts at that byte and ends on a line break when one falls inside
+        ``length``. With neither, the file is returned whole if it fits
+        ``inline_bytes``, else its first ``inline_bytes`` as a truncated window.
+
+        Raises:
+            BinaryFileError: The file does not look like UTF-8 text.
+        """
+
+        if self.is_binary(path):
+            raise BinaryFileError(f"{path.name} looks like a binary file; it cannot be shown as text.")
+        fingerprint = self.fingerprint(path)
+        size = fingerprint.size
+
+        if start_line is not None:
+            return self._read_lines(path, fingerprint, max(1, start_line), line_count)
+
+        if offset is None and length is None and size <= self.inline_bytes:
+            with open(path, "rb") as handle:
+                data = handle.read(size)
+            return FileSlice(str(path), _decode(data), 0, len(data), fingerprint)
+
+        start = min(max(0, offset or 0), size)
+        window = self.inline_bytes if length is None else length
+        window = max(MIN_RANGE_BYTES, min(window, MAX_RANGE_BYTES))
+        with open(path, "rb") as handle:
+            handle.seek(start)
+            data = handle.read(window)
+            start_skip = _char_start(data)
+            data = data[start_skip:]
+            if start + start_skip + len(data) < size:
+                data = data[: _window_end(data)] or data
+        begin = start + start_skip
+        end = begin + len(data)
+        return FileSlice(
+            str(path),
+            _decode(data),
+            begin,
+            end,
+            fingerprint,
+            truncated=offset is None and length is None and end < size,
+        )
+
+    def iter_bytes(self, path: Path, start: int = 0, end: int | None = None) -> Iterator[bytes]:
+        """Yield ``path[start:end]`` in chunks without holding it all in memory."""
+
+        with open(path, "rb") as handle:
+            handle.seek(start)
+            remaining = None if end is None else max(0, end - start)
+            while remaining is None or remaining > 0:
+                chunk = handle.read(READ_CHUNK_BYTES if remaining is None else min(READ_CHUNK_BYTES, remaining))
+                if not chunk:
+                    return
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+    def line_offset(self, path: Path, line: int) -> int:
+        """Return the byte offset where 1-based ``line`` starts (the file size past the end)."""
+
+        index = self.line_index(path)
+        line = max(1, line)
+        if line > index.total_lines:
+            return self._state(path).size
+        checkpoint = (line - 1) // index.stride
+        offset = index.checkpoints[checkpoint]
+        to_skip = (line - 1) - checkpoint * index.stride
+        if not to_skip:
+            return offset
+        with open(path, "rb") as handle:
+            handle.seek(offset)
+            while to_skip:
+                chunk = handle.read(READ_CHUNK_BYTES)
+                if not chunk:
+                    break
+                position = -1
+                while to_skip:
+                    position = chunk.find(b"\n", position + 1)
+                    if position < 0:
+                        break
+                    to_skip -= 1
+                if not to_skip:
+                    return offset + position + 1
+                offset += len(chunk)
+        return offset
+
+    def _read_lines(
+        self, path: Path, fingerprint: FileFingerprint, start_line: int, line_count: int | None
+    ) -> FileSlice:
+        index = self.line_index(path)
+        wanted = max(1, min(line_count or MAX_RANGE_LINES, MAX_RANGE_LINES))
+        start = self.line_offset(path, start_line)
+        data = bytearray()
+        lines = 0
+        truncated = False
+        with open(path, "rb") as handle:
+            handle.seek(start)
+            while lines < wanted:
+                chunk = handle.read(min(READ_CHUNK_BYTES, MAX_RANGE_BYTES - len(data) + 1))
+                if not chunk:
+                    break
+                position = -1
+                while lines < wanted:
+                    position = chunk.find(b"\n", position + 1)
+                    if position < 0:
+                        break
+                    lines += 1
+                if lines == wanted:
+                    data += chunk[: position + 1]
+                    break
+                data += chunk
+                if len(data) > MAX_RANGE_BYTES:
+                    # Very long lines: stop at the last whole line inside the byte cap.
+                    del data[_window_end(bytes(data[:MAX_RANGE_BYTES])) :]
+                    truncated = True
+                    break
+        end_line = min(index.total_lines, start_line + max(0, _count_lines(data) - 1))
+        return FileSlice(
+            str(path),
+            _decode(bytes(data)),
+            start,
+            start + len(data),
+            fingerprint,
+            start_line=start_line if data else None,
+            end_line=end_line if data else None,
+            total_lines=index.total_lines,
+            truncated=truncated,
+        )
+
+    def _state(self, path: Path) -> _FileState:
+        stat = os.stat(path)
+        key = str(path)
+        with self._lock:
+            state = self._states.get(key)
+            if state is None or state.size != stat.st_size or state.mtime_ns != stat.st_mtime_ns:
+                state = _FileState(stat.st_size, stat.st_mtime_ns)
+                self._states[key] = state
+            self._states.move_to_end(key)
+            while len(self._states) > self.max_cached:
+                self._states.popitem(last=False)
+            return state
+
+    def _ensure_hash(self, path: Path, state: _FileState) -> None:
+        with state.lock:
+            if state.hashed:
+                return
+            if state.size <= self.hash_max_bytes:
+                digest = hashlib.sha256()
+                for chunk in self.iter_bytes(path):
+                    digest.update(chunk)
+                state.sha256 = digest.hexdigest()
+            state.hashed = True
+
+
+def looks_binary(sample: bytes) -> bool:
+    """NUL bytes or invalid UTF-8 in the first bytes mean "not text"."""
+
+    if b"\0" in sample:
+        return True
+    try:
+        # final=False tolerates a multi-byte character cut off at the end of the sample.
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+    except UnicodeDecodeError:
+        return True
+    return False
+
+
+def build_line_index(handle: Any, size: int, stride: int = LINE_INDEX_STRIDE) -> LineIndex:
+    """Scan ``handle`` once, recording where every ``stride``-th line starts."""
+
+    checkpoints = [0]
+    newlines = 0
+    position = 0
+    last_byte = b""
+    while chunk := handle.read(READ_CHUNK_BYTES):
+        count = chunk.count(b"\n")
+        first_needed = stride - newlines % stride
+        if count >= first_needed:
+            # Offsets just past each newline in this chunk, computed in C rather than a find loop.
+            line_ends = list(accumulate(len(part) + 1 for part in chunk.split(b"\n")[:-1]))
+            for nth in range(first_needed, count + 1, stride):
+                checkpoints.append(position + line_ends[nth - 1])
+        newlines += count
+        position += len(chunk)
+        last_byte = chunk[-1:]
+    if checkpoints and checkpoints[-1] >= size and len(checkpoints) > 1:
+        # A trailing newline does not start another line.
+        checkpoints.pop()
+    total_lines = newlines + (1 if size and last_byte != b"\n" else 0)
+    return LineIndex(checkpoints, total_lines, stride)
+
+
+def _decode(data: bytes) -> str:
+    return data.decode("utf-8", errors="replace")
+
+
+def _char_start(data: bytes) -> int:
+    """Skip UTF-8 continuation bytes so a window never starts mid-character."""
+
+    skip = 0
+    while skip < min(3, len(data)) and data[skip] & 0xC0 == 0x80:
+        skip += 1
+    return skip
+
+
+def _window_end(data: bytes) -> int:
+    """End a window after its last line break, or on a character boundary if it has none."""
+
+    newline = data.rfind(b"\n")
+    if newline >= 0:
+        return newline + 1
+    end = len(data)
+    # Back up over a multi-byte character cut off at the end.
+    for back in range(1, min(4, end) + 1):
+        byte = data[end - back]
+        if byte & 0xC0 == 0xC0:
+            needed = 4 if byte >= 0xF0 else 3 if byte >= 0xE0 else 2
+            return end if back >= needed else end - back
+        if byte & 0x80 == 0:
+            break
+    return end
+
+
+def _count_lines(data: bytes | bytearray) -> int:
+    if not data:
+        return 0
+    return data.count(b"\n") + (0 if data.endswith(b"\n") else 1)
+
+
+_reader: FileReader | None = None
+_reader_lock = threading.Lock()
+
+
+def get_file_reader() -> FileReader:
+    """Return the process-wide reader, so fingerprints and line indexes are shared."""
+
+    global _reader
+    with _reader_lock:
+        if _reader is None:
+            _reader = FileReader()
+        return _reader
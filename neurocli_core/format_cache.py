@@ -0,0 +1,204 @@
+"""Content-addressed cache of formatter results.
+
+The same text is formatted several times per edit: after the AI response, on
+Format, and again in review. Results are cached under a key built from the
+content hash, the formatter name and version, the target path, and the hashes
+of every config file the formatter would read. When the output equals the
+input only an "already formatted" verdict is stored, and every formatted
+output is recorded as already formatted too, so a second Format click costs
+no subprocess at all.
+
+Entries live in a bounded in-memory LRU and, when a directory is configured,
+on disk as one small file per key.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Iterable
+
+from neurocli_core.config import get_env_str, get_settings
+
+
+ALREADY_FORMATTED_SUFFIX = ".ok"
+FORMATTED_SUFFIX = ".out"
+
+
+@dataclass(slots=True)
+class FormatCacheStats:
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    stores: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def build_cache_key(
+    content: str,
+    *,
+    formatter: str,
+    version: str,
+    file_path: str,
+    config_fingerprint: str,
+) -> str:
+    """Return the hex digest identifying one formatting job."""
+
+    digest = hashlib.sha256()
+    for part in (formatter, version, str(Path(file_path).resolve()), config_fingerprint):
+        digest.update(part.encode("utf-8", "surrogatepass"))
+        digest.update(b"\0")
+    digest.update(content.encode("utf-8", "surrogatepass"))
+    return digest.hexdigest()
+
+
+class ConfigFingerprinter:
+    """Hash the formatter config files that apply to a path.
+
+    Config files are looked up in the file's directory and every ancestor.
+    Each file's content hash is cached by ``(size, mtime)``, so a lookup
+    normally costs a few ``stat`` calls.
+    """
+
+    def __init__(self) -> None:
+        self._hashes: dict[Path, tuple[int, int, str]] = {}
+        self._lock = threading.Lock()
+
+    def fingerprint(self, file_path: str, config_names: Iterable[str]) -> str:
+        names = tuple(config_names)
+        digest = hashlib.sha256()
+        directory = Path(file_path).resolve().parent
+        for folder in (directory, *directory.parents):
+            for name in names:
+                candidate = folder / name
+                file_hash = self._file_hash(candidate)
+                if file_hash is not None:
+                    digest.update(str(candidate).encode("utf-8", "surrogatepass"))
+                    digest.update(file_hash.encode("ascii"))
+        return digest.hexdigest()
+
+    def _file_hash(self, path: Path) -> str | None:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        if not path.is_file():
+            return None
+
+        with self._lock:
+            cached = self._hashes.get(path)
+        if cached is not None and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+
+        try:
+            file_hash = hashlib.sha256(path.read_bytes()).hexdigest()
+        except OSError:
+            return None
+        with self._lock:
+            self._hashes[path] = (stat.st_size, stat.st_mtime_ns, file_hash)
+        return file_hash
+
+
+class FormatCache:
+    """Bounded LRU of formatter results with an optional on-disk layer."""
+
+    def __init__(self, max_entries: int | None = None, disk_dir: Path | None = None) -> None:
+        self.max_entries = max_entries or get_settings().format_cache_entries
+        self.disk_dir = disk_dir
+        self.stats = FormatCacheStats()
+        # ``None`` marks an "already formatted" verdict; otherwise the formatted text.
+        self._entries: OrderedDict[str, str | None] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, content: str) -> str | None:
+        """Return the cached formatted text for ``content``, or ``None`` on a miss."""
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                cached = self._entries[key]
+                return content if cached is None else cached
+
+        cached_on_disk = self._read_disk(key)
+        with self._lock:
+            if cached_on_disk is None:
+                self.stats.misses += 1
+                return None
+            self.stats.disk_hits += 1
+            formatted, already_formatted = cached_on_disk
+            self._remember(key, None if already_formatted else formatted)
+        return content if already_formatted else formatted
+
+    def put(self, key: str, content: str, formatted: str, *, formatted_key: str | None = None) -> None:
+        """Record a result, and the output's own "already formatted" verdict under ``formatted_key``."""
+
+        with self._lock:
+            self.stats.stores += 1
+            self._remember(key, None if formatted == content else formatted)
+            if formatted_key is not None and formatted_key != key:
+                self._remember(formatted_key, None)
+        self._write_disk(key, None if formatted == content else formatted)
+        if formatted_key is not None and formatted_key != key:
+            self._write_disk(formatted_key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _remember(self, key: str, value: str | None) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _disk_path(self, key: str, suffix: str) -> Path:
+        return self.disk_dir / key[:2] / f"{key}{suffix}"
+
+    def _read_disk(self, key: str) -> tuple[str, bool] | None:
+        if self.disk_dir is None:
+            return None
+        if self._disk_path(key, ALREADY_FORMATTED_SUFFIX).exists():
+            return "", True
+        try:
+            # newline="" keeps CRLF endings exactly as _write_disk stored them.
+            with open(self._disk_path(key, FORMATTED_SUFFIX), encoding="utf-8", newline="") as handle:
+                return handle.read(), False
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    def _write_disk(self, key: str, formatted: str | None) -> None:
+        if self.disk_dir is None:
+            return
+        suffix = ALREADY_FORMATTED_SUFFIX if formatted is None else FORMATTED_SUFFIX
+        target = self._disk_path(key, suffix)
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            # Write-then-rename so concurrent readers never see a partial entry.
+            file_descriptor, temp_name = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+            try:
+                with os.fdopen(file_descriptor, "w", encoding="utf-8", newline="") as handle:
+                    handle.write(formatted or "")
+                os.replace(temp_name, target)
+            except BaseException:
+                with contextlib.suppress(OSError):
+                    os.unlink(temp_name)
+                raise
+        except OSError:
+            # The disk layer is an optimization; a failed write only costs a future miss.
+            pass
+
+
+def build_default_format_cache() -> FormatCache:
+    """Memory-only unless ``NEUROCLI_FORMAT_CACHE_DIR`` names a directory."""
+
+    disk_dir = get_env_str("NEUROCLI_FORMAT_CACHE_DIR", "")
+    return FormatCache(disk_dir=Path(disk_dir) if disk_dir else None)
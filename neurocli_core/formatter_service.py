@@ -0,0 +1,810 @@
+"""Resident formatter workers behind ``format_code``.
+
+Spawning ``python -m ruff`` or ``npx prettier`` per call costs tens of
+milliseconds to several seconds before any formatting happens. This service
+keeps one long-lived worker per formatter and talks to it over stdin/stdout:
+
+* ruff runs as ``ruff server`` and is driven with LSP (``Content-Length``
+  framed JSON-RPC) ``textDocument/formatting`` requests.
+* prettier runs inside ``formatter_workers/prettier_server.cjs`` with one
+  JSON object per line.
+
+Workers are started lazily, health-checked on demand, and restarted once when
+they crash or time out mid-request. When a worker cannot start, calls fall
+back to the original one-shot subprocess so behaviour never regresses. Every
+call is timed and the per-formatter metrics are exposed to callers.
+
+Results are cached by content, formatter version, and config file hashes (see
+``format_cache``), so reformatting unchanged or already formatted text skips
+the tool entirely.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Callable
+
+from neurocli_core.config import PROJECT_ROOT, get_env_flag, get_env_float
+from neurocli_core.format_cache import (
+    ConfigFingerprinter,
+    FormatCache,
+    build_cache_key,
+    build_default_format_cache,
+)
+
+
+PYTHON_EXTENSIONS = frozenset({".py"})
+WEB_EXTENSIONS = frozenset({".js", ".jsx", ".ts", ".tsx", ".json", ".css", ".html", ".md"})
+PRETTIER_SERVER_SCRIPT = Path(__file__).with_name("formatter_workers") / "prettier_server.cjs"
+
+DEFAULT_FORMAT_TIMEOUT = 10.0
+DEFAULT_START_TIMEOUT = 10.0
+# After a worker fails to start, one-shot calls are used for this long before
+# trying the worker again, so a missing tool does not cost a spawn per call.
+START_RETRY_SECONDS = 30.0
+HEALTH_CHECK_TIMEOUT = 2.0
+
+RUFF_CONFIG_FILES = ("pyproject.toml", "ruff.toml", ".ruff.toml")
+PRETTIER_CONFIG_FILES = (
+    ".prettierrc",
+    ".prettierrc.json",
+    ".prettierrc.yaml",
+    ".prettierrc.yml",
+    ".prettierrc.json5",
+    ".prettierrc.js",
+    ".prettierrc.cjs",
+    ".prettierrc.mjs",
+    ".prettierrc.toml",
+    "prettier.config.js",
+    "prettier.config.cjs",
+    "prettier.config.mjs",
+    ".prettierignore",
+    ".editorconfig",
+    "package.json",
+)
+
+
+class FormatterUnavailableError(RuntimeError):
+    """Raised when a formatter tool is not installed or not on PATH."""
+
+
+class FormatterWorkerError(RuntimeError):
+    """Raised when a resident worker dies, times out, or breaks protocol."""
+
+
+class FormatToolError(Exception):
+    """Raised when the formatter rejects the input, for example on a syntax error."""
+
+
+@dataclass(slots=True)
+class FormatterMetrics:
+    """Running timing and reliability counters for one formatter."""
+
+    formatter: str
+    mode: str = "idle"
+    calls: int = 0
+    failures: int = 0
+    restarts: int = 0
+    startup_ms: float | None = None
+    last_ms: float | None = None
+    total_ms: float = 0.0
+    last_error: str | None = None
+
+    @property
+    def average_ms(self) -> float | None:
+        return round(self.total_ms / self.calls, 3) if self.calls else None
+
+    def record(self, elapsed_ms: float, mode: str) -> None:
+        self.calls += 1
+        self.mode = mode
+        self.last_ms = round(elapsed_ms, 3)
+        self.total_ms += elapsed_ms
+
+    def to_dict(self) -> dict[str, Any]:
+        payload = asdict(self)
+        payload["total_ms"] = round(self.total_ms, 3)
+        payload["average_ms"] = self.average_ms
+        return payload
+
+
+@dataclass(slots=True)
+class FormatResult:
+    """Formatted content plus how and how fast it was produced.
+
+    ``mode`` is ``daemon``, ``oneshot``, ``cache``, ``rejected``, or ``skipped``.
+    """
+
+    content: str
+    formatter: str | None
+    mode: str
+    elapsed_ms: float
+    changed: bool
+    error: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Metrics form for API callers; the content travels separately."""
+
+        return {
+            "formatter": self.formatter,
+            "mode": self.mode,
+            "elapsed_ms": round(self.elapsed_ms, 3),
+            "changed": self.changed,
+            "error": self.error,
+        }
+
+
+class _PipeWorker(ABC):
+    """A child process answering framed JSON requests on stdin/stdout.
+
+    Subclasses supply the tool's wire format and handshake; this class owns the
+    process, the reader thread and request/reply matching.
+    """
+
+    name = "worker"
+
+    def __init__(self, command: list[str], *, cwd: Path, timeout: float) -> None:
+        self.command = command
+        self.cwd = cwd
+        self.timeout = timeout
+        self._process: subprocess.Popen[bytes] | None = None
+        self._replies: queue.Queue[dict[str, Any] | None] = queue.Queue()
+        self._next_id = 0
+        # Tool version reported during the handshake, when the protocol has one.
+        self.version: str | None = None
+
+    def start(self) -> None:
+        """Launch the process and complete the protocol handshake."""
+
+        try:
+            self._process = subprocess.Popen(
+                self.command,
+                cwd=self.cwd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                shell=(os.name == "nt"),
+            )
+        except OSError as exc:
+            raise FormatterWorkerError(f"{self.name} worker could not start: {exc}") from exc
+
+        threading.Thread(
+            target=self._read_loop,
+            args=(self._process.stdout,),
+            name=f"neurocli-{self.name}-reader",
+            daemon=True,
+        ).start()
+        try:
+            self._handshake()
+        except Exception:
+            self.stop()
+            raise
+
+    def stop(self) -> None:
+        process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            if process.stdin is not None:
+                process.stdin.close()
+            process.wait(timeout=1.0)
+        except (OSError, subprocess.TimeoutExpired):
+            process.kill()
+            process.wait()
+
+    def is_alive(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    @abstractmethod
+    def format(self, code: str, file_path: str) -> str:
+        """Return ``code`` formatted as the tool would format ``file_path``."""
+
+    @abstractmethod
+    def ping(self) -> None:
+        """Round-trip a cheap request, raising if the worker stopped answering."""
+
+    @abstractmethod
+    def _handshake(self) -> None:
+        """Complete the protocol's start-up exchange; called once by ``start``."""
+
+    @abstractmethod
+    def _encode(self, message: dict[str, Any]) -> bytes:
+        """Frame one outgoing message for the worker's stdin."""
+
+    @abstractmethod
+    def _read_message(self, stream: BinaryIO) -> dict[str, Any] | None:
+        """Read one framed message from ``stream``, or ``None`` at end of stream."""
+
+    def _read_loop(self, stream: BinaryIO) -> None:
+        try:
+            while True:
+                message = self._read_message(stream)
+                if message is None:
+                    break
+                self._replies.put(message)
+        except (OSError, ValueError):
+            pass
+        self._replies.put(None)
+
+    def _send(self, message: dict[str, Any]) -> None:
+        if self._process is None or self._process.stdin is None:
+            raise FormatterWorkerError(f"{self.name} worker is not running.")
+        try:
+            self._process.stdin.write(self._encode(message))
+            self._process.stdin.flush()
+        except OSError as exc:
+            raise FormatterWorkerError(f"{self.name} worker pipe closed: {exc}") from exc
+
+    def _call(self, message: dict[str, Any], *, timeout: float | None = None) -> dict[str, Any]:
+        """Send a request and wait for the reply with the same id, dropping notifications."""
+
+        self._next_id += 1
+        request_id = self._next_id
+        self._send({**message, "id": request_id})
+        return self._wait_for(request_id, timeout=self.timeout if timeout is None else timeout)
+
+    def _wait_for(self, request_id: int, *, timeout: float) -> dict[str, Any]:
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise FormatterWorkerError(f"{self.name} worker timed out after {timeout:g}s.")
+            try:
+                reply = self._replies.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if reply is None:
+                raise FormatterWorkerError(f"{self.name} worker exited.")
+            if reply.get("id") == request_id:
+                return reply
+
+
+class RuffServerWorker(_PipeWorker):
+    """``ruff server`` driven as a minimal LSP client."""
+
+    name = "ruff"
+
+    # A formatting round trip on this snippet doubles as the health check.
+    _PING_SOURCE = "x = 1\n"
+
+    def __init__(self, ruff_binary: str, *, cwd: Path, timeout: float) -> None:
+        super().__init__([ruff_binary, "server"], cwd=cwd, timeout=timeout)
+        self._position_encoding = "utf-16"
+        self._document_version = 0
+
+    def format(self, code: str, file_path: str) -> str:
+        uri = Path(file_path).resolve().as_uri()
+        self._document_version += 1
+        self._notify(
+            "textDocument/didOpen",
+            {
+                "textDocument": {
+                    "uri": uri,
+                    "languageId": "python",
+                    "version": self._document_version,
+                    "text": code,
+                }
+            },
+        )
+        try:
+            reply = self._call(
+                {
+                    "jsonrpc": "2.0",
+                    "method": "textDocument/formatting",
+                    "params": {
+                        "textDocument": {"uri": uri},
+                        "options": {"tabSize": 4, "insertSpaces": True},
+                    },
+                }
+            )
+        finally:
+            self._notify("textDocument/didClose", {"textDocument": {"uri": uri}})
+
+        if "error" in reply:
+            raise FormatToolError(reply["error"].get("message", "ruff could not format the file."))
+        # ``None`` means no edits, which is also what ruff returns for syntax errors.
+        return apply_text_edits(code, reply.get("result") or [], self._position_encoding)
+
+    def ping(self) -> None:
+        self.format(self._PING_SOURCE, str(self.cwd / "__neurocli_ping__.py"))
+
+    def stop(self) -> None:
+        if self.is_alive():
+            try:
+                self._notify("exit", {})
+            except FormatterWorkerError:
+                pass
+        super().stop()
+
+    def _handshake(self) -> None:
+        reply = self._call(
+            {
+                "jsonrpc": "2.0",
+                "method": "initialize",
+                "params": {
+                    "processId": os.getpid(),
+                    "rootUri": self.cwd.resolve().as_uri(),
+                    "capabilities": {"general": {"positionEncodings": ["utf-32", "utf-16"]}},
+                },
+            }
+        )
+        if "error" in reply:
+            raise FormatterWorkerError(f"ruff server refused to initialize: {reply['error']}")
+        result = reply.get("result", {})
+        capabilities = result.get("capabilities", {})
+        self._position_encoding = capabilities.get("positionEncoding", "utf-16")
+        self.version = result.get("serverInfo", {}).get("version")
+        self._notify("initialized", {})
+
+    def _notify(self, method: str, params: dict[str, Any]) -> None:
+        self._send({"jsonrpc": "2.0", "method": method, "params": params})
+
+    def _encode(self, message: dict[str, Any]) -> bytes:
+        body = json.dumps(message).encode("utf-8")
+        return b"Content-Length: %d\r\n\r\n%s" % (len(body), body)
+
+    def _read_message(self, stream: BinaryIO) -> dict[str, Any] | None:
+        content_length: int | None = None
+        while True:
+            line = stream.readline()
+            if not line:
+                return None
+            if line in (b"\r\n", b"\n"):
+                break
+            name, _, value = line.decode("ascii").partition(":")
+            if name.strip().lower() == "content-length":
+                content_length = int(value.strip())
+        if content_length is None:
+            raise ValueError("LSP message without Content-Length header.")
+        return json.loads(stream.read(content_length))
+
+
+class PrettierServerWorker(_PipeWorker):
+    """The resident node prettier worker speaking newline-delimited JSON."""
+
+    name = "prettier"
+
+    def __init__(self, node_binary: str, search_roots: list[Path], *, cwd: Path, timeout: float) -> None:
+        command = [node_binary, str(PRETTIER_SERVER_SCRIPT), *(str(root) for root in search_roots)]
+        super().__init__(command, cwd=cwd, timeout=timeout)
+
+    def format(self, code: str, file_path: str) -> str:
+        reply = self._call({"method": "format", "text": code, "filepath": file_path})
+        if not reply.get("ok"):
+            raise FormatToolError(reply.get("error", "prettier could not format the file."))
+        return reply["text"]
+
+    def ping(self) -> None:
+        reply = self._call({"method": "ping"}, timeout=HEALTH_CHECK_TIMEOUT)
+        if not reply.get("ok"):
+            raise FormatterWorkerError(reply.get("error", "prettier ping failed."))
+
+    def _handshake(self) -> None:
+        ready = self._wait_for(0, timeout=DEFAULT_START_TIMEOUT)
+        if not ready.get("ready"):
+            raise FormatterWorkerError(ready.get("error", "prettier worker failed to start."))
+        self.version = ready.get("version")
+
+    def _encode(self, message: dict[str, Any]) -> bytes:
+        return json.dumps(message).encode("utf-8") + b"\n"
+
+    def _read_message(self, stream: BinaryIO) -> dict[str, Any] | None:
+        while True:
+            line = stream.readline()
+            if not line:
+                return None
+            if line.strip():
+                return json.loads(line)
+
+
+class ManagedFormatter:
+    """One formatter: a resident worker when it can run, a one-shot subprocess otherwise."""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        worker_factory: Callable[[], _PipeWorker] | None,
+        oneshot_command: Callable[[str], list[str]],
+        install_message: str,
+        timeout: float,
+        version_command: list[str] | None = None,
+        config_files: tuple[str, ...] = (),
+    ) -> None:
+        self.name = name
+        self.metrics = FormatterMetrics(formatter=name)
+        self.config_files = config_files
+        self._worker_factory = worker_factory
+        self._oneshot_command = oneshot_command
+        self._install_message = install_message
+        self._timeout = timeout
+        self._version_command = version_command
+        self._version: str | None = None
+        self._worker: _PipeWorker | None = None
+        self._retry_worker_at = 0.0
+        self._lock = threading.Lock()
+
+    def format(self, code: str, file_path: str) -> tuple[str, str]:
+        """Return ``(formatted, mode)``; raises ``FormatToolError`` when the tool rejects the input."""
+
+        started_at = time.perf_counter()
+        try:
+            with self._lock:
+                content = self._format_with_worker(code, file_path)
+            mode = "daemon"
+            if content is None:
+                # One-shot subprocesses share no state, so they run outside the
+                # lock and batch callers get real parallelism on this path.
+                content, mode = self._run_oneshot(code, file_path), "oneshot"
+        except Exception as exc:
+            with self._lock:
+                self.metrics.failures += 1
+                self.metrics.last_error = str(exc)
+            raise
+        with self._lock:
+            self.metrics.record((time.perf_counter() - started_at) * 1000, mode)
+        return content, mode
+
+    def health(self) -> dict[str, Any]:
+        """Ping the resident worker (starting it if needed) and report its state."""
+
+        with self._lock:
+            worker = self._ensure_worker()
+            healthy = False
+            ping_ms: float | None = None
+            if worker is not None:
+                started_at = time.perf_counter()
+                try:
+                    worker.ping()
+                    healthy = True
+                    ping_ms = round((time.perf_counter() - started_at) * 1000, 3)
+                except (FormatterWorkerError, FormatToolError) as exc:
+                    self.metrics.last_error = str(exc)
+                    self._discard_worker()
+            return {
+                **self.metrics.to_dict(),
+                "resident": worker is not None,
+                "healthy": healthy,
+                "ping_ms": ping_ms,
+            }
+
+    def version(self) -> str | None:
+        """Return the tool version, or ``None`` when it cannot be determined.
+
+        The resident worker's handshake is preferred; otherwise
+        ``version_command`` is run once and its output remembered.
+        """
+
+        with self._lock:
+            if self._version is None:
+                worker = self._ensure_worker()
+                if worker is not None and worker.version:
+                    self._version = worker.version
+                elif self._version_command is not None:
+                    self._version = self._probe_version()
+            return self._version
+
+    def close(self) -> None:
+        with self._lock:
+            self._discard_worker()
+
+    def _probe_version(self) -> str | None:
+        try:
+            result = subprocess.run(
+                self._version_command,
+                capture_output=True,
+                text=True,
+                check=True,
+                timeout=self._timeout,
+                shell=(os.name == "nt"),
+            )
+        except (OSError, subprocess.SubprocessError):
+            return None
+        return result.stdout.strip() or None
+
+    def _format_with_worker(self, code: str, file_path: str) -> str | None:
+        """Format on the resident worker, or return ``None`` when the one-shot path must be used."""
+
+        worker = self._ensure_worker()
+        if worker is None:
+            return None
+        try:
+            return worker.format(code, file_path)
+        except FormatterWorkerError as exc:
+            # One restart per call: a crashed or wedged worker gets a fresh
+            # process, and a second failure drops to the one-shot path.
+            self.metrics.last_error = str(exc)
+            self.metrics.restarts += 1
+            self._discard_worker()
+        worker = self._ensure_worker()
+        if worker is None:
+            return None
+        try:
+            return worker.format(code, file_path)
+        except FormatterWorkerError as exc:
+            self.metrics.last_error = str(exc)
+            self._discard_worker()
+            self._retry_worker_at = time.monotonic() + START_RETRY_SECONDS
+            return None
+
+    def _ensure_worker(self) -> _PipeWorker | None:
+        if self._worker is not None and self._worker.is_alive():
+            return self._worker
+        if self._worker is not None:
+            # The worker died between calls; replacing it counts as a restart.
+            self.metrics.restarts += 1
+            self._discard_worker()
+        if self._worker_factory is None or time.monotonic() < self._retry_worker_at:
+            return None
+
+        started_at = time.perf_counter()
+        try:
+            worker = self._worker_factory()
+            worker.start()
+        except (FormatterWorkerError, OSError) as exc:
+            self.metrics.last_error = str(exc)
+            self._retry_worker_at = time.monotonic() + START_RETRY_SECONDS
+            return None
+
+        self.metrics.startup_ms = round((time.perf_counter() - started_at) * 1000, 3)
+        self._worker = worker
+        return worker
+
+    def _discard_worker(self) -> None:
+        worker, self._worker = self._worker, None
+        if worker is not None:
+            # A replacement worker may be a different install; ask again.
+            self._version = None
+            worker.stop()
+
+    def _run_oneshot(self, code: str, file_path: str) -> str:
+        try:
+            result = subprocess.run(
+                self._oneshot_command(file_path),
+                input=code,
+                capture_output=True,
+                text=True,
+                check=True,
+                timeout=self._timeout,
+                shell=(os.name == "nt"),
+            )
+        except FileNotFoundError:
+            raise FormatterUnavailableError(
+                f"The '{self.name}' formatter is not installed or not in PATH. "
+                f"{self._install_message}"
+            ) from None
+        except subprocess.CalledProcessError as exc:
+            raise FormatToolError(exc.stderr or f"{self.name} exited with {exc.returncode}.") from exc
+        except subprocess.TimeoutExpired as exc:
+            raise FormatToolError(f"{self.name} timed out after {self._timeout:g}s.") from exc
+        return result.stdout
+
+
+class FormatterService:
+    """Routes files to their formatter by extension and tracks per-formatter metrics."""
+
+    def __init__(
+        self,
+        formatters: dict[str, ManagedFormatter],
+        routes: dict[str, str],
+        *,
+        cache: FormatCache | None = None,
+    ) -> None:
+        self._formatters = formatters
+        self._routes = routes
+        self.cache = cache
+        self._fingerprinter = ConfigFingerprinter()
+
+    def formatter_for(self, file_path: str) -> ManagedFormatter | None:
+        name = self._routes.get(Path(file_path).suffix.lower())
+        return self._formatters.get(name) if name else None
+
+    def format(self, code: str, file_path: str) -> FormatResult:
+        """Format ``code`` for ``file_path``; unsupported files and tool rejections return it unchanged."""
+
+        formatter = self.formatter_for(file_path)
+        if formatter is None:
+            return FormatResult(code, None, "skipped", 0.0, changed=False)
+
+        started_at = time.perf_counter()
+        make_key = self._key_builder(formatter, file_path)
+        key = make_key(code) if make_key is not None else None
+        if key is not None:
+            cached = self.cache.get(key, code)
+            if cached is not None:
+                elapsed_ms = (time.perf_counter() - started_at) * 1000
+                return FormatResult(cached, formatter.name, "cache", elapsed_ms, cached != code)
+
+        try:
+            content, mode = formatter.format(code, file_path)
+            error = None
+        except FormatToolError as exc:
+            content, mode, error = code, "rejected", str(exc)
+        if key is not None and error is None:
+            # The output is itself formatted, so record that verdict as well.
+            self.cache.put(key, code, content, formatted_key=make_key(content))
+        elapsed_ms = (time.perf_counter() - started_at) * 1000
+        return FormatResult(content, formatter.name, mode, elapsed_ms, content != code, error)
+
+    def metrics(self) -> dict[str, dict[str, Any]]:
+        return {name: formatter.metrics.to_dict() for name, formatter in self._formatters.items()}
+
+    def cache_stats(self) -> dict[str, Any] | None:
+        return self.cache.stats.to_dict() if self.cache is not None else None
+
+    def _key_builder(self, formatter: ManagedFormatter, file_path: str) -> Callable[[str], str] | None:
+        """Return a content -> cache key function, or ``None`` when results cannot be cached."""
+
+        if self.cache is None:
+            return None
+        version = formatter.version()
+        if version is None:
+            # Without a version a tool upgrade could silently serve stale output.
+            return None
+        fingerprint = self._fingerprinter.fingerprint(file_path, formatter.config_files)
+        return lambda content: build_cache_key(
+            content,
+            formatter=formatter.name,
+            version=version,
+            file_path=file_path,
+            config_fingerprint=fingerprint,
+        )
+
+    def health(self) -> dict[str, dict[str, Any]]:
+        return {name: formatter.health() for name, formatter in self._formatters.items()}
+
+    def close(self) -> None:
+        for formatter in self._formatters.values():
+            formatter.close()
+
+
+def build_default_formatter_service() -> FormatterService:
+    """Build ruff and prettier formatters from the current environment."""
+
+    timeout = get_env_float("NEUROCLI_FORMAT_TIMEOUT", DEFAULT_FORMAT_TIMEOUT)
+    resident = get_env_flag("NEUROCLI_FORMATTER_DAEMON", True)
+    cwd = Path.cwd()
+    ruff_binary = _find_ruff_binary()
+    node_binary = shutil.which("node")
+
+    ruff_factory = None
+    if resident and ruff_binary:
+        ruff_factory = lambda: RuffServerWorker(ruff_binary, cwd=cwd, timeout=timeout)  # noqa: E731
+
+    prettier_factory = None
+    if resident and node_binary:
+        search_roots = [cwd, PROJECT_ROOT, PROJECT_ROOT / "web_client"]
+        prettier_factory = lambda: PrettierServerWorker(  # noqa: E731
+            node_binary, search_roots, cwd=cwd, timeout=timeout
+        )
+
+    ruff_command = [ruff_binary] if ruff_binary else [sys.executable, "-m", "ruff"]
+    formatters = {
+        "ruff": ManagedFormatter(
+            "ruff",
+            worker_factory=ruff_factory,
+            oneshot_command=lambda _file_path: [*ruff_command, "format", "-"],
+            install_message="Please run 'pip install ruff'.",
+            timeout=timeout,
+            version_command=[*ruff_command, "--version"],
+            config_files=RUFF_CONFIG_FILES,
+        ),
+        "prettier": ManagedFormatter(
+            "prettier",
+            worker_factory=prettier_factory,
+            # npx is generally available with Node.js installations.
+            oneshot_command=lambda file_path: ["npx", "prettier", "--stdin-filepath", file_path],
+            install_message="Please ensure Node.js and 'npx' are installed.",
+            timeout=timeout,
+            # Asking npx for a version can mean a network install, so one-shot
+            # prettier results are only cached once the resident worker reports one.
+            config_files=PRETTIER_CONFIG_FILES,
+        ),
+    }
+    routes = {ext: "ruff" for ext in PYTHON_EXTENSIONS}
+    routes.update({ext: "prettier" for ext in WEB_EXTENSIONS})
+    cache = build_default_format_cache() if get_env_flag("NEUROCLI_FORMAT_CACHE", True) else None
+    return FormatterService(formatters, routes, cache=cache)
+
+
+def apply_text_edits(text: str, edits: list[dict[str, Any]], position_encoding: str = "utf-16") -> str:
+    """Apply LSP ``TextEdit`` objects to ``text``."""
+
+    if not edits:
+        return text
+
+    line_starts = _line_starts(text)
+
+    def offset(position: dict[str, int]) -> int:
+        line = position["line"]
+        if line >= len(line_starts):
+            return len(text)
+        start = line_starts[line]
+        end = line_starts[line + 1] if line + 1 < len(line_starts) else len(text)
+        return start + _column_to_index(text[start:end], position["character"], position_encoding)
+
+    resolved = sorted(
+        ((offset(edit["range"]["start"]), offset(edit["range"]["end"]), edit["newText"]) for edit in edits),
+        reverse=True,
+    )
+    for start, end, new_text in resolved:
+        text = text[:start] + new_text + text[end:]
+    return text
+
+
+_service: FormatterService | None = None
+_service_lock = threading.Lock()
+
+
+def get_formatter_service() -> FormatterService:
+    """Return the process-wide formatter service, building it on first use."""
+
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = build_default_formatter_service()
+        return _service
+
+
+def close_formatter_service() -> None:
+    """Stop every resident worker; the next call starts fresh ones."""
+
+    global _service
+    with _service_lock:
+        service, _service = _service, None
+    if service is not None:
+        service.close()
+
+
+atexit.register(close_formatter_service)
+
+
+def _line_starts(text: str) -> list[int]:
+    starts = [0]
+    index = 0
+    length = len(text)
+    while index < length:
+        char = text[index]
+        if char == "\r" and index + 1 < length and text[index + 1] == "\n":
+            index += 1
+        if char in "\r\n":
+            starts.append(index + 1)
+        index += 1
+    return starts
+
+
+def _column_to_index(line: str, column: int, position_encoding: str) -> int:
+    if position_encoding == "utf-32":
+        return min(column, len(line))
+
+    units = 0
+    for index, char in enumerate(line):
+        if units >= column:
+            return index
+        if position_encoding == "utf-8":
+            units += len(char.encode("utf-8"))
+        else:
+            # Characters outside the BMP are a surrogate pair in UTF-16.
+            units += 2 if ord(char) > 0xFFFF else 1
+    return len(line)
+
+
+def _find_ruff_binary() -> str | None:
+    try:
+        from ruff.__main__ import find_ruff_bin
+    except ImportError:
+        return shutil.which("ruff")
+    try:
+        return os.fsdecode(find_ruff_bin())
+    except FileNotFoundError:
+        return shutil.which("ruff")
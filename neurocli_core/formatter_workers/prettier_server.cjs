@@ -0,0 +1,73 @@
+// Resident prettier worker for neurocli_core.formatter_service.
+//
+// Protocol: one JSON object per line on stdin and stdout.
+//   -> {"id": 1, "method": "format", "text": "...", "filepath": "src/App.jsx"}
+//   <- {"id": 1, "ok": true, "text": "..."}
+//   -> {"id": 2, "method": "ping"}
+//   <- {"id": 2, "ok": true, "version": "3.x"}
+// On startup the worker writes {"id": 0, "ready": true, "version": "..."}, or
+// {"id": 0, "ready": false, "error": "..."} and exits when prettier is missing.
+
+const path = require('node:path')
+const readline = require('node:readline')
+const { createRequire } = require('node:module')
+
+function loadPrettier(searchRoots) {
+  for (const root of searchRoots) {
+    try {
+      return createRequire(path.join(path.resolve(root), 'noop.js'))('prettier')
+    } catch {
+      // Try the next root.
+    }
+  }
+  return null
+}
+
+function send(message) {
+  process.stdout.write(`${JSON.stringify(message)}\n`)
+}
+
+const searchRoots = process.argv.slice(2)
+const prettier = loadPrettier(searchRoots.length > 0 ? searchRoots : [process.cwd()])
+if (!prettier) {
+  send({ id: 0, ready: false, error: `prettier is not installed under: ${searchRoots.join(', ')}` })
+  process.exit(3)
+}
+
+send({ id: 0, ready: true, version: prettier.version })
+
+async function handle(request) {
+  if (request.method === 'ping') {
+    return { id: request.id, ok: true, version: prettier.version }
+  }
+
+  if (request.method === 'format') {
+    try {
+      const config = (await prettier.resolveConfig(request.filepath)) || {}
+      const text = await prettier.format(request.text, { ...config, filepath: request.filepath })
+      return { id: request.id, ok: true, text }
+    } catch (error) {
+      return { id: request.id, ok: false, error: String(error && error.message ? error.message : error) }
+    }
+  }
+
+  return { id: request.id, ok: false, error: `unknown method: ${request.method}` }
+}
+
+// Requests are answered strictly in order so the caller can match replies by id.
+let queue = Promise.resolve()
+readline.createInterface({ input: process.stdin }).on('line', (line) => {
+  if (!line.trim()) {
+    return
+  }
+  queue = queue.then(async () => {
+    let request
+    try {
+      request = JSON.parse(line)
+    } catch {
+      send({ id: null, ok: false, error: 'invalid JSON request' })
+      return
+    }
+    send(await handle(request))
+  })
+})
@@ -1,30 +1,89 @@
 """Core logic for Git operations and AI commit generation."""
 
 import subprocess
-from typing import Tuple
+from dataclasses import asdict, dataclass
+from typing import Iterator, List, Optional, Sequence, Tuple
 
-from neurocli_core.config import get_openai_api_key
-from neurocli_core.llm_api_openai import call_openai_api
 
+@dataclass(slots=True)
+class DiffFileStat:
+    """One file from `git diff --numstat`; counts are None for binary files."""
 
-def get_staged_diff() -> Tuple[str, bool]:
+    path: str
+    added: Optional[int]
+    deleted: Optional[int]
+    old_path: Optional[str] = None
+
+    @property
+    def binary(self) -> bool:
+        return self.added is None
+
+    def to_dict(self) -> dict:
+        payload = asdict(self)
+        payload["binary"] = self.binary
+        return payload
+
+
+def has_staged_changes(cwd=None) -> bool:
+    """Return True when the index differs from HEAD, without producing a diff."""
+    result = subprocess.run(
+        ["git", "diff", "--cached", "--quiet"],
+        capture_output=True,
+        cwd=cwd
+    )
+    if result.returncode not in (0, 1):
+        raise RuntimeError(f"Git diff failed: {result.stderr.decode('utf-8', 'replace')}")
+    return result.returncode == 1
+
+
+def _diff_command(cached: bool, paths: Optional[Sequence[str]], *options: str) -> List[str]:
+    command = ["git", "diff"]
+    if cached:
+        command.append("--cached")
+    command.extend(options)
+    if paths:
+        command.append("--")
+        command.extend(paths)
+    return command
+
+
+def get_staged_diff(paths: Optional[Sequence[str]] = None, cwd=None) -> Tuple[str, bool]:
     """Get the diff of staged changes.
     
     If nothing is staged, falls back to the diff of all tracked changes.
     
+    Args:
+        paths: Optional pathspecs limiting the diff to these files or folders.
+               Staged-versus-fallback is still decided for the whole repository,
+               so a filtered diff always matches `get_diff_stats`.
+        cwd: Repository directory; defaults to the process working directory.
+    
     Returns:
         Tuple[str, bool]: A tuple containing the diff text and a boolean
                           indicating whether it's a fallback (True if fallback,
                           False if there were staged changes).
     """
     try:
+        if paths:
+            cached = has_staged_changes(cwd)
+            result = subprocess.run(
+                _diff_command(cached, paths),
+                capture_output=True,
+                encoding="utf-8",
+                errors="replace",
+                check=True,
+                cwd=cwd
+            )
+            return result.stdout.strip(), not cached
+
         # Check for staged changes
         staged_result = subprocess.run(
             ["git", "diff", "--cached"],
             capture_output=True,
             encoding="utf-8",
             errors="replace",
-            check=True
+            check=True,
+            cwd=cwd
         )
         staged_diff = staged_result.stdout.strip()
         
@@ -37,7 +96,8 @@ def get_staged_diff() -> Tuple[str, bool]:
             capture_output=True,
             encoding="utf-8",
             errors="replace",
-            check=True
+            check=True,
+            cwd=cwd
         )
         # Handle the case where the fallback reading thread somehow still fails
         unstaged_diff = unstaged_result.stdout.strip() if unstaged_result.stdout else ""
@@ -48,39 +108,212 @@ def get_staged_diff() -> Tuple[str, bool]:
         raise RuntimeError(f"Git diff failed: {e.stderr}") from e
 
 
+def get_diff_stats(paths: Optional[Sequence[str]] = None, cwd=None) -> Tuple[List[DiffFileStat], bool]:
+    """List changed files with line counts (`git diff --numstat`), without any diff text.
+    
+    Uses the same staged-or-fallback choice as `get_staged_diff`.
+    
+    Returns:
+        Tuple[List[DiffFileStat], bool]: The files and whether this is the
+                                         unstaged fallback.
+    """
+    try:
+        cached = has_staged_changes(cwd)
+        result = subprocess.run(
+            _diff_command(cached, paths, "--numstat", "-z", "--find-renames"),
+            capture_output=True,
+            check=True,
+            cwd=cwd
+        )
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"Git diff failed: {e.stderr.decode('utf-8', 'replace')}") from e
+    return parse_numstat(result.stdout.decode("utf-8", "replace")), not cached
+
+
+def parse_numstat(output: str) -> List[DiffFileStat]:
+    """Parse `git diff --numstat -z` output, including renames."""
+    stats = []
+    records = iter(output.split("\0"))
+    for record in records:
+        if not record:
+            continue
+        added, deleted, path = record.split("\t", 2)
+        old_path = None
+        if not path:
+            # Renames: "added\tdeleted\t" then the old and new paths as records.
+            old_path = next(records, "")
+            path = next(records, "")
+        stats.append(DiffFileStat(
+            path=path,
+            added=None if added == "-" else int(added),
+            deleted=None if deleted == "-" else int(deleted),
+            old_path=old_path,
+        ))
+    return stats
+
+
+def iter_file_diffs(
+    paths: Optional[Sequence[str]] = None,
+    cwd=None,
+    cached: Optional[bool] = None,
+) -> Iterator[Tuple[str, str]]:
+    """Yield `(path, diff_text)` per file while `git diff` is still running.
+    
+    Nothing is buffered beyond the current file, so very large change sets
+    can be streamed to a client file by file.
+    
+    Args:
+        paths: Optional pathspecs limiting the diff.
+        cwd: Repository directory; defaults to the process working directory.
+        cached: Diff the index (True) or the worktree (False); by default the
+                same staged-or-fallback choice as `get_staged_diff`.
+
+    Raises:
+        RuntimeError: If `git diff` exits with an error once its output has been
+                      read; closing the generator early never raises.
+    """
+    if cached is None:
+        cached = has_staged_changes(cwd)
+    # quotePath=false keeps non-ASCII names readable; names with tabs, quotes,
+    # or newlines are still C-quoted and go through _unquote_path.
+    command = _diff_command(cached, paths, "--find-renames")
+    command[1:1] = ["-c", "core.quotePath=false"]
+    process = subprocess.Popen(
+        command,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        cwd=cwd
+    )
+    path = None
+    in_header = False
+    lines: List[str] = []
+    try:
+        for raw_line in process.stdout:
+            line = raw_line.decode("utf-8", "replace")
+            if line.startswith("diff --git "):
+                if path is not None:
+                    yield path, "".join(lines)
+                # "diff --git a/x b/x" is ambiguous for names with spaces; the
+                # header lines below (when present) give the exact path.
+                header = line.rstrip("\n")
+                if header.endswith('"') and ' "b/' in header:
+                    path = _unquote_path('"' + header.rsplit(' "b/', 1)[-1])
+                else:
+                    path = header.rsplit(" b/", 1)[-1]
+                in_header = True
+                lines = []
+            elif in_header and line.startswith("@@"):
+                in_header = False
+            elif in_header:
+                header_path = _header_path(line)
+                if header_path is not None:
+                    path = header_path
+            lines.append(line)
+        if path is not None:
+            yield path, "".join(lines)
+        # stdout is drained, so git is done writing; its stderr is small.
+        stderr = process.stderr.read()
+        if process.wait() != 0:
+            raise RuntimeError(f"Git diff failed: {stderr.decode('utf-8', 'replace').strip()}")
+    finally:
+        process.stdout.close()
+        process.stderr.close()
+        if process.poll() is None:
+            process.kill()
+        process.wait()
+
+
+def _header_path(line: str) -> Optional[str]:
+    """Return the new-side path named by a diff header line, if it names one."""
+    line = line.rstrip("\n")
+    for prefix in ("rename to ", "copy to "):
+        if line.startswith(prefix):
+            return _unquote_path(line[len(prefix):])
+    for marker, side in (("+++ ", "b/"), ("--- ", "a/")):
+        if line.startswith(marker):
+            # Git appends a tab after names that contain spaces.
+            name = _unquote_path(line[len(marker):].rstrip("\t"))
+            if name.startswith(side):
+                return name[len(side):]
+    return None
+
+
+_C_ESCAPES = {"a": 7, "b": 8, "t": 9, "n": 10, "v": 11, "f": 12, "r": 13, '"': 34, "\\": 92}
+
+
+def _unquote_path(text: str) -> str:
+    """Undo git's C-style quoting (``"caf\\303\\251.py"``); unquoted text is returned as is."""
+    if len(text) < 2 or not (text.startswith('"') and text.endswith('"')):
+        return text
+    body = text[1:-1]
+    raw = bytearray()
+    index = 0
+    while index < len(body):
+        char = body[index]
+        if char != "\\" or index + 1 == len(body):
+            raw += char.encode("utf-8")
+            index += 1
+            continue
+        escape = body[index + 1]
+        octal = body[index + 1:index + 4]
+        if len(octal) == 3 and all(digit in "01234567" for digit in octal):
+            raw.append(int(octal, 8) & 0xFF)
+            index += 4
+        elif escape in _C_ESCAPES:
+            raw.append(_C_ESCAPES[escape])
+            index += 2
+        else:
+            raw += escape.encode("utf-8")
+            index += 2
+    return raw.decode("utf-8", "replace")
+
+
 def generate_commit_message(diff_text: str) -> str:
     """Generate a Conventional Commit message using AI based on a diff.
     
+    Large diffs are summarized file by file first; see
+    ``neurocli_core.commit_summarizer``.
+    
     Args:
         diff_text: The output from `git diff`.
         
     Returns:
         str: The generated commit message.
     """
-    if not diff_text:
-        return "No changes detected to commit."
-
-    prompt = (
-        "You are an expert developer. Generate a concise Conventional Commit message "
-        "for the following diff. Only return the commit message text. Do not use Markdown "
-        "code blocks around it. Do not include introductory text.\n\n"
-        f"DIFF:\n{diff_text}"
-    )
+    from neurocli_core.commit_summarizer import get_commit_summarizer
 
-    api_key = get_openai_api_key()
-    if not api_key:
-        raise ValueError("OpenAI API key not found. Please set it in the .env file.")
+    # Raises ProviderConfigurationError (a ValueError) when no key is configured.
+    return get_commit_summarizer().summarize(diff_text).message
+
+
+def stream_commit_message(diff_text: str, should_stop=None):
+    """Stream a commit message for a diff as ``CommitStreamEvent`` objects.
+    
+    Args:
+        diff_text: The output from `git diff`, as returned by `get_staged_diff`.
+        should_stop: Optional callable; once it returns True the model stream
+                     is closed and a ``cancelled`` event ends the stream.
+        
+    Yields:
+        CommitStreamEvent: ``start``, ``progress``, ``delta``, then ``complete``,
+                           ``cancelled`` or ``error``.
+    """
+    from neurocli_core.commit_summarizer import get_commit_summarizer
 
-    return call_openai_api(api_key, prompt).strip()
+    return get_commit_summarizer().stream(diff_text, should_stop=should_stop)
 
 
-def execute_commit_and_push(commit_message: str, add_all: bool = False) -> None:
-    """Commit changes with the given message and push to the remote repository.
+def execute_commit(commit_message: str, add_all: bool = False, cwd=None) -> str:
+    """Commit changes with the given message, without pushing.
     
     Args:
         commit_message: The commit message to use.
         add_all: If True, uses `git commit -am` to automatically stage tracked changes.
                  Otherwise, uses `git commit -m`.
+        cwd: Repository directory; defaults to the process working directory.
+        
+    Returns:
+        str: The abbreviated hash of the new commit.
     """
     try:
         commit_cmd = ["git", "commit"]
@@ -88,23 +321,52 @@ def execute_commit_and_push(commit_message: str, add_all: bool = False) -> None:
             commit_cmd.append("-a")
         commit_cmd.extend(["-m", commit_message])
 
-        # Execute commit
-        commit_result = subprocess.run(
+        subprocess.run(
             commit_cmd,
             capture_output=True,
             encoding="utf-8",
             errors="replace",
-            check=True
+            check=True,
+            cwd=cwd
         )
-        
-        # Execute push
-        push_result = subprocess.run(
-            ["git", "push"],
+        head_result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
             capture_output=True,
             encoding="utf-8",
-            errors="replace",
-            check=True
+            check=True,
+            cwd=cwd
         )
-        
+        return head_result.stdout.strip()
+
     except subprocess.CalledProcessError as e:
         raise RuntimeError(f"Git operation failed: {e.stderr or e.stdout}") from e
+
+
+def start_push(cwd=None):
+    """Start `git push` as a background job and return it at once.
+    
+    Progress, cancellation, and the final status are available through
+    ``neurocli_core.git_jobs.get_push_job_manager()`` and the job ID.
+    """
+    from neurocli_core.git_jobs import get_push_job_manager
+
+    return get_push_job_manager().start_push(cwd)
+
+
+def execute_commit_and_push(commit_message: str, add_all: bool = False) -> None:
+    """Commit changes with the given message and push to the remote repository.
+    
+    Blocks until the push finishes; use `execute_commit` and `start_push`
+    to return after the commit and push in the background.
+    
+    Args:
+        commit_message: The commit message to use.
+        add_all: If True, uses `git commit -am` to automatically stage tracked changes.
+                 Otherwise, uses `git commit -m`.
+    """
+    from neurocli_core.git_jobs import get_push_job_manager
+
+    execute_commit(commit_message, add_all=add_all)
+    job = get_push_job_manager().wait(start_push().job_id)
+    if job.status != "succeeded":
+        raise RuntimeError(f"Git operation failed: {job.error}")
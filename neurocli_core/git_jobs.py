@@ -0,0 +1,301 @@
+"""Background ``git push`` jobs with parsed progress.
+
+A commit returns as soon as it is recorded locally; the push runs on a
+daemon thread as a ``PushJob``. Progress lines that ``git push --progress``
+writes to stderr (``Writing objects:  40% (2/5)``, separated by ``\\r``)
+are parsed into ``phase``/``percent``/``current``/``total`` so the API can
+stream them over SSE and the TUI can show them. Jobs can be cancelled,
+which terminates the git process.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import subprocess
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterator, Literal
+
+
+PushJobStatus = Literal["running", "succeeded", "failed", "cancelled"]
+
+MAX_FINISHED_JOBS = 20
+MAX_OUTPUT_LINES = 50
+# How long a cancelled push gets to exit after SIGTERM before it is killed.
+CANCEL_GRACE_SECONDS = 3.0
+
+_PROGRESS_LINE = re.compile(
+    r"^(?:remote:\s*)?(?P<phase>[A-Za-z][A-Za-z ]*?):\s+(?P<percent>\d{1,3})% \((?P<current>\d+)/(?P<total>\d+)\)"
+)
+
+
+@dataclass(slots=True)
+class PushProgress:
+    phase: str
+    percent: int
+    current: int
+    total: int
+
+
+@dataclass(slots=True)
+class PushJob:
+    job_id: str
+    cwd: str
+    args: list[str]
+    status: PushJobStatus = "running"
+    progress: PushProgress | None = None
+    output: deque[str] = field(default_factory=lambda: deque(maxlen=MAX_OUTPUT_LINES))
+    error: str | None = None
+    returncode: int | None = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: float | None = None
+    # Bumped on every change so watchers can wait for the next one.
+    version: int = 0
+
+    @property
+    def done(self) -> bool:
+        return self.status != "running"
+
+    def to_dict(self) -> dict[str, Any]:
+        progress = self.progress
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "phase": progress.phase if progress else None,
+            "percent": progress.percent if progress else None,
+            "current": progress.current if progress else None,
+            "total": progress.total if progress else None,
+            "output": list(self.output),
+            "error": self.error,
+            "returncode": self.returncode,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+def parse_push_progress(line: str) -> PushProgress | None:
+    """Parse one ``git push --progress`` line such as ``Writing objects:  40% (2/5), 1 KiB``."""
+
+    match = _PROGRESS_LINE.match(line.strip())
+    if match is None:
+        return None
+    return PushProgress(
+        phase=match.group("phase"),
+        percent=int(match.group("percent")),
+        current=int(match.group("current")),
+        total=int(match.group("total")),
+    )
+
+
+class PushJobManager:
+    """Starts, tracks, watches, and cancels push jobs."""
+
+    def __init__(self, *, max_finished: int = MAX_FINISHED_JOBS) -> None:
+        self.max_finished = max_finished
+        self._jobs: OrderedDict[str, PushJob] = OrderedDict()
+        self._processes: dict[str, subprocess.Popen[bytes]] = {}
+        self._cancelled: set[str] = set()
+        self._changed = threading.Condition()
+
+    def start_push(
+        self,
+        cwd: str | Path | None = None,
+        *,
+        remote: str | None = None,
+        branch: str | None = None,
+    ) -> PushJob:
+        """Start ``git push --progress`` on a background thread and return its job."""
+
+        args = ["git", "push", "--progress"]
+        if remote:
+            args.append(remote)
+            if branch:
+                args.append(branch)
+        return self._launch(PushJob(job_id=uuid.uuid4().hex, cwd=str(cwd or os.getcwd()), args=args))
+
+    def get(self, job_id: str) -> PushJob:
+        with self._changed:
+            job = self._jobs.get(job_id)
+        if job is None:
+            raise KeyError(f"Unknown push job: {job_id}")
+        return job
+
+    def jobs(self) -> list[PushJob]:
+        with self._changed:
+            return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> PushJob:
+        """Terminate a running push; finished jobs are returned unchanged."""
+
+        job = self.get(job_id)
+        with self._changed:
+            if job.done:
+                return job
+            self._cancelled.add(job_id)
+            process = self._processes.get(job_id)
+        # A process not spawned yet is terminated by _run as soon as it starts.
+        if process is not None:
+            process.terminate()
+            try:
+                process.wait(timeout=CANCEL_GRACE_SECONDS)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        # Give the job thread a moment to record the cancelled status.
+        return self.wait(job_id, timeout=CANCEL_GRACE_SECONDS)
+
+    def watch(
+        self,
+        job_id: str,
+        *,
+        should_stop: Callable[[], bool] | None = None,
+        poll_interval: float = 0.5,
+    ) -> Iterator[dict[str, Any]]:
+        """Yield a snapshot of the job each time it changes, ending once it is done."""
+
+        job = self.get(job_id)
+        seen = -1
+        while True:
+            with self._changed:
+                while job.version == seen and not job.done:
+                    self._changed.wait(timeout=poll_interval)
+                    if should_stop is not None and should_stop():
+                        return
+                seen = job.version
+                snapshot = job.to_dict()
+            yield snapshot
+            if snapshot["status"] != "running":
+                return
+
+    def wait(self, job_id: str, timeout: float | None = None) -> PushJob:
+        job = self.get(job_id)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._changed:
+            while not job.done:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                self._changed.wait(timeout=remaining)
+        return job
+
+    def _launch(self, job: PushJob) -> PushJob:
+        with self._changed:
+            self._jobs[job.job_id] = job
+            self._prune()
+        threading.Thread(
+            target=self._run, args=(job,), name=f"git-push-{job.job_id[:8]}", daemon=True
+        ).start()
+        return job
+
+    def _run(self, job: PushJob) -> None:
+        # Never block on a credential prompt: fail and report instead.
+        env = {**os.environ, "GIT_TERMINAL_PROMPT": "0"}
+        try:
+            process = subprocess.Popen(
+                job.args,
+                cwd=job.cwd,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                env=env,
+            )
+        except OSError as exc:
+            self._finish(job, "failed", error=f"Could not start git push: {exc}")
+            return
+
+        with self._changed:
+            self._processes[job.job_id] = process
+            cancelled_early = job.job_id in self._cancelled
+        if cancelled_early:
+            process.terminate()
+
+        for line in _iter_progress_lines(process.stdout):
+            self._record_line(job, line)
+        returncode = process.wait()
+
+        with self._changed:
+            self._processes.pop(job.job_id, None)
+            cancelled = job.job_id in self._cancelled
+            self._cancelled.discard(job.job_id)
+        if cancelled:
+            self._finish(job, "cancelled", returncode=returncode, error="Push cancelled.")
+        elif returncode == 0:
+            self._finish(job, "succeeded", returncode=returncode)
+        else:
+            error = next(
+                (line for line in reversed(job.output) if line.startswith(("fatal:", "error:", "!"))),
+                f"git push exited with {returncode}.",
+            )
+            self._finish(job, "failed", returncode=returncode, error=error)
+
+    def _record_line(self, job: PushJob, line: str) -> None:
+        progress = parse_push_progress(line)
+        with self._changed:
+            if progress is not None:
+                job.progress = progress
+                # Keep one output line per phase instead of every percentage step.
+                if job.output and job.output[-1].startswith(f"{progress.phase}:"):
+                    job.output[-1] = line
+                else:
+                    job.output.append(line)
+            else:
+                job.output.append(line)
+            job.version += 1
+            self._changed.notify_all()
+
+    def _finish(
+        self,
+        job: PushJob,
+        status: PushJobStatus,
+        *,
+        returncode: int | None = None,
+        error: str | None = None,
+    ) -> None:
+        with self._changed:
+            job.status = status
+            job.returncode = returncode
+            job.error = error
+            job.finished_at = time.time()
+            job.version += 1
+            self._changed.notify_all()
+
+    def _prune(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[: max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
+
+
+def _iter_progress_lines(stream: Any) -> Iterator[str]:
+    """Split git's output on both ``\\r`` (progress redraws) and ``\\n``."""
+
+    buffer = b""
+    while True:
+        chunk = stream.read1(4096) if hasattr(stream, "read1") else stream.read(4096)
+        if not chunk:
+            break
+        buffer += chunk
+        parts = re.split(rb"[\r\n]", buffer)
+        buffer = parts.pop()
+        for part in parts:
+            if part.strip():
+                yield part.decode("utf-8", "replace").rstrip()
+    if buffer.strip():
+        yield buffer.decode("utf-8", "replace").rstrip()
+
+
+_manager: PushJobManager | None = None
+_manager_lock = threading.Lock()
+
+
+def get_push_job_manager() -> PushJobManager:
+    """Return the process-wide push job manager."""
+
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = PushJobManager()
+        return _manager
@@ -0,0 +1,310 @@
+"""Typed, cached ``git status``.
+
+One ``git status --porcelain=v2 --branch -z`` call gives the branch, its
+upstream and ahead/behind counts, and every changed path including renames,
+so nothing else needs to be spawned. Results are cached per repository and
+reused until ``.git/index``, ``HEAD``, or the ref ``HEAD`` points at changes.
+Edits to the working tree do not touch any of those files, so the cache also
+expires after ``NEUROCLI_GIT_STATUS_TTL`` seconds (2 by default): bursts of
+polls cost one subprocess without hiding edits for long.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Literal
+
+from neurocli_core.config import get_env_float
+
+
+DEFAULT_STATUS_TTL_SECONDS = 2.0
+
+EntryKind = Literal["changed", "renamed", "copied", "unmerged", "untracked", "ignored"]
+
+
+class GitStatusError(RuntimeError):
+    """Raised when the path is not in a git repository or git fails."""
+
+
+@dataclass(frozen=True, slots=True)
+class GitStatusEntry:
+    """One path from ``git status``; ``.`` in a status column means unmodified."""
+
+    path: str
+    kind: EntryKind
+    index_status: str = "."
+    worktree_status: str = "."
+    orig_path: str | None = None
+    # Rename/copy similarity score, such as ``R100``.
+    score: str | None = None
+
+    @property
+    def staged(self) -> bool:
+        return self.index_status not in (".", "?", "!")
+
+    @property
+    def unstaged(self) -> bool:
+        return self.worktree_status not in (".", "!")
+
+    @property
+    def short_status(self) -> str:
+        """The two-letter ``git status -s`` code."""
+
+        if self.kind == "untracked":
+            return "??"
+        if self.kind == "ignored":
+            return "!!"
+        return (self.index_status + self.worktree_status).replace(".", " ")
+
+    def to_dict(self) -> dict[str, Any]:
+        payload = asdict(self)
+        payload["staged"] = self.staged
+        payload["unstaged"] = self.unstaged
+        return payload
+
+
+@dataclass(frozen=True, slots=True)
+class BranchInfo:
+    head: str | None = None
+    oid: str | None = None
+    upstream: str | None = None
+    ahead: int = 0
+    behind: int = 0
+
+    @property
+    def detached(self) -> bool:
+        return self.head is None
+
+    def to_dict(self) -> dict[str, Any]:
+        payload = asdict(self)
+        payload["detached"] = self.detached
+        return payload
+
+
+@dataclass(frozen=True, slots=True)
+class GitStatus:
+    branch: BranchInfo
+    entries: tuple[GitStatusEntry, ...] = field(default_factory=tuple)
+
+    @property
+    def is_clean(self) -> bool:
+        return not any(entry.kind != "ignored" for entry in self.entries)
+
+    @property
+    def changed_paths(self) -> list[str]:
+        return [entry.path for entry in self.entries if entry.kind != "ignored"]
+
+    @property
+    def has_staged_changes(self) -> bool:
+        return any(entry.staged for entry in self.entries)
+
+    def summary(self) -> str:
+        """``On branch main`` plus upstream drift, in the words ``git status`` uses."""
+
+        if self.branch.detached:
+            oid = (self.branch.oid or "")[:7]
+            message = f"HEAD detached at {oid}" if oid else "HEAD detached"
+        else:
+            message = f"On branch {self.branch.head}"
+        if self.branch.upstream and (self.branch.ahead or self.branch.behind):
+            drift = []
+            if self.branch.ahead:
+                drift.append(f"ahead {self.branch.ahead}")
+            if self.branch.behind:
+                drift.append(f"behind {self.branch.behind}")
+            message += f" ({', '.join(drift)} of {self.branch.upstream})"
+        return message
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "summary": self.summary(),
+            "clean": self.is_clean,
+            "branch": self.branch.to_dict(),
+            "entries": [entry.to_dict() for entry in self.entries],
+        }
+
+
+def parse_porcelain_v2(output: bytes) -> GitStatus:
+    """Parse ``git status --porcelain=v2 --branch -z`` output."""
+
+    branch: dict[str, Any] = {}
+    entries: list[GitStatusEntry] = []
+    records = iter(os.fsdecode(output).split("\0"))
+    for record in records:
+        if not record:
+            continue
+        tag = record[0]
+        if tag == "#":
+            _parse_branch_header(record, branch)
+        elif tag == "1":
+            # 1 XY sub mH mI mW hH hI path
+            fields = record.split(" ", 8)
+            entries.append(_changed_entry(fields[1], fields[8], "changed"))
+        elif tag == "2":
+            # 2 XY sub mH mI mW hH hI Xscore path, then the original path as its own record
+            fields = record.split(" ", 9)
+            kind: EntryKind = "copied" if fields[8].startswith("C") else "renamed"
+            entries.append(
+                _changed_entry(
+                    fields[1], fields[9], kind, orig_path=next(records, None), score=fields[8]
+                )
+            )
+        elif tag == "u":
+            # u XY sub m1 m2 m3 mW h1 h2 h3 path
+            fields = record.split(" ", 10)
+            entries.append(_changed_entry(fields[1], fields[10], "unmerged"))
+        elif tag == "?":
+            entries.append(GitStatusEntry(record[2:], "untracked", "?", "?"))
+        elif tag == "!":
+            entries.append(GitStatusEntry(record[2:], "ignored", "!", "!"))
+
+    return GitStatus(BranchInfo(**branch), tuple(entries))
+
+
+class GitStatusService:
+    """Cached status for one repository."""
+
+    def __init__(self, cwd: Path, *, ttl: float | None = None) -> None:
+        self.cwd = Path(cwd)
+        if ttl is None:
+            ttl = get_env_float("NEUROCLI_GIT_STATUS_TTL", DEFAULT_STATUS_TTL_SECONDS)
+        self.ttl = ttl
+        self.calls = 0
+        self._toplevel: Path | None = None
+        self._git_dir: Path | None = None
+        self._common_dir: Path | None = None
+        self._cached: GitStatus | None = None
+        self._cached_key: tuple[Any, ...] | None = None
+        self._cached_at = 0.0
+        self._lock = threading.Lock()
+
+    def status(self, *, force: bool = False) -> GitStatus:
+        """Return the repository status, running git only when the cache is stale."""
+
+        with self._lock:
+            self._locate_repository()
+            now = time.monotonic()
+            if (
+                not force
+                and self._cached is not None
+                and now - self._cached_at < self.ttl
+                and self._cached_key == self._fingerprint()
+            ):
+                return self._cached
+
+            output = self._run(["status", "--porcelain=v2", "--branch", "-z"])
+            self.calls += 1
+            self._cached = parse_porcelain_v2(output)
+            # Fingerprint after the call: git status may refresh the index itself.
+            self._cached_key = self._fingerprint()
+            self._cached_at = now
+            return self._cached
+
+    @property
+    def toplevel(self) -> Path:
+        """Working tree root; entry paths are relative to it."""
+
+        with self._lock:
+            self._locate_repository()
+            return self._toplevel
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._cached = None
+
+    def _locate_repository(self) -> None:
+        if self._git_dir is not None:
+            return
+        lines = self._run(
+            ["rev-parse", "--show-toplevel", "--git-dir", "--git-common-dir"]
+        ).decode().splitlines()
+        if len(lines) < 3:
+            raise GitStatusError("git rev-parse returned no repository paths.")
+        self._toplevel = Path(lines[0]).resolve()
+        self._git_dir = (self.cwd / lines[1]).resolve()
+        self._common_dir = (self.cwd / lines[2]).resolve()
+
+    def _fingerprint(self) -> tuple[Any, ...]:
+        head_path = self._git_dir / "HEAD"
+        paths = [self._git_dir / "index", head_path, self._common_dir / "packed-refs"]
+        try:
+            head = head_path.read_text(encoding="utf-8").strip()
+        except OSError:
+            head = ""
+        if head.startswith("ref: "):
+            paths.append(self._common_dir / head[5:])
+        if self._cached is not None and self._cached.branch.upstream:
+            # Ahead/behind counts move with the remote-tracking ref after a fetch.
+            paths.append(self._common_dir / "refs" / "remotes" / self._cached.branch.upstream)
+        return (head, *(_stat_key(path) for path in paths))
+
+    def _run(self, args: list[str]) -> bytes:
+        try:
+            result = subprocess.run(
+                ["git", *args],
+                capture_output=True,
+                check=True,
+                cwd=self.cwd,
+            )
+        except FileNotFoundError as exc:
+            raise GitStatusError("git is not installed or not in PATH.") from exc
+        except subprocess.CalledProcessError as exc:
+            message = exc.stderr.decode("utf-8", "replace").strip() or f"git exited with {exc.returncode}."
+            raise GitStatusError(message) from exc
+        return result.stdout
+
+
+_services: dict[Path, GitStatusService] = {}
+_services_lock = threading.Lock()
+
+
+def get_git_status_service(cwd: str | Path | None = None) -> GitStatusService:
+    """Return the shared status service for ``cwd`` (the process directory by default)."""
+
+    key = Path(cwd or os.getcwd()).resolve()
+    with _services_lock:
+        service = _services.get(key)
+        if service is None:
+            service = _services[key] = GitStatusService(key)
+        return service
+
+
+def _parse_branch_header(record: str, branch: dict[str, Any]) -> None:
+    parts = record.split(" ", 2)
+    if len(parts) < 3:
+        return
+    _, name, value = parts
+    if name == "branch.oid":
+        branch["oid"] = None if value == "(initial)" else value
+    elif name == "branch.head":
+        branch["head"] = None if value == "(detached)" else value
+    elif name == "branch.upstream":
+        branch["upstream"] = value
+    elif name == "branch.ab":
+        ahead, _, behind = value.partition(" ")
+        branch["ahead"] = int(ahead.lstrip("+"))
+        branch["behind"] = int(behind.lstrip("-"))
+
+
+def _changed_entry(
+    xy: str,
+    path: str,
+    kind: EntryKind,
+    *,
+    orig_path: str | None = None,
+    score: str | None = None,
+) -> GitStatusEntry:
+    return GitStatusEntry(path, kind, xy[0], xy[1], orig_path, score)
+
+
+def _stat_key(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
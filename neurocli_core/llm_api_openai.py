@@ -2,14 +2,215 @@
 
 from __future__ import annotations
 
-from typing import Any, Iterator, Mapping
+import atexit
+import queue
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Iterator, Literal, Mapping
 
-from neurocli_core.config import DEFAULT_OPENAI_MODEL
+from neurocli_core.config import (
+    DEFAULT_OPENAI_MODEL,
+    get_env_flag,
+    get_env_float,
+    get_env_int,
+    get_openai_api_key,
+    get_openai_base_url,
+    get_settings,
+)
 
 
 SYSTEM_MESSAGE = "You are NeuroCLI, an expert AI assistant."
 
 
+@dataclass(frozen=True, slots=True)
+class OpenAIClientSettings:
+    """Connection pool and timeout limits for the shared OpenAI transport."""
+
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 120.0
+    connect_timeout: float = 10.0
+    read_timeout: float = 600.0
+    write_timeout: float = 30.0
+    pool_timeout: float = 30.0
+
+    @classmethod
+    def from_env(cls) -> "OpenAIClientSettings":
+        """Read ``NEUROCLI_OPENAI_*`` overrides from the project environment."""
+
+        defaults = cls()
+        return cls(
+            max_connections=get_env_int(
+                "NEUROCLI_OPENAI_MAX_CONNECTIONS", defaults.max_connections
+            ),
+            max_keepalive_connections=get_env_int(
+                "NEUROCLI_OPENAI_MAX_KEEPALIVE", defaults.max_keepalive_connections
+            ),
+            keepalive_expiry=get_env_float(
+                "NEUROCLI_OPENAI_KEEPALIVE_EXPIRY", defaults.keepalive_expiry
+            ),
+            connect_timeout=get_env_float(
+                "NEUROCLI_OPENAI_CONNECT_TIMEOUT", defaults.connect_timeout
+            ),
+            read_timeout=get_env_float(
+                "NEUROCLI_OPENAI_READ_TIMEOUT", defaults.read_timeout
+            ),
+            write_timeout=get_env_float(
+                "NEUROCLI_OPENAI_WRITE_TIMEOUT", defaults.write_timeout
+            ),
+            pool_timeout=get_env_float(
+                "NEUROCLI_OPENAI_POOL_TIMEOUT", defaults.pool_timeout
+            ),
+        )
+
+
+_registry_lock = threading.Lock()
+_clients: dict[tuple[str, str | None], Any] = {}
+_http_client: Any | None = None
+_http_client_settings: OpenAIClientSettings | None = None
+
+
+def _build_http_client(settings: OpenAIClientSettings) -> Any:
+    """Create the pooled keep-alive transport shared by every OpenAI client."""
+
+    from openai import DEFAULT_CONNECTION_LIMITS, DefaultHttpxClient, Timeout
+
+    # Build limits from the same class the SDK uses so we stay compatible with
+    # whichever httpx flavour the installed ``openai`` release depends on.
+    limits = type(DEFAULT_CONNECTION_LIMITS)(
+        max_connections=settings.max_connections,
+        max_keepalive_connections=settings.max_keepalive_connections,
+        keepalive_expiry=settings.keepalive_expiry,
+    )
+    timeout = Timeout(
+        settings.read_timeout,
+        connect=settings.connect_timeout,
+        write=settings.write_timeout,
+        pool=settings.pool_timeout,
+    )
+    return DefaultHttpxClient(limits=limits, timeout=timeout)
+
+
+def _get_shared_http_client(settings: OpenAIClientSettings) -> Any:
+    """Return the shared transport, rebuilding it when the pool settings change."""
+
+    global _http_client, _http_client_settings
+
+    if _http_client is not None and _http_client_settings == settings:
+        return _http_client
+
+    if _http_client is not None:
+        # Clients bound to the old transport would keep using closed sockets.
+        _close_registered_clients()
+    _http_client = _build_http_client(settings)
+    _http_client_settings = settings
+    return _http_client
+
+
+def get_openai_client(
+    api_key: str,
+    *,
+    base_url: str | None = None,
+    settings: OpenAIClientSettings | None = None,
+) -> Any:
+    """Return a long-lived OpenAI client keyed by API key and base URL.
+
+    Every client shares one pooled HTTP transport, so repeated prompts reuse
+    open keep-alive connections instead of paying a fresh TLS handshake.
+    """
+
+    resolved_base_url = base_url if base_url is not None else get_openai_base_url()
+    resolved_settings = settings or OpenAIClientSettings.from_env()
+    registry_key = (api_key, resolved_base_url)
+
+    with _registry_lock:
+        http_client = _get_shared_http_client(resolved_settings)
+        client = _clients.get(registry_key)
+        if client is None:
+            from openai import OpenAI
+
+            # Retries belong to ResiliencePolicy, so the SDK must not retry underneath it.
+            client = OpenAI(
+                api_key=api_key,
+                base_url=resolved_base_url,
+                http_client=http_client,
+                max_retries=0,
+            )
+            _clients[registry_key] = client
+        return client
+
+
+def _close_registered_clients() -> None:
+    """Drop cached clients and close the shared transport. Caller holds the lock."""
+
+    global _http_client, _http_client_settings
+
+    _clients.clear()
+    if _http_client is not None:
+        try:
+            _http_client.close()
+        except Exception:  # pragma: no cover - best-effort shutdown
+            pass
+    _http_client = None
+    _http_client_settings = None
+
+
+def close_openai_clients() -> None:
+    """Close every pooled connection and forget cached clients."""
+
+    with _registry_lock:
+        _close_registered_clients()
+
+
+atexit.register(close_openai_clients)
+
+
+def warm_up_openai_client(
+    api_key: str,
+    *,
+    base_url: str | None = None,
+) -> float | None:
+    """Pre-open a pooled connection and return the elapsed seconds.
+
+    The models listing is the cheapest authenticated call, and completing it
+    leaves a keep-alive connection in the pool for the first real prompt.
+    Returns ``None`` when the warm-up request fails; startup should not break
+    because the network is unavailable.
+    """
+
+    started_at = time.perf_counter()
+    try:
+        client = get_openai_client(api_key, base_url=base_url)
+        client.models.list()
+    except Exception:
+        return None
+    return time.perf_counter() - started_at
+
+
+def start_background_warm_up() -> threading.Thread | None:
+    """Warm the pool on a daemon thread when ``NEUROCLI_OPENAI_WARMUP`` is enabled."""
+
+    if not get_env_flag("NEUROCLI_OPENAI_WARMUP"):
+        return None
+
+    api_key = get_openai_api_key()
+    if not api_key:
+        return None
+
+    thread = threading.Thread(
+        target=warm_up_openai_client,
+        args=(api_key,),
+        name="neurocli-openai-warmup",
+        daemon=True,
+    )
+    thread.start()
+    return thread
+
+
 def _normalize_message_content(content: Any) -> str:
     """Collapse OpenAI message payloads into a plain string."""
 
@@ -49,27 +250,480 @@ def _build_completion_kwargs(
     return request_kwargs
 
 
+AttemptKind = Literal["primary", "retry", "hedge"]
+AttemptStatus = Literal["ok", "error", "timeout", "cancelled"]
+AttemptCallback = Callable[["LLMAttempt"], None]
+
+_RETRYABLE_STATUS_CODES = {408, 409, 429}
+
+
+class LLMTimeoutError(TimeoutError):
+    """Raised when a request misses its first-token or idle-stream deadline."""
+
+
+@dataclass(slots=True)
+class LLMAttempt:
+    """One network attempt made while serving a single prompt."""
+
+    attempt: int
+    kind: AttemptKind
+    status: AttemptStatus
+    elapsed_ms: float
+    first_token_ms: float | None = None
+    error: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable attempt record for workflow metrics."""
+
+        return asdict(self)
+
+
+@dataclass(frozen=True, slots=True)
+class ResiliencePolicy:
+    """Deadlines, retry backoff, and hedging rules for one LLM request."""
+
+    max_attempts: int = 3
+    backoff_initial: float = 0.5
+    backoff_max: float = 8.0
+    backoff_multiplier: float = 2.0
+    backoff_jitter: float = 0.2
+    connect_timeout: float = 10.0
+    read_timeout: float = 120.0
+    first_token_timeout: float = 60.0
+    idle_timeout: float = 60.0
+    hedge_enabled: bool = False
+    hedge_after: float | None = None
+    hedge_fallback_delay: float = 4.0
+    hedge_min_samples: int = 20
+
+    @classmethod
+    def from_env(cls) -> "ResiliencePolicy":
+        """Read ``NEUROCLI_LLM_*`` overrides from the project environment."""
+
+        settings = get_settings()
+        defaults = cls()
+        hedge_after = settings.get_float("NEUROCLI_LLM_HEDGE_AFTER", -1.0)
+        return cls(
+            max_attempts=settings.llm_max_attempts,
+            backoff_initial=settings.get_float("NEUROCLI_LLM_BACKOFF_INITIAL", defaults.backoff_initial),
+            backoff_max=settings.get_float("NEUROCLI_LLM_BACKOFF_MAX", defaults.backoff_max),
+            connect_timeout=settings.llm_connect_timeout,
+            read_timeout=settings.llm_read_timeout,
+            first_token_timeout=settings.llm_first_token_timeout,
+            idle_timeout=settings.llm_idle_timeout,
+            hedge_enabled=settings.get_flag("NEUROCLI_LLM_HEDGE", defaults.hedge_enabled),
+            hedge_after=hedge_after if hedge_after > 0 else None,
+        )
+
+    def request_timeout(self) -> Any:
+        """Return the per-request connect/read deadline in SDK form."""
+
+        from openai import Timeout
+
+        return Timeout(self.read_timeout, connect=self.connect_timeout)
+
+    def backoff_delay(self, retry_index: int, error: BaseException | None = None) -> float:
+        """Return the sleep before retry ``retry_index`` (1-based), honouring Retry-After."""
+
+        delay = self.backoff_initial * (self.backoff_multiplier ** (retry_index - 1))
+        delay = min(delay, self.backoff_max)
+        if self.backoff_jitter:
+            delay *= 1 + random.uniform(-self.backoff_jitter, self.backoff_jitter)
+
+        retry_after = _retry_after_seconds(error)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.backoff_max))
+        return max(0.0, delay)
+
+    def hedge_delay(self, latencies: "_LatencyWindow") -> float | None:
+        """Return when to fire the duplicate request, or ``None`` when hedging is off."""
+
+        if not self.hedge_enabled:
+            return None
+        if self.hedge_after is not None:
+            return self.hedge_after
+        observed_p95 = latencies.percentile(0.95, min_samples=self.hedge_min_samples)
+        return observed_p95 if observed_p95 is not None else self.hedge_fallback_delay
+
+
+class _LatencyWindow:
+    """Rolling window of recent latencies used to derive the p95 hedge delay."""
+
+    def __init__(self, size: int = 200) -> None:
+        self._samples: deque[float] = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, fraction: float, *, min_samples: int = 1) -> float | None:
+        with self._lock:
+            if len(self._samples) < max(1, min_samples):
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+        return ordered[index]
+
+
+_call_latencies = _LatencyWindow()
+_first_token_latencies = _LatencyWindow()
+
+
+def _retry_after_seconds(error: BaseException | None) -> float | None:
+    """Read a numeric ``Retry-After`` header from an SDK status error."""
+
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable_error(error: BaseException | None) -> bool:
+    """Return whether a failed attempt is worth retrying."""
+
+    if error is None:
+        return False
+    if isinstance(error, (LLMTimeoutError, ConnectionError)):
+        return True
+
+    try:
+        import openai
+    except ModuleNotFoundError:  # pragma: no cover - depends on local environment
+        return False
+
+    if isinstance(error, (openai.APIConnectionError, openai.APITimeoutError)):
+        return True
+    status_code = getattr(error, "status_code", None)
+    if isinstance(status_code, int):
+        return status_code in _RETRYABLE_STATUS_CODES or status_code >= 500
+    return False
+
+
+def _status_for(error: BaseException) -> AttemptStatus:
+    return "timeout" if isinstance(error, (LLMTimeoutError, TimeoutError)) else "error"
+
+
+def _elapsed_ms(started_at: float, finished_at: float | None = None) -> float:
+    return round(((finished_at or time.perf_counter()) - started_at) * 1000, 2)
+
+
+class _AttemptLog:
+    """Number attempts across retries and hedges and forward them to the caller."""
+
+    def __init__(self, on_attempt: AttemptCallback | None) -> None:
+        self._on_attempt = on_attempt
+        self._count = 0
+
+    def next_number(self) -> int:
+        self._count += 1
+        return self._count
+
+    def report(self, attempt: LLMAttempt | None) -> None:
+        if attempt is not None and self._on_attempt is not None:
+            self._on_attempt(attempt)
+
+
+@dataclass(slots=True)
+class _CallOutcome:
+    value: str = ""
+    error: BaseException | None = None
+
+
+def _open_completion(api_key: str, request_kwargs: Mapping[str, Any]) -> Any:
+    """Send one Chat Completions request through the pooled client."""
+
+    client = get_openai_client(api_key)
+    return client.chat.completions.create(**request_kwargs)
+
+
+def _race_calls(
+    run_once: Callable[[], str],
+    policy: ResiliencePolicy,
+    kind: AttemptKind,
+    log: _AttemptLog,
+) -> _CallOutcome:
+    """Run one non-streaming attempt, hedging with a duplicate when configured."""
+
+    hedge_delay = policy.hedge_delay(_call_latencies)
+    if hedge_delay is None:
+        number = log.next_number()
+        started_at = time.perf_counter()
+        try:
+            value = run_once()
+        except Exception as exc:
+            log.report(LLMAttempt(number, kind, _status_for(exc), _elapsed_ms(started_at), error=str(exc)))
+            return _CallOutcome(error=exc)
+        _call_latencies.record(time.perf_counter() - started_at)
+        log.report(LLMAttempt(number, kind, "ok", _elapsed_ms(started_at)))
+        return _CallOutcome(value=value)
+
+    executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="neurocli-hedge")
+    launched: dict[Future[str], tuple[int, AttemptKind, float]] = {}
+
+    def launch(attempt_kind: AttemptKind) -> None:
+        launched[executor.submit(run_once)] = (log.next_number(), attempt_kind, time.perf_counter())
+
+    try:
+        launch(kind)
+        done, _pending = wait(launched, timeout=hedge_delay)
+        if not done:
+            launch("hedge")
+
+        pending: set[Future[str]] = set(launched)
+        last_error: BaseException | None = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                number, attempt_kind, started_at = launched[future]
+                error = future.exception()
+                if error is not None:
+                    log.report(
+                        LLMAttempt(number, attempt_kind, _status_for(error), _elapsed_ms(started_at), error=str(error))
+                    )
+                    last_error = error
+                    continue
+
+                _call_latencies.record(time.perf_counter() - started_at)
+                log.report(LLMAttempt(number, attempt_kind, "ok", _elapsed_ms(started_at)))
+                for loser in pending:
+                    loser_number, loser_kind, loser_started_at = launched[loser]
+                    log.report(LLMAttempt(loser_number, loser_kind, "cancelled", _elapsed_ms(loser_started_at)))
+                return _CallOutcome(value=future.result())
+        return _CallOutcome(error=last_error)
+    finally:
+        # Never block on the losing request; its result is simply discarded.
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _chunk_text(chunk: Any) -> str:
+    """Return the text carried by one streamed Chat Completions chunk."""
+
+    if not chunk.choices:
+        return ""
+    return getattr(chunk.choices[0].delta, "content", None) or ""
+
+
+def _close_quietly(stream: Any) -> None:
+    close = getattr(stream, "close", None)
+    if close is None:
+        return
+    try:
+        close()
+    except Exception:  # pragma: no cover - best-effort cleanup
+        pass
+
+
+class _StreamPump:
+    """Read one SDK stream on a daemon thread so the consumer can enforce deadlines."""
+
+    def __init__(
+        self,
+        open_stream: Callable[[], Any],
+        events: "queue.Queue[tuple[_StreamPump, str, Any]]",
+        number: int,
+        kind: AttemptKind,
+    ) -> None:
+        self.events = events
+        self.number = number
+        self.kind = kind
+        self.started_at = time.perf_counter()
+        self.first_event_at: float | None = None
+        self._open_stream = open_stream
+        self._stream: Any = None
+        self._closed = threading.Event()
+        self._finished = False
+        self._thread = threading.Thread(target=self._run, name="neurocli-llm-stream", daemon=True)
+
+    def start(self) -> "_StreamPump":
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        try:
+            self._stream = self._open_stream()
+            if self._closed.is_set():
+                _close_quietly(self._stream)
+                return
+            for chunk in self._stream:
+                if self._closed.is_set():
+                    return
+                content = _chunk_text(chunk)
+                if content:
+                    self.events.put((self, "chunk", content))
+            self.events.put((self, "done", None))
+        except Exception as exc:
+            if not self._closed.is_set():
+                self.events.put((self, "error", exc))
+
+    def close(self) -> None:
+        self._closed.set()
+        if self._stream is not None:
+            _close_quietly(self._stream)
+
+    def finish(self, status: AttemptStatus, error: BaseException | None = None) -> LLMAttempt | None:
+        """Return the attempt record once; later calls return ``None``."""
+
+        if self._finished:
+            return None
+        self._finished = True
+        first_token_ms = (
+            _elapsed_ms(self.started_at, self.first_event_at) if self.first_event_at is not None else None
+        )
+        return LLMAttempt(
+            self.number,
+            self.kind,
+            status,
+            _elapsed_ms(self.started_at),
+            first_token_ms=first_token_ms,
+            error=str(error) if error is not None else None,
+        )
+
+
+def _await_first_stream_event(
+    api_key: str,
+    request_kwargs: Mapping[str, Any],
+    policy: ResiliencePolicy,
+    kind: AttemptKind,
+    log: _AttemptLog,
+) -> tuple[_StreamPump | None, tuple[str, Any] | None, BaseException | None]:
+    """Start a stream (plus an optional hedge) and return whichever answers first."""
+
+    events: queue.Queue[tuple[_StreamPump, str, Any]] = queue.Queue()
+
+    def launch(attempt_kind: AttemptKind) -> _StreamPump:
+        return _StreamPump(
+            lambda: _open_completion(api_key, request_kwargs),
+            events,
+            log.next_number(),
+            attempt_kind,
+        ).start()
+
+    started_at = time.perf_counter()
+    deadline = started_at + policy.first_token_timeout
+    hedge_delay = policy.hedge_delay(_first_token_latencies)
+    hedge_at = started_at + hedge_delay if hedge_delay is not None else None
+    live: list[_StreamPump] = [launch(kind)]
+    last_error: BaseException | None = None
+
+    while live:
+        wake_at = deadline if hedge_at is None else min(deadline, hedge_at)
+        try:
+            pump, event_kind, payload = events.get(timeout=max(0.0, wake_at - time.perf_counter()))
+        except queue.Empty:
+            if hedge_at is not None and time.perf_counter() < deadline:
+                live.append(launch("hedge"))
+                hedge_at = None
+                continue
+            last_error = LLMTimeoutError(
+                f"No tokens received within the {policy.first_token_timeout:g}s first-token deadline."
+            )
+            for stalled in live:
+                stalled.close()
+                log.report(stalled.finish("timeout", last_error))
+            return None, None, last_error
+
+        if pump not in live:
+            continue
+        if event_kind == "error":
+            live.remove(pump)
+            log.report(pump.finish(_status_for(payload), payload))
+            last_error = payload
+            continue
+
+        pump.first_event_at = time.perf_counter()
+        _first_token_latencies.record(pump.first_event_at - pump.started_at)
+        for loser in live:
+            if loser is not pump:
+                loser.close()
+                log.report(loser.finish("cancelled"))
+        return pump, (event_kind, payload), None
+
+    return None, None, last_error
+
+
+def _drain_stream(
+    winner: _StreamPump,
+    first_event: tuple[str, Any],
+    policy: ResiliencePolicy,
+    log: _AttemptLog,
+) -> Iterator[str]:
+    """Yield the winning stream's chunks while enforcing the idle-stream timeout."""
+
+    event_kind, payload = first_event
+    try:
+        while True:
+            if event_kind == "done":
+                log.report(winner.finish("ok"))
+                return
+            if event_kind == "error":
+                log.report(winner.finish(_status_for(payload), payload))
+                raise RuntimeError(
+                    f"Could not stream response from OpenAI API. Details: {payload}"
+                ) from payload
+            yield payload
+
+            while True:
+                try:
+                    pump, event_kind, payload = winner.events.get(timeout=policy.idle_timeout)
+                except queue.Empty:
+                    stall = LLMTimeoutError(
+                        f"Stream stalled for more than {policy.idle_timeout:g}s without new tokens."
+                    )
+                    winner.close()
+                    log.report(winner.finish("timeout", stall))
+                    raise RuntimeError(
+                        f"Could not stream response from OpenAI API. Details: {stall}"
+                    ) from stall
+                if pump is winner:
+                    break
+    except GeneratorExit:
+        winner.close()
+        log.report(winner.finish("cancelled"))
+        raise
+
+
 def call_openai_api(
     api_key: str,
     prompt: str,
     *,
     model: str | None = None,
     options: Mapping[str, Any] | None = None,
+    policy: ResiliencePolicy | None = None,
+    on_attempt: AttemptCallback | None = None,
 ) -> str:
-    """Return the full response body for a single prompt."""
+    """Return the full response body for a single prompt.
 
-    try:
-        from openai import OpenAI
+    Retryable failures are retried with exponential backoff, and when hedging
+    is enabled a duplicate request races the first one after the hedge delay.
+    """
 
-        client = OpenAI(api_key=api_key)
-        response = client.chat.completions.create(
-            **_build_completion_kwargs(prompt, model, options, stream=False)
-        )
+    active_policy = policy or ResiliencePolicy.from_env()
+    request_kwargs = _build_completion_kwargs(prompt, model, options, stream=False)
+    request_kwargs["timeout"] = active_policy.request_timeout()
+
+    def run_once() -> str:
+        response = _open_completion(api_key, request_kwargs)
         return _normalize_message_content(response.choices[0].message.content)
-    except Exception as exc:  # pragma: no cover - depends on external API failures
-        raise RuntimeError(
-            f"Could not retrieve response from OpenAI API. Details: {exc}"
-        ) from exc
+
+    log = _AttemptLog(on_attempt)
+    last_error: BaseException | None = None
+    for retry_index in range(max(1, active_policy.max_attempts)):
+        if retry_index:
+            time.sleep(active_policy.backoff_delay(retry_index, last_error))
+        outcome = _race_calls(run_once, active_policy, "retry" if retry_index else "primary", log)
+        if outcome.error is None:
+            return outcome.value
+        last_error = outcome.error
+        if not is_retryable_error(last_error):
+            break
+
+    raise RuntimeError(
+        f"Could not retrieve response from OpenAI API. Details: {last_error}"
+    ) from last_error
 
 
 def stream_openai_api(
@@ -78,24 +732,41 @@ def stream_openai_api(
     *,
     model: str | None = None,
     options: Mapping[str, Any] | None = None,
+    policy: ResiliencePolicy | None = None,
+    on_attempt: AttemptCallback | None = None,
 ) -> Iterator[str]:
-    """Yield response chunks from the OpenAI streaming API."""
+    """Yield response chunks from the OpenAI streaming API.
 
-    try:
-        from openai import OpenAI
+    Attempts are retried only until the first token reaches the caller; after
+    that a failure or an idle stall ends the stream, because replaying would
+    duplicate output the caller has already rendered.
+    """
+
+    active_policy = policy or ResiliencePolicy.from_env()
+    request_kwargs = _build_completion_kwargs(prompt, model, options, stream=True)
+    request_kwargs["timeout"] = active_policy.request_timeout()
 
-        client = OpenAI(api_key=api_key)
-        stream = client.chat.completions.create(
-            **_build_completion_kwargs(prompt, model, options, stream=True)
+    log = _AttemptLog(on_attempt)
+    last_error: BaseException | None = None
+    for retry_index in range(max(1, active_policy.max_attempts)):
+        if retry_index:
+            time.sleep(active_policy.backoff_delay(retry_index, last_error))
+
+        winner, first_event, last_error = _await_first_stream_event(
+            api_key,
+            request_kwargs,
+            active_policy,
+            "retry" if retry_index else "primary",
+            log,
         )
-        for chunk in stream:
-            if not chunk.choices:
-                continue
-            delta = chunk.choices[0].delta
-            content = getattr(delta, "content", None)
-            if content:
-                yield content
-    except Exception as exc:  # pragma: no cover - depends on external API failures
-        raise RuntimeError(
-            f"Could not stream response from OpenAI API. Details: {exc}"
-        ) from exc
+        if winner is None:
+            if not is_retryable_error(last_error):
+                break
+            continue
+
+        yield from _drain_stream(winner, first_event, active_policy, log)
+        return
+
+    raise RuntimeError(
+        f"Could not stream response from OpenAI API. Details: {last_error}"
+    ) from last_error
@@ -0,0 +1,356 @@
+"""Pluggable LLM backends behind the shared workflow service.
+
+``OpenAIProvider`` is the production backend. ``MockProvider`` streams
+deterministic synthetic tokens and ``ReplayProvider`` records real streams to
+disk and plays them back with their original timing, so the pipeline can be
+benchmarked and load-tested without a live key or network.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import random
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator, Literal, Mapping, Protocol
+
+from neurocli_core.config import (
+    get_env_float,
+    get_env_int,
+    get_env_str,
+    get_openai_api_key,
+    get_settings,
+)
+from neurocli_core.llm_api_openai import (
+    AttemptCallback,
+    LLMAttempt,
+    ResiliencePolicy,
+    call_openai_api,
+    stream_openai_api,
+)
+
+
+ProviderName = Literal["openai", "mock", "replay", "record"]
+
+MISSING_OPENAI_KEY_MESSAGE = (
+    "OpenAI API key not found. Please set OPENAI_API_KEY in the project .env file."
+)
+DEFAULT_CASSETTE_DIR = Path(__file__).parent.parent / ".neurocli" / "cassettes"
+CASSETTE_VERSION = 1
+
+_MOCK_VOCABULARY = (
+    "neuro", "cli", "stream", "token", "diff", "patch", "review", "apply",
+    "format", "radar", "commit", "context", "model", "workflow", "shared",
+    "backend", "terminal", "async", "queue", "buffer",
+)
+
+
+class ProviderConfigurationError(ValueError):
+    """Raised when the selected provider cannot run with the current settings."""
+
+
+class LLMProvider(Protocol):
+    """The contract the workflow service needs from an LLM backend."""
+
+    name: str
+
+    def complete(
+        self,
+        prompt: str,
+        *,
+        model: str | None = None,
+        options: Mapping[str, Any] | None = None,
+        on_attempt: AttemptCallback | None = None,
+    ) -> str:
+        """Return the whole response for ``prompt``; raise ``RuntimeError`` on failure."""
+
+    def stream(
+        self,
+        prompt: str,
+        *,
+        model: str | None = None,
+        options: Mapping[str, Any] | None = None,
+        on_attempt: AttemptCallback | None = None,
+    ) -> Iterator[str]:
+        """Yield response chunks for ``prompt``; raise ``RuntimeError`` on failure."""
+
+
+@dataclass(slots=True)
+class OpenAIProvider:
+    """Live backend over the pooled, retrying OpenAI adapter."""
+
+    api_key: str
+    policy: ResiliencePolicy | None = None
+    name: str = "openai"
+
+    def complete(
+        self,
+        prompt: str,
+        *,
+        model: str | None = None,
+        options: Mapping[str, Any] | None = None,
+        on_attempt: AttemptCallback | None = None,
+    ) -> str:
+        return call_openai_api(
+            self.api_key,
+            prompt,
+            model=model,
+            options=options,
+            policy=self.policy,
+            on_attempt=on_attempt,
+        )
+
+    def stream(
+        self,
+        prompt: str,
+        *,
+        model: str | None = None,
+        options: Mapping[str, Any] | None = None,
+        on_attempt: AttemptCallback | None = None,
+    ) -> Iterator[str]:
+        return stream_openai_api(
+            self.api_key,
+            prompt,
+            model=model,
+            options=options,
+            policy=self.policy,
+            on_attempt=on_attempt,
+        )
+
+
+@dataclass(slots=True)
+class MockProvider:
+    """Deterministic local backend that streams synthetic tokens.
+
+    The same prompt, model, and seed always produce the same chunks.
+    ``first_token_latency`` delays the first chunk, and ``tokens_per_second``
+    paces the rest (``0`` streams as fast as possible).
+    """
+
+    response_tokens: int = 64
+    tokens_per_second: float = 0.0
+    first_token_latency: float = 0.0
+    seed: int = 0
+    name: str = "mock"
+
+    def chunks_for(self, prompt: str, model: str | None = None) -> list[str]:
+        """Return the deterministic chunk list for one prompt."""
+
+        digest = hashlib.sha256(f"{self.seed}\0{model or ''}\0{prompt}".encode("utf-8")).digest()
+        rng = random.Random(int.from_bytes(digest[:8], "big"))
+        chunks = [rng.choice(_MOCK_VOCABULARY) for _ in range(max(0, self.response_tokens))]
+        return [chunk if index == 0 else f" {chunk}" for index, chunk in enumerate(chunks)]
+
+    def complete(
+        self,
+        prompt: str,
+        *,
+        model: str | None = None,
+        options: Mapping[str, Any] | None = None,
+        on_attempt: AttemptCallback | None = None,
+    ) -> str:
+        return "".join(self.stream(prompt, model=model, options=options, on_attempt=on_attempt))
+
+    def stream(
+        self,
+        prompt: str,
+        *,
+        model: str | None = None,
+        options: Mapping[str, Any] | None = None,
+        on_attempt: AttemptCallback | None = None,
+    ) -> Iterator[str]:
+        started_at = time.perf_counter()
+        first_token_at: float | None = None
+        interval = 1.0 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+
+        for index, chunk in enumerate(self.chunks_for(prompt, model)):
+            delay = self.first_token_latency if index == 0 else interval
+            if delay:
+                time.sleep(delay)
+            if first_token_at is None:
+                first_token_at = time.perf_counter()
+            yield chunk
+
+        _report_single_attempt(on_attempt, started_at, first_token_at)
+
+
+@dataclass(slots=True)
+class ReplayProvider:
+    """Record streams from ``inner`` to disk, or replay them with original timing.
+
+    Cassettes are keyed by a hash of model, prompt, and options. ``speed``
+    scales replayed timing; ``0`` replays without sleeping.
+    """
+
+    cassette_dir: Path = DEFAULT_CASSETTE_DIR
+    mode: Literal["record", "replay"] = "replay"
+    inner: LLMProvider | None = None
+    speed: float = 1.0
+    name: str = "replay"
+
+    def cassette_path(
+        self,
+        prompt: str,
+        model: str | None,
+        options: Mapping[str, Any] | None,
+    ) -> Path:
+        """Return the on-disk location for one request's recording."""
+
+        key_material = json.dumps(
+            {"model": model or "", "prompt": prompt, "options": dict(options or {})},
+            sort_keys=True,
+            default=str,
+        )
+        digest = hashlib.sha256(key_material.encode("utf-8")).hexdigest()[:32]
+        return Path(self.cassette_dir) / f"{digest}.json"
+
+    def complete(
+        self,
+        prompt: str,
+        *,
+        model: str | None = None,
+        options: Mapping[str, Any] | None = None,
+        on_attempt: AttemptCallback | None = None,
+    ) -> str:
+        return "".join(self.stream(prompt, model=model, options=options, on_attempt=on_attempt))
+
+    def stream(
+        self,
+        prompt: str,
+        *,
+        model: str | None = None,
+        options: Mapping[str, Any] | None = None,
+        on_attempt: AttemptCallback | None = None,
+    ) -> Iterator[str]:
+        path = self.cassette_path(prompt, model, options)
+        if self.mode == "record":
+            return self._record(path, prompt, model, options, on_attempt)
+        return self._replay(path, on_attempt)
+
+    def _record(
+        self,
+        path: Path,
+        prompt: str,
+        model: str | None,
+        options: Mapping[str, Any] | None,
+        on_attempt: AttemptCallback | None,
+    ) -> Iterator[str]:
+        if self.inner is None:
+            raise ProviderConfigurationError("Record mode needs an inner provider to capture.")
+
+        started_at = time.perf_counter()
+        recorded: list[dict[str, Any]] = []
+        for chunk in self.inner.stream(prompt, model=model, options=options, on_attempt=on_attempt):
+            recorded.append(
+                {"offset_ms": round((time.perf_counter() - started_at) * 1000, 3), "text": chunk}
+            )
+            yield chunk
+
+        # Only complete streams are written, so a replay never ends early.
+        _write_json_atomic(
+            path,
+            {"version": CASSETTE_VERSION, "model": model or "", "chunks": recorded},
+        )
+
+    def _replay(self, path: Path, on_attempt: AttemptCallback | None) -> Iterator[str]:
+        try:
+            cassette = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError as exc:
+            raise RuntimeError(
+                f"No recorded stream for this request. Record it first (expected {path.name})."
+            ) from exc
+        except (OSError, ValueError) as exc:
+            raise RuntimeError(f"Could not read recorded stream {path.name}. Details: {exc}") from exc
+
+        started_at = time.perf_counter()
+        first_token_at: float | None = None
+        for entry in cassette.get("chunks", []):
+            if self.speed > 0:
+                target = started_at + entry.get("offset_ms", 0.0) / 1000 / self.speed
+                remaining = target - time.perf_counter()
+                if remaining > 0:
+                    time.sleep(remaining)
+            if first_token_at is None:
+                first_token_at = time.perf_counter()
+            yield entry.get("text", "")
+
+        _report_single_attempt(on_attempt, started_at, first_token_at)
+
+
+def _report_single_attempt(
+    on_attempt: AttemptCallback | None,
+    started_at: float,
+    first_token_at: float | None,
+) -> None:
+    """Report the one successful attempt offline backends make, for metrics parity."""
+
+    if on_attempt is None:
+        return
+    first_token_ms = (
+        round((first_token_at - started_at) * 1000, 2) if first_token_at is not None else None
+    )
+    on_attempt(
+        LLMAttempt(
+            attempt=1,
+            kind="primary",
+            status="ok",
+            elapsed_ms=round((time.perf_counter() - started_at) * 1000, 2),
+            first_token_ms=first_token_ms,
+        )
+    )
+
+
+def _write_json_atomic(path: Path, payload: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    file_descriptor, temp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(file_descriptor, "w", encoding="utf-8") as handle:
+            json.dump(payload, handle)
+        os.replace(temp_name, path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+
+def get_llm_provider(name: str | None = None) -> LLMProvider:
+    """Return the provider selected by ``name`` or ``NEUROCLI_LLM_PROVIDER``.
+
+    Supported names are ``openai`` (default), ``mock``, ``replay``, and
+    ``record`` (OpenAI wrapped in a recorder).
+    """
+
+    selected = (name or get_settings().llm_provider).lower()
+
+    if selected == "mock":
+        return MockProvider(
+            response_tokens=get_env_int("NEUROCLI_MOCK_TOKENS", 64),
+            tokens_per_second=get_env_float("NEUROCLI_MOCK_TOKENS_PER_SECOND", 0.0),
+            first_token_latency=get_env_float("NEUROCLI_MOCK_LATENCY", 0.0),
+            seed=get_env_int("NEUROCLI_MOCK_SEED", 0),
+        )
+
+    cassette_dir = Path(get_env_str("NEUROCLI_CASSETTE_DIR", str(DEFAULT_CASSETTE_DIR)))
+    if selected == "replay":
+        return ReplayProvider(
+            cassette_dir=cassette_dir,
+            mode="replay",
+            speed=get_env_float("NEUROCLI_REPLAY_SPEED", 1.0),
+        )
+
+    if selected not in {"openai", "record"}:
+        raise ProviderConfigurationError(
+            f"Unknown LLM provider '{selected}'. Use openai, mock, replay, or record."
+        )
+
+    api_key = get_openai_api_key()
+    if not api_key:
+        raise ProviderConfigurationError(MISSING_OPENAI_KEY_MESSAGE)
+
+    provider = OpenAIProvider(api_key=api_key)
+    if selected == "record":
+        return ReplayProvider(cassette_dir=cassette_dir, mode="record", inner=provider, name="record")
+    return provider
@@ -0,0 +1,181 @@
+"""Hunk-level review and partial apply for file proposals.
+
+A proposal is a baseline/proposed pair split into ``DiffHunk`` records. The
+server keeps the contents; clients only send back the ids of the hunks they
+accept. Accepted hunks are applied in one pass over the file as it is now on
+disk, and each hunk is relocated by searching for its old lines near the
+expected position when the file has moved since the proposal was made.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Sequence
+
+from neurocli_core.diff_generator import DiffHunk, compute_diff_hunks
+
+
+MAX_STORED_PROPOSALS = 64
+
+
+class HunkConflictError(ValueError):
+    """Raised when accepted hunks no longer match the file they target."""
+
+    def __init__(self, hunk_ids: Sequence[str]) -> None:
+        self.hunk_ids = list(hunk_ids)
+        super().__init__(
+            "The file changed where these hunks apply; regenerate the proposal: "
+            + ", ".join(self.hunk_ids)
+        )
+
+
+@dataclass(slots=True)
+class Proposal:
+    """One reviewable change to a single file."""
+
+    proposal_id: str
+    target_file: str
+    baseline_content: str
+    proposed_content: str
+    hunks: list[DiffHunk]
+    created_at: float = field(default_factory=time.time)
+
+    @property
+    def hunk_ids(self) -> list[str]:
+        return [hunk.id for hunk in self.hunks]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Wire form: ids and hunks only, never the full file contents."""
+
+        return {
+            "proposal_id": self.proposal_id,
+            "target_file": self.target_file,
+            "hunks": [hunk.to_dict() for hunk in self.hunks],
+        }
+
+
+def build_proposal(target_file: str, baseline_content: str, proposed_content: str) -> Proposal:
+    """Split a baseline/proposed pair into a reviewable proposal."""
+
+    return Proposal(
+        proposal_id=uuid.uuid4().hex,
+        target_file=target_file,
+        baseline_content=baseline_content,
+        proposed_content=proposed_content,
+        hunks=compute_diff_hunks(baseline_content, proposed_content),
+    )
+
+
+def apply_hunks(
+    current_content: str,
+    hunks: Sequence[DiffHunk],
+    accepted_ids: Iterable[str] | None = None,
+) -> str:
+    """Apply the accepted hunks (all of them when ``accepted_ids`` is None) to ``current_content``.
+
+    Raises:
+        KeyError: An accepted id does not belong to ``hunks``.
+        HunkConflictError: One or more accepted hunks could not be located.
+    """
+
+    selected = _select_hunks(hunks, accepted_ids)
+    lines = current_content.splitlines(keepends=True)
+    result: list[str] = []
+    cursor = 0
+    # Running drift between where a hunk was expected and where it was found,
+    # so later hunks start their search at the already-observed offset.
+    drift = 0
+    conflicts: list[str] = []
+
+    for hunk in selected:
+        old_lines = hunk.old_lines
+        position = _locate(lines, old_lines, hunk.old_start + drift, cursor)
+        if position is None:
+            conflicts.append(hunk.id)
+            continue
+
+        drift = position - hunk.old_start
+        result.extend(lines[cursor:position])
+        result.extend(hunk.new_lines)
+        cursor = position + len(old_lines)
+
+    if conflicts:
+        raise HunkConflictError(conflicts)
+
+    result.extend(lines[cursor:])
+    return "".join(result)
+
+
+class ProposalStore:
+    """Bounded, thread-safe in-memory store of open proposals."""
+
+    def __init__(self, max_entries: int = MAX_STORED_PROPOSALS) -> None:
+        self._max_entries = max_entries
+        self._proposals: OrderedDict[str, Proposal] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, target_file: str, baseline_content: str, proposed_content: str) -> Proposal:
+        proposal = build_proposal(target_file, baseline_content, proposed_content)
+        with self._lock:
+            self._proposals[proposal.proposal_id] = proposal
+            while len(self._proposals) > self._max_entries:
+                self._proposals.popitem(last=False)
+        return proposal
+
+    def get(self, proposal_id: str) -> Proposal:
+        with self._lock:
+            try:
+                return self._proposals[proposal_id]
+            except KeyError:
+                raise KeyError(f"Unknown or expired proposal: {proposal_id}") from None
+
+    def discard(self, proposal_id: str) -> None:
+        with self._lock:
+            self._proposals.pop(proposal_id, None)
+
+
+_store = ProposalStore()
+
+
+def get_proposal_store() -> ProposalStore:
+    """Return the process-wide proposal store."""
+
+    return _store
+
+
+def _select_hunks(hunks: Sequence[DiffHunk], accepted_ids: Iterable[str] | None) -> list[DiffHunk]:
+    if accepted_ids is None:
+        return list(hunks)
+
+    wanted = set(accepted_ids)
+    unknown = wanted.difference(hunk.id for hunk in hunks)
+    if unknown:
+        raise KeyError(f"Unknown hunk ids: {', '.join(sorted(unknown))}")
+    return [hunk for hunk in hunks if hunk.id in wanted]
+
+
+def _locate(lines: Sequence[str], needle: Sequence[str], expected: int, floor: int) -> int | None:
+    """Find ``needle`` in ``lines`` at or after ``floor``, nearest to ``expected`` first."""
+
+    needle = list(needle)
+    limit = len(lines) - len(needle)
+    if limit < floor:
+        return None
+
+    expected = min(max(expected, floor), limit)
+    if not needle:
+        return expected
+
+    first = needle[0]
+    for distance in range(max(expected - floor, limit - expected) + 1):
+        for position in (expected - distance, expected + distance):
+            if floor <= position <= limit and lines[position] == first:
+                if lines[position:position + len(needle)] == needle:
+                    return position
+            if distance == 0:
+                break
+    return None
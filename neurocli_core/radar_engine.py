@@ -1,7 +1,7 @@
 import os
 import re
-from typing import Dict, List, Any
-from datetime import datetime
+from typing import Any, Dict, Iterator, List
+from datetime import datetime, timedelta
 
 # Exclude generated, dependency, cache, and tool-runtime folders from workspace
 # health scans so Radar reports project-owned source instead of environment noise.
@@ -37,41 +37,25 @@ LANGUAGE_MAP = {
 # Matches # TODO, // FIXME, <!-- TODO, /* FIXME */, etc.
 DEBT_REGEX = re.compile(r'(?i)(?:#|//|<!--|/\*\*?|\*)\s*(TODO|FIXME)\b\s*:?\s*(.*)')
 
+# Streaming scans report progress after this many source files
+PROGRESS_BATCH_FILES = 200
+
 def _is_valid_file(file_name: str) -> bool:
     """Check if the file has a mapped extension."""
     _, ext = os.path.splitext(file_name)
     return ext.lower() in LANGUAGE_MAP
 
-def scan_workspace_health(cwd: str = '.') -> Dict[str, Any]:
-    """
-    Scans the workspace to calculate Lines of Code (LOC) per language.
-    """
-    loc_by_lang = {}
-    total_loc = 0
-    
+def _iter_source_files(cwd: str) -> Iterator[str]:
+    """Yield paths of Radar-tracked source files under cwd, skipping excluded folders."""
     for root, dirs, files in os.walk(cwd):
         # Modify dirs in-place to exclude unwanted directories
         dirs[:] = [d for d in dirs if d not in EXCLUDED_DIRS]
-        
+
         for file in files:
             if _is_valid_file(file):
-                ext = os.path.splitext(file)[1].lower()
-                lang = LANGUAGE_MAP[ext]
-                
-                file_path = os.path.join(root, file)
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        # Count non-empty lines for LOC
-                        count = sum(1 for line in f if line.strip())
-                        
-                        if lang not in loc_by_lang:
-                            loc_by_lang[lang] = 0
-                        loc_by_lang[lang] += count
-                        total_loc += count
-                except (UnicodeDecodeError, IOError):
-                    # Skip files that can't be read as text
-                    continue
-                    
+                yield os.path.join(root, file)
+
+def _health_snapshot(loc_by_lang: Dict[str, int], total_loc: int) -> Dict[str, Any]:
     # Calculate percentages and sort by volume
     composition = {}
     for lang, count in sorted(loc_by_lang.items(), key=lambda item: item[1], reverse=True):
@@ -80,113 +64,128 @@ def scan_workspace_health(cwd: str = '.') -> Dict[str, Any]:
             'loc': count,
             'percentage': percentage
         }
-        
+
     return {
         'total_loc': total_loc,
         'composition': composition
     }
 
+def iter_workspace_health(cwd: str = '.', batch_files: int = PROGRESS_BATCH_FILES) -> Iterator[Dict[str, Any]]:
+    """
+    Yields running Lines of Code (LOC) totals every batch_files files, then the final totals.
+    Each snapshot has the same shape as scan_workspace_health's result.
+    """
+    loc_by_lang: Dict[str, int] = {}
+    total_loc = 0
+    scanned = 0
+
+    for file_path in _iter_source_files(cwd):
+        lang = LANGUAGE_MAP[os.path.splitext(file_path)[1].lower()]
+        scanned += 1
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                # Count non-empty lines for LOC
+                count = sum(1 for line in f if line.strip())
+        except (UnicodeDecodeError, IOError):
+            # Skip files that can't be read as text
+            continue
+        loc_by_lang[lang] = loc_by_lang.get(lang, 0) + count
+        total_loc += count
+        if scanned % batch_files == 0:
+            yield _health_snapshot(loc_by_lang, total_loc)
+
+    yield _health_snapshot(loc_by_lang, total_loc)
+
+def scan_workspace_health(cwd: str = '.') -> Dict[str, Any]:
+    """
+    Scans the workspace to calculate Lines of Code (LOC) per language.
+    """
+    snapshot: Dict[str, Any] = {}
+    for snapshot in iter_workspace_health(cwd):
+        pass
+    return snapshot
+
+def iter_technical_debt(cwd: str = '.', batch_files: int = PROGRESS_BATCH_FILES) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Yields the TODO/FIXME items found in each batch of batch_files files, ending with
+    a (possibly empty) final batch. Concatenated, the batches equal scan_technical_debt.
+    """
+    batch = []
+    scanned = 0
+
+    for file_path in _iter_source_files(cwd):
+        rel_path = os.path.relpath(file_path, cwd)
+        scanned += 1
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                for line_num, line in enumerate(f, 1):
+                    match = DEBT_REGEX.search(line)
+                    if match:
+                        msg_type = match.group(1).upper()
+                        raw_msg = match.group(2).strip()
+
+                        # Clean up closing comment tags and hashes
+                        clean_msg = re.sub(r'(-->|\*/|#)+$', '', raw_msg).strip()
+
+                        if not clean_msg:
+                            message = msg_type
+                        else:
+                            message = f"{msg_type} {clean_msg}"
+
+                        batch.append({
+                            'file_name': rel_path,
+                            'line_number': line_num,
+                            'message': message
+                        })
+        except (UnicodeDecodeError, IOError):
+            continue
+        if scanned % batch_files == 0:
+            yield batch
+            batch = []
+
+    yield batch
+
 def scan_technical_debt(cwd: str = '.') -> List[Dict[str, Any]]:
     """
     Scans valid files line-by-line to find TODO/FIXME comments.
     """
-    debt_list = []
-    
-    for root, dirs, files in os.walk(cwd):
-        dirs[:] = [d for d in dirs if d not in EXCLUDED_DIRS]
-        
-        for file in files:
-            if _is_valid_file(file):
-                file_path = os.path.join(root, file)
-                rel_path = os.path.relpath(file_path, cwd)
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        for line_num, line in enumerate(f, 1):
-                            match = DEBT_REGEX.search(line)
-                            if match:
-                                msg_type = match.group(1).upper()
-                                raw_msg = match.group(2).strip()
-                                
-                                # Clean up closing comment tags and hashes
-                                clean_msg = re.sub(r'(-->|\*/|#)+$', '', raw_msg).strip()
-                                
-                                if not clean_msg:
-                                    message = msg_type
-                                else:
-                                    message = f"{msg_type} {clean_msg}"
-                                    
-                                debt_list.append({
-                                    'file_name': rel_path,
-                                    'line_number': line_num,
-                                    'message': message
-                                })
-                except (UnicodeDecodeError, IOError):
-                    continue
-                    
-    return debt_list
+    return [item for batch in iter_technical_debt(cwd) for item in batch]
 
 def scan_recent_edits(cwd: str = '.', max_items: int = 20, max_days: int = 7) -> List[Dict[str, Any]]:
     """
-    Scans the workspace to find recent AI modifications by looking for 
-    `backups/` directories and parsing the timestamped files within them.
+    Lists recent AI modifications under cwd from the backup store index
+    (every apply records a version there), newest first.
     Filters out edits older than max_days and returns up to max_items most recent edits.
     """
-    edits = []
+    from neurocli_core.backup_store import get_backup_store
+
     now = datetime.now()
-    
-    # Matches filenames like: my_file_20260303_224551.py
-    # Group 1: original name (my_file), Group 2: timestamp, Group 3: extension (.py)
-    backup_regex = re.compile(r'^(.*)_(\d{8}_\d{6})(\.[a-zA-Z0-9]+)?$')
-    
-    for root, dirs, files in os.walk(cwd):
-        # We still exclude the main problematic folders
-        dirs[:] = [d for d in dirs if d not in EXCLUDED_DIRS]
-        
-        # Only process files if we are inside a 'backups' directory
-        if os.path.basename(root) == 'backups':
-            for file in files:
-                match = backup_regex.search(file)
-                if match:
-                    base_name, timestamp_str, ext = match.groups()
-                    original_name = f"{base_name}{ext}" if ext else base_name
-                    
-                    try:
-                        # Parse the timestamp: YYYYMMDD_HHMMSS
-                        backup_time = datetime.strptime(timestamp_str, "%Y%m%d_%H%M%S")
-                        
-                        delta = now - backup_time
-                        if delta.days > max_days:
-                            continue
-                            
-                        # Format the time ago
-                        if delta.days > 0:
-                            time_ago = f"{delta.days} {'day' if delta.days == 1 else 'days'} ago"
-                        elif delta.seconds >= 3600:
-                            hours = delta.seconds // 3600
-                            time_ago = f"{hours} {'hour' if hours == 1 else 'hours'} ago"
-                        elif delta.seconds >= 60:
-                            minutes = delta.seconds // 60
-                            time_ago = f"{minutes} {'minute' if minutes == 1 else 'minutes'} ago"
-                        else:
-                            time_ago = "Just now"
-                        
-                        # Build the relative path representing the original file location
-                        # The original file is one level up from the /backups folder
-                        parent_dir = os.path.dirname(root)
-                        original_path = os.path.join(parent_dir, original_name)
-                        rel_path = os.path.relpath(original_path, cwd)
-                        
-                        edits.append({
-                            'original_file': rel_path,
-                            'backup_time': backup_time,
-                            'time_ago': time_ago,
-                            'timestamp_str': backup_time.strftime("%Y-%m-%d %H:%M:%S")
-                        })
-                    except ValueError:
-                        pass # Ignore if timestamp matching fails
-                        
-    # Sort by the most recent edits first
-    edits.sort(key=lambda x: x['backup_time'], reverse=True)
-    
-    # Return top N recent edits
-    return edits[:max_items]
+    # Edits up to max_days whole days old are kept, matching `delta.days <= max_days`.
+    since = (now - timedelta(days=max_days + 1)).timestamp()
+    edits = []
+
+    for record in get_backup_store().versions(under=cwd, since=since, limit=max_items):
+        backup_time = datetime.fromtimestamp(record.created_at)
+        delta = now - backup_time
+
+        # Format the time ago
+        if delta.days > 0:
+            time_ago = f"{delta.days} {'day' if delta.days == 1 else 'days'} ago"
+        elif delta.seconds >= 3600:
+            hours = delta.seconds // 3600
+            time_ago = f"{hours} {'hour' if hours == 1 else 'hours'} ago"
+        elif delta.seconds >= 60:
+            minutes = delta.seconds // 60
+            time_ago = f"{minutes} {'minute' if minutes == 1 else 'minutes'} ago"
+        else:
+            time_ago = "Just now"
+
+        edits.append({
+            'original_file': os.path.relpath(record.path, cwd),
+            'backup_time': backup_time,
+            'time_ago': time_ago,
+            'timestamp_str': backup_time.strftime("%Y-%m-%d %H:%M:%S"),
+            'version_id': record.id,
+        })
+
+    return edits
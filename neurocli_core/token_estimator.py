@@ -0,0 +1,235 @@
+"""Shared, cached token estimation for context selections.
+
+Both the Textual context manager and ``/api/context/estimate`` use this
+module. A first pass estimates from ``stat`` sizes only; a refine pass reads
+files and caches each result by ``(size, mtime)`` so unchanged files are never
+re-read.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from neurocli_core.config import get_settings
+
+
+# Roughly four characters per token for English prose and source code.
+CHARS_PER_TOKEN = 4
+
+
+@dataclass(slots=True)
+class PathEstimate:
+    """Token estimate for one selected file or directory."""
+
+    path: str
+    tokens: int = 0
+    files: int = 0
+    bytes: int = 0
+    exact: bool = False
+    error: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(slots=True)
+class ContextEstimate:
+    """Combined estimate for a whole context selection."""
+
+    total_tokens: int
+    exact: bool
+    budget: int
+    paths: list[PathEstimate] = field(default_factory=list)
+    pending: list[str] = field(default_factory=list)
+
+    @property
+    def over_budget(self) -> bool:
+        return self.total_tokens > self.budget
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "total_tokens": self.total_tokens,
+            "exact": self.exact,
+            "budget": self.budget,
+            "over_budget": self.over_budget,
+            "paths": [estimate.to_dict() for estimate in self.paths],
+            "pending": list(self.pending),
+        }
+
+
+class TokenEstimator:
+    """Estimate tokens per path with an LRU cache keyed by ``(size, mtime)``."""
+
+    def __init__(self, max_entries: int | None = None) -> None:
+        self.max_entries = max_entries or get_settings().token_cache_entries
+        self._cache: OrderedDict[str, tuple[int, int, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _cached_tokens(self, key: str, size: int, mtime_ns: int) -> int | None:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None or entry[0] != size or entry[1] != mtime_ns:
+                return None
+            self._cache.move_to_end(key)
+            return entry[2]
+
+    def _store(self, key: str, size: int, mtime_ns: int, tokens: int) -> None:
+        with self._lock:
+            self._cache[key] = (size, mtime_ns, tokens)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+    def estimate_file(self, path: Path, *, refine: bool = True) -> tuple[int, int, bool]:
+        """Return ``(tokens, bytes, exact)`` for one file.
+
+        Without ``refine`` an uncached file is estimated from its byte size.
+        Files that are not valid UTF-8 count as zero tokens, matching the
+        workflow's context builder, which skips them.
+        """
+
+        stat = path.stat()
+        key = str(path)
+        cached = self._cached_tokens(key, stat.st_size, stat.st_mtime_ns)
+        if cached is not None:
+            return cached, stat.st_size, True
+        if not refine:
+            return stat.st_size // CHARS_PER_TOKEN, stat.st_size, False
+
+        try:
+            tokens = len(path.read_text(encoding="utf-8")) // CHARS_PER_TOKEN
+        except (UnicodeDecodeError, OSError):
+            tokens = 0
+        self._store(key, stat.st_size, stat.st_mtime_ns, tokens)
+        return tokens, stat.st_size, True
+
+    def estimate_path(
+        self,
+        raw_path: str,
+        *,
+        refine: bool = True,
+        should_stop: Callable[[], bool] | None = None,
+    ) -> PathEstimate:
+        """Estimate a file, or every file below a directory."""
+
+        estimate = PathEstimate(path=raw_path, exact=True)
+        path = Path(raw_path)
+        try:
+            if path.is_file():
+                file_paths: Iterable[Path] = [path]
+            elif path.is_dir():
+                file_paths = _walk_files(path)
+            else:
+                estimate.error = f"Path not found: {raw_path}"
+                return estimate
+
+            for file_path in file_paths:
+                if should_stop is not None and should_stop():
+                    estimate.exact = False
+                    break
+                try:
+                    tokens, size, exact = self.estimate_file(file_path, refine=refine)
+                except OSError:
+                    continue
+                estimate.tokens += tokens
+                estimate.bytes += size
+                estimate.files += 1
+                estimate.exact = estimate.exact and exact
+        except OSError as exc:
+            estimate.error = str(exc)
+        return estimate
+
+    def estimate(self, raw_paths: Iterable[str], *, refine: bool = True) -> ContextEstimate:
+        """Estimate a whole selection in one call."""
+
+        estimates = [self.estimate_path(raw_path, refine=refine) for raw_path in raw_paths]
+        return _combine(estimates, pending=[])
+
+
+def _walk_files(directory: Path) -> Iterable[Path]:
+    """Yield files below ``directory`` in the same order the context builder reads them."""
+
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for file_name in sorted(files):
+            yield Path(root) / file_name
+
+
+def _combine(estimates: list[PathEstimate], *, pending: list[str]) -> ContextEstimate:
+    return ContextEstimate(
+        total_tokens=sum(estimate.tokens for estimate in estimates),
+        exact=not pending and all(estimate.exact for estimate in estimates),
+        budget=get_settings().context_token_budget,
+        paths=sorted(estimates, key=lambda estimate: estimate.path),
+        pending=sorted(pending),
+    )
+
+
+class ContextTokenTracker:
+    """Incrementally maintained estimate for a selection that changes path by path.
+
+    ``add`` marks a path as pending, ``update`` records a (possibly partial)
+    estimate for it, and ``remove`` drops it immediately. Updates for paths
+    that were removed in the meantime are ignored, so background workers can
+    finish late without corrupting the total.
+    """
+
+    def __init__(self, estimator: TokenEstimator | None = None) -> None:
+        self.estimator = estimator or get_token_estimator()
+        self._estimates: dict[str, PathEstimate | None] = {}
+        self._lock = threading.Lock()
+
+    def add(self, raw_path: str) -> bool:
+        with self._lock:
+            if raw_path in self._estimates:
+                return False
+            self._estimates[raw_path] = None
+            return True
+
+    def remove(self, raw_path: str) -> None:
+        with self._lock:
+            self._estimates.pop(raw_path, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._estimates.clear()
+
+    def is_tracked(self, raw_path: str) -> bool:
+        with self._lock:
+            return raw_path in self._estimates
+
+    def update(self, estimate: PathEstimate) -> bool:
+        with self._lock:
+            if estimate.path not in self._estimates:
+                return False
+            self._estimates[estimate.path] = estimate
+            return True
+
+    def snapshot(self) -> ContextEstimate:
+        with self._lock:
+            known = [estimate for estimate in self._estimates.values() if estimate is not None]
+            pending = [
+                path
+                for path, estimate in self._estimates.items()
+                if estimate is None or not estimate.exact
+            ]
+        return _combine(known, pending=pending)
+
+
+_shared_estimator: TokenEstimator | None = None
+_shared_estimator_lock = threading.Lock()
+
+
+def get_token_estimator() -> TokenEstimator:
+    """Return the process-wide estimator so both UIs share one cache."""
+
+    global _shared_estimator
+    with _shared_estimator_lock:
+        if _shared_estimator is None:
+            _shared_estimator = TokenEstimator()
+        return _shared_estimator
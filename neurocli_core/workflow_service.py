@@ -2,12 +2,18 @@
 
 from __future__ import annotations
 
+import time
 from dataclasses import asdict, dataclass, field
 from pathlib import Path
 from typing import Any, Iterator, Literal, Mapping
 
-from neurocli_core.config import get_default_openai_model, get_openai_api_key
-from neurocli_core.llm_api_openai import call_openai_api, stream_openai_api
+from neurocli_core.config import get_default_openai_model
+from neurocli_core.llm_api_openai import LLMAttempt
+from neurocli_core.llm_providers import (
+    LLMProvider,
+    ProviderConfigurationError,
+    get_llm_provider,
+)
 
 
 SYSTEM_PROMPT = """
@@ -56,6 +62,7 @@ class AIWorkflowResponse:
     original_content: str = ""
     model: str | None = None
     error: str | None = None
+    metrics: dict[str, Any] = field(default_factory=dict)
 
     def to_dict(self) -> dict[str, Any]:
         """Return a JSON-serializable representation for API callers."""
@@ -121,29 +128,39 @@ def build_ai_workflow_request(
     )
 
 
-def execute_ai_workflow(request: AIWorkflowRequest) -> AIWorkflowResponse:
-    """Run the AI workflow synchronously and return a standardized payload."""
+def execute_ai_workflow(
+    request: AIWorkflowRequest,
+    *,
+    provider: LLMProvider | None = None,
+) -> AIWorkflowResponse:
+    """Run the AI workflow synchronously and return a standardized payload.
+
+    ``provider`` defaults to the backend selected by ``NEUROCLI_LLM_PROVIDER``.
+    """
 
     prepared, error_response = _prepare_workflow(request)
     if error_response is not None:
         return error_response
 
-    api_key = get_openai_api_key()
-    if not api_key:
+    try:
+        active_provider = provider or get_llm_provider()
+    except ProviderConfigurationError as exc:
         return _build_error_response(
             prepared.request,
-            "OpenAI API key not found. Please set OPENAI_API_KEY in the project .env file.",
+            str(exc),
             response_kind=prepared.response_kind,
             original_content=prepared.original_content,
             model=prepared.model,
         )
 
+    attempts: list[LLMAttempt] = []
+    started_at = time.perf_counter()
     try:
-        output_text = call_openai_api(
-            api_key,
+        output_text = active_provider.complete(
             prepared.compiled_prompt,
             model=prepared.model,
             options=prepared.request.model_options,
+            on_attempt=attempts.append,
         )
     except RuntimeError as exc:
         return _build_error_response(
@@ -152,26 +169,40 @@ def execute_ai_workflow(request: AIWorkflowRequest) -> AIWorkflowResponse:
             response_kind=prepared.response_kind,
             original_content=prepared.original_content,
             model=prepared.model,
+            metrics=_build_metrics(attempts, started_at),
         )
 
-    return _build_success_response(prepared, output_text)
+    return _build_success_response(
+        prepared,
+        output_text,
+        metrics=_build_metrics(attempts, started_at),
+    )
 
 
-def stream_ai_workflow(request: AIWorkflowRequest) -> Iterator[AIWorkflowStreamEvent]:
-    """Yield structured workflow events backed by the shared prompt preparation logic."""
+def stream_ai_workflow(
+    request: AIWorkflowRequest,
+    *,
+    provider: LLMProvider | None = None,
+) -> Iterator[AIWorkflowStreamEvent]:
+    """Yield structured workflow events backed by the shared prompt preparation logic.
+
+    Every provider yields plain text chunks, so the event sequence is the same
+    whether the chunks come from OpenAI, the mock backend, or a replay.
+    """
 
     prepared, error_response = _prepare_workflow(request)
     if error_response is not None:
         yield AIWorkflowStreamEvent(event="error", response=error_response)
         return
 
-    api_key = get_openai_api_key()
-    if not api_key:
+    try:
+        active_provider = provider or get_llm_provider()
+    except ProviderConfigurationError as exc:
         yield AIWorkflowStreamEvent(
             event="error",
             response=_build_error_response(
                 prepared.request,
-                "OpenAI API key not found. Please set OPENAI_API_KEY in the project .env file.",
+                str(exc),
                 response_kind=prepared.response_kind,
                 original_content=prepared.original_content,
                 model=prepared.model,
@@ -182,13 +213,18 @@ def stream_ai_workflow(request: AIWorkflowRequest) -> Iterator[AIWorkflowStreamE
     yield AIWorkflowStreamEvent(event="start")
 
     collected_chunks: list[str] = []
+    attempts: list[LLMAttempt] = []
+    started_at = time.perf_counter()
+    first_token_at: float | None = None
     try:
-        for chunk in stream_openai_api(
-            api_key,
+        for chunk in active_provider.stream(
             prepared.compiled_prompt,
             model=prepared.model,
             options=prepared.request.model_options,
+            on_attempt=attempts.append,
         ):
+            if first_token_at is None:
+                first_token_at = time.perf_counter()
             collected_chunks.append(chunk)
             yield AIWorkflowStreamEvent(event="delta", delta=chunk)
     except RuntimeError as exc:
@@ -200,13 +236,18 @@ def stream_ai_workflow(request: AIWorkflowRequest) -> Iterator[AIWorkflowStreamE
                 response_kind=prepared.response_kind,
                 original_content=prepared.original_content,
                 model=prepared.model,
+                metrics=_build_metrics(attempts, started_at, first_token_at),
             ),
         )
         return
 
     yield AIWorkflowStreamEvent(
         event="complete",
-        response=_build_success_response(prepared, "".join(collected_chunks)),
+        response=_build_success_response(
+            prepared,
+            "".join(collected_chunks),
+            metrics=_build_metrics(attempts, started_at, first_token_at),
+        ),
     )
 
 
@@ -315,9 +356,27 @@ def _prepare_workflow(
     )
 
 
+def _build_metrics(
+    attempts: list[LLMAttempt],
+    started_at: float,
+    first_token_at: float | None = None,
+) -> dict[str, Any]:
+    """Summarize timing and every LLM attempt made for one workflow run."""
+
+    metrics: dict[str, Any] = {
+        "latency_ms": round((time.perf_counter() - started_at) * 1000, 2),
+        "attempts": [attempt.to_dict() for attempt in attempts],
+    }
+    if first_token_at is not None:
+        metrics["first_token_ms"] = round((first_token_at - started_at) * 1000, 2)
+    return metrics
+
+
 def _build_success_response(
     prepared: _PreparedWorkflow,
     output_text: str,
+    *,
+    metrics: dict[str, Any] | None = None,
 ) -> AIWorkflowResponse:
     """Create a stable success payload for sync and streaming callers."""
 
@@ -331,6 +390,7 @@ def _build_success_response(
         context_paths=list(prepared.request.context_paths),
         original_content=prepared.original_content,
         model=prepared.model,
+        metrics=dict(metrics or {}),
     )
 
 
@@ -341,6 +401,7 @@ def _build_error_response(
     response_kind: ResponseKind = "message",
     original_content: str = "",
     model: str | None = None,
+    metrics: dict[str, Any] | None = None,
 ) -> AIWorkflowResponse:
     """Create a stable error payload without raising across UI boundaries."""
 
@@ -354,4 +415,5 @@ def _build_error_response(
         original_content=original_content,
         model=model or request.model,
         error=error,
+        metrics=dict(metrics or {}),
     )
@@ -0,0 +1,224 @@
+"""One-level-at-a-time workspace listings for file trees.
+
+``WorkspaceTree.list_directory`` returns the immediate children of one
+directory with workspace-relative paths, a child count for each
+subdirectory, and a cursor for the next page. Listings are cached per
+directory and reused until that directory's mtime changes (adding,
+removing, or renaming an entry updates it), so expanding a folder again,
+or paging through a huge one, costs a single ``stat``.
+"""
+
+from __future__ import annotations
+
+import base64
+import bisect
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable
+
+from neurocli_core.config import get_env_int
+
+
+DEFAULT_PAGE_SIZE = 200
+MAX_PAGE_SIZE = 1000
+DEFAULT_CACHED_DIRECTORIES = 2048
+
+# Sort key: directories first, then case-insensitive name, then exact name as a tiebreak.
+SortKey = tuple[bool, str, str]
+
+
+@dataclass(frozen=True, slots=True)
+class TreeEntry:
+    name: str
+    path: str
+    type: str
+
+    @property
+    def sort_key(self) -> SortKey:
+        return (self.type != "directory", self.name.lower(), self.name)
+
+
+@dataclass(slots=True)
+class TreePage:
+    path: str
+    name: str
+    entries: list[dict[str, Any]] = field(default_factory=list)
+    total: int = 0
+    next_cursor: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "path": self.path,
+            "name": self.name,
+            "type": "directory",
+            "entries": self.entries,
+            "total": self.total,
+            "next_cursor": self.next_cursor,
+        }
+
+
+@dataclass(slots=True)
+class _Listing:
+    mtime_ns: int
+    entries: list[TreeEntry]
+    keys: list[SortKey]
+
+
+class WorkspaceTree:
+    """Cached, paginated directory listings confined to ``root``."""
+
+    def __init__(
+        self,
+        root: Path,
+        *,
+        excluded: Iterable[str] = (),
+        max_cached: int | None = None,
+    ) -> None:
+        self.root = Path(root).resolve()
+        self.excluded = frozenset(excluded)
+        if max_cached is None:
+            max_cached = get_env_int("NEUROCLI_TREE_CACHE_DIRECTORIES", DEFAULT_CACHED_DIRECTORIES)
+        self.max_cached = max(1, max_cached)
+        self.scans = 0
+        self._listings: OrderedDict[Path, _Listing] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def list_directory(
+        self,
+        relative_path: str = "",
+        *,
+        cursor: str | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> TreePage:
+        """Return one page of a directory's children.
+
+        Raises:
+            ValueError: The path leaves the workspace or the cursor is malformed.
+            NotADirectoryError: The path is not a directory.
+        """
+
+        directory = self._resolve(relative_path)
+        listing = self._listing(directory)
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        start = bisect.bisect_right(listing.keys, _decode_cursor(cursor)) if cursor else 0
+        page = listing.entries[start : start + limit]
+
+        entries = []
+        for entry in page:
+            payload: dict[str, Any] = {"name": entry.name, "path": entry.path, "type": entry.type}
+            if entry.type == "directory":
+                payload["child_count"] = self._child_count(self.root / entry.path)
+            entries.append(payload)
+
+        more = start + limit < len(listing.entries)
+        return TreePage(
+            path=self._relative(directory),
+            name=directory.name,
+            entries=entries,
+            total=len(listing.entries),
+            next_cursor=_encode_cursor(page[-1].sort_key) if more and page else None,
+        )
+
+    def invalidate(self, relative_path: str | None = None) -> None:
+        with self._lock:
+            if relative_path is None:
+                self._listings.clear()
+            else:
+                self._listings.pop(self._resolve(relative_path), None)
+
+    def _resolve(self, relative_path: str) -> Path:
+        candidate = (self.root / (relative_path or "").strip().lstrip("/")).resolve()
+        if candidate != self.root and self.root not in candidate.parents:
+            raise ValueError("Path must stay within the workspace root.")
+        if not candidate.is_dir():
+            raise NotADirectoryError(f"Not a directory: {relative_path}")
+        return candidate
+
+    def _relative(self, path: Path) -> str:
+        relative = path.relative_to(self.root).as_posix()
+        return "" if relative == "." else relative
+
+    def _child_count(self, directory: Path) -> int | None:
+        try:
+            return len(self._listing(directory).entries)
+        except OSError:
+            return None
+
+    def _listing(self, directory: Path) -> _Listing:
+        mtime_ns = directory.stat().st_mtime_ns
+        with self._lock:
+            cached = self._listings.get(directory)
+            if cached is not None and cached.mtime_ns == mtime_ns:
+                self._listings.move_to_end(directory)
+                return cached
+
+        listing = self._scan(directory, mtime_ns)
+        with self._lock:
+            self._listings[directory] = listing
+            self._listings.move_to_end(directory)
+            while len(self._listings) > self.max_cached:
+                self._listings.popitem(last=False)
+        return listing
+
+    def _scan(self, directory: Path, mtime_ns: int) -> _Listing:
+        self.scans += 1
+        base = self._relative(directory)
+        entries: list[TreeEntry] = []
+        try:
+            with os.scandir(directory) as iterator:
+                for item in iterator:
+                    if item.name in self.excluded:
+                        continue
+                    # Only symlinks can point outside the workspace; skip resolving everything else.
+                    if item.is_symlink() and not self._within_root(Path(item.path)):
+                        continue
+                    try:
+                        is_directory = item.is_dir()
+                    except OSError:
+                        continue
+                    entries.append(
+                        TreeEntry(
+                            name=item.name,
+                            path=f"{base}/{item.name}" if base else item.name,
+                            type="directory" if is_directory else "file",
+                        )
+                    )
+        except PermissionError:
+            pass
+        entries.sort(key=lambda entry: entry.sort_key)
+        return _Listing(mtime_ns, entries, [entry.sort_key for entry in entries])
+
+    def _within_root(self, path: Path) -> bool:
+        resolved = path.resolve(strict=False)
+        return resolved == self.root or self.root in resolved.parents
+
+
+def _encode_cursor(key: SortKey) -> str:
+    return base64.urlsafe_b64encode(json.dumps(key).encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> SortKey:
+    try:
+        is_file, folded, name = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Invalid cursor.") from exc
+    return (bool(is_file), str(folded), str(name))
+
+
+_trees: dict[Path, WorkspaceTree] = {}
+_trees_lock = threading.Lock()
+
+
+def get_workspace_tree(root: Path, *, excluded: Iterable[str] = ()) -> WorkspaceTree:
+    """Return the shared tree for ``root``, so its listing cache outlives single requests."""
+
+    key = Path(root).resolve()
+    with _trees_lock:
+        tree = _trees.get(key)
+        if tree is None:
+            tree = _trees[key] = WorkspaceTree(key, excluded=excluded)
+        return tree
@@ -8,6 +8,7 @@ from pathlib import Path
 from unittest.mock import patch
 
 from neurocli_core import ai_services
+from neurocli_core.llm_api_openai import LLMAttempt
 from neurocli_core.workflow_service import (
     AIWorkflowResponse,
     build_ai_workflow_request,
@@ -28,6 +29,7 @@ class ExecuteAIWorkflowTests(unittest.TestCase):
             *,
             model: str | None = None,
             options: dict[str, object] | None = None,
+            **_kwargs: object,
         ) -> str:
             call_args["api_key"] = api_key
             call_args["prompt"] = prompt
@@ -37,9 +39,9 @@ class ExecuteAIWorkflowTests(unittest.TestCase):
 
         request = build_ai_workflow_request("Write hello world", model_options={"temperature": 0.2})
 
-        with patch("neurocli_core.workflow_service.get_openai_api_key", return_value="test-key"), patch(
+        with patch("neurocli_core.llm_providers.get_openai_api_key", return_value="test-key"), patch(
             "neurocli_core.workflow_service.get_default_openai_model", return_value="test-model"
-        ), patch("neurocli_core.workflow_service.call_openai_api", side_effect=fake_call):
+        ), patch("neurocli_core.llm_providers.call_openai_api", side_effect=fake_call):
             response = execute_ai_workflow(request)
 
         self.assertTrue(response.ok)
@@ -60,6 +62,7 @@ class ExecuteAIWorkflowTests(unittest.TestCase):
             *,
             model: str | None = None,
             options: dict[str, object] | None = None,
+            **_kwargs: object,
         ) -> str:
             captured_prompt["value"] = prompt
             return "print('generated')\n"
@@ -68,8 +71,8 @@ class ExecuteAIWorkflowTests(unittest.TestCase):
             target_path = Path(tmp_dir) / "empty.py"
             target_path.write_text("", encoding="utf-8")
 
-            with patch("neurocli_core.workflow_service.get_openai_api_key", return_value="test-key"), patch(
-                "neurocli_core.workflow_service.call_openai_api", side_effect=fake_call
+            with patch("neurocli_core.llm_providers.get_openai_api_key", return_value="test-key"), patch(
+                "neurocli_core.llm_providers.call_openai_api", side_effect=fake_call
             ):
                 response = execute_ai_workflow(
                     build_ai_workflow_request("Fill the file", target_file=str(target_path))
@@ -82,7 +85,7 @@ class ExecuteAIWorkflowTests(unittest.TestCase):
         self.assertIn("TARGET FILE CONTEXT:", captured_prompt["value"])
 
     def test_execute_returns_structured_error_when_key_is_missing(self) -> None:
-        with patch("neurocli_core.workflow_service.get_openai_api_key", return_value=None):
+        with patch("neurocli_core.llm_providers.get_openai_api_key", return_value=None):
             response = execute_ai_workflow(build_ai_workflow_request("Explain this code"))
 
         self.assertFalse(response.ok)
@@ -94,8 +97,8 @@ class StreamAIWorkflowTests(unittest.TestCase):
     """Verify that streaming uses the same prepared request contract."""
 
     def test_stream_emits_start_delta_and_complete_events(self) -> None:
-        with patch("neurocli_core.workflow_service.get_openai_api_key", return_value="test-key"), patch(
-            "neurocli_core.workflow_service.stream_openai_api",
+        with patch("neurocli_core.llm_providers.get_openai_api_key", return_value="test-key"), patch(
+            "neurocli_core.llm_providers.stream_openai_api",
             return_value=iter(["hello", " ", "world"]),
         ):
             events = list(stream_ai_workflow(build_ai_workflow_request("Stream a response")))
@@ -105,6 +108,22 @@ class StreamAIWorkflowTests(unittest.TestCase):
         self.assertIsNotNone(events[-1].response)
         self.assertEqual(events[-1].response.output_text, "hello world")
         self.assertEqual(events[-1].response.response_kind, "message")
+        self.assertIn("first_token_ms", events[-1].response.metrics)
+
+    def test_stream_reports_llm_attempts_in_metrics(self) -> None:
+        def fake_stream(*_args, on_attempt=None, **_kwargs):
+            on_attempt(LLMAttempt(1, "primary", "timeout", 10.0, error="slow"))
+            on_attempt(LLMAttempt(2, "retry", "ok", 5.0, first_token_ms=2.0))
+            yield "done"
+
+        with patch("neurocli_core.llm_providers.get_openai_api_key", return_value="test-key"), patch(
+            "neurocli_core.llm_providers.stream_openai_api", side_effect=fake_stream
+        ):
+            events = list(stream_ai_workflow(build_ai_workflow_request("Stream a response")))
+
+        attempts = events[-1].response.metrics["attempts"]
+        self.assertEqual([attempt["status"] for attempt in attempts], ["timeout", "ok"])
+        self.assertEqual(attempts[1]["kind"], "retry")
 
 
 class LegacyCompatibilityTests(unittest.TestCase):
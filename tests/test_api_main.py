@@ -5,14 +5,65 @@ from __future__ import annotations
 import asyncio
 import json
 import tempfile
+import threading
 import unittest
 from pathlib import Path
 from unittest.mock import patch
 
 from api import main
+from neurocli_core.backup_store import BackupStore
+from neurocli_core.commit_summarizer import CommitStreamEvent, CommitSummary
+from neurocli_core.executors import ExecutionLanes, LaneSpec
+from neurocli_core.formatter_service import FormatResult
+from neurocli_core.git_engine import DiffFileStat
+from neurocli_core.git_jobs import PushJob, PushJobManager
+from neurocli_core.git_status import GitStatusError, parse_porcelain_v2
 from neurocli_core.workflow_service import AIWorkflowResponse, AIWorkflowStreamEvent
 
 
+def _use_temp_backup_store(test_case: unittest.TestCase) -> BackupStore:
+    """Point the process-wide backup store at a throwaway directory for one test."""
+
+    temp_dir = tempfile.TemporaryDirectory()
+    test_case.addCleanup(temp_dir.cleanup)
+    store = BackupStore(Path(temp_dir.name))
+    test_case.addCleanup(store.close)
+    patcher = patch("neurocli_core.backup_store._store", store)
+    patcher.start()
+    test_case.addCleanup(patcher.stop)
+    return store
+
+
+def _asgi_get(path: str) -> tuple[int, bytes]:
+    """Send one GET through the full app (middleware and exception handlers included)."""
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "headers": [],
+        "client": ("127.0.0.1", 1),
+        "server": ("127.0.0.1", 80),
+        "root_path": "",
+    }
+    messages: list[dict] = []
+
+    async def receive() -> dict:
+        await asyncio.sleep(10)
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict) -> None:
+        messages.append(message)
+
+    asyncio.run(main.app(scope, receive, send))
+    return messages[0]["status"], b"".join(message.get("body", b"") for message in messages[1:])
+
+
 class PromptEndpointTests(unittest.TestCase):
     def test_prompt_endpoint_returns_standard_workflow_payload(self) -> None:
         captured_request: dict[str, object] = {}
@@ -120,5 +171,365 @@ class FileSafetyEndpointTests(unittest.TestCase):
         self.assertIn("workspace root", response["error"])
 
 
+
+class FileReadEndpointTests(unittest.TestCase):
+    def test_returns_line_windows_with_an_etag_and_304_when_unchanged(self) -> None:
+        with tempfile.TemporaryDirectory(dir=main.WORKSPACE_ROOT) as temp_dir:
+            log_file = Path(temp_dir) / "app.log"
+            log_file.write_text("".join(f"line {index}\n" for index in range(1, 101)), encoding="utf-8")
+            relative_path = str(log_file.relative_to(main.WORKSPACE_ROOT))
+
+            response = asyncio.run(main.get_file_content(path=relative_path, start_line=10, line_count=2))
+            etag = response.headers["etag"]
+            unchanged = asyncio.run(main.get_file_content(path=relative_path, if_none_match=etag))
+
+        payload = json.loads(response.body)
+        self.assertEqual(payload["content"], "line 10\nline 11\n")
+        self.assertEqual((payload["start_line"], payload["end_line"], payload["total_lines"]), (10, 11, 100))
+        self.assertEqual(payload["etag"], etag)
+        self.assertEqual(unchanged.status_code, 304)
+
+    def test_binary_files_are_refused(self) -> None:
+        with tempfile.TemporaryDirectory(dir=main.WORKSPACE_ROOT) as temp_dir:
+            blob = Path(temp_dir) / "blob.bin"
+            blob.write_bytes(b"\0\1\2binary")
+            relative_path = str(blob.relative_to(main.WORKSPACE_ROOT))
+
+            response = asyncio.run(main.get_file_content(path=relative_path))
+            raw = asyncio.run(main.get_file_raw(path=relative_path))
+
+        self.assertTrue(response["binary"])
+        self.assertIn("binary", raw["error"])
+
+
+class FileListEndpointTests(unittest.TestCase):
+    def test_lists_one_level_with_relative_paths(self) -> None:
+        with tempfile.TemporaryDirectory(dir=main.WORKSPACE_ROOT) as temp_dir:
+            (Path(temp_dir) / "nested").mkdir()
+            (Path(temp_dir) / "nested" / "inner.py").write_text("", encoding="utf-8")
+            (Path(temp_dir) / "top.py").write_text("", encoding="utf-8")
+            relative_dir = Path(temp_dir).relative_to(main.WORKSPACE_ROOT).as_posix()
+
+            response = asyncio.run(main.list_directory_endpoint(path=relative_dir))
+
+        self.assertEqual(response["path"], relative_dir)
+        self.assertEqual(response["entries"], [
+            {"name": "nested", "path": f"{relative_dir}/nested", "type": "directory", "child_count": 1},
+            {"name": "top.py", "path": f"{relative_dir}/top.py", "type": "file"},
+        ])
+        self.assertIsNone(response["next_cursor"])
+
+    def test_rejects_paths_outside_workspace(self) -> None:
+        response = asyncio.run(main.list_directory_endpoint(path="../.."))
+
+        self.assertIn("workspace root", response["error"])
+
+
+class ProposalEndpointTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.backup_store = _use_temp_backup_store(self)
+
+    def test_format_proposal_applies_only_accepted_hunks(self) -> None:
+        baseline = "".join(f"line {index}\n" for index in range(30))
+        formatted = baseline.replace("line 2\n", "line two\n").replace("line 25\n", "line 25!\n")
+
+        with tempfile.TemporaryDirectory(dir=main.WORKSPACE_ROOT) as temp_dir:
+            target_file = Path(temp_dir) / "sample.py"
+            target_file.write_text(baseline, encoding="utf-8")
+            relative_path = str(target_file.relative_to(main.WORKSPACE_ROOT))
+
+            format_result = FormatResult(formatted, "ruff", "daemon", 1.5, changed=True)
+            with patch("neurocli_core.code_formatter.format_code_result", return_value=format_result):
+                proposal = asyncio.run(main.format_file_endpoint(main.FormatRequest(file_path=relative_path)))
+
+            self.assertEqual(len(proposal["hunks"]), 2)
+            self.assertEqual(proposal["formatter"]["mode"], "daemon")
+            # The file moves on disk before the user decides; the hunk still lands.
+            target_file.write_text("# new header\n" + baseline, encoding="utf-8")
+
+            result = asyncio.run(
+                main.apply_proposal_endpoint(
+                    proposal["proposal_id"],
+                    main.ProposalApplyRequest(accepted_hunk_ids=[proposal["hunks"][1]["id"]]),
+                )
+            )
+            content = target_file.read_text(encoding="utf-8")
+
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["applied_hunk_ids"], [proposal["hunks"][1]["id"]])
+        self.assertIn("line 2\n", content)
+        self.assertIn("line 25!\n", content)
+        self.assertTrue(content.startswith("# new header\n"))
+
+    def test_unknown_proposal_returns_error(self) -> None:
+        result = asyncio.run(
+            main.apply_proposal_endpoint("missing", main.ProposalApplyRequest())
+        )
+
+        self.assertIn("Unknown or expired proposal", result["error"])
+
+
+class FormatBatchEndpointTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.backup_store = _use_temp_backup_store(self)
+
+    def test_batch_formats_in_parallel_and_applies_in_one_step(self) -> None:
+        def fake_format(code: str, _file_path: str) -> FormatResult:
+            return FormatResult(code.upper(), "ruff", "daemon", 0.1, changed=code != code.upper())
+
+        with tempfile.TemporaryDirectory(dir=main.WORKSPACE_ROOT) as temp_dir:
+            for name in ("one.py", "two.py"):
+                (Path(temp_dir) / name).write_text(f"{name}\n", encoding="utf-8")
+            relative_dir = str(Path(temp_dir).relative_to(main.WORKSPACE_ROOT))
+
+            with patch("neurocli_core.batch_formatter.format_code_result", side_effect=fake_format):
+                report = asyncio.run(
+                    main.format_batch_endpoint(main.FormatBatchRequest(paths=[relative_dir]))
+                )
+                events = list(
+                    main._serialize_format_batch_events(
+                        main.FormatBatchRequest(paths=[relative_dir], check_only=True)
+                    )
+                )
+            result = asyncio.run(main.apply_format_batch_endpoint(report["batch_id"]))
+            contents = sorted(path.read_text(encoding="utf-8") for path in Path(temp_dir).glob("*.py"))
+
+        self.assertEqual(report["summary"]["changed"], 2)
+        self.assertEqual([event["event"] for event in events], ["start", "progress", "progress", "complete"])
+        self.assertFalse(json.loads(events[-1]["data"])["ok"])
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(contents, ["ONE.PY\n", "TWO.PY\n"])
+
+
+class BackupEndpointTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.backup_store = _use_temp_backup_store(self)
+
+    def test_apply_records_versions_that_can_be_listed_and_undone(self) -> None:
+        with tempfile.TemporaryDirectory(dir=main.WORKSPACE_ROOT) as temp_dir:
+            target_file = Path(temp_dir) / "notes.py"
+            target_file.write_text("v1\n", encoding="utf-8")
+            relative_path = str(target_file.relative_to(main.WORKSPACE_ROOT))
+
+            asyncio.run(main.apply_changes_endpoint(main.ApplyRequest(file_path=relative_path, content="v2\n")))
+            asyncio.run(main.apply_changes_endpoint(main.ApplyRequest(file_path=relative_path, content="v3\n")))
+            listing = asyncio.run(main.list_backups_endpoint(path=relative_path))
+            version = asyncio.run(main.get_backup_endpoint(listing["versions"][-1]["id"]))
+            undo = asyncio.run(main.undo_backup_endpoint(main.UndoRequest(file_path=relative_path)))
+            content = target_file.read_text(encoding="utf-8")
+
+        self.assertEqual(len(listing["versions"]), 2)
+        self.assertEqual(version["content"], "v1\n")
+        self.assertEqual(undo["status"], "success")
+        self.assertEqual(content, "v2\n")
+        self.assertFalse((Path(temp_dir) / "backups").exists())
+
+
+class GitStatusEndpointTests(unittest.TestCase):
+    def test_status_reports_branch_and_typed_entries(self) -> None:
+        status = parse_porcelain_v2(
+            b"# branch.oid abc\0# branch.head main\0"
+            b"1 M. N... 100644 100644 100644 aaa bbb api/main.py\0? scratch.txt\0"
+        )
+        with patch("neurocli_core.git_status.GitStatusService.status", return_value=status):
+            payload = asyncio.run(main.get_status_endpoint())
+
+        self.assertEqual(payload["status_message"], "On branch main")
+        self.assertEqual(payload["unsaved_files"], ["api/main.py", "scratch.txt"])
+        self.assertEqual(payload["branch"]["head"], "main")
+        self.assertTrue(payload["entries"][0]["staged"])
+
+    def test_status_falls_back_outside_a_repository(self) -> None:
+        with patch(
+            "neurocli_core.git_status.GitStatusService.status",
+            side_effect=GitStatusError("not a git repository"),
+        ):
+            payload = asyncio.run(main.get_status_endpoint())
+
+        self.assertEqual(
+            payload, {"status_message": "Not a git repository or git error.", "unsaved_files": []}
+        )
+
+    def test_status_reports_a_full_git_lane_instead_of_queueing(self) -> None:
+        lanes = ExecutionLanes([LaneSpec("git", workers=1, queue=0)])
+        self.addCleanup(lanes.close)
+        release = threading.Event()
+        self.addCleanup(release.set)
+        lanes.submit("git", release.wait, 5)
+
+        with patch("neurocli_core.executors._lanes", lanes):
+            payload = asyncio.run(main.get_status_endpoint())
+
+        self.assertIn("git lane is full", payload["error"])
+
+    def test_uncaught_full_lane_becomes_an_error_payload(self) -> None:
+        lanes = ExecutionLanes([LaneSpec("io", workers=1, queue=0)])
+        self.addCleanup(lanes.close)
+        release = threading.Event()
+        self.addCleanup(release.set)
+        lanes.submit("io", release.wait, 5)
+
+        with patch("neurocli_core.executors._lanes", lanes):
+            for path in ("/api/files", "/api/files/list"):
+                status, body = _asgi_get(path)
+
+                self.assertEqual(status, 503)
+                self.assertIn("io lane is full", json.loads(body)["error"])
+
+
+class GitDiffEndpointTests(unittest.TestCase):
+    def test_summary_is_paginated_and_path_diffs_are_filtered(self) -> None:
+        stats = [DiffFileStat(f"pkg/mod{i}.py", i, 1) for i in range(5)]
+        with (
+            patch("neurocli_core.git_engine.get_diff_stats", return_value=(stats, False)),
+            patch("neurocli_core.git_engine.get_staged_diff", return_value=("diff --git a/x b/x\n", True)) as diff,
+        ):
+            page = asyncio.run(main.get_diff_endpoint(summary=True, offset=3, limit=2))
+            single = asyncio.run(main.get_diff_endpoint(path="api/main.py"))
+
+        self.assertEqual([entry["path"] for entry in page["files"]], ["pkg/mod3.py", "pkg/mod4.py"])
+        self.assertEqual((page["total_files"], page["added"], page["deleted"]), (5, 10, 5))
+        diff.assert_called_once_with(["api/main.py"], main.WORKSPACE_ROOT)
+        self.assertEqual(single["diffs"], "diff --git a/x b/x\n")
+        self.assertFalse(single["truncated"])
+        self.assertTrue(single["fallback"])
+
+    def test_path_outside_workspace_is_rejected(self) -> None:
+        payload = asyncio.run(main.get_diff_endpoint(path="../../etc/passwd"))
+
+        self.assertIn("error", payload)
+
+    def test_stream_sends_file_list_before_diffs(self) -> None:
+        stats = [DiffFileStat("a.py", 1, 0), DiffFileStat("b.py", 2, 0)]
+        with (
+            patch("neurocli_core.git_engine.get_diff_stats", return_value=(stats, True)),
+            patch(
+                "neurocli_core.git_engine.iter_file_diffs",
+                return_value=iter([("a.py", "diff a\n"), ("b.py", "diff b\n")]),
+            ),
+        ):
+            messages = list(main._serialize_diff_events(main.DiffStreamRequest()))
+
+        self.assertEqual([message["event"] for message in messages], ["summary", "file", "file", "complete"])
+        self.assertEqual(len(json.loads(messages[0]["data"])["files"]), 2)
+        self.assertEqual(json.loads(messages[2]["data"])["diff"], "diff b\n")
+
+    def test_stream_failing_part_way_ends_with_an_error_event(self) -> None:
+        def failing_diffs(*_args, **_kwargs):
+            yield "a.py", "diff a\n"
+            raise RuntimeError("Git diff failed: fatal: bad object")
+
+        stats = [DiffFileStat("a.py", 1, 0), DiffFileStat("b.py", 2, 0)]
+        with (
+            patch("neurocli_core.git_engine.get_diff_stats", return_value=(stats, True)),
+            patch("neurocli_core.git_engine.iter_file_diffs", side_effect=failing_diffs),
+        ):
+            messages = list(main._serialize_diff_events(main.DiffStreamRequest()))
+
+        self.assertEqual([message["event"] for message in messages], ["summary", "file", "error"])
+        payload = json.loads(messages[-1]["data"])
+        self.assertEqual(payload["error"], "Git diff failed: fatal: bad object")
+        self.assertEqual(payload["files"], 1)
+
+
+class CommitMessageStreamTests(unittest.TestCase):
+    def test_stream_reuses_staged_diff_and_marks_fallback(self) -> None:
+        summary = CommitSummary(message="fix: tidy", mode="direct", files=1)
+        events = [
+            CommitStreamEvent("start", summary=summary),
+            CommitStreamEvent("delta", delta="fix: tidy"),
+            CommitStreamEvent("complete", summary=summary),
+        ]
+        with (
+            patch("neurocli_core.git_engine.get_staged_diff", return_value=("diff --git a/x b/x\n", True)),
+            patch("neurocli_core.git_engine.stream_commit_message", return_value=iter(events)) as stream,
+        ):
+            messages = list(main._serialize_commit_message_events())
+
+        stream.assert_called_once_with("diff --git a/x b/x\n")
+        payloads = [json.loads(message["data"]) for message in messages]
+        self.assertEqual([message["event"] for message in messages], ["start", "delta", "complete"])
+        self.assertTrue(payloads[0]["fallback"])
+        self.assertEqual(payloads[1]["delta"], "fix: tidy")
+        self.assertEqual(payloads[2]["summary"]["message"], "fix: tidy")
+
+    def test_diff_failure_becomes_an_error_event(self) -> None:
+        with patch("neurocli_core.git_engine.get_staged_diff", side_effect=RuntimeError("Git diff failed")):
+            messages = list(main._serialize_commit_message_events())
+
+        self.assertEqual(messages[0]["event"], "error")
+        self.assertEqual(json.loads(messages[0]["data"])["error"], "Git diff failed")
+
+
+class GitCommitEndpointTests(unittest.TestCase):
+    def test_commit_returns_before_the_push_finishes(self) -> None:
+        job = PushJob("job-1", str(main.WORKSPACE_ROOT), ["git", "push"])
+        with (
+            patch.object(main, "_get_git_status", return_value=("On branch main", ["a.py"], None)),
+            patch("neurocli_core.git_engine.execute_commit", return_value="abc1234") as commit,
+            patch("neurocli_core.git_engine.start_push", return_value=job),
+        ):
+            payload = asyncio.run(main.execute_commit_endpoint(main.CommitRequest(message="fix: x")))
+
+        commit.assert_called_once_with("fix: x", True, main.WORKSPACE_ROOT)
+        self.assertTrue(payload["success"])
+        self.assertEqual(payload["commit"], "abc1234")
+        self.assertEqual(payload["push_job_id"], "job-1")
+
+    def test_push_stream_ends_with_the_final_status(self) -> None:
+        manager = PushJobManager()
+        job = PushJob("job-2", str(main.WORKSPACE_ROOT), ["git", "push"], status="failed", error="fatal: no remote")
+        manager._jobs[job.job_id] = job
+        with patch("neurocli_core.git_jobs._manager", manager):
+            messages = list(main._serialize_push_events("job-2"))
+            missing = list(main._serialize_push_events("nope"))
+
+        self.assertEqual([message["event"] for message in messages], ["error"])
+        self.assertEqual(json.loads(messages[0]["data"])["job"]["error"], "fatal: no remote")
+        self.assertEqual(missing[0]["event"], "error")
+
+    def test_push_stream_releases_its_thread_once_the_client_is_gone(self) -> None:
+        manager = PushJobManager()
+        job = PushJob("job-3", str(main.WORKSPACE_ROOT), ["git", "push"])
+        manager._jobs[job.job_id] = job
+        disconnected = threading.Event()
+        with patch("neurocli_core.git_jobs._manager", manager):
+            events = main._serialize_push_events("job-3", should_stop=disconnected.is_set)
+            first = next(events)
+            rest: list[dict[str, str]] = []
+            watcher = threading.Thread(target=lambda: rest.extend(events))
+            watcher.start()
+            disconnected.set()
+            watcher.join(timeout=3)
+
+        self.assertEqual(first["event"], "progress")
+        self.assertFalse(watcher.is_alive())
+        self.assertEqual(rest, [])
+
+
+class ContextEstimateEndpointTests(unittest.TestCase):
+    def test_estimate_endpoint_returns_shared_service_payload(self) -> None:
+        with tempfile.TemporaryDirectory(dir=main.WORKSPACE_ROOT) as temp_dir:
+            context_file = Path(temp_dir) / "notes.md"
+            context_file.write_text("x" * 400, encoding="utf-8")
+            relative_path = str(context_file.relative_to(main.WORKSPACE_ROOT))
+
+            data = asyncio.run(
+                main.estimate_context_endpoint(main.ContextEstimateRequest(paths=[relative_path]))
+            )
+
+        self.assertEqual(data["total_tokens"], 100)
+        self.assertTrue(data["exact"])
+        self.assertEqual(data["paths"][0]["path"], relative_path)
+
+    def test_estimate_endpoint_rejects_paths_outside_workspace(self) -> None:
+        with tempfile.NamedTemporaryFile(suffix=".txt") as outside_file:
+            data = asyncio.run(
+                main.estimate_context_endpoint(main.ContextEstimateRequest(paths=[outside_file.name]))
+            )
+
+        self.assertIn("workspace root", data["error"])
+
+
 if __name__ == "__main__":
     unittest.main()
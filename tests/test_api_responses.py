@@ -0,0 +1,135 @@
+"""Tests for JSON rendering, compression negotiation, and response metrics."""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import unittest
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from fastapi import FastAPI
+from sse_starlette.sse import EventSourceResponse
+
+from api.responses import (
+    CompressionMiddleware,
+    FastJSONRoute,
+    ResponseMetrics,
+    dumps,
+    negotiate_encoding,
+)
+
+
+def _build_app() -> FastAPI:
+    app = FastAPI()
+    app.router.route_class = FastJSONRoute
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @app.get("/big")
+    async def big() -> dict[str, Any]:
+        return {"rows": [{"path": f"src/file_{index}.py", "index": index} for index in range(200)]}
+
+    @app.get("/small")
+    async def small() -> dict[str, Any]:
+        return {"ok": True}
+
+    @app.get("/events")
+    async def events() -> EventSourceResponse:
+        def generate():
+            for index in range(50):
+                yield {"event": "delta", "data": "x" * 100 + str(index)}
+
+        return EventSourceResponse(generate())
+
+    return app
+
+
+def _get(app: FastAPI, path: str, accept_encoding: str = "gzip") -> tuple[dict[bytes, bytes], bytes]:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "headers": [(b"accept-encoding", accept_encoding.encode())],
+        "client": ("127.0.0.1", 1),
+        "server": ("127.0.0.1", 80),
+        "root_path": "",
+    }
+    messages: list[dict[str, Any]] = []
+
+    async def receive() -> dict[str, Any]:
+        await asyncio.sleep(10)
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict[str, Any]) -> None:
+        messages.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    headers = dict(messages[0]["headers"])
+    return headers, b"".join(message.get("body", b"") for message in messages[1:])
+
+
+class EncodingNegotiationTests(unittest.TestCase):
+    def test_honours_q_values_and_wildcards(self) -> None:
+        self.assertEqual(negotiate_encoding("gzip, deflate, br"), "gzip")
+        self.assertEqual(negotiate_encoding("*"), negotiate_encoding("gzip"))
+        self.assertIsNone(negotiate_encoding("gzip;q=0, br"))
+        self.assertIsNone(negotiate_encoding(""))
+
+
+class CompressionMiddlewareTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.app = _build_app()
+
+    def test_large_json_is_gzipped_and_small_json_is_not(self) -> None:
+        headers, body = _get(self.app, "/big")
+        small_headers, small_body = _get(self.app, "/small")
+
+        self.assertEqual(headers[b"content-encoding"], b"gzip")
+        self.assertIn(b"Accept-Encoding", headers[b"vary"])
+        self.assertEqual(int(headers[b"content-length"]), len(body))
+        self.assertEqual(len(json.loads(gzip.decompress(body))["rows"]), 200)
+        self.assertNotIn(b"content-encoding", small_headers)
+        self.assertEqual(small_body, b'{"ok":true}')
+
+    def test_identity_when_the_client_does_not_accept_compression(self) -> None:
+        headers, body = _get(self.app, "/big", accept_encoding="identity")
+
+        self.assertNotIn(b"content-encoding", headers)
+        self.assertEqual(len(json.loads(body)["rows"]), 200)
+
+    def test_event_streams_pass_through_uncompressed(self) -> None:
+        headers, body = _get(self.app, "/events")
+
+        self.assertNotIn(b"content-encoding", headers)
+        self.assertIn(b"event: delta", body)
+
+
+class ResponseMetricsTests(unittest.TestCase):
+    def test_metrics_report_serialization_and_wire_bytes(self) -> None:
+        metrics = ResponseMetrics()
+        metrics.record_serialization("/big", 2.0)
+        metrics.record_transfer("/big", 1000, 250, "gzip", 0.5)
+        metrics.record_transfer("/big", 1000, 1000, "identity")
+
+        snapshot = metrics.snapshot()["/big"]
+
+        self.assertEqual(snapshot["responses"], 2)
+        self.assertEqual(snapshot["avg_serialize_ms"], 2.0)
+        self.assertEqual(snapshot["ratio"], 0.625)
+        self.assertEqual(snapshot["encodings"], {"gzip": 1, "identity": 1})
+
+    def test_dumps_encodes_datetimes_and_paths_compactly(self) -> None:
+        payload = {"when": datetime(2026, 1, 2, 3, 4, 5), "path": Path("a/b.py")}
+
+        self.assertEqual(dumps(payload), '{"when":"2026-01-02T03:04:05","path":"a/b.py"}')
+
+
+if __name__ == "__main__":
+    unittest.main()
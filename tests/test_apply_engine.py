@@ -0,0 +1,143 @@
+"""Tests for atomic multi-file apply."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from neurocli_core.apply_engine import (
+    ApplyConflictError,
+    FileChange,
+    apply_transaction,
+    content_hash,
+    undo_transaction,
+)
+from neurocli_core.backup_store import BackupStore
+from neurocli_core.diff_generator import compute_diff_hunks
+
+
+class ApplyTransactionTests(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.root = Path(temp_dir.name)
+        self.store = BackupStore(self.root / ".store")
+        self.addCleanup(self.store.close)
+        patcher = patch("neurocli_core.backup_store._store", self.store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.first = self.root / "first.py"
+        self.second = self.root / "second.py"
+        self.first.write_text("a = 1\n", encoding="utf-8")
+        self.second.write_text("b = 1\n", encoding="utf-8")
+
+    def _leftover_temp_files(self) -> list[str]:
+        return [name for name in os.listdir(self.root) if name.endswith(".neurocli-tmp")]
+
+    def test_writes_content_and_hunks_with_one_backup_set(self) -> None:
+        hunks = compute_diff_hunks("b = 1\n", "b = 2\n")
+        new_file = self.root / "pkg" / "new.py"
+
+        result = apply_transaction(
+            [
+                FileChange(str(self.first), content="a = 2\n", expected_hash=content_hash(b"a = 1\n")),
+                FileChange(str(self.second), hunks=hunks),
+                FileChange(str(new_file), content="c = 1\n"),
+            ]
+        )
+
+        self.assertEqual(self.first.read_text(encoding="utf-8"), "a = 2\n")
+        self.assertEqual(self.second.read_text(encoding="utf-8"), "b = 2\n")
+        self.assertEqual(new_file.read_text(encoding="utf-8"), "c = 1\n")
+        self.assertEqual(result.created, [str(new_file)])
+        backed_up = self.store.transaction(result.transaction_id)
+        self.assertEqual(sorted(record.path for record in backed_up), [str(self.first), str(self.second)])
+        self.assertEqual(self._leftover_temp_files(), [])
+
+    def test_stale_expected_content_refuses_every_file(self) -> None:
+        with self.assertRaises(ApplyConflictError) as caught:
+            apply_transaction(
+                [
+                    FileChange(str(self.first), content="a = 2\n"),
+                    FileChange(str(self.second), content="b = 2\n", expected_content="b = 0\n"),
+                ]
+            )
+
+        self.assertEqual(caught.exception.paths, [str(self.second)])
+        self.assertEqual(self.first.read_text(encoding="utf-8"), "a = 1\n")
+
+    def test_failure_mid_rename_rolls_back_replaced_files(self) -> None:
+        real_replace = os.replace
+
+        def failing_replace(source, target):
+            if Path(target) == self.second:
+                raise OSError("disk full")
+            return real_replace(source, target)
+
+        with patch("neurocli_core.apply_engine.os.replace", side_effect=failing_replace):
+            with self.assertRaises(OSError):
+                apply_transaction(
+                    [
+                        FileChange(str(self.first), content="a = 2\n"),
+                        FileChange(str(self.second), content="b = 2\n"),
+                    ]
+                )
+
+        self.assertEqual(self.first.read_text(encoding="utf-8"), "a = 1\n")
+        self.assertEqual(self.second.read_text(encoding="utf-8"), "b = 1\n")
+        self.assertEqual(self._leftover_temp_files(), [])
+
+    def test_crlf_files_keep_their_line_endings(self) -> None:
+        self.first.write_bytes(b"a = 1\r\n")
+
+        apply_transaction([FileChange(str(self.first), content="a = 2\nb = 3\n")])
+
+        self.assertEqual(self.first.read_bytes(), b"a = 2\r\nb = 3\r\n")
+
+    def test_undo_restores_the_whole_transaction(self) -> None:
+        result = apply_transaction(
+            [
+                FileChange(str(self.first), content="a = 2\n"),
+                FileChange(str(self.second), content="b = 2\n"),
+            ]
+        )
+
+        undo_transaction(result.transaction_id)
+
+        self.assertEqual(self.first.read_text(encoding="utf-8"), "a = 1\n")
+        self.assertEqual(self.second.read_text(encoding="utf-8"), "b = 1\n")
+
+
+    def test_undo_restores_non_utf8_files_byte_for_byte(self) -> None:
+        latin = self.root / "latin.txt"
+        latin.write_bytes("café\n".encode("latin-1"))
+
+        result = apply_transaction([FileChange(str(latin), content="coffee\n")])
+        undo_transaction(result.transaction_id)
+
+        self.assertEqual(latin.read_bytes(), "café\n".encode("latin-1"))
+
+    def test_failed_temp_write_leaves_no_temp_file(self) -> None:
+        with patch("neurocli_core.apply_engine.os.fdopen", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                apply_transaction([FileChange(str(self.first), content="a = 2\n")])
+
+        self.assertEqual(self._leftover_temp_files(), [])
+        self.assertEqual(self.first.read_text(encoding="utf-8"), "a = 1\n")
+
+    def test_failed_transaction_keeps_no_backup_set(self) -> None:
+        with patch("neurocli_core.apply_engine.os.replace", side_effect=OSError("disk full")):
+            with patch("neurocli_core.apply_engine.uuid.uuid4") as uuid4:
+                uuid4.return_value.hex = "failed-tx"
+                with self.assertRaises(OSError):
+                    apply_transaction([FileChange(str(self.first), content="a = 2\n")])
+
+        with self.assertRaises(KeyError):
+            self.store.transaction("failed-tx")
+
+
+if __name__ == "__main__":
+    unittest.main()
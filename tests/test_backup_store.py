@@ -0,0 +1,118 @@
+"""Tests for the content-addressed backup store."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from neurocli_core.backup_store import BackupStore, get_backup_store
+from neurocli_core.config import refresh_settings
+from neurocli_core.radar_engine import scan_recent_edits
+
+
+class BackupStoreTests(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.workspace = Path(temp_dir.name) / "workspace"
+        self.workspace.mkdir()
+        self.store = BackupStore(Path(temp_dir.name) / "store")
+        self.addCleanup(self.store.close)
+        self.target = self.workspace / "app.py"
+
+    def _save(self, content: str) -> None:
+        self.target.write_text(content, encoding="utf-8")
+        self.store.backup(self.target)
+
+    def test_identical_content_is_stored_once_and_compressed(self) -> None:
+        content = "print('hello')\n" * 500
+        self._save(content)
+        self._save(content)
+
+        stats = self.store.stats()
+        self.assertEqual((stats["versions"], stats["blobs"]), (2, 1))
+        self.assertLess(stats["stored_bytes"], stats["bytes"] // 10)
+        self.assertEqual(self.store.read(self.store.versions(self.target)[0].id), content.encode())
+
+    def test_undo_steps_back_through_distinct_versions(self) -> None:
+        for content in ("v1\n", "v2\n", "v3\n"):
+            self._save(content)
+        self.target.write_text("v4\n", encoding="utf-8")
+
+        self.store.undo(self.target)
+        self.assertEqual(self.target.read_text(encoding="utf-8"), "v3\n")
+        self.store.undo(self.target)
+        self.assertEqual(self.target.read_text(encoding="utf-8"), "v2\n")
+        # The content replaced by each undo is kept, so nothing is lost.
+        self.assertEqual(
+            [record.label for record in self.store.versions(self.target)][:2], ["restore", "restore"]
+        )
+
+    def test_gc_keeps_newest_versions_and_drops_unreferenced_blobs(self) -> None:
+        for index in range(5):
+            self._save(f"version {index}\n")
+
+        report = self.store.gc(keep_per_file=2, max_age_days=0)
+
+        self.assertEqual((report.versions_removed, report.blobs_removed), (3, 3))
+        remaining = self.store.versions(self.target)
+        self.assertEqual([self.store.read(record.id) for record in remaining], [b"version 4\n", b"version 3\n"])
+        self.assertEqual(len(list((self.store.root / "objects").rglob("*.*"))), 2)
+
+    def test_gc_cannot_drop_a_blob_that_a_backup_is_reusing(self) -> None:
+        self._save("shared\n")
+        with self.store._db:
+            self.store._db.execute("UPDATE versions SET created_at = created_at - 86400")
+        store_blob = self.store._store_blob
+        collectors: list[threading.Thread] = []
+
+        def store_blob_then_collect(digest: str, data: bytes) -> None:
+            store_blob(digest, data)
+            # The only existing version of this blob is old enough to collect.
+            collector = threading.Thread(target=lambda: self.store.gc(keep_per_file=0, max_age_days=0.5))
+            collector.start()
+            collector.join(timeout=0.2)
+            collectors.append(collector)
+
+        with patch.object(self.store, "_store_blob", store_blob_then_collect):
+            record = self.store.backup_bytes(self.target, b"shared\n")
+        collectors[0].join(timeout=5)
+
+        self.assertEqual(self.store.read(record.id), b"shared\n")
+        self.assertEqual(len(self.store.versions(self.target)), 1)
+
+    def test_recent_edits_come_from_the_index(self) -> None:
+        self._save("a\n")
+        (self.workspace / "elsewhere.py").write_text("b\n", encoding="utf-8")
+        other_store_path = Path(self.store.root).parent / "other.py"
+        other_store_path.write_text("c\n", encoding="utf-8")
+        self.store.backup(other_store_path)
+
+        with patch("neurocli_core.backup_store._store", self.store):
+            edits = scan_recent_edits(str(self.workspace), max_items=5, max_days=1)
+
+        self.assertEqual([edit["original_file"] for edit in edits], ["app.py"])
+        self.assertEqual(edits[0]["time_ago"], "Just now")
+        self.assertLessEqual(time.time() - edits[0]["backup_time"].timestamp(), 60)
+
+    def test_shared_store_accepts_fractional_retention_days(self) -> None:
+        settings = {
+            "NEUROCLI_BACKUP_DIR": str(Path(self.store.root).parent / "shared"),
+            "NEUROCLI_BACKUP_MAX_AGE_DAYS": "0.5",
+        }
+        with patch.dict(os.environ, settings), patch("neurocli_core.backup_store._store", None):
+            refresh_settings()
+            store = get_backup_store()
+            store.close()
+        refresh_settings()
+
+        self.assertEqual(store.max_age_days, 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
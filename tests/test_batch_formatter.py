@@ -0,0 +1,99 @@
+"""Tests for parallel workspace formatting and batch apply."""
+
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from neurocli_core.apply_engine import ApplyConflictError
+from neurocli_core.backup_store import BackupStore
+from neurocli_core.batch_formatter import apply_format_batch, collect_format_targets, run_format_batch
+from neurocli_core.formatter_service import FormatResult
+
+
+def _fake_format(code: str, file_path: str) -> FormatResult:
+    if "syntax error" in code:
+        return FormatResult(code, "ruff", "rejected", 0.1, changed=False, error="bad syntax")
+    formatted = code.replace("=", " = ").replace("  ", " ")
+    return FormatResult(formatted, "ruff", "daemon", 0.1, changed=formatted != code)
+
+
+class BatchFormatterTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._temp_dir.cleanup)
+        self.root = Path(self._temp_dir.name)
+        (self.root / "pkg").mkdir()
+        (self.root / "node_modules").mkdir()
+        (self.root / "a.py").write_text("x=1\n", encoding="utf-8")
+        (self.root / "pkg" / "b.py").write_text("y = 2\n", encoding="utf-8")
+        (self.root / "pkg" / "notes.txt").write_text("z=3\n", encoding="utf-8")
+        (self.root / "node_modules" / "dep.js").write_text("a=1\n", encoding="utf-8")
+        self.backup_store = BackupStore(self.root / ".store")
+        self.addCleanup(self.backup_store.close)
+        for patcher in (
+            patch("neurocli_core.batch_formatter.format_code_result", side_effect=_fake_format),
+            patch("neurocli_core.backup_store._store", self.backup_store),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_targets_skip_excluded_folders_and_unsupported_files(self) -> None:
+        targets = collect_format_targets(self.root)
+
+        self.assertEqual(targets, [self.root / "a.py", self.root / "pkg" / "b.py"])
+        self.assertEqual(collect_format_targets(self.root, pattern="pkg/*"), [self.root / "pkg" / "b.py"])
+
+    def test_check_only_batch_reports_changes_without_writing(self) -> None:
+        progress: list[tuple[int, int]] = []
+        batch = run_format_batch(
+            self.root,
+            collect_format_targets(self.root),
+            check_only=True,
+            max_workers=2,
+            on_outcome=lambda _outcome, done, total: progress.append((done, total)),
+        )
+
+        self.assertFalse(batch.ok)
+        self.assertEqual(batch.summary()["changed"], 1)
+        self.assertEqual(progress, [(1, 2), (2, 2)])
+        self.assertIn("--- a/a.py\n+++ b/a.py\n", batch.unified_diff())
+        self.assertEqual((self.root / "a.py").read_text(encoding="utf-8"), "x=1\n")
+        with self.assertRaises(ValueError):
+            apply_format_batch(batch)
+
+    def test_apply_refuses_whole_batch_when_any_file_moved(self) -> None:
+        (self.root / "pkg" / "b.py").write_text("y=2\n", encoding="utf-8")
+        batch = run_format_batch(self.root, collect_format_targets(self.root))
+        (self.root / "pkg" / "b.py").write_text("y=3\n", encoding="utf-8")
+
+        with self.assertRaises(ApplyConflictError) as caught:
+            apply_format_batch(batch)
+
+        self.assertEqual(caught.exception.paths, [str(self.root / "pkg" / "b.py")])
+        self.assertEqual((self.root / "a.py").read_text(encoding="utf-8"), "x=1\n")
+
+    def test_apply_writes_all_files_with_one_backup_set(self) -> None:
+        (self.root / "pkg" / "b.py").write_text("y=2\n", encoding="utf-8")
+        batch = run_format_batch(self.root, collect_format_targets(self.root))
+
+        result = apply_format_batch(batch)
+
+        self.assertEqual(result.files, [str(self.root / "a.py"), str(self.root / "pkg" / "b.py")])
+        self.assertEqual((self.root / "pkg" / "b.py").read_text(encoding="utf-8"), "y = 2\n")
+        backups = self.backup_store.transaction(result.transaction_id)
+        self.assertEqual([record.label for record in backups], ["format", "format"])
+
+    def test_rejected_files_fail_the_batch(self) -> None:
+        (self.root / "a.py").write_text("syntax error\n", encoding="utf-8")
+
+        batch = run_format_batch(self.root, collect_format_targets(self.root), check_only=True)
+
+        self.assertFalse(batch.ok)
+        self.assertEqual(batch.summary()["error"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,185 @@
+"""Tests for map-reduce commit message generation."""
+
+from __future__ import annotations
+
+import threading
+import unittest
+
+from neurocli_core.commit_summarizer import (
+    CommitSummarizer,
+    FileDiff,
+    SummaryCache,
+    chunk_file_diff,
+    split_diff,
+)
+
+
+def _file_diff(path: str, *added: str) -> str:
+    body = "".join(f"+{line}\n" for line in added)
+    return (
+        f"diff --git a/{path} b/{path}\n"
+        f"index 1111111..2222222 100644\n"
+        f"--- a/{path}\n"
+        f"+++ b/{path}\n"
+        f"@@ -1,0 +1,{len(added)} @@\n"
+        f"{body}"
+    )
+
+
+class _RecordingProvider:
+    name = "fake"
+
+    def __init__(self) -> None:
+        self.prompts: list[str] = []
+        self._lock = threading.Lock()
+
+    def complete(self, prompt: str, **_kwargs) -> str:
+        with self._lock:
+            self.prompts.append(prompt)
+        if prompt.startswith("Summarize"):
+            file_line = next(line for line in prompt.splitlines() if "File: " in line)
+            return f"changed {file_line.split('File: ', 1)[1]}"
+        return "feat: update files"
+
+    def stream(self, prompt: str, **_kwargs):
+        self.closed = False
+        try:
+            for word in self.complete(prompt).split(" "):
+                yield word + " "
+        finally:
+            self.closed = True
+
+    @property
+    def chunk_prompts(self) -> list[str]:
+        return [prompt for prompt in self.prompts if prompt.startswith("Summarize")]
+
+
+class SplitDiffTests(unittest.TestCase):
+    def test_splits_files_and_hunks_and_skips_lockfiles(self) -> None:
+        diff = (
+            _file_diff("src/app.py", "x = 1")
+            + "@@ -10,0 +11,1 @@\n+y = 2\n"
+            + _file_diff("web/package-lock.json", '"lockfileVersion": 3')
+            + _file_diff("gen/api.py", "# @generated by protoc", "x = 1")
+            + 'diff --git "a/docs/my notes.md" "b/docs/my notes.md"\n'
+            + "Binary files a/docs/my notes.md and b/docs/my notes.md differ\n"
+        )
+
+        files = split_diff(diff)
+
+        self.assertEqual(
+            [(diff.path, diff.skip_reason) for diff in files],
+            [
+                ("src/app.py", None),
+                ("web/package-lock.json", "lockfile"),
+                ("gen/api.py", "generated"),
+                ("docs/my notes.md", "binary"),
+            ],
+        )
+        self.assertEqual(len(files[0].hunks), 2)
+        self.assertTrue(files[0].header.startswith("diff --git a/src/app.py"))
+
+    def test_large_file_is_chunked_by_hunk_groups(self) -> None:
+        hunks = [f"@@ -{i},1 +{i},1 @@\n+{'x' * 300}\n" for i in range(6)]
+        diff = FileDiff("big.py", "diff --git a/big.py b/big.py\n", hunks)
+
+        chunks = chunk_file_diff(diff, max_tokens=200)
+
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual({chunk.parts for chunk in chunks}, {len(chunks)})
+        self.assertTrue(all(chunk.text.startswith("diff --git a/big.py") for chunk in chunks))
+        self.assertEqual(sum(chunk.text.count("@@ -") for chunk in chunks), 6)
+
+
+class CommitSummarizerTests(unittest.TestCase):
+    def test_small_diff_uses_one_prompt(self) -> None:
+        provider = _RecordingProvider()
+        summarizer = CommitSummarizer(direct_tokens=1_000, cache=SummaryCache(16))
+
+        summary = summarizer.summarize(_file_diff("a.py", "x = 1"), provider=provider)
+
+        self.assertEqual(summary.mode, "direct")
+        self.assertEqual(summary.message, "feat: update files")
+        self.assertEqual(len(provider.prompts), 1)
+        self.assertIn("DIFF:\ndiff --git a/a.py b/a.py", provider.prompts[0])
+
+    def test_large_diff_is_map_reduced_and_cached_per_chunk(self) -> None:
+        files = [_file_diff(f"pkg/mod{i}.py", *(f"value_{i}_{n} = {n}" for n in range(40))) for i in range(4)]
+        lockfile = _file_diff("yarn.lock", *("dep@1.0.0" for _ in range(500)))
+        summarizer = CommitSummarizer(
+            direct_tokens=200, chunk_tokens=2_000, max_workers=3, cache=SummaryCache(16)
+        )
+
+        provider = _RecordingProvider()
+        first = summarizer.summarize("".join(files) + lockfile, provider=provider)
+
+        self.assertEqual(first.mode, "map_reduce")
+        self.assertEqual((first.files, first.chunks, first.cache_hits), (4, 4, 0))
+        self.assertEqual(first.skipped, ["yarn.lock"])
+        self.assertEqual(len(provider.chunk_prompts), 4)
+        self.assertFalse(any("yarn.lock" in prompt for prompt in provider.chunk_prompts))
+        final_prompt = provider.prompts[-1]
+        self.assertIn("- pkg/mod0.py: changed pkg/mod0.py", final_prompt)
+        self.assertIn("- yarn.lock (lockfile)", final_prompt)
+
+        files[2] = _file_diff("pkg/mod2.py", "value = 'changed again'", *(f"v{n} = {n}" for n in range(40)))
+        provider = _RecordingProvider()
+        second = summarizer.summarize("".join(files) + lockfile, provider=provider)
+
+        self.assertEqual(second.cache_hits, 3)
+        self.assertEqual(len(provider.chunk_prompts), 1)
+        self.assertIn("File: pkg/mod2.py", provider.chunk_prompts[0])
+
+    def test_stream_reports_progress_then_deltas(self) -> None:
+        diff = "".join(_file_diff(f"mod{i}.py", *(f"v{n} = {n}" for n in range(40))) for i in range(2))
+        summarizer = CommitSummarizer(direct_tokens=100, chunk_tokens=2_000, cache=SummaryCache(16))
+
+        events = list(summarizer.stream(diff, provider=_RecordingProvider()))
+
+        self.assertEqual(
+            [event.event for event in events],
+            ["start", "progress", "progress", "delta", "delta", "delta", "complete"],
+        )
+        self.assertEqual(events[0].summary.mode, "map_reduce")
+        self.assertEqual(events[2].progress["done"], 2)
+        self.assertEqual("".join(event.delta for event in events), "feat: update files ")
+        self.assertEqual(events[-1].summary.message, "feat: update files")
+
+    def test_stream_stops_and_closes_the_model_stream(self) -> None:
+        provider = _RecordingProvider()
+        seen: list[str] = []
+
+        events = CommitSummarizer(cache=SummaryCache(1)).stream(
+            _file_diff("a.py", "x = 1"), provider=provider, should_stop=lambda: len(seen) >= 1
+        )
+        for event in events:
+            if event.event == "delta":
+                seen.append(event.delta)
+            last = event
+
+        self.assertEqual(seen, ["feat: "])
+        self.assertEqual(last.event, "cancelled")
+        self.assertEqual(last.summary.message, "feat:")
+        self.assertTrue(provider.closed)
+
+    def test_stream_turns_provider_errors_into_an_event(self) -> None:
+        def failing_stream(prompt: str, **_kwargs):
+            raise RuntimeError("rate limited")
+            yield ""
+
+        provider = _RecordingProvider()
+        provider.stream = failing_stream
+
+        events = list(CommitSummarizer(cache=SummaryCache(1)).stream(_file_diff("a.py", "x"), provider=provider))
+
+        self.assertEqual([event.event for event in events], ["start", "error"])
+        self.assertEqual(events[-1].error, "rate limited")
+
+    def test_empty_diff_needs_no_provider(self) -> None:
+        summary = CommitSummarizer(cache=SummaryCache(1)).summarize("  \n")
+
+        self.assertEqual(summary.message, "No changes detected to commit.")
+
+
+if __name__ == "__main__":
+    unittest.main()
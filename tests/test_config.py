@@ -0,0 +1,80 @@
+"""Tests for the cached NeuroCLI settings snapshot."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from neurocli_core import config
+from neurocli_core.config import NeuroSettings, _SettingsCache
+
+
+class NeuroSettingsTests(unittest.TestCase):
+    def test_typed_fields_fall_back_on_bad_values(self) -> None:
+        settings = NeuroSettings.from_mapping(
+            {
+                "OPENAI_MODEL": "gpt-test",
+                "NEUROCLI_LLM_MAX_ATTEMPTS": "5",
+                "NEUROCLI_LLM_IDLE_TIMEOUT": "soon",
+                "NEUROCLI_LLM_PROVIDER": "MOCK",
+            }
+        )
+
+        self.assertEqual(settings.openai_model, "gpt-test")
+        self.assertEqual(settings.llm_max_attempts, 5)
+        self.assertEqual(settings.llm_idle_timeout, NeuroSettings().llm_idle_timeout)
+        self.assertEqual(settings.llm_provider, "mock")
+        self.assertIsNone(settings.openai_api_key)
+
+    def test_generic_getters_read_the_snapshot(self) -> None:
+        settings = NeuroSettings.from_mapping({"FLAG": "yes", "COUNT": "3", "RATIO": "0.5"})
+
+        self.assertTrue(settings.get_flag("FLAG"))
+        self.assertEqual(settings.get_int("COUNT", 0), 3)
+        self.assertEqual(settings.get_float("RATIO", 0.0), 0.5)
+        self.assertEqual(settings.get_str("MISSING", "fallback"), "fallback")
+
+
+class SettingsCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.dotenv_path = Path(temp_dir.name) / ".env"
+        self.dotenv_path.write_text("OPENAI_MODEL=first-model\n", encoding="utf-8")
+        self.cache = _SettingsCache(self.dotenv_path)
+
+    def test_env_file_is_parsed_once_until_it_changes(self) -> None:
+        with patch("neurocli_core.config.dotenv_values", wraps=config.dotenv_values) as parser, patch(
+            "neurocli_core.config.ENV_CHECK_INTERVAL_SECONDS", 0
+        ), patch.dict(os.environ, {}, clear=False):
+            os.environ.pop("OPENAI_MODEL", None)
+            for _ in range(5):
+                self.assertEqual(self.cache.get().openai_model, "first-model")
+            self.assertEqual(parser.call_count, 1)
+
+            self.dotenv_path.write_text("OPENAI_MODEL=second-model\n", encoding="utf-8")
+            stat = self.dotenv_path.stat()
+            os.utime(self.dotenv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+            self.assertEqual(self.cache.get().openai_model, "second-model")
+            self.assertEqual(parser.call_count, 2)
+
+    def test_env_checks_are_throttled(self) -> None:
+        with patch.object(self.cache, "_env_mtime_ns", wraps=self.cache._env_mtime_ns) as stat_check:
+            for _ in range(10):
+                self.cache.get()
+
+        self.assertEqual(stat_check.call_count, 1)
+
+    def test_process_environment_wins_and_refresh_picks_it_up(self) -> None:
+        with patch.dict(os.environ, {"OPENAI_MODEL": "env-model"}):
+            self.assertEqual(self.cache.refresh().openai_model, "env-model")
+
+        self.assertEqual(self.cache.refresh().openai_model, "first-model")
+
+
+if __name__ == "__main__":
+    unittest.main()
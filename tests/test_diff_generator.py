@@ -0,0 +1,154 @@
+"""Tests for the structured diff engine."""
+
+from __future__ import annotations
+
+import difflib
+import random
+import unittest
+
+from neurocli_core.diff_generator import (
+    IncrementalDiff,
+    compute_diff_hunks,
+    diff_opcodes,
+    generate_diff,
+)
+
+
+def _rebuild_new_text(original: str, hunks) -> str:
+    """Replay hunks over the original text to reconstruct the new side."""
+
+    old_lines = original.splitlines(keepends=True)
+    rebuilt: list[str] = []
+    cursor = 0
+    for hunk in hunks:
+        rebuilt.extend(old_lines[cursor:hunk.old_start])
+        rebuilt.extend(hunk.new_lines)
+        cursor = hunk.old_start + hunk.old_count
+    rebuilt.extend(old_lines[cursor:])
+    return "".join(rebuilt)
+
+
+def _lcs_length(a: list[str], b: list[str]) -> int:
+    previous = [0] * (len(b) + 1)
+    for item in a:
+        current = [0]
+        for j, other in enumerate(b):
+            current.append(previous[j] + 1 if item == other else max(previous[j + 1], current[j]))
+        previous = current
+    return previous[-1]
+
+
+class DiffGeneratorTests(unittest.TestCase):
+    def test_markdown_output_matches_difflib_for_simple_edits(self) -> None:
+        original = "".join(f"line {index}\n" for index in range(60))
+        updated = original.replace("line 10\n", "").replace("line 40\n", "line forty\nextra\n")
+
+        expected = "".join(
+            difflib.unified_diff(
+                original.splitlines(keepends=True),
+                updated.splitlines(keepends=True),
+                fromfile="original",
+                tofile="new",
+            )
+        )
+
+        self.assertEqual(generate_diff(original, updated), f"```diff\n{expected}```")
+
+    def test_identical_content_reports_no_changes(self) -> None:
+        self.assertEqual(generate_diff("a\nb\n", "a\nb\n"), "No changes proposed.")
+        self.assertEqual(compute_diff_hunks("a\nb\n", "a\nb\n"), [])
+
+    def test_hunks_carry_ranges_and_rebuild_the_new_text(self) -> None:
+        original = "".join(f"line {index}\n" for index in range(30))
+        updated = original.replace("line 2\n", "line two\n").replace("line 25\n", "")
+
+        hunks = compute_diff_hunks(original, updated)
+
+        self.assertEqual(len(hunks), 2)
+        self.assertEqual((hunks[0].old_start, hunks[0].old_count), (0, 6))
+        self.assertEqual(hunks[0].header, "@@ -1,6 +1,6 @@")
+        self.assertEqual(hunks[1].header, "@@ -23,7 +23,6 @@")
+        self.assertNotEqual(hunks[0].id, hunks[1].id)
+        self.assertEqual(hunks[1].to_dict()["lines"][3], "-line 25\n")
+        self.assertEqual(_rebuild_new_text(original, hunks), updated)
+
+    def test_random_edits_produce_minimal_valid_diffs(self) -> None:
+        rng = random.Random(7)
+        for _ in range(300):
+            old = [rng.choice("abcd") + "\n" for _ in range(rng.randint(0, 30))]
+            new = [rng.choice("abcd") + "\n" for _ in range(rng.randint(0, 30))]
+
+            opcodes = diff_opcodes(old, new)
+            matched = sum(i2 - i1 for tag, i1, i2, _j1, _j2 in opcodes if tag == "equal")
+
+            self.assertEqual(matched, _lcs_length(old, new))
+            original, updated = "".join(old), "".join(new)
+            self.assertEqual(_rebuild_new_text(original, compute_diff_hunks(original, updated)), updated)
+
+    def test_whitespace_rewrite_of_large_file_is_a_single_hunk(self) -> None:
+        original = "".join(f"    value_{index} = {index}\n" for index in range(20000))
+        updated = original.replace("    ", "\t")
+
+        hunks = compute_diff_hunks(original, updated)
+
+        self.assertEqual(len(hunks), 1)
+        self.assertEqual((hunks[0].old_count, hunks[0].new_count), (20000, 20000))
+        self.assertEqual(_rebuild_new_text(original, hunks), updated)
+
+    def test_missing_trailing_newline_is_marked(self) -> None:
+        diff = generate_diff("a\nb", "a\nc")
+
+        self.assertIn("-b\n\\ No newline at end of file\n+c\n\\ No newline at end of file\n", diff)
+
+
+class IncrementalDiffTests(unittest.TestCase):
+    def test_early_hunks_are_final_before_the_stream_ends(self) -> None:
+        original = "".join(f"line {index}\n" for index in range(200))
+        updated = original.replace("line 5\n", "line five\n").replace("line 150\n", "")
+        differ = IncrementalDiff(original)
+        midpoint = len(updated) // 2
+
+        early = differ.feed(updated[:midpoint])
+        self.assertEqual([hunk.header for hunk in early], ["@@ -3,7 +3,7 @@"])
+
+        hunks = early + differ.feed(updated[midpoint:]) + differ.finish()
+
+        self.assertEqual(hunks, compute_diff_hunks(original, updated))
+        self.assertEqual(_rebuild_new_text(original, hunks), updated)
+
+    def test_random_streams_rebuild_the_final_text(self) -> None:
+        rng = random.Random(11)
+        for _ in range(200):
+            old = [rng.choice("abcdef") + "\n" for _ in range(rng.randint(0, 40))]
+            new = list(old)
+            for _ in range(rng.randint(0, 5)):
+                index = rng.randint(0, len(new))
+                if rng.random() < 0.5 or not new:
+                    new.insert(index, f"new {rng.randint(0, 3)}\n")
+                else:
+                    del new[min(index, len(new) - 1)]
+            original, updated = "".join(old), "".join(new)
+
+            differ = IncrementalDiff(original)
+            hunks: list = []
+            offset = 0
+            while offset < len(updated):
+                step = rng.randint(1, 9)
+                hunks.extend(differ.feed(updated[offset:offset + step]))
+                offset += step
+            hunks.extend(differ.finish())
+
+            self.assertEqual(hunks, differ.hunks)
+            self.assertEqual(_rebuild_new_text(original, hunks), updated)
+
+    def test_pending_text_holds_the_open_change(self) -> None:
+        differ = IncrementalDiff("a\nb\nc\n")
+
+        differ.feed("a\nnew\npart")
+
+        self.assertEqual(differ.aligned_old_lines, 1)
+        self.assertEqual(differ.pending_text, "new\npart")
+
+
+if __name__ == "__main__":
+    unittest.main()
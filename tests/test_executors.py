@@ -0,0 +1,83 @@
+"""Tests for the bounded execution lanes used by the API."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import unittest
+
+from neurocli_core.executors import ExecutionLanes, LaneBusyError, LaneSpec
+
+
+class ExecutionLaneTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.lanes = ExecutionLanes([LaneSpec("io", workers=1, queue=1)])
+        self.addCleanup(self.lanes.close)
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+
+    def _blocked(self, value: int) -> int:
+        self.release.wait(5)
+        return value
+
+    def test_rejects_calls_beyond_workers_plus_queue(self) -> None:
+        running = self.lanes.submit("io", self._blocked, 1)
+        queued = self.lanes.submit("io", self._blocked, 2)
+
+        with self.assertRaises(LaneBusyError):
+            self.lanes.submit("io", self._blocked, 3)
+        self.release.set()
+
+        self.assertEqual((running.result(5), queued.result(5)), (1, 2))
+        stats = self.lanes.stats()["io"]
+        self.assertEqual((stats["pending"], stats["completed"], stats["rejected"]), (0, 2, 1))
+        self.assertEqual(self.lanes.submit("io", int, "4").result(5), 4)
+
+    def test_shared_calls_run_once_for_concurrent_callers(self) -> None:
+        calls: list[int] = []
+
+        def scan() -> str:
+            calls.append(1)
+            self.release.wait(5)
+            return "report"
+
+        async def scenario() -> list[str]:
+            first = asyncio.ensure_future(self.lanes.run_shared("io", "radar", scan))
+            second = asyncio.ensure_future(self.lanes.run_shared("io", "radar", scan))
+            await asyncio.sleep(0.05)
+            # The first caller leaving must not cancel the scan the second one awaits.
+            first.cancel()
+            self.release.set()
+            return [await second]
+
+        self.assertEqual(asyncio.run(scenario()), ["report"])
+        self.assertEqual(len(calls), 1)
+
+    def test_run_keeps_the_event_loop_responsive(self) -> None:
+        async def scenario() -> int:
+            ticks = 0
+
+            async def ticker() -> None:
+                nonlocal ticks
+                while not self.release.is_set():
+                    ticks += 1
+                    await asyncio.sleep(0.005)
+
+            ticking = asyncio.ensure_future(ticker())
+            threading.Timer(0.1, self.release.set).start()
+            await self.lanes.run("io", self._blocked, 1)
+            await ticking
+            return ticks
+
+        self.assertGreater(asyncio.run(scenario()), 5)
+
+    def test_process_lane_runs_module_level_functions(self) -> None:
+        lanes = ExecutionLanes([LaneSpec("cpu", workers=1, queue=0, kind="process")])
+        self.addCleanup(lanes.close)
+
+        self.assertNotEqual(lanes.submit("cpu", os.getpid).result(30), os.getpid())
+
+
+if __name__ == "__main__":
+    unittest.main()
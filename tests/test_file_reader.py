@@ -0,0 +1,118 @@
+"""Tests for ranged, conditional text file reads."""
+
+from __future__ import annotations
+
+import io
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from neurocli_core.file_reader import (
+    BinaryFileError,
+    FileReader,
+    build_line_index,
+    looks_binary,
+)
+
+
+class FileReaderTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._temp_dir.cleanup)
+        self.root = Path(self._temp_dir.name)
+        self.lines = [f"line {index} é {'x' * (index % 37)}\n" for index in range(1, 5001)]
+        self.log = self.root / "app.log"
+        self.log.write_text("".join(self.lines), encoding="utf-8")
+        self.reader = FileReader(inline_bytes=4096)
+
+    def test_line_windows_match_the_file_across_index_strides(self) -> None:
+        for start_line in (1, 2, 1024, 1025, 2049, 4999, 5000):
+            window = self.reader.read(self.log, start_line=start_line, line_count=3)
+
+            self.assertEqual(window.content, "".join(self.lines[start_line - 1 : start_line + 2]))
+            self.assertEqual(window.total_lines, 5000)
+            self.assertEqual(window.end_line, min(5000, start_line + 2))
+
+    def test_byte_windows_end_on_lines_and_page_through_the_file(self) -> None:
+        first = self.reader.read(self.log)
+        pages = [first.content]
+        offset = first.next_offset
+        while offset is not None:
+            window = self.reader.read(self.log, offset=offset, length=1000)
+            pages.append(window.content)
+            offset = window.next_offset
+
+        self.assertTrue(first.truncated)
+        self.assertTrue(first.content.endswith("\n"))
+        self.assertEqual("".join(pages), "".join(self.lines))
+
+    def test_tiny_byte_windows_always_make_progress(self) -> None:
+        text = "é€😀a😀€é"
+        note = self.root / "wide.txt"
+        note.write_text(text, encoding="utf-8")
+
+        for length in (1, 2, 3):
+            pages = []
+            offset = 0
+            while offset is not None:
+                window = self.reader.read(note, offset=offset, length=length)
+                self.assertGreater(window.end, offset)
+                pages.append(window.content)
+                offset = window.next_offset
+            self.assertEqual("".join(pages), text)
+        # Starting inside a 4-byte character still yields the next whole one.
+        self.assertEqual(self.reader.read(note, offset=6, length=1).content, "a")
+
+    def test_small_files_are_returned_whole(self) -> None:
+        note = self.root / "note.txt"
+        note.write_text("a\nb\nc", encoding="utf-8")
+
+        window = self.reader.read(note)
+        tail = self.reader.read(note, start_line=2, line_count=10)
+
+        self.assertEqual((window.content, window.truncated, window.next_offset), ("a\nb\nc", False, None))
+        self.assertEqual((tail.content, tail.start_line, tail.end_line), ("b\nc", 2, 3))
+
+    def test_fingerprint_etag_tracks_content_and_matches_if_none_match(self) -> None:
+        before = self.reader.fingerprint(self.log)
+        self.assertTrue(before.matches(before.etag))
+        self.assertTrue(before.matches(f'"other", W/{before.etag}'))
+
+        self.log.write_text("changed\n", encoding="utf-8")
+        stat = self.log.stat()
+        os.utime(self.log, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        after = self.reader.fingerprint(self.log)
+
+        self.assertNotEqual(before.etag, after.etag)
+        self.assertFalse(after.matches(before.etag))
+
+    def test_large_files_get_a_weak_etag_without_hashing(self) -> None:
+        reader = FileReader(hash_max_bytes=10)
+
+        fingerprint = reader.fingerprint(self.log)
+
+        self.assertIsNone(fingerprint.sha256)
+        self.assertTrue(fingerprint.etag.startswith('W/"'))
+
+    def test_binary_files_are_refused(self) -> None:
+        blob = self.root / "image.png"
+        blob.write_bytes(b"\x89PNG\r\n\x1a\n\0\0\0\rIHDR")
+
+        with self.assertRaises(BinaryFileError):
+            self.reader.read(blob)
+        self.assertTrue(looks_binary(b"\xff\xfe\xfd"))
+        # A multi-byte character cut off by the sniff window is still text.
+        self.assertFalse(looks_binary("é".encode("utf-8")[:1]))
+
+    def test_line_index_ignores_a_trailing_newline(self) -> None:
+        data = b"a\n" * 8
+
+        index = build_line_index(io.BytesIO(data), len(data), stride=4)
+
+        self.assertEqual(index.total_lines, 8)
+        self.assertEqual(index.checkpoints, [0, 8])
+
+
+if __name__ == "__main__":
+    unittest.main()
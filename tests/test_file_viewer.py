@@ -0,0 +1,115 @@
+"""Tests for the Textual app's virtualized file viewer."""
+
+from __future__ import annotations
+
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+
+from textual.app import App, ComposeResult
+
+from neurocli_app.file_viewer import BLOCK_LINES, FileViewer, highlight_block
+from neurocli_core.file_reader import FileReader
+
+
+class _ViewerApp(App):
+    def __init__(self, **viewer_options) -> None:
+        super().__init__()
+        self.viewer_options = viewer_options
+        self.messages: list[object] = []
+
+    def compose(self) -> ComposeResult:
+        yield FileViewer(id="viewer", reader=FileReader(), **self.viewer_options)
+
+    def on_file_viewer_loaded(self, event: FileViewer.Loaded) -> None:
+        self.messages.append(event)
+
+    def on_file_viewer_failed(self, event: FileViewer.Failed) -> None:
+        self.messages.append(event)
+
+
+async def _settle(pilot, viewer: FileViewer) -> None:
+    for _ in range(50):
+        await pilot.pause(0.02)
+        if viewer.path is not None and viewer._message is None and not viewer._pending:
+            return
+        if pilot.app.messages and isinstance(pilot.app.messages[-1], FileViewer.Failed):
+            return
+
+
+class HighlightBlockTests(unittest.TestCase):
+    def test_block_keeps_one_display_line_per_file_line(self) -> None:
+        text = 'def f():\n    return "x"\n\n\n'
+
+        highlighted = highlight_block(text, Path("module.py"), highlight=True)
+        plain = highlight_block(text, Path("module.py"), highlight=False)
+
+        self.assertEqual([line.plain for line in highlighted], ["def f():", '    return "x"', "", ""])
+        self.assertEqual([line.plain for line in plain], [line.plain for line in highlighted])
+        self.assertTrue(highlighted[0].spans)
+        self.assertFalse(plain[0].spans)
+
+
+class FileViewerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._temp_dir.cleanup)
+        self.root = Path(self._temp_dir.name)
+        self.log = self.root / "big.py"
+        self.log.write_text("".join(f"value_{index} = {index}\n" for index in range(1, 20001)), encoding="utf-8")
+
+    def test_only_blocks_under_the_viewport_are_loaded(self) -> None:
+        async def scenario() -> tuple[list[int], list[int], int, bool]:
+            app = _ViewerApp()
+            async with app.run_test(size=(80, 24)) as pilot:
+                viewer = app.query_one(FileViewer)
+                viewer.load(self.log)
+                await _settle(pilot, viewer)
+                first = viewer.loaded_blocks
+
+                viewer.scroll_to(0, 12_000, animate=False, immediate=True)
+                await _settle(pilot, viewer)
+                return first, viewer.loaded_blocks, viewer.total_lines, viewer.highlighted
+
+        first, after_scroll, total_lines, highlighted = asyncio.run(scenario())
+
+        self.assertEqual(first, [0])
+        self.assertEqual(after_scroll, [0, 12_000 // BLOCK_LINES])
+        self.assertEqual(total_lines, 20_000)
+        self.assertTrue(highlighted)
+
+    def test_large_files_fall_back_to_plain_text(self) -> None:
+        async def scenario() -> FileViewer.Loaded:
+            app = _ViewerApp(highlight_max_bytes=1024)
+            async with app.run_test(size=(80, 24)) as pilot:
+                viewer = app.query_one(FileViewer)
+                viewer.load(self.log)
+                await _settle(pilot, viewer)
+                return app.messages[-1]
+
+        loaded = asyncio.run(scenario())
+
+        self.assertIsInstance(loaded, FileViewer.Loaded)
+        self.assertFalse(loaded.highlighted)
+
+    def test_binary_files_report_a_failure(self) -> None:
+        blob = self.root / "image.png"
+        blob.write_bytes(b"\x89PNG\r\n\x1a\n\0\0\0\rIHDR")
+
+        async def scenario() -> object:
+            app = _ViewerApp()
+            async with app.run_test(size=(80, 24)) as pilot:
+                viewer = app.query_one(FileViewer)
+                viewer.load(blob)
+                await _settle(pilot, viewer)
+                return app.messages[-1]
+
+        failed = asyncio.run(scenario())
+
+        self.assertIsInstance(failed, FileViewer.Failed)
+        self.assertIn("binary", failed.error)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+"""Tests for the content-addressed formatter result cache."""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from neurocli_core.format_cache import ConfigFingerprinter, FormatCache, build_cache_key
+from neurocli_core.formatter_service import FormatterService, ManagedFormatter
+
+
+UPPERCASE_COMMAND = [
+    sys.executable,
+    "-c",
+    "import sys; sys.stdout.write(sys.stdin.read().upper())",
+]
+
+
+def _uppercase_service(cache: FormatCache, *, version: str | None = "1.0") -> FormatterService:
+    formatter = ManagedFormatter(
+        "upper",
+        worker_factory=None,
+        oneshot_command=lambda _path: UPPERCASE_COMMAND,
+        install_message="",
+        timeout=10.0,
+        version_command=[sys.executable, "-c", f"print({version!r})"] if version else None,
+        config_files=("upper.toml",),
+    )
+    return FormatterService({"upper": formatter}, {".txt": "upper"}, cache=cache)
+
+
+class FormatCacheTests(unittest.TestCase):
+    def test_lru_evicts_oldest_entry_and_reports_stats(self) -> None:
+        cache = FormatCache(max_entries=2)
+        cache.put("a", "x", "X")
+        cache.put("b", "y", "y")
+        cache.get("a", "x")
+        cache.put("c", "z", "Z")
+
+        self.assertEqual(cache.get("a", "x"), "X")
+        # "b" is an already-formatted verdict, returned as the input itself.
+        self.assertIsNone(cache.get("b", "y"))
+        self.assertEqual(cache.stats.misses, 1)
+
+    def test_disk_layer_survives_a_new_cache_instance(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            FormatCache(disk_dir=Path(temp_dir)).put("k1", "raw", "FORMATTED", formatted_key="k2")
+
+            fresh = FormatCache(disk_dir=Path(temp_dir))
+            self.assertEqual(fresh.get("k1", "raw"), "FORMATTED")
+            self.assertEqual(fresh.get("k2", "FORMATTED"), "FORMATTED")
+            self.assertEqual(fresh.stats.disk_hits, 2)
+
+    def test_disk_layer_keeps_crlf_line_endings(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            FormatCache(disk_dir=Path(temp_dir)).put("k1", "raw", "x = 1\r\ny = 2\r\n")
+
+            fresh = FormatCache(disk_dir=Path(temp_dir))
+            self.assertEqual(fresh.get("k1", "raw"), "x = 1\r\ny = 2\r\n")
+
+    def test_failed_disk_write_leaves_no_temp_file(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = FormatCache(disk_dir=Path(temp_dir))
+            with patch("neurocli_core.format_cache.os.replace", side_effect=OSError("disk full")):
+                cache.put("k1", "raw", "FORMATTED")
+
+            self.assertEqual([path for path in Path(temp_dir).rglob("*") if path.is_file()], [])
+
+    def test_key_depends_on_version_and_config(self) -> None:
+        base = dict(formatter="ruff", version="0.1", file_path="a.py", config_fingerprint="c")
+
+        key = build_cache_key("x = 1\n", **base)
+        self.assertNotEqual(key, build_cache_key("x = 1\n", **{**base, "version": "0.2"}))
+        self.assertNotEqual(key, build_cache_key("x = 1\n", **{**base, "config_fingerprint": "d"}))
+
+
+class FormatterServiceCacheTests(unittest.TestCase):
+    def test_repeat_and_already_formatted_content_skip_the_tool(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            service = _uppercase_service(FormatCache(max_entries=8))
+            target = str(Path(temp_dir) / "note.txt")
+
+            first = service.format("abc", target)
+            repeat = service.format("abc", target)
+            formatted_again = service.format("ABC", target)
+
+            self.assertEqual((first.content, first.mode), ("ABC", "oneshot"))
+            self.assertEqual((repeat.content, repeat.mode), ("ABC", "cache"))
+            self.assertEqual(formatted_again.mode, "cache")
+            self.assertFalse(formatted_again.changed)
+            self.assertEqual(service.formatter_for(target).metrics.calls, 1)
+
+    def test_config_change_invalidates_cached_results(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            service = _uppercase_service(FormatCache(max_entries=8))
+            target = str(Path(temp_dir) / "note.txt")
+            service.format("abc", target)
+
+            (Path(temp_dir) / "upper.toml").write_text("line-length = 10\n", encoding="utf-8")
+
+            self.assertEqual(service.format("abc", target).mode, "oneshot")
+
+    def test_unknown_version_disables_caching(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            service = _uppercase_service(FormatCache(max_entries=8), version=None)
+            target = str(Path(temp_dir) / "note.txt")
+            service.format("abc", target)
+
+            self.assertEqual(service.format("abc", target).mode, "oneshot")
+            self.assertEqual(service.cache_stats()["stores"], 0)
+
+
+class ConfigFingerprinterTests(unittest.TestCase):
+    def test_fingerprint_covers_ancestor_config_files(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            (root / "pkg").mkdir()
+            target = str(root / "pkg" / "mod.py")
+            fingerprinter = ConfigFingerprinter()
+            before = fingerprinter.fingerprint(target, ["ruff.toml"])
+
+            (root / "ruff.toml").write_text("indent-width = 2\n", encoding="utf-8")
+
+            self.assertNotEqual(before, fingerprinter.fingerprint(target, ["ruff.toml"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+"""Tests for the resident formatter workers behind format_code."""
+
+from __future__ import annotations
+
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from neurocli_core.formatter_service import (
+    FormatterUnavailableError,
+    FormatterWorkerError,
+    ManagedFormatter,
+    PrettierServerWorker,
+    RuffServerWorker,
+    _PipeWorker,
+    _find_ruff_binary,
+    apply_text_edits,
+)
+
+
+FAKE_PRETTIER = """
+module.exports = {
+  version: '0.0-test',
+  resolveConfig: async () => ({ semi: false }),
+  format: async (text, options) => {
+    if (text.includes('syntax error')) throw new Error('SyntaxError: unexpected token')
+    return `${text.trim().toUpperCase()}${options.semi ? ';' : ''}\\n`
+  },
+}
+"""
+
+
+class ApplyTextEditsTests(unittest.TestCase):
+    def test_utf16_columns_account_for_surrogate_pairs(self) -> None:
+        edits = [
+            {
+                "range": {"start": {"line": 0, "character": 7}, "end": {"line": 0, "character": 8}},
+                "newText": "!",
+            }
+        ]
+
+        self.assertEqual(apply_text_edits("a = '😀x'\n", edits, "utf-16"), "a = '😀!'\n")
+        self.assertEqual(apply_text_edits("a = '😀x'\n", edits, "utf-32"), "a = '😀x!\n")
+
+
+class ManagedFormatterTests(unittest.TestCase):
+    def test_failed_worker_falls_back_to_one_shot_subprocess(self) -> None:
+        def broken_factory():
+            raise FormatterWorkerError("no daemon here")
+
+        formatter = ManagedFormatter(
+            "upper",
+            worker_factory=broken_factory,
+            oneshot_command=lambda _path: [
+                sys.executable,
+                "-c",
+                "import sys; sys.stdout.write(sys.stdin.read().upper())",
+            ],
+            install_message="",
+            timeout=10.0,
+        )
+
+        self.assertEqual(formatter.format("abc", "x.txt"), ("ABC", "oneshot"))
+        self.assertEqual(formatter.metrics.calls, 1)
+        self.assertEqual(formatter.metrics.last_error, "no daemon here")
+
+    def test_missing_tool_raises_runtime_error_with_install_hint(self) -> None:
+        formatter = ManagedFormatter(
+            "ghost",
+            worker_factory=None,
+            oneshot_command=lambda _path: ["neurocli-no-such-formatter-binary"],
+            install_message="Install ghost.",
+            timeout=10.0,
+        )
+
+        with self.assertRaisesRegex(RuntimeError, "Install ghost."):
+            formatter.format("abc", "x.txt")
+        self.assertTrue(issubclass(FormatterUnavailableError, RuntimeError))
+
+
+@unittest.skipUnless(_find_ruff_binary(), "ruff is not installed")
+class PipeWorkerContractTests(unittest.TestCase):
+    def test_incomplete_worker_cannot_be_constructed(self) -> None:
+        class HalfWorker(_PipeWorker):
+            def format(self, code: str, file_path: str) -> str:
+                return code
+
+        with self.assertRaisesRegex(TypeError, "_read_message"):
+            HalfWorker(["true"], cwd=Path.cwd(), timeout=1.0)
+
+
+class RuffServerWorkerTests(unittest.TestCase):
+    def test_resident_ruff_formats_and_restarts_after_a_crash(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            formatter = ManagedFormatter(
+                "ruff",
+                worker_factory=lambda: RuffServerWorker(
+                    _find_ruff_binary(), cwd=Path(temp_dir), timeout=10.0
+                ),
+                oneshot_command=lambda _path: [_find_ruff_binary(), "format", "-"],
+                install_message="",
+                timeout=10.0,
+            )
+            self.addCleanup(formatter.close)
+            target = str(Path(temp_dir) / "sample.py")
+
+            self.assertEqual(formatter.format("x=[1,2]\n", target), ("x = [1, 2]\n", "daemon"))
+            self.assertTrue(formatter.version())
+            # Syntax errors leave the source untouched, matching the one-shot path.
+            self.assertEqual(formatter.format("def f(:\n", target), ("def f(:\n", "daemon"))
+
+            formatter._worker._process.kill()
+            formatter._worker._process.wait()
+            self.assertEqual(formatter.format("y=1\n", target), ("y = 1\n", "daemon"))
+            self.assertEqual(formatter.metrics.restarts, 1)
+            self.assertTrue(formatter.health()["healthy"])
+
+
+@unittest.skipUnless(shutil.which("node"), "node is not installed")
+class PrettierServerWorkerTests(unittest.TestCase):
+    def test_resident_prettier_worker_formats_over_ndjson(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            module_dir = Path(temp_dir) / "node_modules" / "prettier"
+            module_dir.mkdir(parents=True)
+            (module_dir / "index.js").write_text(FAKE_PRETTIER, encoding="utf-8")
+
+            worker = PrettierServerWorker(
+                shutil.which("node"), [Path(temp_dir)], cwd=Path(temp_dir), timeout=10.0
+            )
+            worker.start()
+            self.addCleanup(worker.stop)
+
+            self.assertEqual(worker.version, "0.0-test")
+            self.assertEqual(worker.format("const a = 1", "src/a.js"), "CONST A = 1\n")
+            worker.ping()
+
+    def test_worker_start_fails_cleanly_without_prettier(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            worker = PrettierServerWorker(
+                shutil.which("node"), [Path(temp_dir)], cwd=Path(temp_dir), timeout=10.0
+            )
+
+            with self.assertRaisesRegex(FormatterWorkerError, "not installed"):
+                worker.start()
+            self.assertFalse(worker.is_alive())
@@ -0,0 +1,124 @@
+"""Tests for per-file and summary git diffs."""
+
+from __future__ import annotations
+
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+
+from neurocli_core.git_engine import get_diff_stats, get_staged_diff, iter_file_diffs, parse_numstat
+
+
+class NumstatParserTests(unittest.TestCase):
+    def test_parses_counts_binary_files_and_renames(self) -> None:
+        output = "3\t1\tsrc/app.py\0-\t-\tlogo.png\0" "0\t0\t\0old name.md\0docs/new name.md\0"
+
+        stats = parse_numstat(output)
+
+        self.assertEqual([(stat.path, stat.added, stat.deleted) for stat in stats], [
+            ("src/app.py", 3, 1),
+            ("logo.png", None, None),
+            ("docs/new name.md", 0, 0),
+        ])
+        self.assertTrue(stats[1].binary)
+        self.assertEqual(stats[2].old_path, "old name.md")
+        self.assertEqual(stats[0].to_dict()["binary"], False)
+
+
+@unittest.skipIf(shutil.which("git") is None, "git is not installed")
+class DiffQueryTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._temp_dir.cleanup)
+        self.root = Path(self._temp_dir.name)
+        self._git("init", "-q", "-b", "main")
+        self._git("config", "user.email", "dev@example.com")
+        self._git("config", "user.name", "Dev")
+        for name in ("a.py", "b.py", "c.py"):
+            (self.root / name).write_text(f"{name} = 1\n", encoding="utf-8")
+        self._git("add", ".")
+        self._git("commit", "-q", "-m", "init")
+
+    def _git(self, *args: str) -> None:
+        subprocess.run(["git", *args], cwd=self.root, check=True, capture_output=True)
+
+    def test_unstaged_fallback_lists_files_and_filters_by_path(self) -> None:
+        (self.root / "a.py").write_text("a.py = 2\nextra = 1\n", encoding="utf-8")
+        (self.root / "b.py").write_text("b.py = 2\n", encoding="utf-8")
+
+        stats, is_fallback = get_diff_stats(cwd=self.root)
+        diff_text, diff_fallback = get_staged_diff(["b.py"], cwd=self.root)
+
+        self.assertTrue(is_fallback)
+        self.assertEqual([(stat.path, stat.added, stat.deleted) for stat in stats], [
+            ("a.py", 2, 1),
+            ("b.py", 1, 1),
+        ])
+        self.assertTrue(diff_fallback)
+        self.assertIn("+b.py = 2", diff_text)
+        self.assertNotIn("a.py", diff_text)
+
+    def test_staged_changes_win_over_worktree_changes(self) -> None:
+        (self.root / "a.py").write_text("a.py = 2\n", encoding="utf-8")
+        (self.root / "c.py").write_text("c.py = 2\n", encoding="utf-8")
+        self._git("add", "c.py")
+
+        stats, is_fallback = get_diff_stats(cwd=self.root)
+        filtered, _ = get_staged_diff(["a.py"], cwd=self.root)
+
+        self.assertFalse(is_fallback)
+        self.assertEqual([stat.path for stat in stats], ["c.py"])
+        self.assertEqual(filtered, "")
+
+    def test_iter_file_diffs_yields_one_entry_per_file(self) -> None:
+        for name in ("a.py", "b.py", "c.py"):
+            (self.root / name).write_text(f"{name} = 3\n", encoding="utf-8")
+
+        diffs = list(iter_file_diffs(cwd=self.root))
+        first_only = iter_file_diffs(cwd=self.root)
+        first = next(first_only)
+        first_only.close()
+
+        self.assertEqual([path for path, _ in diffs], ["a.py", "b.py", "c.py"])
+        self.assertTrue(all(text.startswith("diff --git") for _, text in diffs))
+        self.assertIn("+b.py = 3", diffs[1][1])
+        self.assertEqual(first[0], "a.py")
+
+    def test_iter_file_diffs_paths_match_numstat_for_unusual_names(self) -> None:
+        names = ("café.py", "sp ace.txt", 'quo"te.py')
+        for name in names:
+            (self.root / name).write_text("one\n", encoding="utf-8")
+        self._git("add", ".")
+        self._git("commit", "-q", "-m", "more")
+        for name in names:
+            (self.root / name).write_text("-- a/not-a-header\n", encoding="utf-8")
+        (self.root / "sp ace.txt").unlink()
+
+        stats, _ = get_diff_stats(cwd=self.root)
+        diffs = list(iter_file_diffs(cwd=self.root))
+
+        self.assertEqual([path for path, _ in diffs], [stat.path for stat in stats])
+        self.assertEqual(sorted(path for path, _ in diffs), sorted(names))
+
+
+    def test_iter_file_diffs_raises_when_git_fails(self) -> None:
+        (self.root / "a.py").write_text("a.py = 3\n", encoding="utf-8")
+
+        with self.assertRaisesRegex(RuntimeError, "Git diff failed"):
+            list(iter_file_diffs([":(nosuchmagic)a.py"], cwd=self.root, cached=False))
+        with tempfile.TemporaryDirectory() as outside, self.assertRaisesRegex(RuntimeError, "Git diff failed"):
+            list(iter_file_diffs(cwd=outside, cached=False))
+
+    def test_closing_iter_file_diffs_early_does_not_raise(self) -> None:
+        for name in ("a.py", "b.py"):
+            (self.root / name).write_text(f"{name} = 3\n", encoding="utf-8")
+
+        diffs = iter_file_diffs(cwd=self.root)
+        next(diffs)
+        diffs.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+"""Tests for background push jobs."""
+
+from __future__ import annotations
+
+import io
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from neurocli_core.git_engine import execute_commit
+from neurocli_core.git_jobs import PushJob, PushJobManager, _iter_progress_lines, parse_push_progress
+
+
+class PushProgressParsingTests(unittest.TestCase):
+    def test_parses_local_and_remote_progress_lines(self) -> None:
+        writing = parse_push_progress("Writing objects:  40% (2/5), 1.20 KiB | 1.20 MiB/s")
+        remote = parse_push_progress("remote: Resolving deltas: 100% (3/3), done.")
+
+        self.assertEqual(
+            (writing.phase, writing.percent, writing.current, writing.total),
+            ("Writing objects", 40, 2, 5),
+        )
+        self.assertEqual((remote.phase, remote.percent), ("Resolving deltas", 100))
+        self.assertIsNone(parse_push_progress("To github.com:org/repo.git"))
+
+    def test_splits_carriage_return_redraws(self) -> None:
+        stream = io.BytesIO(b"Counting objects:  50% (1/2)\rCounting objects: 100% (2/2), done.\nTo origin\n")
+
+        self.assertEqual(
+            list(_iter_progress_lines(stream)),
+            ["Counting objects:  50% (1/2)", "Counting objects: 100% (2/2), done.", "To origin"],
+        )
+
+
+@unittest.skipIf(shutil.which("git") is None, "git is not installed")
+class PushJobManagerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._temp_dir.cleanup)
+        base = Path(self._temp_dir.name)
+        self.remote = base / "remote.git"
+        self.clone = base / "clone"
+        self._git(base, "init", "-q", "--bare", "-b", "main", str(self.remote))
+        self._git(base, "clone", "-q", str(self.remote), str(self.clone))
+        self._git(self.clone, "config", "user.email", "dev@example.com")
+        self._git(self.clone, "config", "user.name", "Dev")
+        self._git(self.clone, "checkout", "-q", "-b", "main")
+        self.manager = PushJobManager()
+
+    def _git(self, cwd: Path, *args: str) -> str:
+        return subprocess.run(
+            ["git", *args], cwd=cwd, check=True, capture_output=True, text=True
+        ).stdout
+
+    def test_commit_returns_before_push_and_job_reports_progress(self) -> None:
+        (self.clone / "notes.txt").write_text("hello\n", encoding="utf-8")
+        self._git(self.clone, "add", "notes.txt")
+
+        commit = execute_commit("docs: add notes", cwd=self.clone)
+        self.assertEqual(self._git(self.remote, "branch", "--list"), "")
+
+        job = self.manager.start_push(self.clone, remote="origin", branch="main")
+        snapshots = list(self.manager.watch(job.job_id))
+
+        self.assertEqual(snapshots[-1]["status"], "succeeded")
+        self.assertEqual(snapshots[-1]["returncode"], 0)
+        self.assertTrue(any(snapshot["phase"] for snapshot in snapshots))
+        self.assertEqual(self._git(self.remote, "rev-parse", "--short", "main").strip(), commit)
+
+    def test_failed_push_reports_git_error(self) -> None:
+        job = self.manager.start_push(self.clone, remote="no-such-remote")
+
+        finished = self.manager.wait(job.job_id, timeout=30)
+
+        self.assertEqual(finished.status, "failed")
+        self.assertIn("no-such-remote", finished.error)
+
+    def test_cancel_terminates_the_process(self) -> None:
+        job = self.manager._launch(
+            PushJob("slow", str(self.clone), [sys.executable, "-c", "import time; time.sleep(30)"])
+        )
+
+        cancelled = self.manager.cancel(job.job_id)
+
+        self.assertEqual(cancelled.status, "cancelled")
+        self.assertEqual(self.manager.cancel(job.job_id).status, "cancelled")
+        with self.assertRaises(KeyError):
+            self.manager.get("missing")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+"""Tests for the porcelain v2 parser and the cached git status service."""
+
+from __future__ import annotations
+
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+
+from neurocli_core.batch_formatter import changed_files
+from neurocli_core.git_status import GitStatusError, GitStatusService, parse_porcelain_v2
+
+
+SAMPLE_OUTPUT = b"\0".join(
+    [
+        b"# branch.oid 1234567890abcdef1234567890abcdef12345678",
+        b"# branch.head feature/status",
+        b"# branch.upstream origin/feature/status",
+        b"# branch.ab +2 -1",
+        b"1 .M N... 100644 100644 100644 aaaaaaa aaaaaaa src/app.py",
+        b"2 R. N... 100644 100644 100644 bbbbbbb bbbbbbb R100 docs/new name.md",
+        b"docs/old name.md",
+        b"u UU N... 100644 100644 100644 100644 ccccccc ddddddd eeeeeee conflict.py",
+        b"? notes/",
+        b"",
+    ]
+)
+
+
+class PorcelainV2ParserTests(unittest.TestCase):
+    def test_parses_branch_header_and_entries(self) -> None:
+        status = parse_porcelain_v2(SAMPLE_OUTPUT)
+
+        self.assertEqual(status.branch.head, "feature/status")
+        self.assertEqual(status.branch.upstream, "origin/feature/status")
+        self.assertEqual((status.branch.ahead, status.branch.behind), (2, 1))
+        self.assertEqual(
+            status.summary(), "On branch feature/status (ahead 2, behind 1 of origin/feature/status)"
+        )
+        self.assertEqual(
+            status.changed_paths, ["src/app.py", "docs/new name.md", "conflict.py", "notes/"]
+        )
+
+        modified, renamed, unmerged, untracked = status.entries
+        self.assertTrue(modified.unstaged)
+        self.assertFalse(modified.staged)
+        self.assertEqual(modified.short_status, " M")
+        self.assertEqual(renamed.kind, "renamed")
+        self.assertEqual(renamed.orig_path, "docs/old name.md")
+        self.assertEqual(renamed.score, "R100")
+        self.assertTrue(renamed.staged)
+        self.assertEqual(unmerged.kind, "unmerged")
+        self.assertEqual(unmerged.short_status, "UU")
+        self.assertEqual(untracked.short_status, "??")
+
+    def test_detached_head_on_initial_commit(self) -> None:
+        status = parse_porcelain_v2(b"# branch.oid (initial)\0# branch.head (detached)\0")
+
+        self.assertTrue(status.branch.detached)
+        self.assertIsNone(status.branch.oid)
+        self.assertTrue(status.is_clean)
+        self.assertEqual(status.summary(), "HEAD detached")
+
+
+@unittest.skipIf(shutil.which("git") is None, "git is not installed")
+class GitStatusServiceTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._temp_dir.cleanup)
+        self.root = Path(self._temp_dir.name)
+        self._git("init", "-q", "-b", "main")
+        self._git("config", "user.email", "dev@example.com")
+        self._git("config", "user.name", "Dev")
+        (self.root / "tracked.py").write_text("x = 1\n", encoding="utf-8")
+        (self.root / "gone.py").write_text("y = 1\n", encoding="utf-8")
+        self._git("add", ".")
+        self._git("commit", "-q", "-m", "init")
+
+    def _git(self, *args: str) -> None:
+        subprocess.run(["git", *args], cwd=self.root, check=True, capture_output=True)
+
+    def test_repeated_calls_reuse_cache_until_index_changes(self) -> None:
+        service = GitStatusService(self.root, ttl=60)
+        (self.root / "tracked.py").write_text("x = 2\n", encoding="utf-8")
+
+        first = service.status()
+        second = service.status()
+
+        self.assertIs(first, second)
+        self.assertEqual(service.calls, 1)
+        self.assertEqual(first.summary(), "On branch main")
+        self.assertEqual(first.changed_paths, ["tracked.py"])
+
+        self._git("add", "tracked.py")
+        third = service.status()
+
+        self.assertEqual(service.calls, 2)
+        self.assertTrue(third.has_staged_changes)
+
+    def test_invalidate_and_ttl_force_a_fresh_call(self) -> None:
+        service = GitStatusService(self.root, ttl=0)
+        service.status()
+        service.status()
+        self.assertEqual(service.calls, 2)
+
+        cached = GitStatusService(self.root, ttl=60)
+        cached.status()
+        cached.invalidate()
+        cached.status()
+        self.assertEqual(cached.calls, 2)
+
+    def test_changed_files_skips_deletions_and_expands_new_directories(self) -> None:
+        (self.root / "tracked.py").write_text("x = 2\n", encoding="utf-8")
+        (self.root / "gone.py").unlink()
+        (self.root / "pkg").mkdir()
+        (self.root / "pkg" / "new.py").write_text("z = 1\n", encoding="utf-8")
+
+        paths = changed_files(self.root)
+
+        self.assertEqual(
+            sorted(path.relative_to(self.root.resolve()).as_posix() for path in paths),
+            ["pkg/new.py", "tracked.py"],
+        )
+
+    def test_outside_a_repository_raises(self) -> None:
+        with tempfile.TemporaryDirectory() as other:
+            with self.assertRaises(GitStatusError):
+                GitStatusService(Path(other), ttl=60).status()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,222 @@
+"""Tests for the pooled OpenAI client registry."""
+
+from __future__ import annotations
+
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from neurocli_core import llm_api_openai
+from neurocli_core.config import refresh_settings
+from neurocli_core.llm_api_openai import (
+    LLMAttempt,
+    LLMTimeoutError,
+    OpenAIClientSettings,
+    ResiliencePolicy,
+    call_openai_api,
+    close_openai_clients,
+    get_openai_client,
+    is_retryable_error,
+    stream_openai_api,
+    warm_up_openai_client,
+)
+
+
+FAST_POLICY = ResiliencePolicy(
+    max_attempts=3,
+    backoff_initial=0.0,
+    backoff_jitter=0.0,
+    first_token_timeout=0.2,
+    idle_timeout=0.2,
+)
+
+
+def _completion(text: str) -> SimpleNamespace:
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))])
+
+
+def _stream_chunks(*parts: str, delay: float = 0.0, stall_after: int | None = None):
+    for index, part in enumerate(parts):
+        if stall_after is not None and index >= stall_after:
+            time.sleep(5)
+        if delay:
+            time.sleep(delay)
+        yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=part))])
+
+
+class OpenAIClientRegistryTests(unittest.TestCase):
+    def setUp(self) -> None:
+        close_openai_clients()
+        self.addCleanup(close_openai_clients)
+
+    def test_clients_are_reused_per_key_and_base_url(self) -> None:
+        settings = OpenAIClientSettings()
+
+        first = get_openai_client("key-a", base_url="https://example.test/v1", settings=settings)
+        second = get_openai_client("key-a", base_url="https://example.test/v1", settings=settings)
+        other_key = get_openai_client("key-b", base_url="https://example.test/v1", settings=settings)
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other_key)
+
+    def test_clients_share_one_pooled_transport(self) -> None:
+        settings = OpenAIClientSettings(max_connections=4, max_keepalive_connections=2)
+
+        get_openai_client("key-a", base_url="https://one.test/v1", settings=settings)
+        get_openai_client("key-a", base_url="https://two.test/v1", settings=settings)
+
+        self.assertIsNotNone(llm_api_openai._http_client)
+        self.assertEqual(len(llm_api_openai._clients), 2)
+        for client in llm_api_openai._clients.values():
+            self.assertIs(client._client, llm_api_openai._http_client)
+
+    def test_changed_pool_settings_rebuild_the_transport(self) -> None:
+        first = get_openai_client("key-a", base_url="https://example.test/v1", settings=OpenAIClientSettings())
+        second = get_openai_client(
+            "key-a",
+            base_url="https://example.test/v1",
+            settings=OpenAIClientSettings(max_connections=2),
+        )
+
+        self.assertIsNot(first, second)
+
+    def test_settings_read_environment_overrides(self) -> None:
+        self.addCleanup(refresh_settings)
+        with patch.dict(
+            "os.environ",
+            {"NEUROCLI_OPENAI_MAX_CONNECTIONS": "7", "NEUROCLI_OPENAI_CONNECT_TIMEOUT": "oops"},
+        ):
+            refresh_settings()
+            settings = OpenAIClientSettings.from_env()
+
+        self.assertEqual(settings.max_connections, 7)
+        self.assertEqual(settings.connect_timeout, OpenAIClientSettings().connect_timeout)
+
+
+class WarmUpTests(unittest.TestCase):
+    def test_warm_up_reports_elapsed_seconds(self) -> None:
+        fake_client = MagicMock()
+
+        with patch("neurocli_core.llm_api_openai.get_openai_client", return_value=fake_client):
+            elapsed = warm_up_openai_client("test-key")
+
+        self.assertIsNotNone(elapsed)
+        fake_client.models.list.assert_called_once()
+
+    def test_warm_up_swallows_network_failures(self) -> None:
+        fake_client = MagicMock()
+        fake_client.models.list.side_effect = OSError("offline")
+
+        with patch("neurocli_core.llm_api_openai.get_openai_client", return_value=fake_client):
+            self.assertIsNone(warm_up_openai_client("test-key"))
+
+
+
+class ResiliencePolicyTests(unittest.TestCase):
+    def test_timeouts_and_connection_errors_are_retryable(self) -> None:
+        self.assertTrue(is_retryable_error(LLMTimeoutError("slow")))
+        self.assertTrue(is_retryable_error(ConnectionError("reset")))
+        self.assertFalse(is_retryable_error(ValueError("bad request")))
+
+    def test_backoff_grows_and_is_capped(self) -> None:
+        policy = ResiliencePolicy(backoff_initial=1.0, backoff_max=3.0, backoff_jitter=0.0)
+
+        self.assertEqual(policy.backoff_delay(1), 1.0)
+        self.assertEqual(policy.backoff_delay(2), 2.0)
+        self.assertEqual(policy.backoff_delay(5), 3.0)
+
+
+class CallRetryTests(unittest.TestCase):
+    def test_retryable_failures_are_retried_and_reported(self) -> None:
+        attempts: list[LLMAttempt] = []
+        responses = [ConnectionError("reset"), _completion("recovered")]
+
+        def fake_open(_api_key, _kwargs):
+            result = responses.pop(0)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        with patch("neurocli_core.llm_api_openai._open_completion", side_effect=fake_open):
+            text = call_openai_api("key", "hi", policy=FAST_POLICY, on_attempt=attempts.append)
+
+        self.assertEqual(text, "recovered")
+        self.assertEqual([(a.kind, a.status) for a in attempts], [("primary", "error"), ("retry", "ok")])
+
+    def test_non_retryable_failures_raise_immediately(self) -> None:
+        attempts: list[LLMAttempt] = []
+
+        with patch("neurocli_core.llm_api_openai._open_completion", side_effect=ValueError("bad request")):
+            with self.assertRaisesRegex(RuntimeError, "bad request"):
+                call_openai_api("key", "hi", policy=FAST_POLICY, on_attempt=attempts.append)
+
+        self.assertEqual(len(attempts), 1)
+
+    def test_hedged_call_returns_the_first_response(self) -> None:
+        attempts: list[LLMAttempt] = []
+        call_count = {"value": 0}
+        lock = threading.Lock()
+
+        def fake_open(_api_key, _kwargs):
+            with lock:
+                call_count["value"] += 1
+                is_first = call_count["value"] == 1
+            if is_first:
+                time.sleep(1.0)
+                return _completion("slow")
+            return _completion("fast")
+
+        policy = ResiliencePolicy(hedge_enabled=True, hedge_after=0.05)
+        with patch("neurocli_core.llm_api_openai._open_completion", side_effect=fake_open):
+            text = call_openai_api("key", "hi", policy=policy, on_attempt=attempts.append)
+
+        self.assertEqual(text, "fast")
+        self.assertEqual(
+            sorted((a.kind, a.status) for a in attempts),
+            [("hedge", "ok"), ("primary", "cancelled")],
+        )
+
+
+class StreamResilienceTests(unittest.TestCase):
+    def test_missing_first_token_is_retried(self) -> None:
+        attempts: list[LLMAttempt] = []
+        streams = [_stream_chunks("never", stall_after=0), _stream_chunks("hello", " world")]
+
+        with patch("neurocli_core.llm_api_openai._open_completion", side_effect=lambda *_: streams.pop(0)):
+            chunks = list(stream_openai_api("key", "hi", policy=FAST_POLICY, on_attempt=attempts.append))
+
+        self.assertEqual(chunks, ["hello", " world"])
+        self.assertEqual([(a.kind, a.status) for a in attempts], [("primary", "timeout"), ("retry", "ok")])
+        self.assertIsNotNone(attempts[-1].first_token_ms)
+
+    def test_idle_stream_stall_raises_instead_of_hanging(self) -> None:
+        attempts: list[LLMAttempt] = []
+        received: list[str] = []
+
+        with patch(
+            "neurocli_core.llm_api_openai._open_completion",
+            return_value=_stream_chunks("partial", "never", stall_after=1),
+        ):
+            with self.assertRaisesRegex(RuntimeError, "stalled"):
+                for chunk in stream_openai_api("key", "hi", policy=FAST_POLICY, on_attempt=attempts.append):
+                    received.append(chunk)
+
+        self.assertEqual(received, ["partial"])
+        self.assertEqual([a.status for a in attempts], ["timeout"])
+
+    def test_hedged_stream_uses_the_first_stream_to_respond(self) -> None:
+        attempts: list[LLMAttempt] = []
+        streams = [_stream_chunks("slow", delay=1.0), _stream_chunks("fast", "!")]
+        policy = ResiliencePolicy(hedge_enabled=True, hedge_after=0.05, first_token_timeout=2.0)
+
+        with patch("neurocli_core.llm_api_openai._open_completion", side_effect=lambda *_: streams.pop(0)):
+            chunks = list(stream_openai_api("key", "hi", policy=policy, on_attempt=attempts.append))
+
+        self.assertEqual(chunks, ["fast", "!"])
+        self.assertEqual([(a.kind, a.status) for a in attempts], [("primary", "cancelled"), ("hedge", "ok")])
+
+
+if __name__ == "__main__":
+    unittest.main()
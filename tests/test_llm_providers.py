@@ -0,0 +1,108 @@
+"""Tests for the pluggable LLM providers behind the workflow service."""
+
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from neurocli_core.config import refresh_settings
+from neurocli_core.llm_providers import (
+    MockProvider,
+    OpenAIProvider,
+    ProviderConfigurationError,
+    ReplayProvider,
+    get_llm_provider,
+)
+from neurocli_core.workflow_service import build_ai_workflow_request, stream_ai_workflow
+
+
+def _event_shape(events) -> list[tuple[str, str, str | None]]:
+    """Project events onto the fields that must match across providers."""
+
+    return [
+        (
+            event.event,
+            event.delta,
+            event.response.output_text if event.response is not None else None,
+        )
+        for event in events
+    ]
+
+
+class MockProviderTests(unittest.TestCase):
+    def test_mock_stream_is_deterministic_per_prompt(self) -> None:
+        provider = MockProvider(response_tokens=12, seed=7)
+
+        first = list(provider.stream("explain the diff"))
+        second = list(provider.stream("explain the diff"))
+        other = list(provider.stream("something else"))
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(first), 12)
+        self.assertNotEqual(first, other)
+        self.assertEqual(provider.complete("explain the diff"), "".join(first))
+
+    def test_mock_reports_one_successful_attempt(self) -> None:
+        attempts = []
+
+        list(MockProvider(response_tokens=3).stream("hi", on_attempt=attempts.append))
+
+        self.assertEqual([(a.kind, a.status) for a in attempts], [("primary", "ok")])
+
+
+class ReplayProviderTests(unittest.TestCase):
+    def test_replay_without_recording_raises_runtime_error(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            provider = ReplayProvider(cassette_dir=Path(temp_dir))
+
+            with self.assertRaisesRegex(RuntimeError, "No recorded stream"):
+                list(provider.stream("never recorded"))
+
+    def test_all_providers_produce_identical_workflow_events(self) -> None:
+        mock = MockProvider(response_tokens=20, seed=3)
+        request = build_ai_workflow_request("Summarize the workspace")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            recorder = ReplayProvider(cassette_dir=Path(temp_dir), mode="record", inner=mock)
+            replayer = ReplayProvider(cassette_dir=Path(temp_dir), mode="replay", speed=0)
+
+            mock_events = list(stream_ai_workflow(request, provider=mock))
+            recorded_events = list(stream_ai_workflow(request, provider=recorder))
+            replayed_events = list(stream_ai_workflow(request, provider=replayer))
+
+        self.assertEqual(_event_shape(mock_events), _event_shape(recorded_events))
+        self.assertEqual(_event_shape(mock_events), _event_shape(replayed_events))
+        self.assertEqual(replayed_events[-1].event, "complete")
+
+
+class ProviderSelectionTests(unittest.TestCase):
+    def test_default_provider_is_openai(self) -> None:
+        self.addCleanup(refresh_settings)
+        with patch.dict("os.environ", {"NEUROCLI_LLM_PROVIDER": ""}), patch(
+            "neurocli_core.llm_providers.get_openai_api_key", return_value="test-key"
+        ):
+            refresh_settings()
+            provider = get_llm_provider()
+
+        self.assertIsInstance(provider, OpenAIProvider)
+
+    def test_mock_provider_needs_no_api_key(self) -> None:
+        with patch("neurocli_core.llm_providers.get_openai_api_key", return_value=None):
+            provider = get_llm_provider("mock")
+
+        self.assertIsInstance(provider, MockProvider)
+
+    def test_openai_provider_requires_a_key(self) -> None:
+        with patch("neurocli_core.llm_providers.get_openai_api_key", return_value=None):
+            with self.assertRaisesRegex(ProviderConfigurationError, "OPENAI_API_KEY"):
+                get_llm_provider("openai")
+
+    def test_unknown_provider_is_rejected(self) -> None:
+        with self.assertRaisesRegex(ProviderConfigurationError, "Unknown LLM provider"):
+            get_llm_provider("carrier-pigeon")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+"""Tests for hunk-level proposal review and partial apply."""
+
+from __future__ import annotations
+
+import unittest
+
+from neurocli_core.proposals import HunkConflictError, ProposalStore, apply_hunks, build_proposal
+
+
+def _numbered(count: int) -> list[str]:
+    return [f"line {index}\n" for index in range(count)]
+
+
+class ApplyHunksTests(unittest.TestCase):
+    def setUp(self) -> None:
+        lines = _numbered(40)
+        self.baseline = "".join(lines)
+        lines[5] = "line five\n"
+        lines[20] = "line twenty\n"
+        lines[35] = "line thirty-five\n"
+        self.proposed = "".join(lines)
+        self.proposal = build_proposal("sample.py", self.baseline, self.proposed)
+
+    def test_all_hunks_reproduce_the_proposal(self) -> None:
+        self.assertEqual(len(self.proposal.hunks), 3)
+        self.assertEqual(apply_hunks(self.baseline, self.proposal.hunks), self.proposed)
+
+    def test_only_accepted_hunks_are_applied(self) -> None:
+        first, _middle, last = self.proposal.hunk_ids
+
+        updated = apply_hunks(self.baseline, self.proposal.hunks, [first, last])
+
+        self.assertIn("line five\n", updated)
+        self.assertIn("line 20\n", updated)
+        self.assertIn("line thirty-five\n", updated)
+
+    def test_hunks_rebase_when_the_file_shifted_on_disk(self) -> None:
+        drifted = "# header added later\n# and another\n" + self.baseline.replace(
+            "line 28\n", "line 28 edited\n"
+        )
+
+        updated = apply_hunks(drifted, self.proposal.hunks)
+
+        self.assertTrue(updated.startswith("# header added later\n"))
+        self.assertIn("line 28 edited\n", updated)
+        self.assertIn("line twenty\n", updated)
+        self.assertIn("line thirty-five\n", updated)
+
+    def test_conflicting_hunks_are_reported_and_nothing_is_applied(self) -> None:
+        conflicted = self.baseline.replace("line 20\n", "someone else changed this\n")
+
+        with self.assertRaises(HunkConflictError) as raised:
+            apply_hunks(conflicted, self.proposal.hunks)
+
+        self.assertEqual(raised.exception.hunk_ids, [self.proposal.hunk_ids[1]])
+
+    def test_unknown_hunk_ids_are_rejected(self) -> None:
+        with self.assertRaises(KeyError):
+            apply_hunks(self.baseline, self.proposal.hunks, ["not-a-hunk"])
+
+
+class ProposalStoreTests(unittest.TestCase):
+    def test_store_is_bounded_and_wire_form_omits_contents(self) -> None:
+        store = ProposalStore(max_entries=2)
+        first = store.create("a.py", "a\n", "b\n")
+        store.create("b.py", "a\n", "c\n")
+        store.create("c.py", "a\n", "d\n")
+
+        with self.assertRaises(KeyError):
+            store.get(first.proposal_id)
+
+        payload = first.to_dict()
+        self.assertNotIn("proposed_content", payload)
+        self.assertEqual(payload["hunks"][0]["lines"], ["-a\n", "+b\n"])
+
+
+if __name__ == "__main__":
+    unittest.main()
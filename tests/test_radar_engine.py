@@ -6,7 +6,12 @@ import tempfile
 import unittest
 from pathlib import Path
 
-from neurocli_core.radar_engine import scan_technical_debt, scan_workspace_health
+from neurocli_core.radar_engine import (
+    iter_technical_debt,
+    iter_workspace_health,
+    scan_technical_debt,
+    scan_workspace_health,
+)
 
 
 class RadarEngineExclusionTests(unittest.TestCase):
@@ -30,5 +35,23 @@ class RadarEngineExclusionTests(unittest.TestCase):
         self.assertEqual(health["composition"]["Python"]["loc"], 2)
 
 
+class RadarEngineStreamingTests(unittest.TestCase):
+    def test_batches_add_up_to_the_full_scan(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            workspace = Path(temp_dir)
+            for index in range(7):
+                (workspace / f"mod_{index}.py").write_text(f"# TODO item {index}\nx = {index}\n", encoding="utf-8")
+
+            snapshots = list(iter_workspace_health(str(workspace), batch_files=3))
+            batches = list(iter_technical_debt(str(workspace), batch_files=3))
+            health = scan_workspace_health(str(workspace))
+            debt = scan_technical_debt(str(workspace))
+
+        self.assertEqual([snapshot["total_loc"] for snapshot in snapshots], [6, 12, 14])
+        self.assertEqual(snapshots[-1], health)
+        self.assertEqual([len(batch) for batch in batches], [3, 3, 1])
+        self.assertEqual([item for batch in batches for item in batch], debt)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,89 @@
+"""Tests for the Textual Radar modal's background scans and result cache."""
+
+from __future__ import annotations
+
+import asyncio
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from textual.app import App
+from textual.widgets import DataTable, Label
+
+from neurocli_app.radar_modal import RadarModal, cached_radar_results, clear_radar_cache
+
+
+class RadarModalTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._temp_dir.cleanup)
+        self.root = Path(self._temp_dir.name)
+        for index in range(5):
+            (self.root / f"mod_{index}.py").write_text(f"# TODO item {index}\nx = {index}\n", encoding="utf-8")
+        clear_radar_cache()
+        self.addCleanup(clear_radar_cache)
+        edits = patch("neurocli_app.radar_modal.scan_recent_edits", return_value=[])
+        edits.start()
+        self.addCleanup(edits.stop)
+
+    def test_scans_fill_the_panels_and_reopening_paints_the_cache_at_once(self) -> None:
+        async def scenario() -> tuple[int, str, int]:
+            app = App()
+            async with app.run_test() as pilot:
+                await app.push_screen(RadarModal(str(self.root)))
+                for _ in range(100):
+                    await pilot.pause(0.02)
+                    if not app.screen._active_scans:
+                        break
+                first_rows = app.screen.query_one("#debt_table", DataTable).row_count
+                app.screen.dismiss()
+                await pilot.pause()
+
+                # The reopened modal shows the cached scan before any worker reports.
+                with patch("neurocli_app.radar_modal.RadarModal._start_scan"):
+                    await app.push_screen(RadarModal(str(self.root)))
+                    await pilot.pause()
+                    total = str(app.screen.query_one("#total_loc_label", Label).content)
+                    cached_rows = app.screen.query_one("#debt_table", DataTable).row_count
+                return first_rows, total, cached_rows
+
+        first_rows, total, cached_rows = asyncio.run(scenario())
+
+        self.assertEqual(first_rows, 5)
+        self.assertEqual(total, "Total Lines of Code: 10")
+        self.assertEqual(cached_rows, 5)
+
+    def test_closing_the_modal_cancels_scans_without_caching_partials(self) -> None:
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_health(root: str):
+            yield {"total_loc": 1, "composition": {}}
+            started.set()
+            release.wait(5)
+            yield {"total_loc": 2, "composition": {}}
+
+        async def scenario() -> bool:
+            app = App()
+            async with app.run_test() as pilot:
+                with patch("neurocli_app.radar_modal.iter_workspace_health", slow_health):
+                    await app.push_screen(RadarModal(str(self.root)))
+                    await asyncio.to_thread(started.wait, 5)
+                    workers = [worker for worker in app.workers if worker.name == "radar_health"]
+                    await pilot.click("#btn_close_radar")
+                    await pilot.pause()
+                    cancelled = all(worker.is_cancelled for worker in workers) and bool(workers)
+                    release.set()
+                    await pilot.pause(0.1)
+                return cancelled
+
+        cancelled = asyncio.run(scenario())
+
+        self.assertTrue(cancelled)
+        self.assertIsNone(cached_radar_results(str(self.root)).health)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+"""Guard the lazy-import boundaries that keep cold start fast."""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _modules_loaded_by(import_statement: str) -> set[str]:
+    probe = f"import json, sys\n{import_statement}\nprint(json.dumps(sorted(sys.modules)))"
+    result = subprocess.run(
+        [sys.executable, "-c", probe],
+        capture_output=True,
+        text=True,
+        cwd=PROJECT_ROOT,
+        check=True,
+    )
+    return set(json.loads(result.stdout.strip().splitlines()[-1]))
+
+
+class LazyImportTests(unittest.TestCase):
+    def test_textual_app_defers_modals_and_services(self) -> None:
+        loaded = _modules_loaded_by("import neurocli_app.main")
+
+        for deferred in (
+            "textual_fspicker",
+            "neurocli_app.git_modal",
+            "neurocli_app.radar_modal",
+            "neurocli_app.context_modal",
+            "neurocli_core.workflow_service",
+            "neurocli_core.code_formatter",
+            "openai",
+        ):
+            self.assertNotIn(deferred, loaded)
+
+    def test_api_defers_git_radar_and_formatter(self) -> None:
+        loaded = _modules_loaded_by("import api.main")
+
+        for deferred in (
+            "neurocli_core.git_engine",
+            "neurocli_core.radar_engine",
+            "neurocli_core.code_formatter",
+            "neurocli_core.diff_generator",
+            "openai",
+        ):
+            self.assertNotIn(deferred, loaded)
+
+
+if __name__ == "__main__":
+    unittest.main()
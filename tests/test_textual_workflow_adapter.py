@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+import tempfile
 import unittest
+from pathlib import Path
 from unittest.mock import patch
 
 from neurocli_app.workflow_adapter import (
+    StreamDiffPreview,
     build_textual_workflow_request,
     parse_model_options,
     run_textual_stream_workflow,
@@ -85,3 +88,26 @@ class RunTextualStreamWorkflowTests(unittest.TestCase):
         ):
             with self.assertRaisesRegex(RuntimeError, "final response event"):
                 run_textual_stream_workflow(request, lambda _event: None)
+
+
+class StreamDiffPreviewTests(unittest.TestCase):
+    def test_preview_shows_finalized_hunks_while_streaming(self) -> None:
+        original = "".join(f"line {index}\n" for index in range(40))
+        updated = original.replace("line 3\n", "line three\n")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            target_file = Path(temp_dir) / "sample.py"
+            target_file.write_text(original, encoding="utf-8")
+            preview = StreamDiffPreview.from_request(
+                build_ai_workflow_request("Edit", target_file=str(target_file))
+            )
+
+        self.assertIsNotNone(preview)
+        rendered = preview.update(AIWorkflowStreamEvent(event="delta", delta=updated[:200]))
+
+        self.assertIn("1 hunks ready", rendered)
+        self.assertIn("+line three", rendered)
+
+    def test_preview_is_skipped_without_a_readable_target(self) -> None:
+        self.assertIsNone(StreamDiffPreview.from_request(build_ai_workflow_request("Explain")))
+
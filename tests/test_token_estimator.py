@@ -0,0 +1,86 @@
+"""Tests for the shared context token estimation service."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from neurocli_core.token_estimator import ContextTokenTracker, PathEstimate, TokenEstimator
+
+
+class TokenEstimatorTests(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.root = Path(temp_dir.name)
+        (self.root / "pkg").mkdir()
+        (self.root / "pkg" / "a.py").write_text("a" * 400, encoding="utf-8")
+        (self.root / "pkg" / "b.md").write_text("b" * 80, encoding="utf-8")
+        (self.root / "pkg" / "blob.bin").write_bytes(b"\xff\xfe" * 50)
+
+    def test_stat_pass_estimates_without_reading_files(self) -> None:
+        estimator = TokenEstimator(max_entries=16)
+
+        with patch.object(Path, "read_text", side_effect=AssertionError("read during stat pass")):
+            estimate = estimator.estimate_path(str(self.root / "pkg"), refine=False)
+
+        self.assertFalse(estimate.exact)
+        self.assertEqual(estimate.files, 3)
+        self.assertEqual(estimate.tokens, 100 + 20 + 25)
+
+    def test_refined_results_are_cached_by_size_and_mtime(self) -> None:
+        estimator = TokenEstimator(max_entries=16)
+        target = self.root / "pkg" / "a.py"
+
+        first = estimator.estimate_path(str(self.root / "pkg"))
+        with patch.object(Path, "read_text", side_effect=AssertionError("cache miss")):
+            second = estimator.estimate_path(str(self.root / "pkg"))
+
+        self.assertTrue(first.exact)
+        self.assertEqual(first.tokens, 120)
+        self.assertEqual(second.tokens, 120)
+
+        target.write_text("a" * 800, encoding="utf-8")
+        stat = target.stat()
+        os.utime(target, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        self.assertEqual(estimator.estimate_path(str(target)).tokens, 200)
+
+    def test_cache_is_bounded(self) -> None:
+        estimator = TokenEstimator(max_entries=1)
+
+        estimator.estimate_path(str(self.root / "pkg"))
+
+        self.assertEqual(len(estimator._cache), 1)
+
+    def test_missing_paths_report_an_error(self) -> None:
+        estimate = TokenEstimator(max_entries=4).estimate_path(str(self.root / "missing"))
+
+        self.assertIn("not found", estimate.error or "")
+
+
+class ContextTokenTrackerTests(unittest.TestCase):
+    def test_tracker_updates_incrementally_and_ignores_removed_paths(self) -> None:
+        tracker = ContextTokenTracker(TokenEstimator(max_entries=4))
+
+        tracker.add("one.py")
+        tracker.add("two.py")
+        self.assertEqual(tracker.snapshot().pending, ["one.py", "two.py"])
+
+        tracker.update(PathEstimate(path="one.py", tokens=10, exact=True))
+        tracker.update(PathEstimate(path="two.py", tokens=5, exact=False))
+        snapshot = tracker.snapshot()
+        self.assertEqual(snapshot.total_tokens, 15)
+        self.assertEqual(snapshot.pending, ["two.py"])
+
+        tracker.remove("two.py")
+        self.assertFalse(tracker.update(PathEstimate(path="two.py", tokens=50, exact=True)))
+        snapshot = tracker.snapshot()
+        self.assertEqual(snapshot.total_tokens, 10)
+        self.assertTrue(snapshot.exact)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+"""Tests for lazy, paginated workspace listings."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from neurocli_core.workspace_tree import WorkspaceTree
+
+
+class WorkspaceTreeTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._temp_dir.cleanup)
+        self.root = Path(self._temp_dir.name)
+        (self.root / "src" / "pkg").mkdir(parents=True)
+        (self.root / "node_modules").mkdir()
+        (self.root / "src" / "main.py").write_text("", encoding="utf-8")
+        (self.root / "src" / "pkg" / "a.py").write_text("", encoding="utf-8")
+        (self.root / "README.md").write_text("", encoding="utf-8")
+        (self.root / "b.txt").write_text("", encoding="utf-8")
+        self.tree = WorkspaceTree(self.root, excluded={"node_modules"})
+
+    def test_lists_one_level_with_relative_paths_and_child_counts(self) -> None:
+        page = self.tree.list_directory("").to_dict()
+        nested = self.tree.list_directory("src").to_dict()
+
+        self.assertEqual(page["path"], "")
+        self.assertEqual(
+            page["entries"],
+            [
+                {"name": "src", "path": "src", "type": "directory", "child_count": 2},
+                {"name": "b.txt", "path": "b.txt", "type": "file"},
+                {"name": "README.md", "path": "README.md", "type": "file"},
+            ],
+        )
+        self.assertEqual([entry["path"] for entry in nested["entries"]], ["src/pkg", "src/main.py"])
+        self.assertIsNone(page["next_cursor"])
+
+    def test_cursor_pages_through_a_large_directory(self) -> None:
+        big = self.root / "big"
+        big.mkdir()
+        for index in range(25):
+            (big / f"file_{index:02d}.txt").write_text("", encoding="utf-8")
+
+        names: list[str] = []
+        cursor = None
+        pages = 0
+        while True:
+            page = self.tree.list_directory("big", cursor=cursor, limit=10)
+            names.extend(entry["name"] for entry in page.entries)
+            pages += 1
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        self.assertEqual(pages, 3)
+        self.assertEqual(names, [f"file_{index:02d}.txt" for index in range(25)])
+        self.assertEqual(page.total, 25)
+
+    def test_listing_is_cached_until_the_directory_mtime_changes(self) -> None:
+        self.tree.list_directory("src/pkg")
+        scans = self.tree.scans
+        self.tree.list_directory("src/pkg")
+        self.assertEqual(self.tree.scans, scans)
+
+        new_file = self.root / "src" / "pkg" / "b.py"
+        new_file.write_text("", encoding="utf-8")
+        # Guard against coarse filesystem timestamps.
+        stat = (self.root / "src" / "pkg").stat()
+        os.utime(self.root / "src" / "pkg", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        page = self.tree.list_directory("src/pkg")
+
+        self.assertEqual(self.tree.scans, scans + 1)
+        self.assertEqual([entry["name"] for entry in page.entries], ["a.py", "b.py"])
+
+    def test_rejects_paths_outside_the_workspace_and_bad_cursors(self) -> None:
+        with self.assertRaises(ValueError):
+            self.tree.list_directory("../")
+        with self.assertRaises(NotADirectoryError):
+            self.tree.list_directory("README.md")
+        with self.assertRaises(ValueError):
+            self.tree.list_directory("", cursor="not-a-cursor")
+
+    @unittest.skipIf(os.name == "nt", "symlinks need privileges on Windows")
+    def test_symlinks_leaving_the_workspace_are_hidden(self) -> None:
+        with tempfile.TemporaryDirectory() as outside:
+            (self.root / "escape").symlink_to(outside, target_is_directory=True)
+            (self.root / "inside").symlink_to(self.root / "src", target_is_directory=True)
+
+            names = [entry["name"] for entry in self.tree.list_directory("").entries]
+
+        self.assertIn("inside", names)
+        self.assertNotIn("escape", names)
+
+
+if __name__ == "__main__":
+    unittest.main()
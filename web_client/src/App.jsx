@@ -33,6 +33,8 @@ function App() {
   const [isStreaming, setIsStreaming] = useState(false)
   const [targetFile, setTargetFile] = useState('')
   const [proposedContent, setProposedContent] = useState('')
+  // Server-side proposal: only its id and hunk ids go back over the wire on apply.
+  const [proposal, setProposal] = useState(null)
   const [showApplyBtn, setShowApplyBtn] = useState(false)
   const [isContextModalOpen, setIsContextModalOpen] = useState(false)
   const [contextPaths, setContextPaths] = useState(() => new Set())
@@ -93,6 +95,7 @@ function App() {
   const handleFileSelect = async (path) => {
     setTargetFile(path)
     setProposedContent('')
+    setProposal(null)
     setShowApplyBtn(false)
 
     try {
@@ -101,10 +104,15 @@ function App() {
         throw new Error(data.error)
       }
 
+      // Large files arrive as a first window; say so instead of implying the view is complete.
+      const truncatedNote = data.truncated
+        ? `\n\n[Showing the first ${Math.round(data.end / 1024)} KB of ${Math.round(data.size / 1024)} KB.]`
+        : ''
+
       pushHistoryEntry({
         id: createEntryId('file'),
         type: 'system',
-        content: `Viewing ${getFileLabel(path)}\n\n${data.content}`,
+        content: `Viewing ${getFileLabel(path)}\n\n${data.content}${truncatedNote}`,
       })
     } catch (error) {
       pushHistoryEntry({
@@ -137,6 +145,39 @@ function App() {
         content: data.message,
       })
       setProposedContent('')
+      setProposal(null)
+      setShowApplyBtn(false)
+      await handleFileSelect(targetFile)
+    } catch (error) {
+      pushHistoryEntry({
+        id: createEntryId('error'),
+        type: 'error',
+        content: `Apply Error: ${error.message}`,
+      })
+    }
+  }
+
+  const handleApplyHunks = async (acceptedHunkIds) => {
+    if (!proposal) {
+      return
+    }
+
+    try {
+      const data = await postJson(`/api/proposals/${encodeURIComponent(proposal.proposal_id)}/apply`, {
+        accepted_hunk_ids: acceptedHunkIds,
+      })
+
+      if (data.error) {
+        throw new Error(data.error)
+      }
+
+      pushHistoryEntry({
+        id: createEntryId('apply'),
+        type: 'system',
+        content: data.message,
+      })
+      setProposedContent('')
+      setProposal(null)
       setShowApplyBtn(false)
       await handleFileSelect(targetFile)
     } catch (error) {
@@ -178,6 +219,7 @@ function App() {
           content: 'No formatting changes were needed.',
         })
         setProposedContent('')
+        setProposal(null)
         setShowApplyBtn(false)
         return
       }
@@ -188,6 +230,7 @@ function App() {
         content: data.diff,
       })
       setProposedContent(data.proposed_content || '')
+      setProposal(data.proposal_id ? { proposal_id: data.proposal_id, hunks: data.hunks || [] } : null)
       setShowApplyBtn(Boolean(data.proposed_content))
     } catch (error) {
       pushHistoryEntry({
@@ -233,6 +276,7 @@ function App() {
     setInput('')
     setIsStreaming(true)
     setProposedContent('')
+    setProposal(null)
     setShowApplyBtn(false)
 
     try {
@@ -281,7 +325,7 @@ function App() {
             }))
           },
           onComplete: (event) => {
-            streamResponse = event.response || null
+            streamResponse = event.response ? { ...event.response, proposal: event.proposal } : null
           },
           onError: (event) => {
             streamErrorMessage =
@@ -345,6 +389,7 @@ function App() {
 
     if (response.response_kind === 'file_update') {
       setProposedContent(response.output_text || '')
+      setProposal(response.proposal || null)
       setShowApplyBtn(Boolean(response.output_text))
       pushHistoryEntry({
         id: createEntryId('system'),
@@ -355,6 +400,8 @@ function App() {
     }
 
     setProposedContent('')
+
+    setProposal(null)
     setShowApplyBtn(false)
   }
 
@@ -382,6 +429,7 @@ function App() {
               setIsStreaming(false)
               setHistory([{ id: 'reset-1', type: 'system', content: 'Console reset.' }])
               setProposedContent('')
+              setProposal(null)
               setShowApplyBtn(false)
             }}
           >
@@ -468,6 +516,7 @@ function App() {
               onClick={() => {
                 setTargetFile('')
                 setProposedContent('')
+                setProposal(null)
                 setShowApplyBtn(false)
               }}
               disabled={!targetFile}
@@ -509,6 +558,7 @@ function App() {
                 onClick={() => {
                   setInput('')
                   setProposedContent('')
+                  setProposal(null)
                   setShowApplyBtn(false)
                   setHistory([{ id: 'clear-1', type: 'system', content: 'Console cleared.' }])
                 }}
@@ -634,8 +684,16 @@ function App() {
         onClose={() => setIsReviewModalOpen(false)}
         targetFile={targetFile}
         proposedContent={proposedContent}
-        setProposedContent={setProposedContent}
+        setProposedContent={(content) => {
+          // Hand edits invalidate the server-side hunks, so fall back to whole-file apply.
+          if (content !== proposedContent) {
+            setProposal(null)
+          }
+          setProposedContent(content)
+        }}
+        proposal={proposal}
         onApply={handleApply}
+        onApplyHunks={handleApplyHunks}
       />
 
       <CommandModal
@@ -1,12 +1,45 @@
+import { useEffect, useState } from 'react'
 import { File, Trash2, X } from 'lucide-react'
+import { postJson } from '../lib/api'
 
 export default function ContextModal({ isOpen, onClose, contextPaths, setContextPaths, onFileSelect }) {
+  const [estimate, setEstimate] = useState(null)
+
+  // Token counts come from the shared backend estimator used by the Textual app.
+  useEffect(() => {
+    if (!isOpen || contextPaths.size === 0) {
+      setEstimate(null)
+      return undefined
+    }
+
+    let cancelled = false
+    postJson('/api/context/estimate', { paths: Array.from(contextPaths) })
+      .then((data) => {
+        if (!cancelled) {
+          setEstimate(data.error ? null : data)
+        }
+      })
+      .catch(() => {
+        if (!cancelled) {
+          setEstimate(null)
+        }
+      })
+
+    return () => {
+      cancelled = true
+    }
+  }, [isOpen, contextPaths])
+
   if (!isOpen) {
     return null
   }
 
   const selectedPaths = Array.from(contextPaths).sort((left, right) => left.localeCompare(right))
-  const estimatedTokens = selectedPaths.length * 1500
+  const tokenLabel = estimate
+    ? `~${estimate.total_tokens.toLocaleString()} Tokens${estimate.over_budget ? ' (over budget)' : ''}`
+    : selectedPaths.length > 0
+      ? 'Estimating…'
+      : '~0 Tokens'
 
   const removePath = (path) => {
     const nextPaths = new Set(contextPaths)
@@ -43,7 +76,7 @@ export default function ContextModal({ isOpen, onClose, contextPaths, setContext
           <div className="overflow-hidden rounded-md border border-[#30363d] bg-[#010409]">
             <div className="flex items-center justify-between border-b border-[#30363d] bg-[#161b22] p-2 text-xs font-semibold uppercase tracking-wider text-[#8b949e]">
               <span>{selectedPaths.length} Files Selected</span>
-              <span>~{estimatedTokens.toLocaleString()} Tokens</span>
+              <span className={estimate?.over_budget ? 'text-[#f85149]' : ''}>{tokenLabel}</span>
             </div>
 
             <div className="max-h-64 space-y-1 overflow-y-auto p-2">
@@ -1,4 +1,4 @@
-import { useEffect, useState } from 'react'
+import { useCallback, useEffect, useState } from 'react'
 import {
   ChevronDown,
   ChevronRight,
@@ -9,6 +9,17 @@ import {
 } from 'lucide-react'
 import { fetchJson } from '../lib/api'
 
+const PAGE_SIZE = 200
+
+// Fetch one page of a directory's immediate children; paths are workspace-relative.
+const fetchListing = (path, cursor = null) => {
+  const params = new URLSearchParams({ path, limit: String(PAGE_SIZE) })
+  if (cursor) {
+    params.set('cursor', cursor)
+  }
+  return fetchJson(`/api/files/list?${params.toString()}`)
+}
+
 const FileTreeNode = ({
   node,
   level = 0,
@@ -19,8 +30,39 @@ const FileTreeNode = ({
   showContextToggle = true,
 }) => {
   const [isOpen, setIsOpen] = useState(level === 0)
+  const [children, setChildren] = useState(node.entries ?? null)
+  const [nextCursor, setNextCursor] = useState(node.next_cursor ?? null)
+  const [total, setTotal] = useState(node.total ?? node.child_count ?? 0)
+  const [loadingChildren, setLoadingChildren] = useState(false)
+  const [loadError, setLoadError] = useState(null)
 
   const isDirectory = node.type === 'directory'
+  const isEmpty = isDirectory && node.child_count === 0
+
+  const loadChildren = useCallback(
+    async (cursor = null) => {
+      setLoadingChildren(true)
+      try {
+        const page = await fetchListing(node.path, cursor)
+        setChildren((previous) => (cursor && previous ? [...previous, ...page.entries] : page.entries))
+        setNextCursor(page.next_cursor)
+        setTotal(page.total)
+        setLoadError(null)
+      } catch (fetchError) {
+        setLoadError(fetchError.message)
+      } finally {
+        setLoadingChildren(false)
+      }
+    },
+    [node.path],
+  )
+
+  // Children are fetched the first time a directory opens and kept while it is collapsed.
+  useEffect(() => {
+    if (isDirectory && isOpen && children === null && !isEmpty && !loadingChildren && !loadError) {
+      loadChildren()
+    }
+  }, [isDirectory, isOpen, children, isEmpty, loadingChildren, loadError, loadChildren])
   const isInContext = !isDirectory && contextPaths.has(node.path)
   const isTargetFile = !isDirectory && targetFile === node.path
 
@@ -97,9 +139,9 @@ const FileTreeNode = ({
         )}
       </div>
 
-      {isDirectory && isOpen && node.children && (
+      {isDirectory && isOpen && children && (
         <div>
-          {node.children.map((child) => (
+          {children.map((child) => (
             <FileTreeNode
               key={child.path}
               node={child}
@@ -111,6 +153,32 @@ const FileTreeNode = ({
               showContextToggle={showContextToggle}
             />
           ))}
+          {nextCursor && (
+            <button
+              type="button"
+              disabled={loadingChildren}
+              onClick={(event) => {
+                event.stopPropagation()
+                loadChildren(nextCursor)
+              }}
+              className="w-full px-2 py-1 text-left text-xs text-[#58a6ff] hover:bg-[#30363d] disabled:opacity-50"
+              style={{ paddingLeft: `${(level + 1) * 16 + 30}px` }}
+            >
+              {loadingChildren ? 'Loading...' : `Show more (${children.length} of ${total})`}
+            </button>
+          )}
+        </div>
+      )}
+
+      {isDirectory && isOpen && loadingChildren && !children && (
+        <div className="py-1 text-xs text-[#8b949e]" style={{ paddingLeft: `${(level + 1) * 16 + 30}px` }}>
+          Loading...
+        </div>
+      )}
+
+      {isDirectory && isOpen && loadError && (
+        <div className="py-1 text-xs text-[#f85149]" style={{ paddingLeft: `${(level + 1) * 16 + 30}px` }}>
+          Error: {loadError}
         </div>
       )}
     </div>
@@ -131,8 +199,9 @@ export default function FileTree({
   useEffect(() => {
     const fetchTree = async () => {
       try {
-        const data = await fetchJson('/api/files')
-        setTreeData(data)
+        // Only the root level is fetched up front; subdirectories load when expanded.
+        const data = await fetchListing('')
+        setTreeData({ ...data, name: data.name || 'workspace' })
         setError(null)
       } catch (fetchError) {
         setError(fetchError.message)
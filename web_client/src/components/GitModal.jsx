@@ -1,28 +1,45 @@
-import { useEffect, useState } from 'react'
-import { AlertCircle, CheckCircle2, FileText, GitCommit, X } from 'lucide-react'
-import { fetchJson, postJson } from '../lib/api'
+import { useEffect, useRef, useState } from 'react'
+import { AlertCircle, CheckCircle2, FileText, GitCommit, Sparkles, Square, X } from 'lucide-react'
+import { fetchJson, postJson, streamJsonEvents } from '../lib/api'
 
 export default function GitModal({ isOpen, onClose }) {
   const [status, setStatus] = useState(null)
-  const [diffs, setDiffs] = useState('')
+  const [diffSummary, setDiffSummary] = useState(null)
+  const [selectedDiffPath, setSelectedDiffPath] = useState(null)
+  const [fileDiffs, setFileDiffs] = useState({})
   const [loading, setLoading] = useState(true)
   const [commitMessage, setCommitMessage] = useState('')
   const [committing, setCommitting] = useState(false)
   const [error, setError] = useState(null)
   const [successMessage, setSuccessMessage] = useState('')
+  const [generating, setGenerating] = useState(false)
+  const [generationProgress, setGenerationProgress] = useState(null)
+  const generateAbortRef = useRef(null)
+  const [pushJob, setPushJob] = useState(null)
+  const pushAbortRef = useRef(null)
 
   const fetchGitData = async () => {
     setLoading(true)
     setError(null)
 
     try {
-      const [statusData, diffData] = await Promise.all([
+      // Only the file list loads up front; each file's diff is fetched when it is opened.
+      const [statusData, summaryData] = await Promise.all([
         fetchJson('/api/git/status'),
-        fetchJson('/api/git/diff'),
+        fetchJson('/api/git/diff?summary=true'),
       ])
+      if (summaryData.error) {
+        throw new Error(summaryData.error)
+      }
 
       setStatus(statusData)
-      setDiffs(diffData.diffs || '')
+      setDiffSummary(summaryData)
+      setFileDiffs({})
+      const firstPath = summaryData.files[0]?.path ?? null
+      setSelectedDiffPath(firstPath)
+      if (firstPath) {
+        loadFileDiff(firstPath, {})
+      }
     } catch (fetchError) {
       setError(fetchError.message)
     } finally {
@@ -30,6 +47,36 @@ export default function GitModal({ isOpen, onClose }) {
     }
   }
 
+  const loadFileDiff = async (path, loaded = fileDiffs) => {
+    setSelectedDiffPath(path)
+    if (loaded[path]) {
+      return
+    }
+
+    setFileDiffs((current) => ({ ...current, [path]: { loading: true } }))
+    try {
+      const data = await fetchJson(`/api/git/diff?path=${encodeURIComponent(path)}`)
+      setFileDiffs((current) => ({
+        ...current,
+        [path]: data.error ? { error: data.error } : { diffs: data.diffs, truncated: data.truncated },
+      }))
+    } catch (diffError) {
+      setFileDiffs((current) => ({ ...current, [path]: { error: diffError.message } }))
+    }
+  }
+
+  const loadMoreDiffFiles = async () => {
+    try {
+      const data = await fetchJson(`/api/git/diff?summary=true&offset=${diffSummary.files.length}`)
+      if (data.error) {
+        throw new Error(data.error)
+      }
+      setDiffSummary((current) => ({ ...data, files: [...current.files, ...data.files] }))
+    } catch (moreError) {
+      setError(moreError.message)
+    }
+  }
+
   useEffect(() => {
     if (!isOpen) {
       return
@@ -38,8 +85,108 @@ export default function GitModal({ isOpen, onClose }) {
     setCommitMessage('')
     setSuccessMessage('')
     fetchGitData()
+
+    // Closing the modal stops any message still streaming; a running push carries on.
+    return () => {
+      generateAbortRef.current?.abort()
+      pushAbortRef.current?.abort()
+    }
   }, [isOpen])
 
+  const followPush = async (jobId) => {
+    const abortController = new AbortController()
+    pushAbortRef.current = abortController
+    const trackJob = (event) => setPushJob(event.job)
+
+    try {
+      await streamJsonEvents(
+        `/api/git/push/${jobId}/stream`,
+        {},
+        {
+          onProgress: trackJob,
+          onComplete: (event) => {
+            trackJob(event)
+            setSuccessMessage('Pushed to the remote.')
+          },
+          onCancelled: (event) => {
+            trackJob(event)
+            setSuccessMessage('Push cancelled. The commit is kept locally.')
+          },
+          onError: (event) => {
+            if (event.job) {
+              trackJob(event)
+            }
+            setError(event.job?.error || event.error || 'Push failed.')
+          },
+        },
+        { signal: abortController.signal },
+      )
+    } catch (pushError) {
+      if (pushError.name !== 'AbortError') {
+        setError(pushError.message)
+      }
+    } finally {
+      pushAbortRef.current = null
+      await fetchGitData()
+    }
+  }
+
+  const handleCancelPush = async () => {
+    if (!pushJob || pushJob.status !== 'running') {
+      return
+    }
+
+    try {
+      await postJson(`/api/git/push/${pushJob.job_id}/cancel`, {})
+    } catch (cancelError) {
+      setError(cancelError.message)
+    }
+  }
+
+  const handleGenerate = async () => {
+    if (generating) {
+      generateAbortRef.current?.abort()
+      return
+    }
+
+    const abortController = new AbortController()
+    generateAbortRef.current = abortController
+    setGenerating(true)
+    setGenerationProgress(null)
+    setError(null)
+    setCommitMessage('')
+
+    try {
+      await streamJsonEvents(
+        '/api/git/commit-message/stream',
+        {},
+        {
+          onProgress: (event) => setGenerationProgress(event.progress),
+          onDelta: (event) => {
+            setGenerationProgress(null)
+            setCommitMessage((current) => `${current}${event.delta || ''}`)
+          },
+          onComplete: (event) => {
+            if (event.summary) {
+              setCommitMessage(event.summary.message)
+            }
+          },
+          onError: (event) => setError(event.error || 'Commit message generation failed.'),
+        },
+        { signal: abortController.signal },
+      )
+    } catch (generateError) {
+      // Stopping keeps the partial message as an editable draft.
+      if (generateError.name !== 'AbortError') {
+        setError(generateError.message)
+      }
+    } finally {
+      generateAbortRef.current = null
+      setGenerating(false)
+      setGenerationProgress(null)
+    }
+  }
+
   const handleCommit = async () => {
     if (!commitMessage.trim() || committing) {
       return
@@ -58,6 +205,11 @@ export default function GitModal({ isOpen, onClose }) {
       setSuccessMessage(data.message)
       setCommitMessage('')
       await fetchGitData()
+      if (data.push_job_id) {
+        setPushJob({ job_id: data.push_job_id, status: 'running' })
+        // The commit is done; the push streams its progress in the background.
+        followPush(data.push_job_id)
+      }
     } catch (commitError) {
       setError(commitError.message)
     } finally {
@@ -70,6 +222,9 @@ export default function GitModal({ isOpen, onClose }) {
   }
 
   const hasChanges = Boolean(status?.unsaved_files?.length)
+  const diffFiles = diffSummary?.files || []
+  const selectedDiff = selectedDiffPath ? fileDiffs[selectedDiffPath] : null
+  const diffs = selectedDiff?.diffs || ''
 
   return (
     <div className="fixed inset-0 z-50 flex items-center justify-center bg-black/60 p-4 backdrop-blur-sm transition-opacity sm:p-6">
@@ -137,12 +292,47 @@ export default function GitModal({ isOpen, onClose }) {
           </div>
 
           <div className="flex flex-1 flex-col overflow-hidden bg-[#0d1117]">
+            {!loading && diffFiles.length > 0 && (
+              <div className="custom-scrollbar max-h-40 shrink-0 overflow-y-auto border-b border-[#30363d] bg-[#0d1117] py-1 font-mono text-xs">
+                {diffFiles.map((file) => (
+                  <button
+                    key={file.path}
+                    onClick={() => loadFileDiff(file.path)}
+                    className={`flex w-full items-center gap-2 px-3 py-0.5 text-left transition-colors hover:bg-[#161b22] ${
+                      file.path === selectedDiffPath ? 'bg-[#161b22] text-white' : 'text-[#c9d1d9]'
+                    }`}
+                  >
+                    <span className="flex-1 truncate">
+                      {file.old_path ? `${file.old_path} → ${file.path}` : file.path}
+                    </span>
+                    {file.binary ? (
+                      <span className="text-[#8b949e]">binary</span>
+                    ) : (
+                      <>
+                        <span className="text-[#3fb950]">+{file.added}</span>
+                        <span className="text-[#f85149]">-{file.deleted}</span>
+                      </>
+                    )}
+                  </button>
+                ))}
+                {diffFiles.length < diffSummary.total_files && (
+                  <button onClick={loadMoreDiffFiles} className="px-3 py-1 text-[#58a6ff] hover:underline">
+                    Show {diffSummary.total_files - diffFiles.length} more files
+                  </button>
+                )}
+              </div>
+            )}
             <div className="custom-scrollbar flex-1 overflow-y-auto bg-[#010409] p-4">
-              {loading ? (
+              {loading || selectedDiff?.loading ? (
                 <div className="flex h-full flex-col justify-end p-4 pb-0 font-mono text-sm text-[#8b949e]">
                   <div className="mb-2 h-px w-full animate-pulse bg-gradient-to-r from-transparent via-[#58a6ff]/50 to-transparent"></div>
                   Generating diff...
                 </div>
+              ) : selectedDiff?.error ? (
+                <div className="flex items-start gap-2 text-sm text-[#f85149]">
+                  <AlertCircle size={16} className="mt-0.5" />
+                  <span>{selectedDiff.error}</span>
+                </div>
               ) : diffs ? (
                 <pre className="whitespace-pre-wrap text-xs font-mono text-[#c9d1d9]">
                   {diffs.split('\n').map((line, index) => {
@@ -161,6 +351,9 @@ export default function GitModal({ isOpen, onClose }) {
                       </div>
                     )
                   })}
+                  {selectedDiff.truncated && (
+                    <div className="px-2 pt-2 italic text-[#8b949e]">Diff truncated; it is too large to show in full.</div>
+                  )}
                 </pre>
               ) : (
                 <div className="flex h-full items-center justify-center text-sm italic text-[#8b949e]">
@@ -171,27 +364,50 @@ export default function GitModal({ isOpen, onClose }) {
 
             <div className="shrink-0 border-t border-[#30363d] bg-[#161b22] p-4">
               <div className="space-y-2">
-                <input
-                  type="text"
+                <textarea
+                  rows={3}
                   value={commitMessage}
                   onChange={(event) => setCommitMessage(event.target.value)}
                   placeholder="Enter commit message..."
-                  className="w-full rounded border border-[#30363d] bg-[#010409] px-3 py-2 font-mono text-sm text-[#c9d1d9] outline-none transition-colors focus:border-[#58a6ff]"
-                  disabled={committing || !hasChanges}
+                  className="w-full resize-none rounded border border-[#30363d] bg-[#010409] px-3 py-2 font-mono text-sm text-[#c9d1d9] outline-none transition-colors focus:border-[#58a6ff]"
+                  disabled={committing || generating || !hasChanges}
                 />
 
-                <div className="text-xs text-[#8b949e]">
-                  The web client uses the backend git endpoints directly. AI-generated commit messages are not part of the current backend contract.
+                <div className="flex items-center justify-between gap-2 text-xs text-[#8b949e]">
+                  <span className="truncate">
+                    {generationProgress
+                      ? `Summarizing changes ${generationProgress.done}/${generationProgress.total}: ${generationProgress.file}`
+                      : generating
+                        ? 'Writing commit message...'
+                        : 'Write a message, or generate one from the staged diff.'}
+                  </span>
+                  <button
+                    onClick={handleGenerate}
+                    disabled={committing || !hasChanges}
+                    className="flex shrink-0 items-center gap-1.5 rounded border border-[#30363d] px-3 py-1 text-xs text-[#c9d1d9] transition-colors hover:border-[#58a6ff] disabled:cursor-not-allowed disabled:text-[#484f58]"
+                  >
+                    {generating ? <Square size={12} /> : <Sparkles size={12} />}
+                    {generating ? 'Stop' : 'Generate'}
+                  </button>
                 </div>
               </div>
 
               <div className="mt-3 flex items-center justify-between">
-                <div className="text-xs text-[#8b949e]">
-                  {committing ? 'Committing changes...' : 'Press Commit to save the current snapshot.'}
+                <div className="flex items-center gap-2 text-xs text-[#8b949e]">
+                  {committing
+                    ? 'Committing changes...'
+                    : pushJob?.status === 'running'
+                      ? `Pushing${pushJob.phase ? `: ${pushJob.phase} ${pushJob.percent}% (${pushJob.current}/${pushJob.total})` : '...'}`
+                      : 'Press Commit to save the current snapshot.'}
+                  {pushJob?.status === 'running' && (
+                    <button onClick={handleCancelPush} className="text-[#f85149] transition-colors hover:underline">
+                      Cancel push
+                    </button>
+                  )}
                 </div>
                 <button
                   onClick={handleCommit}
-                  disabled={!commitMessage.trim() || committing || !hasChanges}
+                  disabled={!commitMessage.trim() || committing || generating || !hasChanges}
                   className="flex items-center gap-1.5 rounded bg-[#238636] px-6 py-1.5 text-sm font-semibold text-white shadow-sm transition-colors hover:bg-[#2ea043] disabled:cursor-not-allowed disabled:bg-[#21262d] disabled:text-[#8b949e]"
                 >
                   <CheckCircle2 size={14} />
@@ -7,9 +7,13 @@ export default function ReviewModal({
   targetFile,
   proposedContent,
   onApply,
-  setProposedContent
+  setProposedContent,
+  proposal = null,
+  onApplyHunks = () => {},
 }) {
   const [localContent, setLocalContent] = useState('')
+  const [showHunks, setShowHunks] = useState(false)
+  const [acceptedHunkIds, setAcceptedHunkIds] = useState(() => new Set())
 
   useEffect(() => {
     if (isOpen) {
@@ -17,6 +21,12 @@ export default function ReviewModal({
     }
   }, [isOpen, proposedContent])
 
+  useEffect(() => {
+    // Every hunk starts accepted; reviewers opt out of the ones they do not want.
+    setAcceptedHunkIds(new Set((proposal?.hunks || []).map((hunk) => hunk.id)))
+    setShowHunks(false)
+  }, [proposal])
+
   const initialEditorText = () => {
     return (
       "No editable proposal is ready yet.\n\n" +
@@ -27,6 +37,9 @@ export default function ReviewModal({
   if (!isOpen) return null
 
   const hasProposal = Boolean(proposedContent)
+  const hunks = proposal?.hunks || []
+  // Hunks describe the unedited proposal, so they are only offered until the draft is hand-edited.
+  const canReviewHunks = hunks.length > 0 && localContent === proposedContent
   const lineCount = localContent ? localContent.split('\n').length : 0
   const fileName = targetFile ? targetFile.split(/[\\/]/).pop() : 'none'
 
@@ -45,6 +58,23 @@ export default function ReviewModal({
     onClose()
   }
 
+  const handleToggleHunk = (hunkId) => {
+    setAcceptedHunkIds((previousIds) => {
+      const nextIds = new Set(previousIds)
+      if (nextIds.has(hunkId)) {
+        nextIds.delete(hunkId)
+      } else {
+        nextIds.add(hunkId)
+      }
+      return nextIds
+    })
+  }
+
+  const handleApplyHunks = () => {
+    onApplyHunks(hunks.map((hunk) => hunk.id).filter((hunkId) => acceptedHunkIds.has(hunkId)))
+    onClose()
+  }
+
   return (
     <div className="fixed inset-0 z-50 flex items-center justify-center bg-black/60 p-4 backdrop-blur-sm transition-opacity sm:p-6">
       <div
@@ -75,8 +105,14 @@ export default function ReviewModal({
           <button disabled className="flex items-center gap-1.5 text-xs text-[#8b949e] opacity-50 cursor-not-allowed">
             <Search size={14} /> Find
           </button>
-          <button disabled className="flex items-center gap-1.5 text-xs text-[#8b949e] opacity-50 cursor-not-allowed">
-            <FileDiff size={14} /> Diff
+          <button
+            onClick={() => setShowHunks((previous) => !previous)}
+            disabled={!canReviewHunks}
+            className={`flex items-center gap-1.5 text-xs transition-colors disabled:opacity-50 disabled:cursor-not-allowed ${
+              showHunks && canReviewHunks ? 'text-[#58a6ff]' : 'text-[#8b949e] hover:text-[#c9d1d9]'
+            }`}
+          >
+            <FileDiff size={14} /> Hunks{hunks.length > 0 ? ` (${acceptedHunkIds.size}/${hunks.length})` : ''}
           </button>
           <button disabled className="flex items-center gap-1.5 text-xs text-[#8b949e] opacity-50 cursor-not-allowed">
             <FlaskConical size={14} /> Tests
@@ -87,14 +123,47 @@ export default function ReviewModal({
         </div>
 
         {/* Main Editor Area */}
-        <div className="flex-1 overflow-hidden bg-[#010409]">
-          <textarea
-            value={localContent}
-            onChange={(e) => setLocalContent(e.target.value)}
-            className="h-full w-full resize-none bg-transparent p-4 font-mono text-sm text-[#c9d1d9] outline-none"
-            spellCheck="false"
-          />
-        </div>
+        {showHunks && canReviewHunks ? (
+          <div className="flex-1 overflow-y-auto bg-[#010409] p-4">
+            {hunks.map((hunk) => (
+              <div key={hunk.id} className="mb-3 rounded border border-[#30363d]">
+                <label className="flex cursor-pointer items-center gap-2 border-b border-[#30363d] bg-[#161b22] px-3 py-1.5 text-xs text-[#8b949e]">
+                  <input
+                    type="checkbox"
+                    checked={acceptedHunkIds.has(hunk.id)}
+                    onChange={() => handleToggleHunk(hunk.id)}
+                  />
+                  <span className="font-mono">{hunk.header}</span>
+                </label>
+                <pre className="overflow-x-auto p-2 text-xs">
+                  {hunk.lines.map((line, index) => (
+                    <div
+                      key={index}
+                      className={
+                        line.startsWith('+')
+                          ? 'text-[#3fb950]'
+                          : line.startsWith('-')
+                            ? 'text-[#f85149]'
+                            : 'text-[#8b949e]'
+                      }
+                    >
+                      {line.replace(/\r?\n$/, '')}
+                    </div>
+                  ))}
+                </pre>
+              </div>
+            ))}
+          </div>
+        ) : (
+          <div className="flex-1 overflow-hidden bg-[#010409]">
+            <textarea
+              value={localContent}
+              onChange={(e) => setLocalContent(e.target.value)}
+              className="h-full w-full resize-none bg-transparent p-4 font-mono text-sm text-[#c9d1d9] outline-none"
+              spellCheck="false"
+            />
+          </div>
+        )}
 
         {/* Footer Actions */}
         <div className="flex items-center justify-end gap-3 border-t border-[#30363d] bg-[#161b22] p-4">
@@ -119,6 +188,16 @@ export default function ReviewModal({
             <Save size={14} />
             Keep Draft
           </button>
+          {showHunks && canReviewHunks && (
+            <button
+              onClick={handleApplyHunks}
+              disabled={acceptedHunkIds.size === 0}
+              className="flex items-center gap-1.5 rounded border border-[#238636] px-4 py-1.5 text-sm font-semibold text-[#3fb950] transition-colors hover:bg-[#238636]/20 disabled:opacity-50 disabled:cursor-not-allowed"
+            >
+              <CheckCircle2 size={14} />
+              Apply Selected
+            </button>
+          )}
           <button
             onClick={handleApply}
             disabled={!hasProposal}